@@ -0,0 +1,151 @@
+"""
+Time the construction of Accounts for a bulk import.
+
+The Account constructors used to deep copy their defaults for every
+instance; they now share the read-only class DEFAULTS. The real
+Account and BankAccount classes are timed on the src tree of the
+revision before that change and on the current tree, each in its own
+interpreter: construction from a dict of values, from_row(), and the
+peak memory of keeping 'count' BankAccounts. lbk_library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_account_construction.py [count] [baseline] [revision]
+
+where baseline is the git revision to compare with, by default the one
+before the class DEFAULTS were shared, and revision the one timed against it,
+by default the src tree of the working directory.
+
+File:       bench_account_construction.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+from bench_support import export_src, print_comparison, time_tree
+
+# The revision before the Account DEFAULTS were shared.
+BASELINE = "d2aa8d7^"
+
+
+def time_per_call(function, count: int) -> float:
+    """
+    Get the best time of a function in microseconds per call.
+
+    Parameters:
+        function (callable): the function to time.
+        count (int): the number of calls per repeat.
+
+    Returns:
+        (float) the best time per call in microseconds.
+    """
+    best = min(timeit.repeat(function, number=count, repeat=5))
+    return best / count * 1e6
+
+
+def peak_memory(function, count: int) -> int:
+    """
+    Get the peak memory allocated while building 'count' results.
+
+    Parameters:
+        function (callable): the function building one result.
+        count (int): the number of results kept alive.
+
+    Returns:
+        (int) the peak allocation in bytes.
+    """
+    tracemalloc.start()
+    results = [function() for _ in range(count)]
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del results
+    return peak
+
+
+def timings(count: int) -> dict:
+    """
+    Time the Accounts of the src tree first on sys.path.
+
+    Parameters:
+        count (int): the number of accounts.
+
+    Returns:
+        (dict) the microseconds per account and the kilobytes kept.
+    """
+    from lbk_library import Dbal
+
+    from constants.account_types import AccountType, BankAccountType
+    from elements.account import Account
+    from elements.bank_account import BankAccount
+
+    row = {
+        "record_id": 1,
+        "name": "Chase Savings",
+        "company": "Chase Bank",
+        "account_type": AccountType.BANK,
+        "account_subtype": BankAccountType.SAVINGS,
+    }
+    dbref = Dbal()
+    dbref.sql_connect(":memory:")
+    results = {
+        "us/account": {
+            "Account()": time_per_call(lambda: Account(dbref, dict(row)), count),
+            "BankAccount()": time_per_call(
+                lambda: BankAccount(dbref, dict(row)), count
+            ),
+            "BankAccount.from_row()": time_per_call(
+                lambda: BankAccount.from_row(dbref, row), count
+            ),
+        },
+        "KB": {
+            "BankAccounts kept": peak_memory(
+                lambda: BankAccount(dbref, dict(row)), count
+            )
+            / 1024,
+        },
+    }
+    dbref.sql_close()
+    return results
+
+
+def main(count: int, baseline: str, revision: str = None) -> None:
+    """Compare the construction of 'count' accounts with the baseline."""
+    if importlib.util.find_spec("lbk_library") is None:
+        print("lbk_library is needed to construct the Accounts")
+        return
+    script = os.path.realpath(__file__)
+    with tempfile.TemporaryDirectory() as directory:
+        before = time_tree(script, export_src(baseline, directory), str(count))
+    with tempfile.TemporaryDirectory() as directory:
+        src = (
+            os.path.realpath("src")
+            if revision is None
+            else export_src(revision, directory)
+        )
+        after = time_tree(script, src, str(count))
+    print(
+        "Account construction, {} accounts, {} -> {}".format(
+            count, baseline, revision or "current"
+        )
+    )
+    for unit in before:
+        print_comparison(before[unit], after[unit], unit)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--src"]:
+        sys.path.insert(0, sys.argv[2])
+        print(json.dumps(timings(int(sys.argv[3]))))
+    else:
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+            sys.argv[2] if len(sys.argv) > 2 else BASELINE,
+            sys.argv[3] if len(sys.argv) > 3 else None,
+        )
@@ -0,0 +1,130 @@
+"""
+Time the account lookups and set queries with and without the indexes.
+
+A table of 'count' accounts is built in memory at schema version 1,
+with only the record_id primary key, and the queries run by the
+Account constructors and the account sets are timed. The table is then
+upgraded to the current schema version and the same queries timed
+again. Only the standard library sqlite3 module is needed.
+
+Run from the project directory:
+    python benchmarks/bench_account_indexes.py [count]
+
+File:       bench_account_indexes.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import timeit
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
+from database.schema import Schema
+
+# The queries timed, as (label, sql, parameters).
+QUERIES = (
+    (
+        "account by name",
+        "SELECT * FROM accounts WHERE name = :name",
+        {"name": "Account 77777"},
+    ),
+    (
+        "bank set, page of 50",
+        "SELECT * FROM accounts WHERE account_type = :account_type"
+        + " ORDER BY name, record_id LIMIT 50 OFFSET 0",
+        {"account_type": AccountType.BANK},
+    ),
+    (
+        "CD set, page of 50",
+        "SELECT * FROM accounts WHERE account_type = :account_type"
+        + " AND account_subtype = :account_subtype"
+        + " ORDER BY name, record_id LIMIT 50 OFFSET 0",
+        {"account_type": AccountType.BANK, "account_subtype": BankAccountType.CD},
+    ),
+    (
+        "count of CDs",
+        "SELECT COUNT(*) FROM accounts WHERE account_type = :account_type"
+        + " AND account_subtype = :account_subtype",
+        {"account_type": AccountType.BANK, "account_subtype": BankAccountType.CD},
+    ),
+)
+
+
+def migrate(connection: sqlite3.Connection, version: int) -> None:
+    """Run the Schema migrations up to 'version' on a connection."""
+    for migration, statements in Schema.MIGRATIONS:
+        if migration <= version:
+            for statement in statements:
+                connection.execute(statement)
+    connection.commit()
+
+
+def load(connection: sqlite3.Connection, count: int) -> None:
+    """Fill the 'accounts' table with 'count' accounts of mixed types."""
+    subtypes = BankAccountType.list()[1:] + InvestmentAccountType.list()[1:]
+    rows = []
+    for record_id in range(1, count + 1):
+        subtype = random.choice(subtypes)
+        rows.append(
+            (
+                record_id,
+                AccountType.type_of(subtype),
+                subtype,
+                "Account " + str(record_id),
+                "Company " + str(record_id % 50),
+            )
+        )
+    connection.executemany(
+        "INSERT INTO accounts (record_id, account_type, account_subtype, name,"
+        + " company) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    connection.commit()
+
+
+def time_queries(connection: sqlite3.Connection) -> dict:
+    """Get the best time of each query in microseconds."""
+    times = {}
+    for label, sql, values in QUERIES:
+        number = 20
+        best = min(
+            timeit.repeat(
+                lambda: connection.execute(sql, values).fetchall(),
+                number=number,
+                repeat=3,
+            )
+        )
+        times[label] = best / number * 1e6
+    return times
+
+
+def main(count: int) -> None:
+    """Run the benchmarks on a table of 'count' accounts."""
+    random.seed(1)
+    connection = sqlite3.connect(":memory:")
+    migrate(connection, 1)
+    load(connection, count)
+    before = time_queries(connection)
+    migrate(connection, Schema.VERSION)
+    connection.execute("ANALYZE")
+    after = time_queries(connection)
+
+    print("Account queries on " + str(count) + " accounts, us/query")
+    print("  {:24} {:>12} {:>12}".format("", "version 1", "indexed"))
+    for label, sql, values in QUERIES:
+        print("  {:24} {:12.1f} {:12.1f}".format(label, before[label], after[label]))
+        plan = connection.execute("EXPLAIN QUERY PLAN " + sql, values).fetchall()
+        print("    " + "; ".join(step[3] for step in plan))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
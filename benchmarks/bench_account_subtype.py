@@ -0,0 +1,153 @@
+"""
+Time the account subtype checks made for every account constructed.
+
+Each BankAccount and InvestmentAccount checks its subtype when it is
+set and again each time it is read. The checks used to build a new
+list with list() and scan it; they now test a cached frozenset. The
+real classes are timed on the src tree of the revision before that
+change and on the current tree, each in its own interpreter:
+construction from a dict of values, set_account_subtype() and
+get_account_subtype(). lbk_library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_account_subtype.py [count] [baseline] [revision]
+
+where baseline is the git revision to compare with, by default the one
+before the constant lists were cached, and revision the one timed against it,
+by default the src tree of the working directory.
+
+File:       bench_account_subtype.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from bench_support import export_src, print_comparison, time_tree
+
+# The revision before the constant lists were cached.
+BASELINE = "3832e7d^"
+
+
+def time_per_call(function, count: int) -> float:
+    """
+    Get the best time of a function in microseconds per call.
+
+    Parameters:
+        function (callable): the function to time.
+        count (int): the number of calls per repeat.
+
+    Returns:
+        (float) the best time per call in microseconds.
+    """
+    best = min(timeit.repeat(function, number=count, repeat=5))
+    return best / count * 1e6
+
+
+def timings(count: int) -> dict:
+    """
+    Time the Accounts of the src tree first on sys.path.
+
+    Parameters:
+        count (int): the number of accounts.
+
+    Returns:
+        (dict) the microseconds per account of each operation.
+    """
+    from lbk_library import Dbal
+
+    from constants.account_types import (
+        AccountType,
+        BankAccountType,
+        InvestmentAccountType,
+    )
+    from elements.bank_account import BankAccount
+    from elements.investment_account import InvestmentAccount
+
+    bank_values = {
+        "record_id": 1,
+        "name": "BA checking",
+        "company": "Bank of America",
+        "account_type": AccountType.BANK,
+        "account_subtype": BankAccountType.CHECKING,
+    }
+    investment_values = {
+        "record_id": 2,
+        "name": "Schwab brokerage",
+        "company": "Schwab",
+        "account_type": AccountType.INVESTMENT,
+        "account_subtype": InvestmentAccountType.BROKERAGE,
+    }
+    dbref = Dbal()
+    dbref.sql_connect(":memory:")
+    bank = BankAccount(dbref, dict(bank_values))
+    investment = InvestmentAccount(dbref, dict(investment_values))
+    results = {
+        "us/account": {
+            "BankAccount()": time_per_call(
+                lambda: BankAccount(dbref, dict(bank_values)), count
+            ),
+            "InvestmentAccount()": time_per_call(
+                lambda: InvestmentAccount(dbref, dict(investment_values)), count
+            ),
+            "BankAccount set_account_subtype()": time_per_call(
+                lambda: bank.set_account_subtype(BankAccountType.SAVINGS), count
+            ),
+            "InvestmentAccount set_account_subtype()": time_per_call(
+                lambda: investment.set_account_subtype(
+                    InvestmentAccountType.SINGLE_FUND
+                ),
+                count,
+            ),
+            "BankAccount get_account_subtype()": time_per_call(
+                bank.get_account_subtype, count
+            ),
+            "InvestmentAccount get_account_subtype()": time_per_call(
+                investment.get_account_subtype, count
+            ),
+        },
+    }
+    dbref.sql_close()
+    return results
+
+
+def main(count: int, baseline: str, revision: str = None) -> None:
+    """Compare the subtype checks of 'count' accounts with the baseline."""
+    if importlib.util.find_spec("lbk_library") is None:
+        print("lbk_library is needed to construct the Accounts")
+        return
+    script = os.path.realpath(__file__)
+    with tempfile.TemporaryDirectory() as directory:
+        before = time_tree(script, export_src(baseline, directory), str(count))
+    with tempfile.TemporaryDirectory() as directory:
+        src = (
+            os.path.realpath("src")
+            if revision is None
+            else export_src(revision, directory)
+        )
+        after = time_tree(script, src, str(count))
+    print(
+        "Account subtypes, {} accounts, {} -> {}".format(
+            count, baseline, revision or "current"
+        )
+    )
+    for unit in before:
+        print_comparison(before[unit], after[unit], unit)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--src"]:
+        sys.path.insert(0, sys.argv[2])
+        print(json.dumps(timings(int(sys.argv[3]))))
+    else:
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+            sys.argv[2] if len(sys.argv) > 2 else BASELINE,
+            sys.argv[3] if len(sys.argv) > 3 else None,
+        )
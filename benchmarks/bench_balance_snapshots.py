@@ -0,0 +1,120 @@
+"""
+Time the account list balances with and without the balance snapshots.
+
+A ledger of 'count' transactions over 200 accounts is loaded into an
+in-memory database at the current schema version, with the triggers
+maintaining the snapshots. The benchmark times the balances of all
+accounts summed from the ledger and read from 'account_balances', the
+cost of the triggers on inserting transactions, and verifying and
+rebuilding the snapshots. Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_balance_snapshots.py [count]
+
+File:       bench_balance_snapshots.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from database.balance_snapshots import BalanceSnapshots
+from database.schema import Schema
+
+ACCOUNTS = 200
+
+INSERT = (
+    "INSERT INTO transactions (account_id, date, transaction_type, amount)"
+    + " VALUES (?, ?, 0, ?)"
+)
+
+
+def transactions(count: int) -> list[tuple]:
+    """Make 'count' transactions over 20 years."""
+    first = date(2002, 1, 1)
+    return [
+        (
+            random.randrange(1, ACCOUNTS + 1),
+            (first + timedelta(days=number * 7300 // count)).isoformat(),
+            random.randrange(-50000, 60000),
+        )
+        for number in range(count)
+    ]
+
+
+def create(triggers: bool) -> sqlite3.Connection:
+    """Create a database at the current schema, optionally without triggers."""
+    connection = sqlite3.connect(":memory:")
+    for migration, statements in Schema.MIGRATIONS:
+        for statement in statements:
+            connection.execute(statement)
+    if not triggers:
+        for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        ).fetchall():
+            connection.execute('DROP TRIGGER "' + name + '"')
+    return connection
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks on a ledger of 'count' transactions."""
+    random.seed(1)
+    rows = transactions(count)
+    plain = create(False)
+    loaded = timed(lambda: (plain.executemany(INSERT, rows), plain.commit()))
+    plain.close()
+    connection = create(True)
+    maintained = timed(
+        lambda: (connection.executemany(INSERT, rows), connection.commit())
+    )
+    print("Ledger of {} transactions in {} accounts".format(count, ACCOUNTS))
+    print("  insert without triggers:  {:10.1f} ms".format(loaded))
+    print("  insert with triggers:     {:10.1f} ms".format(maintained))
+
+    summed = timed(
+        lambda: connection.execute(
+            "SELECT account_id, SUM(amount) FROM transactions GROUP BY account_id"
+        ).fetchall()
+    )
+    snapshot = timed(
+        lambda: connection.execute(
+            "SELECT account_id, balance FROM account_balances"
+        ).fetchall()
+    )
+    print("All account balances")
+    print("  summed from the ledger:   {:10.2f} ms".format(summed))
+    print("  read from the snapshots:  {:10.2f} ms".format(snapshot))
+
+    connection.row_factory = sqlite3.Row
+    verified = timed(lambda: connection.execute(BalanceSnapshots.VERIFY).fetchall())
+    print("Snapshot maintenance")
+    print("  verify:                   {:10.1f} ms".format(verified))
+
+    def rebuild():
+        for statement in BalanceSnapshots.REBUILD:
+            connection.execute(statement)
+        connection.commit()
+
+    print("  rebuild:                  {:10.1f} ms".format(timed(rebuild)))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
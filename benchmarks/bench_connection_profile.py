@@ -0,0 +1,100 @@
+"""
+Time database writes and reads with and without the connection profile.
+
+Dbal commits after every statement, so the write benchmark inserts
+accounts one at a time with a commit after each. The read benchmark
+looks accounts up by name on a second connection to the same file.
+Each is run once on a connection with SQLite's default settings and
+once with the default ConnectionProfile applied. Only the standard
+library sqlite3 module is needed.
+
+Run from the project directory:
+    python benchmarks/bench_connection_profile.py [count]
+
+File:       bench_connection_profile.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from constants.account_types import AccountType, BankAccountType
+from database.connection_profile import ConnectionProfile
+from database.schema import Schema
+
+INSERT = (
+    "INSERT INTO accounts (account_type, account_subtype, name, company)"
+    + " VALUES (:account_type, :account_subtype, :name, :company)"
+)
+SELECT = "SELECT * FROM accounts WHERE name = :name"
+
+
+def connect(path: str, profile: ConnectionProfile) -> sqlite3.Connection:
+    """Open a connection, applying 'profile' if it is given."""
+    connection = sqlite3.connect(path)
+    if profile is not None:
+        for statement in profile.get_statements():
+            connection.execute(statement)
+    return connection
+
+
+def run(path: str, profile: ConnectionProfile, count: int) -> tuple:
+    """Get the writes and reads per second on a new database file."""
+    writer = connect(path, profile)
+    for migration, statements in Schema.MIGRATIONS:
+        for statement in statements:
+            writer.execute(statement)
+    writer.commit()
+
+    start = time.perf_counter()
+    for number in range(count):
+        writer.execute(
+            INSERT,
+            {
+                "account_type": AccountType.BANK,
+                "account_subtype": BankAccountType.CHECKING,
+                "name": "Account " + str(number),
+                "company": "Company " + str(number % 50),
+            },
+        )
+        writer.commit()
+    writes = count / (time.perf_counter() - start)
+
+    reader = connect(path, profile)
+    names = ["Account " + str(random.randrange(count)) for _ in range(count * 10)]
+    start = time.perf_counter()
+    for name in names:
+        reader.execute(SELECT, {"name": name}).fetchall()
+    reads = len(names) / (time.perf_counter() - start)
+    reader.close()
+    writer.close()
+    return writes, reads
+
+
+def main(count: int) -> None:
+    """Run the benchmarks with 'count' single row writes."""
+    random.seed(1)
+    print("Accounts written one per commit, and read by name, per second")
+    print("  {:20} {:>12} {:>12}".format("", "writes/s", "reads/s"))
+    for label, profile in (
+        ("SQLite defaults", None),
+        ("ConnectionProfile", ConnectionProfile()),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.db")
+            writes, reads = run(path, profile, count)
+        print("  {:20} {:12.0f} {:12.0f}".format(label, writes, reads))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
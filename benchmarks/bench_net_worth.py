@@ -0,0 +1,152 @@
+"""
+Time the net worth series of a large ledger.
+
+A ledger of 'count' transactions over 20 years and 300 accounts, a
+tenth of them kept separate, is loaded into an in-memory database at
+the current schema version. A fifth of the accounts are investment
+accounts, holding shares of 50 securities bought by one transaction
+in 20, with a close for each weekday. The benchmark times the monthly
+and the daily series when nothing is kept, again with everything kept,
+after a transaction is added to the last month, and after a close of
+the last month is changed. Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_net_worth.py [count]
+
+File:       bench_net_worth.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from bench_support import Database
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from analytics.net_worth import NetWorth
+from constants.account_types import AccountType
+from constants.transaction_types import TransactionType
+from database.price_history import PriceHistory
+from database.schema import Schema
+
+ACCOUNTS = 300
+SECURITIES = 50
+FIRST = date(2003, 1, 1)
+DAYS = 7300
+
+
+def load(dbref: Database, count: int) -> None:
+    """Fill the accounts, a ledger of 'count' transactions and the closes."""
+    connection = dbref.connection
+    connection.execute("BEGIN")
+    connection.executemany(
+        "INSERT INTO accounts (record_id, account_type, name, account_separate)"
+        + " VALUES (?, ?, ?, ?)",
+        [
+            (
+                number,
+                AccountType.INVESTMENT if number % 5 == 1 else AccountType.BANK,
+                "account " + str(number),
+                number % 10 == 0,
+            )
+            for number in range(1, ACCOUNTS + 1)
+        ],
+    )
+    for number in range(count):
+        day = (FIRST + timedelta(days=number * DAYS // count)).isoformat()
+        if number % 20:
+            connection.execute(
+                "INSERT INTO transactions (account_id, date, transaction_type, "
+                + "amount) VALUES (?, ?, ?, ?)",
+                (
+                    random.randrange(1, ACCOUNTS + 1),
+                    day,
+                    TransactionType.DEPOSIT,
+                    random.randrange(-50000, 60000),
+                ),
+            )
+            continue
+        shares = random.randrange(1, 100) * 10000
+        record_id = connection.execute(
+            "INSERT INTO transactions (account_id, date, transaction_type, "
+            + "amount) VALUES (?, ?, ?, ?)",
+            (
+                random.randrange(1, ACCOUNTS + 1, 5),
+                day,
+                TransactionType.BUY,
+                -shares // 100,
+            ),
+        ).lastrowid
+        connection.execute(
+            "INSERT INTO trades (transaction_id, security_id, shares) "
+            + "VALUES (?, ?, ?)",
+            (record_id, random.randrange(1, SECURITIES + 1), shares),
+        )
+    connection.execute("COMMIT")
+
+    prices = PriceHistory(dbref)
+    weekdays = [
+        FIRST + timedelta(days=number)
+        for number in range(DAYS + 31)
+        if (FIRST + timedelta(days=number)).weekday() < 5
+    ]
+    connection.execute("BEGIN")
+    for security_id in range(1, SECURITIES + 1):
+        close = 100.0
+        closes = []
+        for day in weekdays:
+            close *= random.uniform(0.98, 1.0205)
+            closes.append((day, close))
+        prices.add_prices(security_id, closes)
+    connection.execute("COMMIT")
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks on a ledger of 'count' transactions."""
+    random.seed(1)
+    dbref = Database()
+    Schema.upgrade(dbref)
+    load(dbref, count)
+    net_worth = NetWorth(dbref)
+    print("Ledger of {} transactions in {} accounts".format(count, ACCOUNTS))
+    print("  monthly series")
+    cold = timed(lambda: net_worth.get_series())
+    print("    nothing kept:            {:8.1f} ms".format(cold))
+    warm = timed(lambda: net_worth.get_series())
+    print("    all months kept:         {:8.1f} ms".format(warm))
+    net_worth.clear()
+    cold = timed(lambda: net_worth.get_series(period=NetWorth.DAY))
+    labels, values = net_worth.get_series(period=NetWorth.DAY)
+    print("  daily series, {} days".format(len(labels)))
+    print("    nothing kept:            {:8.1f} ms".format(cold))
+    warm = timed(lambda: net_worth.get_series(period=NetWorth.DAY))
+    print("    all months kept:         {:8.1f} ms".format(warm))
+    dbref.sql_query(
+        "INSERT INTO transactions (account_id, date, transaction_type, amount)"
+        + " VALUES (1, :date, 0, 100)",
+        {"date": labels[-1]},
+    )
+    tail = timed(lambda: net_worth.get_series(period=NetWorth.DAY))
+    print("    last month changed:      {:8.1f} ms".format(tail))
+    PriceHistory(dbref).add_prices(1, [(labels[-1], 150.0)])
+    tail = timed(lambda: net_worth.get_series(period=NetWorth.DAY))
+    print("    last month's close:      {:8.1f} ms".format(tail))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
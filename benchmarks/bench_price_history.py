@@ -0,0 +1,148 @@
+"""
+Time and size the price history of many securities.
+
+Daily closes for 'count' securities over 30 years of trading days are
+stored in a database file at the current schema version, and in a
+plain rowid table with a row for each ISO date and REAL close for
+comparison. The benchmark reports the size of each, the time to store
+the prices, and the time to read the history of one security and of
+all of them from each.
+Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_price_history.py [count]
+
+File:       bench_price_history.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bench_support import Database
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from database.price_history import PriceHistory
+from database.schema import Schema
+
+YEARS = 30
+
+PLAIN = (
+    'CREATE TABLE "plain_prices" ('
+    + '"record_id" INTEGER PRIMARY KEY, "security_id" INTEGER NOT NULL, '
+    + '"date" TEXT NOT NULL, "close" REAL NOT NULL)',
+    'CREATE UNIQUE INDEX "plain_prices_security_date" '
+    + 'ON "plain_prices" ("security_id", "date")',
+)
+
+
+def trading_days() -> list[date]:
+    """List the weekdays of the last 30 years."""
+    day = date(1994, 1, 3)
+    days = []
+    while len(days) < YEARS * 252:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def file_size(dbref: Database, table: str) -> int:
+    """Get the bytes used by a table and its indexes."""
+    row = dbref.sql_fetchrow(
+        dbref.sql_query(
+            "SELECT SUM(pgsize) AS size FROM dbstat WHERE name IN"
+            + " (SELECT name FROM sqlite_master WHERE tbl_name = :table)",
+            {"table": table},
+        )
+    )
+    return row["size"]
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks for 'count' securities."""
+    random.seed(1)
+    days = trading_days()
+    histories = []
+    for _ in range(count):
+        close = random.uniform(10, 200)
+        history = []
+        for day in days:
+            close = max(0.01, close * random.gauss(1.0003, 0.012))
+            history.append((day, close))
+        histories.append(history)
+
+    with tempfile.TemporaryDirectory() as directory:
+        dbref = Database(os.path.join(directory, "prices.db"))
+        Schema.upgrade(dbref)
+        prices = PriceHistory(dbref)
+        stored = timed(
+            lambda: [
+                prices.add_prices(security_id, history)
+                for security_id, history in enumerate(histories, 1)
+            ]
+        )
+        for statement in PLAIN:
+            dbref.sql_query(statement)
+        dbref.connection.execute("BEGIN")
+        dbref.connection.executemany(
+            'INSERT INTO "plain_prices" ("security_id", "date", "close")'
+            + " VALUES (?, ?, ?)",
+            (
+                (security_id, day.isoformat(), close)
+                for security_id, history in enumerate(histories, 1)
+                for day, close in history
+            ),
+        )
+        dbref.connection.execute("COMMIT")
+
+        rows = count * len(days)
+        print("{} securities, {} daily closes each".format(count, len(days)))
+        print("  stored in:                {:8.0f} ms".format(stored))
+        for table in ("prices", "plain_prices"):
+            size = file_size(dbref, table)
+            print(
+                "  size of {:14}    {:8.1f} MiB, {:4.1f} bytes a price".format(
+                    table + ":", size / 2**20, size / rows
+                )
+            )
+        one = timed(lambda: prices.get_prices(count // 2))
+        print("  read one history:         {:8.2f} ms".format(one))
+        every = timed(
+            lambda: [prices.get_prices(number) for number in range(1, count + 1)]
+        )
+        print("  read every history:       {:8.0f} ms".format(every))
+
+        def plain(security_id):
+            return dbref.connection.execute(
+                'SELECT "date", "close" FROM "plain_prices"'
+                + ' WHERE "security_id" = ? ORDER BY "date"',
+                (security_id,),
+            ).fetchall()
+
+        dbref.connection.row_factory = None
+        one = timed(lambda: plain(count // 2))
+        print("  read one plain history:   {:8.2f} ms".format(one))
+        every = timed(lambda: [plain(number) for number in range(1, count + 1)])
+        print("  read every plain history: {:8.0f} ms".format(every))
+        dbref.connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,142 @@
+"""
+Time the quote service against a provider with network latency.
+
+A stand-in provider answers after a fixed delay for each request, as a
+web service would, with made up prices. Quotes for 'count' symbols are
+fetched one symbol a request on one thread, as a simple client would,
+and through the QuoteService in batches on its thread pool; then again
+while the quotes are kept. A year of history is fetched, then only the
+week after it. Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_quote_service.py [count] [latency_ms]
+
+File:       bench_quote_service.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from bench_support import Database
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from database.schema import Schema
+from quotes.quote_provider import QuoteProvider
+from quotes.quote_service import QuoteService
+
+
+class LatencyProvider(QuoteProvider):
+    """Answers every symbol, after 'latency' seconds a request."""
+
+    MAX_SYMBOLS = 50
+    RATE = 10.0
+    BURST = 4
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def request(self) -> None:
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.latency)
+
+    def get_quotes(self, symbols: list[str]) -> dict[str, float]:
+        self.request()
+        return {symbol: 100.0 + len(symbol) for symbol in symbols}
+
+    def get_history(
+        self, symbols: list[str], start: date, end: date
+    ) -> dict[str, list[tuple[date, float]]]:
+        self.request()
+        days = []
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                days.append(day)
+            day += timedelta(days=1)
+        return {
+            symbol: [(day, 100.0 + number % 50) for number, day in enumerate(days)]
+            for symbol in symbols
+        }
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int, latency: float) -> None:
+    """Run the benchmarks for 'count' symbols."""
+    symbols = ["S{:04d}".format(number) for number in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        dbref = Database(os.path.join(directory, "quotes.db"))
+        Schema.upgrade(dbref)
+        dbref.connection.executemany(
+            'INSERT INTO "securities" ("symbol") VALUES (?)',
+            ((symbol,) for symbol in symbols),
+        )
+        print("{} symbols, {:.0f} ms a request".format(count, latency * 1000))
+
+        provider = LatencyProvider(latency)
+        single = timed(lambda: [provider.get_quotes([symbol]) for symbol in symbols])
+        print(
+            "  one symbol a request:     {:8.0f} ms, {} requests".format(
+                single, provider.requests
+            )
+        )
+
+        provider = LatencyProvider(latency)
+        service = QuoteService(dbref, provider)
+        batched = timed(lambda: service.get_quotes(symbols))
+        print(
+            "  batched on the pool:      {:8.0f} ms, {} requests".format(
+                batched, provider.requests
+            )
+        )
+        kept = timed(lambda: service.get_quotes(symbols))
+        print(
+            "  kept quotes:              {:8.2f} ms, {} requests".format(
+                kept, provider.requests
+            )
+        )
+
+        end = date(2023, 6, 30)
+        provider.requests = 0
+        year = timed(
+            lambda: service.update_history(start=end - timedelta(days=365), end=end)
+        )
+        print(
+            "  a year of history:        {:8.0f} ms, {} requests".format(
+                year, provider.requests
+            )
+        )
+        provider.requests = 0
+        week = timed(lambda: service.update_history(end=end + timedelta(days=7)))
+        print(
+            "  the week after it:        {:8.0f} ms, {} requests".format(
+                week, provider.requests
+            )
+        )
+        service.close()
+        dbref.connection.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        (float(sys.argv[2]) if len(sys.argv) > 2 else 200.0) / 1000,
+    )
@@ -0,0 +1,111 @@
+"""
+The database and the source trees shared by the benchmarks.
+
+Database gives the Dbal calls the analytics, database and quotes
+classes use, on a sqlite3 connection, so the benchmarks run with the
+standard library only, without lbk_library. The connection is in
+autocommit mode; a benchmark loading many rows wraps them in its own
+BEGIN and COMMIT.
+
+A benchmark comparing the code before and after a change exports the
+src tree of the earlier git revision with export_src() and runs its
+timings on each tree in a new interpreter with time_tree(), so the two
+trees' modules never meet in one process.
+
+File:       bench_support.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+
+class Database:
+    """The Dbal calls used by the benchmarks, on a sqlite3 connection."""
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+
+    def sql_query(self, sql: str, values: dict = None) -> sqlite3.Cursor:
+        return self.connection.execute(sql, values or {})
+
+    def sql_fetchrow(self, result: sqlite3.Cursor) -> dict:
+        row = result.fetchone()
+        return dict(row) if row is not None else None
+
+    def sql_fetchrowset(self, result: sqlite3.Cursor) -> list[dict]:
+        return [dict(row) for row in result.fetchall()]
+
+
+def export_src(revision: str, directory: str) -> str:
+    """
+    Write the src tree of a git revision into a directory.
+
+    Parameters:
+        revision (str): the git revision, such as a commit hash.
+        directory (str): the directory to write the tree into.
+
+    Returns:
+        (str) the path of the src tree written.
+    """
+    archive = subprocess.run(
+        ["git", "archive", revision, "src"], check=True, capture_output=True
+    ).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+    return os.path.join(directory, "src")
+
+
+def time_tree(script: str, src: str, *arguments: str) -> dict:
+    """
+    Run the timings of a benchmark on one src tree in a new interpreter.
+
+    The script is run with '--src', the path of the tree, and the
+    arguments, and must print its timings as a JSON object.
+
+    Parameters:
+        script (str): the path of the benchmark script.
+        src (str): the path of the src tree to time.
+        arguments (str): further arguments of the script.
+
+    Returns:
+        (dict) the timings printed by the script.
+    """
+    output = subprocess.run(
+        [sys.executable, script, "--src", src, *arguments],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def print_comparison(before: dict, after: dict, unit: str) -> None:
+    """
+    Print the timings of two trees side by side.
+
+    Parameters:
+        before (dict): the timings of the earlier tree.
+        after (dict): the timings of the current tree, with the same keys.
+        unit (str): the unit of the timings.
+    """
+    width = max(len(name) for name in before)
+    print("  {}  {:>12} {:>12}".format(" " * width, "before", "after"))
+    for name in before:
+        print(
+            "  {}  {:>12,.2f} {:>12,.2f} {} {:6.2f}x".format(
+                name.ljust(width),
+                before[name],
+                after[name],
+                unit,
+                before[name] / after[name],
+            )
+        )
+
+
+# end bench_support.py
@@ -0,0 +1,150 @@
+"""
+Time the yearly tax estimates, read from the ledger and kept.
+
+A ledger of bank, taxable and tax deferred investment accounts and a
+tax account holds 'count' trades over 20 years, with monthly interest
+and quarterly dividends. The estimate of every year is timed when it
+is first read, when the report is opened again, and after a change to
+the last year, when only that year is read again. Only the standard
+library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_tax_estimate.py [count]
+
+File:       bench_tax_estimate.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bench_support import Database
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from analytics.tax_estimate import TaxEstimate
+from constants.account_types import AccountType
+from constants.transaction_types import TransactionType
+from database.schema import Schema
+
+SECURITIES = 50
+YEARS = 20
+FIRST = 2003
+
+# record_id: (account_type, tax_deferred)
+ACCOUNTS = {
+    1: (AccountType.BANK, False),
+    2: (AccountType.BANK, False),
+    3: (AccountType.INVESTMENT, False),
+    4: (AccountType.INVESTMENT, False),
+    5: (AccountType.INVESTMENT, True),
+    6: (AccountType.TAX, False),
+}
+TRADED = (3, 4, 5)
+
+
+def add(connection: sqlite3.Connection, account_id, day, kind, amount) -> int:
+    """Insert a transaction and get its record_id."""
+    return connection.execute(
+        'INSERT INTO "transactions" ("account_id", "date", "transaction_type", '
+        + '"amount") VALUES (?, ?, ?, ?)',
+        (account_id, day, kind, amount),
+    ).lastrowid
+
+
+def load(dbref: Database, count: int) -> None:
+    """Load the accounts, the income and the trades."""
+    random.seed(1)
+    connection = dbref.connection
+    connection.execute("BEGIN")
+    for record_id, (account_type, tax_deferred) in ACCOUNTS.items():
+        connection.execute(
+            'INSERT INTO "accounts" ("record_id", "account_type", "name", '
+            + '"tax_deferred") VALUES (?, ?, ?, ?)',
+            (record_id, account_type, "account " + str(record_id), tax_deferred),
+        )
+    for year in range(FIRST, FIRST + YEARS):
+        for month in range(1, 13):
+            day = "{}-{:02}-28".format(year, month)
+            for account_id in (1, 2):
+                add(connection, account_id, day, TransactionType.INTEREST, 500)
+            if month % 3 == 0:
+                for account_id in TRADED:
+                    add(connection, account_id, day, TransactionType.DIVIDEND, 20000)
+                add(connection, 6, day, TransactionType.TRANSFER, 250000)
+
+    held: dict[tuple[int, int], int] = {}
+    first = date(FIRST, 1, 1)
+    for number in range(count):
+        day = (first + timedelta(days=number * YEARS * 365 // count)).isoformat()
+        account_id = random.choice(TRADED)
+        security_id = random.randint(1, SECURITIES)
+        shares = random.randint(1, 100) * 10000
+        key = (account_id, security_id)
+        if held.get(key, 0) >= shares and random.random() < 0.4:
+            kind = TransactionType.SELL
+            amount = shares * random.randint(80, 160) // 10000
+            shares = -shares
+        else:
+            kind = TransactionType.BUY
+            amount = -shares // 100
+        held[key] = held.get(key, 0) + shares
+        record_id = add(connection, account_id, day, kind, amount)
+        connection.execute(
+            'INSERT INTO "trades" ("transaction_id", "security_id", "shares") '
+            + "VALUES (?, ?, ?)",
+            (record_id, security_id, shares),
+        )
+    connection.execute("COMMIT")
+
+
+def report(dbref: Database) -> list[dict[str, int]]:
+    """Open the report of the estimate of every year."""
+    taxes = TaxEstimate.for_dbref(dbref)
+    return [taxes.get_estimate(year) for year in range(FIRST, FIRST + YEARS)]
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks for 'count' trades."""
+    with tempfile.TemporaryDirectory() as directory:
+        dbref = Database(os.path.join(directory, "tax_estimate.db"))
+        Schema.upgrade(dbref)
+        load(dbref, count)
+        print("{} trades, {} years".format(count, YEARS))
+        results = []
+        cold = timed(lambda: results.append(report(dbref)))
+        print("  first report:             {:8.1f} ms".format(cold))
+        warm = timed(lambda: results.append(report(dbref)))
+        print("  report opened again:      {:8.1f} ms".format(warm))
+        assert results[0] == results[1]
+
+        last = "{}-12-31".format(FIRST + YEARS - 1)
+        add(dbref.connection, 1, last, TransactionType.INTEREST, 1000)
+        changed = timed(lambda: results.append(report(dbref)))
+        print("  after a change:           {:8.1f} ms".format(changed))
+        assert results[2][:-1] == results[0][:-1]
+        assert (
+            results[2][-1][TaxEstimate.INTEREST]
+            == results[0][-1][TaxEstimate.INTEREST] + 1000
+        )
+        dbref.connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
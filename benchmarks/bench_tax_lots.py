@@ -0,0 +1,126 @@
+"""
+Time the tax lots of an account with many purchases and sales.
+
+'count' lots of 100 securities are bought over 20 years, with a sale
+after every third purchase, and the realized gains of each year are
+totalled by each cost basis method. For comparison, the FIFO gains are
+also found by rescanning the purchases of the security at each sale,
+on a smaller history. Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_tax_lots.py [count]
+
+File:       bench_tax_lots.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from analytics.tax_lots import TaxLots
+
+SECURITIES = 100
+YEARS = 20
+
+
+def history(count: int) -> list[tuple]:
+    """Make the ('buy' or 'sell', security_id, day, shares, cash) trades."""
+    random.seed(1)
+    held = [0] * (SECURITIES + 1)
+    trades = []
+    first = date(2003, 1, 1)
+    for number in range(count):
+        day = (first + timedelta(days=number * YEARS * 365 // count)).isoformat()
+        security_id = random.randint(1, SECURITIES)
+        shares = random.randint(1, 100)
+        trades.append(("buy", security_id, day, shares, shares * 1000))
+        held[security_id] += shares
+        if number % 3 == 2:
+            security_id = random.randint(1, SECURITIES)
+            shares = random.randint(1, held[security_id]) if held[security_id] else 0
+            if shares:
+                trades.append(("sell", security_id, day, shares, shares * 1100))
+                held[security_id] -= shares
+    return trades
+
+
+def engine(trades: list[tuple], method: str) -> TaxLots:
+    """Apply the trades to a TaxLots."""
+    lots = TaxLots(method)
+    for kind, security_id, day, shares, cash in trades:
+        if kind == "buy":
+            lots.buy(security_id, day, shares, cash)
+        else:
+            lots.sell(security_id, day, shares, cash)
+    return lots
+
+
+def rescan(trades: list[tuple]) -> int:
+    """Find the FIFO gains by scanning every purchase at each sale."""
+    purchases = []
+    gains = 0
+    for kind, security_id, day, shares, cash in trades:
+        if kind == "buy":
+            purchases.append([security_id, shares, cash])
+            continue
+        remaining = shares
+        basis = 0
+        for lot in purchases:
+            if lot[0] == security_id and lot[1] and remaining:
+                take = min(remaining, lot[1])
+                part = lot[2] if take == lot[1] else lot[2] * take // lot[1]
+                lot[1] -= take
+                lot[2] -= part
+                basis += part
+                remaining -= take
+        gains += cash - basis
+    return gains
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks for 'count' lots."""
+    trades = history(count)
+    sales = sum(1 for trade in trades if trade[0] == "sell")
+    print("{} lots, {} sales".format(count, sales))
+    for method in (TaxLots.FIFO, TaxLots.AVERAGE):
+        lots = []
+        every = timed(lambda: lots.append(engine(trades, method)))
+        years = timed(
+            lambda: [lots[0].get_realized(year) for year in range(2003, 2023)]
+        )
+        print(
+            "  {:8} lots: {:8.0f} ms, yearly gains: {:6.3f} ms".format(
+                method, every, years
+            )
+        )
+
+    small = history(count // 10)
+    lots = []
+    queued = timed(lambda: lots.append(engine(small, TaxLots.FIFO)))
+    gains = []
+    scanned = timed(lambda: gains.append(rescan(small)))
+    total = sum(gain.get_gain() for gain in lots[0].get_gains())
+    assert total == gains[0]
+    print("{} lots:".format(count // 10))
+    print("  queued lots:              {:8.0f} ms".format(queued))
+    print("  rescan of purchases:      {:8.0f} ms".format(scanned))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
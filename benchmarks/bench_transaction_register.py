@@ -0,0 +1,158 @@
+"""
+Time account register reads with running balances on a large ledger.
+
+A ledger of 'count' transactions spread over 20 accounts is built in
+memory with the current schema. For one account the benchmark times
+- the opening balance of a date, summed from the index,
+- a 50 row page of the register from that date with its balances,
+- a scan of the whole register, streaming the rows in chunks with
+  the window SUM() balance, and its peak Python memory use,
+and then times the opening balance and page again without the
+'(account_id, date, ...)' index. Only the standard library is needed.
+
+Run from the project directory:
+    python benchmarks/bench_transaction_register.py [count]
+
+File:       bench_transaction_register.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from constants.transaction_types import TransactionType
+from database.schema import Schema
+
+ACCOUNTS = 20
+ACCOUNT_ID = 7
+MIDDLE = "2012-01-01"
+
+# As CHUNK_SIZE and BALANCE; the set itself
+# needs lbk_library, which this benchmark does without.
+CHUNK_SIZE = 500
+BALANCE = (
+    ":opening + SUM(amount) OVER "
+    + "(ORDER BY date, record_id ROWS UNBOUNDED PRECEDING)"
+)
+
+OPENING = (
+    "SELECT SUM(amount) FROM transactions"
+    + " WHERE account_id = :account_id AND date < :date"
+)
+REGISTER = (
+    "SELECT *, "
+    + BALANCE
+    + " AS balance FROM transactions"
+    + " WHERE account_id = :account_id AND date >= :date"
+    + " ORDER BY date, record_id LIMIT :limit"
+)
+
+
+def load(connection: sqlite3.Connection, count: int) -> None:
+    """Fill the ledger with 'count' transactions over 20 years."""
+    first = date(2002, 1, 1)
+    types = TransactionType.list()[1:]
+    rows = (
+        (
+            random.randrange(1, ACCOUNTS + 1),
+            (first + timedelta(days=number * 7300 // count)).isoformat(),
+            random.choice(types),
+            random.randrange(-50000, 60000),
+        )
+        for number in range(count)
+    )
+    connection.executemany(
+        "INSERT INTO transactions (account_id, date, transaction_type, amount)"
+        + " VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    connection.commit()
+
+
+def best_time(function, repeat: int = 5) -> float:
+    """Get the best time of 'function' in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def page(connection: sqlite3.Connection) -> list:
+    """Read a 50 row register page from the middle date."""
+    values = {"account_id": ACCOUNT_ID, "date": MIDDLE}
+    opening = connection.execute(OPENING, values).fetchone()[0] or 0
+    values.update({"opening": opening, "limit": 50})
+    return connection.execute(REGISTER, values).fetchall()
+
+
+def scan(connection: sqlite3.Connection) -> int:
+    """Stream the whole register of the account, returning the balance."""
+    values = {"account_id": ACCOUNT_ID, "date": "", "opening": 0, "limit": -1}
+    cursor = connection.execute(REGISTER, values)
+    balance = 0
+    rows = cursor.fetchmany(CHUNK_SIZE)
+    while rows:
+        balance = rows[-1][-1]
+        rows = cursor.fetchmany(CHUNK_SIZE)
+    return balance
+
+
+def main(count: int) -> None:
+    """Run the benchmarks on a ledger of 'count' transactions."""
+    random.seed(1)
+    connection = sqlite3.connect(":memory:")
+    for migration, statements in Schema.MIGRATIONS:
+        for statement in statements:
+            connection.execute(statement)
+    start = time.perf_counter()
+    load(connection, count)
+    print(
+        "Ledger of {} transactions in {} accounts, built in {:.1f} s".format(
+            count, ACCOUNTS, time.perf_counter() - start
+        )
+    )
+
+    values = {"account_id": ACCOUNT_ID, "date": MIDDLE}
+    opening = best_time(lambda: connection.execute(OPENING, values).fetchone())
+    print("  opening balance:        {:9.2f} ms".format(opening))
+    paged = best_time(lambda: page(connection))
+    print("  register page of 50:    {:9.2f} ms".format(paged))
+    tracemalloc.start()
+    scanned = best_time(lambda: scan(connection), 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        "  whole register scan:    {:9.2f} ms, peak {:.0f} KiB".format(
+            scanned, peak / 1024
+        )
+    )
+    plan = connection.execute(
+        "EXPLAIN QUERY PLAN " + REGISTER, dict(values, opening=0, limit=50)
+    ).fetchall()
+    print("    " + "; ".join(step[3] for step in plan))
+
+    connection.execute('DROP INDEX "transactions_account_date"')
+    print("Without the (account_id, date) index")
+    opening = best_time(lambda: connection.execute(OPENING, values).fetchone(), 2)
+    print("  opening balance:        {:9.2f} ms".format(opening))
+    paged = best_time(lambda: page(connection), 2)
+    print("  register page of 50:    {:9.2f} ms".format(paged))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,180 @@
+"""
+Time the valuation of the investment accounts over their history.
+
+'count' securities with 10 years of daily closes are traded in 10
+investment accounts, a trade a week in each account. The daily value of
+every account is computed by the Valuation, and by a plain loop over
+the days and holdings for comparison. Only the standard library is
+needed.
+
+Run from the project directory:
+    python benchmarks/bench_valuation.py [count]
+
+File:       bench_valuation.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2023 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from bench_support import Database
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from analytics.valuation import Valuation
+from constants.account_types import AccountType
+from constants.transaction_types import TransactionType
+from database.price_history import PriceHistory
+from database.schema import Schema
+
+ACCOUNTS = 10
+YEARS = 10
+START = date(2013, 1, 1)
+
+
+def load(dbref: Database, count: int) -> None:
+    """Load the accounts, securities, prices and trades."""
+    random.seed(1)
+    connection = dbref.connection
+    connection.execute("BEGIN")
+    for number in range(1, ACCOUNTS + 1):
+        connection.execute(
+            'INSERT INTO "accounts" ("record_id", "account_type", "name", '
+            + '"tax_deferred") VALUES (?, ?, ?, ?)',
+            (number, AccountType.INVESTMENT, "account " + str(number), number % 3 == 0),
+        )
+    for number in range(1, count + 1):
+        connection.execute(
+            'INSERT INTO "securities" ("symbol") VALUES (?)', ("S" + str(number),)
+        )
+    connection.execute("COMMIT")
+
+    days = [
+        START + timedelta(days=day)
+        for day in range(YEARS * 365)
+        if (START + timedelta(days=day)).weekday() < 5
+    ]
+    prices = PriceHistory(dbref)
+    for number in range(1, count + 1):
+        close = random.uniform(10, 200)
+        history = []
+        for day in days:
+            close = max(0.01, close * random.gauss(1.0003, 0.012))
+            history.append((day, close))
+        prices.add_prices(number, history)
+
+    connection.execute("BEGIN")
+    for account_id in range(1, ACCOUNTS + 1):
+        connection.execute(
+            'INSERT INTO "transactions" ("account_id", "date", "transaction_type", '
+            + '"amount") VALUES (?, ?, ?, ?)',
+            (account_id, START.isoformat(), TransactionType.DEPOSIT, 10**9),
+        )
+        held = {}
+        for week in range(YEARS * 52):
+            day = START + timedelta(days=7 * week + 1)
+            security_id = random.randint(1, count)
+            shares = random.randint(1, 100) * 10000
+            if held.get(security_id, 0) >= shares and random.random() < 0.3:
+                shares = -shares
+                kind = TransactionType.SELL
+            else:
+                kind = TransactionType.BUY
+            held[security_id] = held.get(security_id, 0) + shares
+            record_id = connection.execute(
+                'INSERT INTO "transactions" ("account_id", "date", '
+                + '"transaction_type", "amount") VALUES (?, ?, ?, ?)',
+                (account_id, day.isoformat(), kind, -shares // 100),
+            ).lastrowid
+            connection.execute(
+                'INSERT INTO "trades" ("transaction_id", "security_id", "shares") '
+                + "VALUES (?, ?, ?)",
+                (record_id, security_id, shares),
+            )
+    connection.execute("COMMIT")
+
+
+def plain(dbref: Database, start: date, end: date) -> dict[int, list[int]]:
+    """Value each account on each day with a loop over its holdings."""
+    connection = dbref.connection
+    trades = connection.execute(
+        'SELECT t."account_id", t."date", t."amount", r."security_id", r."shares" '
+        + 'FROM "transactions" t LEFT JOIN "trades" r '
+        + 'ON r."transaction_id" = t."record_id" ORDER BY t."date"'
+    ).fetchall()
+    prices = PriceHistory(dbref)
+    histories = {}
+    values = {account_id: [] for account_id in range(1, ACCOUNTS + 1)}
+    cash = dict.fromkeys(values, 0)
+    holdings = {account_id: {} for account_id in values}
+    position = 0
+    day = start
+    while day <= end:
+        text = day.isoformat()
+        while position < len(trades) and trades[position]["date"] <= text:
+            trade = trades[position]
+            cash[trade["account_id"]] += trade["amount"]
+            if trade["security_id"] is not None:
+                shares = holdings[trade["account_id"]]
+                security_id = trade["security_id"]
+                shares[security_id] = shares.get(security_id, 0) + trade["shares"]
+            position += 1
+        number = PriceHistory.to_day(day)
+        for account_id, shares in holdings.items():
+            value = 0
+            for security_id, count in shares.items():
+                if security_id not in histories:
+                    histories[security_id] = prices.get_prices(security_id)
+                days, closes = histories[security_id]
+                index = bisect_right(days, number)
+                if index:
+                    value += count * closes[index - 1]
+            values[account_id].append(cash[account_id] + (value + 500000) // 10**6)
+        day += timedelta(days=1)
+    return values
+
+
+def timed(function) -> float:
+    """Get the time of one call of 'function' in milliseconds."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(count: int) -> None:
+    """Run the benchmarks for 'count' securities."""
+    with tempfile.TemporaryDirectory() as directory:
+        dbref = Database(os.path.join(directory, "valuation.db"))
+        Schema.upgrade(dbref)
+        load(dbref, count)
+        end = START + timedelta(days=YEARS * 365 - 1)
+        valuation = Valuation(dbref)
+        holdings = sum(len(shares) for shares in valuation.get_holdings().values())
+        print(
+            "{} accounts, {} securities, {} holdings, {} days".format(
+                ACCOUNTS, count, holdings, (end - START).days + 1
+            )
+        )
+        results = {}
+        every = timed(
+            lambda: results.update(valuation=valuation.get_account_values(START, end))
+        )
+        print("  valuation:                {:8.0f} ms".format(every))
+        every = timed(lambda: results.update(plain=plain(dbref, START, end)))
+        print("  plain loop:               {:8.0f} ms".format(every))
+        for account_id, series in results["valuation"][1].items():
+            assert list(series) == results["plain"][account_id]
+        dbref.connection.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,25 @@
+"""
+Define the members of the analytics package for the MoneyTracker Program
+
+The analytics work on whole tables at a time, in columns, rather than
+on individual database elements. The modules included in the package
+are
+    AccountColumns - A columnar snapshot of the 'accounts' table with
+        bitmap filtering and group-by on the account type codes.
+    NetWorth - The net worth of the accounts not kept separate, with
+        the market value of their shares, at the end of each day or
+        month.
+    TaxEstimate - A simplified yearly income tax estimate from the
+        interest, dividends and realized gains of the taxable accounts,
+        kept for each year until the ledger changes.
+    TaxLots - The tax lots of the securities of an account, with the
+        gains realized by FIFO, specific lot or average cost.
+    Valuation - The daily value of the investment accounts, their cash
+        and the market value of their holdings, per account and in
+        total.
+
+ File:       analytics.__init__.py
+ Author:     Lorn B Kerr
+ Copyright:  (c) 2022 Lorn B Kerr
+ License:    MIT, see file LICENSE
+ """
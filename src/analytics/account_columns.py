@@ -0,0 +1,344 @@
+"""
+A columnar snapshot of the 'accounts' table for the MoneyTrack program.
+
+File:       account_columns.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from array import array
+from typing import Any
+
+from lbk_library import Dbal
+
+from database.row_stream import RowStream
+
+
+class AccountColumns:
+    """
+    Hold the 'accounts' table as columns for counting and grouping.
+
+    Each column is an array of integers: the type codes as stored, the
+    boolean flags as 0 or 1, and the text columns dictionary encoded as
+    indexes into a table of their distinct values. For every column a
+    bitmap of the rows holding each distinct value is built at load
+    time. A selection of rows is a bitmap held in a Python int, so
+    filters combine with '&', '|' and '~' and are counted with
+    int.bit_count(), all without a Python loop over the rows.
+
+    Selections on the type codes can apply a mask to the bit-packed
+    codes first, so, for example, all bank accounts are found from the
+    'account_subtype' column with the AccountType.ACCOUNT_TYPE_NASK
+    mask.
+    """
+
+    # The integer code columns, held as stored.
+    CODE_COLUMNS = ("account_type", "account_subtype")
+
+    # The boolean columns, held as 0 or 1.
+    FLAG_COLUMNS = (
+        "account_separate",
+        "hide_in_transaction_list",
+        "hide_in_account_lists",
+        "check_writing_avail",
+        "tax_deferred",
+    )
+
+    # The text columns, dictionary encoded.
+    TEXT_COLUMNS = ("company",)
+
+    # The number of rows pulled from the cursor at a time while loading.
+    CHUNK_SIZE = 1000
+
+    def __init__(self, dbref: Dbal) -> None:
+        """
+        Load the columns of the 'accounts' table.
+
+        Parameters:
+            dbref (Dbal): the database instance to load from.
+        """
+        self.__record_ids = array("q")
+        self.__columns: dict[str, array] = {}
+        self.__labels: dict[str, list] = {}
+        self.__label_codes: dict[str, dict[str, int]] = {}
+        self.__bitmaps: dict[str, dict[int, int]] = {}
+
+        for column in self.CODE_COLUMNS:
+            self.__columns[column] = array("q")
+        for column in self.FLAG_COLUMNS:
+            self.__columns[column] = array("b")
+        for column in self.TEXT_COLUMNS:
+            self.__columns[column] = array("l")
+            self.__labels[column] = []
+            self.__label_codes[column] = {}
+
+        self.__load(dbref)
+        self.__all_rows = (1 << len(self.__record_ids)) - 1
+        for column, values in self.__columns.items():
+            self.__bitmaps[column] = self.__build_bitmaps(values)
+        # end __init__()
+
+    def __load(self, dbref: Dbal) -> None:
+        """
+        Read the table into the columns, ordered by record_id.
+
+        Parameters:
+            dbref (Dbal): the database instance to load from.
+        """
+        names = self.CODE_COLUMNS + self.FLAG_COLUMNS + self.TEXT_COLUMNS
+        sql = (
+            "SELECT record_id, "
+            + ", ".join(names)
+            + " FROM accounts ORDER BY record_id"
+        )
+        code_columns = [
+            (column, self.__columns[column]) for column in self.CODE_COLUMNS
+        ]
+        flag_columns = [
+            (column, self.__columns[column]) for column in self.FLAG_COLUMNS
+        ]
+        text_columns = [
+            (
+                column,
+                self.__columns[column],
+                self.__labels[column],
+                self.__label_codes[column],
+            )
+            for column in self.TEXT_COLUMNS
+        ]
+
+        for row in RowStream(dbref.sql_query(sql), self.CHUNK_SIZE):
+            self.__record_ids.append(row["record_id"])
+            for column, values in code_columns:
+                values.append(row[column] or 0)
+            for column, values in flag_columns:
+                values.append(1 if row[column] else 0)
+            for column, values, labels, codes in text_columns:
+                label = row[column] or ""
+                code = codes.get(label)
+                if code is None:
+                    code = codes[label] = len(labels)
+                    labels.append(label)
+                values.append(code)
+        # end __load()
+
+    @staticmethod
+    def __build_bitmaps(values: array) -> dict[int, int]:
+        """
+        Build the bitmap of rows holding each distinct value of a column.
+
+        Parameters:
+            values (array): the column values.
+
+        Returns:
+            (dict) the bitmap, bit n set for row n, of each value.
+        """
+        size = (len(values) + 7) // 8
+        maps: dict[int, bytearray] = {}
+        for position, value in enumerate(values):
+            bitmap = maps.get(value)
+            if bitmap is None:
+                bitmap = maps[value] = bytearray(size)
+            bitmap[position >> 3] |= 1 << (position & 7)
+        return {
+            value: int.from_bytes(bitmap, "little") for value, bitmap in maps.items()
+        }
+        # end __build_bitmaps()
+
+    def get_number_rows(self) -> int:
+        """
+        Get the number of accounts in the snapshot.
+
+        Returns:
+            (int) the number of rows loaded.
+        """
+        return len(self.__record_ids)
+        # end get_number_rows()
+
+    def get_record_ids(self, rows: int = None) -> list[int]:
+        """
+        Get the record_ids of a selection of rows.
+
+        Parameters:
+            rows (int): the bitmap of the selected rows, default is all
+                rows.
+
+        Returns:
+            (list) the record_ids of the selected rows, in record_id
+                order.
+        """
+        if rows is None:
+            return list(self.__record_ids)
+        record_ids = self.__record_ids
+        selected = []
+        bitmap = (rows & self.__all_rows).to_bytes((len(record_ids) + 7) // 8, "little")
+        for index, byte in enumerate(bitmap):
+            if byte:
+                base = index << 3
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        selected.append(record_ids[base + bit])
+        return selected
+        # end get_record_ids()
+
+    def get_column(self, column: str) -> array:
+        """
+        Get the values of a column.
+
+        Text columns are returned as their dictionary codes; see
+        get_labels().
+
+        Parameters:
+            column (str): the column name.
+
+        Returns:
+            (array) the column values, in record_id order.
+        """
+        if column == "record_id":
+            return self.__record_ids
+        return self.__columns[column]
+        # end get_column()
+
+    def get_labels(self, column: str) -> list[str]:
+        """
+        Get the dictionary of a text column.
+
+        Parameters:
+            column (str): the text column name.
+
+        Returns:
+            (list) the distinct values of the column, indexed by code.
+        """
+        return list(self.__labels[column])
+        # end get_labels()
+
+    def select_all(self) -> int:
+        """
+        Get the bitmap selecting every row.
+
+        Returns:
+            (int) the bitmap with a bit set for every row.
+        """
+        return self.__all_rows
+        # end select_all()
+
+    def select(self, column: str, value: Any, code_mask: int = None) -> int:
+        """
+        Select the rows where a column matches a value.
+
+        A list, tuple, set or frozenset value matches any of its
+        members. Text columns are matched on their text, flag columns on
+        True or False.
+
+        Parameters:
+            column (str): the column to match.
+            value (Any): the value, or collection of values, to match.
+            code_mask (int): a mask applied to each stored code before
+                it is compared to 'value', such as
+                AccountType.ACCOUNT_TYPE_NASK; default is no mask.
+
+        Returns:
+            (int) the bitmap of the matching rows.
+        """
+        if isinstance(value, (list, tuple, set, frozenset)):
+            wanted = {self.__encode(column, member) for member in value}
+        else:
+            wanted = {self.__encode(column, value)}
+
+        rows = 0
+        for code, bitmap in self.__bitmaps[column].items():
+            if code_mask is not None:
+                code &= code_mask
+            if code in wanted:
+                rows |= bitmap
+        return rows
+        # end select()
+
+    def count(self, rows: int = None) -> int:
+        """
+        Count the rows of a selection.
+
+        Parameters:
+            rows (int): the bitmap of the selected rows, default is all
+                rows.
+
+        Returns:
+            (int) the number of rows selected.
+        """
+        if rows is None:
+            rows = self.__all_rows
+        return (rows & self.__all_rows).bit_count()
+        # end count()
+
+    def group_by(
+        self, column: str, rows: int = None, code_mask: int = None
+    ) -> dict[Any, int]:
+        """
+        Count the rows of a selection for each value of a column.
+
+        Parameters:
+            column (str): the column to group on.
+            rows (int): the bitmap of the selected rows, default is all
+                rows.
+            code_mask (int): a mask applied to each stored code before
+                grouping, such as AccountType.ACCOUNT_TYPE_NASK to group
+                subtypes by their account type; default is no mask.
+
+        Returns:
+            (dict) the number of selected rows for each value present;
+                text columns are keyed on their text and flag columns on
+                True and False.
+        """
+        if rows is None:
+            rows = self.__all_rows
+        groups: dict[Any, int] = {}
+        for code, bitmap in self.__bitmaps[column].items():
+            number = (bitmap & rows).bit_count()
+            if not number:
+                continue
+            if code_mask is not None:
+                code &= code_mask
+            key = self.__decode(column, code)
+            groups[key] = groups.get(key, 0) + number
+        return groups
+        # end group_by()
+
+    def __encode(self, column: str, value: Any) -> int:
+        """
+        Convert a value to the code stored in a column.
+
+        Parameters:
+            column (str): the column name.
+            value (Any): the value to convert.
+
+        Returns:
+            (int) the stored code; -1 for text not in the column.
+        """
+        if column in self.__label_codes:
+            return self.__label_codes[column].get(value, -1)
+        if column in self.FLAG_COLUMNS:
+            return 1 if value else 0
+        return value
+        # end __encode()
+
+    def __decode(self, column: str, code: int) -> Any:
+        """
+        Convert a stored code back to its value.
+
+        Parameters:
+            column (str): the column name.
+            code (int): the stored code.
+
+        Returns:
+            (Any) the value of the code.
+        """
+        if column in self.__labels:
+            return self.__labels[column][code]
+        if column in self.FLAG_COLUMNS:
+            return bool(code)
+        return code
+        # end __decode()
+
+
+# end class AccountColumns
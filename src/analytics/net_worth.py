@@ -0,0 +1,498 @@
+"""
+The net worth of the MoneyTrack program over time.
+
+File:       net_worth.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import operator
+from array import array
+from bisect import bisect_left, bisect_right
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Any, Union
+
+from analytics.valuation import Valuation
+
+
+class NetWorth:
+    """
+    Compute the net worth at the end of each day or month.
+
+    The net worth is the total balance of all accounts that are not
+    kept separate, plus the market value of the shares held by the
+    investment accounts among them, so buying shares at their price
+    leaves it unchanged. A series is computed as the running sum of the net
+    change of each period, held in an array and summed with
+    itertools.accumulate(), so no Python arithmetic is done per
+    transaction.
+
+    A monthly series is built from the 'monthly_balances' snapshots,
+    one row per account and month. A daily series needs the net change
+    of each day; those of each month are kept by the NetWorth with the
+    month's version from the 'ledger_months' table, and a month is read
+    from the ledger again only when its version has changed, so
+    normally only the current month is recomputed. Changing which
+    accounts are kept separate clears the kept months.
+
+    The market value of the shares on each day of a month, and at its
+    end, is kept the same way. It depends on every trade and close up
+    to the day, so it is kept with the sum of the 'ledger_months'
+    versions up to the end of the month and the sum of the
+    'price_months' versions, raised by any change to the prices of a
+    month. A monthly series values only the last day of each month,
+    with Valuation.get_market_values_on(). Changing which accounts are
+    counted, or their types, clears the market values kept too.
+    """
+
+    # The periods of a series.
+    DAY = "day"
+    MONTH = "month"
+
+    # The record_ids of the accounts counted in the net worth.
+    INCLUDED = (
+        'SELECT "record_id" FROM "accounts" '
+        + 'WHERE NOT IFNULL("account_separate", 0)'
+    )
+
+    def __init__(self, dbref: Any) -> None:
+        """
+        Define the net worth of a database.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+        """
+        self.__dbref = dbref
+        self.__valuation = Valuation(dbref)
+        # the (record_id, account_type) of each account counted
+        self.__included: tuple[tuple[int, int], ...] = ()
+        # the (version, daily net changes) of each month read
+        self.__months: dict[str, tuple[int, array]] = {}
+        # the (market version, daily market values) of each month valued
+        self.__market_days: dict[str, tuple[tuple[int, int], array]] = {}
+        # the (market version, market value at its end) of each month
+        self.__market_ends: dict[str, tuple[tuple[int, int], int]] = {}
+        # end __init__()
+
+    def get_dbref(self) -> Any:
+        """
+        Get the database reference of the net worth.
+
+        Returns:
+            (Dbal) the database the net worth is computed from.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def get_number_months(self) -> int:
+        """
+        Get the number of months of daily changes kept.
+
+        Returns:
+            (int) the number of months kept.
+        """
+        return len(self.__months)
+        # end get_number_months()
+
+    def clear(self) -> None:
+        """Discard the daily changes and market values kept for each month."""
+        self.__months = {}
+        self.__market_days = {}
+        self.__market_ends = {}
+        # end clear()
+
+    def get_series(
+        self,
+        start: Union[str, date] = None,
+        end: Union[str, date] = None,
+        period: str = MONTH,
+    ) -> tuple[list[str], array]:
+        """
+        Get the net worth at the end of each period of a date range.
+
+        Parameters:
+            start (Mixed): the first day, or month, of the series, a
+                date or ISO string; default is the first month of the
+                ledger.
+            end (Mixed): the last day, or month, of the series, a date
+                or ISO string; default is the last month of the ledger.
+            period (str): NetWorth.DAY or NetWorth.MONTH, default is
+                MONTH.
+
+        Returns:
+            (tuple) the list of periods, as ISO 'YYYY-MM-DD' days or
+                'YYYY-MM' months, and the array of the net worth in
+                cents at the end of each.
+        """
+        if period not in (self.DAY, self.MONTH):
+            raise ValueError("Invalid period ('" + str(period) + "').")
+        dbref = self.__dbref
+        versions = {
+            row["month"]: row["version"]
+            for row in dbref.sql_fetchrowset(
+                dbref.sql_query('SELECT "month", "version" FROM "ledger_months"')
+            )
+        }
+        if isinstance(start, date):
+            start = start.isoformat()
+        if isinstance(end, date):
+            end = end.isoformat()
+        if not versions and (start is None or end is None):
+            return [], array("q")
+        first = min(versions) if versions else start[:7]
+        if start is None:
+            start = first
+        if end is None:
+            end = max(versions)
+        months = self.__month_range(min(first, start[:7]), end[:7])
+        if not months:
+            return [], array("q")
+
+        if period == self.MONTH:
+            changes = self.__monthly_changes(months)
+            labels = months
+            start = start[:7]
+            end = end[:7]
+        else:
+            changes = self.__daily_changes(months, versions)
+            day = date.fromisoformat(months[0] + "-01")
+            labels = [
+                (day + timedelta(days=number)).isoformat()
+                for number in range(len(changes))
+            ]
+            if len(start) == 7:
+                start += "-01"
+            if len(end) == 7:
+                end += "-31"
+
+        balances = array("q", accumulate(changes))
+        first_index = bisect_left(labels, start)
+        last_index = bisect_right(labels, end)
+        labels = labels[first_index:last_index]
+        balances = balances[first_index:last_index]
+        market = self.__market_values(labels, period, versions)
+        return labels, array("q", map(operator.add, balances, market))
+        # end get_series()
+
+    def __market_values(
+        self, labels: list[str], period: str, versions: dict[str, int]
+    ) -> list[int]:
+        """
+        Get the market value of the shares held at the end of each period.
+
+        Only the investment accounts counted in the net worth are
+        included. Only the months whose market version has changed are
+        valued again.
+
+        Parameters:
+            labels (list): the ISO 'YYYY-MM-DD' days or 'YYYY-MM'
+                months of the series.
+            period (str): NetWorth.DAY or NetWorth.MONTH.
+            versions (dict): the version of each month of the ledger.
+
+        Returns:
+            (list) the market value in cents at the end of each period.
+        """
+        if not labels:
+            return []
+        included = set(self.__included_accounts())
+        months = self.__month_range(labels[0][:7], labels[-1][:7])
+        market_versions = self.__market_versions(months, versions)
+        if period == self.MONTH:
+            kept = self.__market_ends
+            stale = self.__stale_months(kept, market_versions)
+            if stale:
+                values = self.__valuation.get_market_values_on(
+                    [month + "-" + str(self.__month_days(month)) for month in stale]
+                )
+                totals = self.__included_totals(values, included, len(stale))
+                for month, total in zip(stale, totals):
+                    kept[month] = (market_versions[month], total)
+            return [kept[month][1] for month in months]
+
+        kept = self.__market_days
+        stale = self.__stale_months(kept, market_versions)
+        if stale:
+            self.__value_months(stale[0], stale[-1], market_versions, included)
+        totals = array("q")
+        for month in months:
+            totals.extend(kept[month][1])
+        first = int(labels[0][8:10]) - 1
+        last = first + len(labels)
+        return totals[first:last]
+        # end __market_values()
+
+    def __value_months(
+        self,
+        first: str,
+        last: str,
+        market_versions: dict[str, tuple[int, int]],
+        included: set[int],
+    ) -> None:
+        """
+        Value the shares on each day of a range of months.
+
+        The value at the end of each month is kept as well.
+
+        Parameters:
+            first (str): the first month to value.
+            last (str): the last month to value.
+            market_versions (dict): the market version of each month,
+                read before the ledger and the prices.
+            included (set): the record_ids of the accounts counted.
+        """
+        days, values = self.__valuation.get_market_values(
+            first + "-01", last + "-" + str(self.__month_days(last))
+        )
+        totals = self.__included_totals(values, included, len(days))
+        position = 0
+        for month in self.__month_range(first, last):
+            end = position + self.__month_days(month)
+            version = market_versions[month]
+            self.__market_days[month] = (version, array("q", totals[position:end]))
+            self.__market_ends[month] = (version, totals[end - 1])
+            position = end
+        # end __value_months()
+
+    def __market_versions(
+        self, months: list[str], versions: dict[str, int]
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Get the version of the market values of each month.
+
+        The value of the shares on a day depends on every trade and
+        every close up to it, so the version of a month is the sum of
+        the versions of the ledger and the sum of the versions of the
+        prices of the months up to its end. Each sum rises with any
+        change to one of those months.
+
+        Parameters:
+            months (list): the consecutive months of the series.
+            versions (dict): the version of each month of the ledger.
+
+        Returns:
+            (dict) the (ledger, prices) version of each month.
+        """
+        dbref = self.__dbref
+        prices = {
+            row["month"]: row["version"]
+            for row in dbref.sql_fetchrowset(
+                dbref.sql_query('SELECT "month", "version" FROM "price_months"')
+            )
+        }
+        return dict(
+            zip(
+                months,
+                zip(
+                    self.__running_versions(versions, months),
+                    self.__running_versions(prices, months),
+                ),
+            )
+        )
+        # end __market_versions()
+
+    @staticmethod
+    def __stale_months(kept: dict[str, tuple], versions: dict[str, tuple]) -> list[str]:
+        """
+        List the months not kept at their current version.
+
+        Parameters:
+            kept (dict): the (version, values) kept of each month.
+            versions (dict): the current version of each month.
+
+        Returns:
+            (list) the months of 'versions' to value again, in order.
+        """
+        return [
+            month
+            for month, version in versions.items()
+            if month not in kept or kept[month][0] != version
+        ]
+        # end __stale_months()
+
+    @staticmethod
+    def __running_versions(versions: dict[str, int], months: list[str]) -> list[int]:
+        """
+        Sum the versions up to the end of each month.
+
+        Parameters:
+            versions (dict): the version of each month with any.
+            months (list): the consecutive months of the series.
+
+        Returns:
+            (list) the sum of the versions of the months up to each.
+        """
+        changed = sorted(versions)
+        sums = list(accumulate(versions[month] for month in changed))
+        indexes = (bisect_right(changed, month) - 1 for month in months)
+        return [sums[index] if index >= 0 else 0 for index in indexes]
+        # end __running_versions()
+
+    @staticmethod
+    def __included_totals(
+        values: dict[int, array], included: set[int], count: int
+    ) -> list[int]:
+        """
+        Sum the market values of the accounts counted in the net worth.
+
+        Parameters:
+            values (dict): the array of values of each account_id.
+            included (set): the record_ids of the accounts counted.
+            count (int): the number of values of each account.
+
+        Returns:
+            (list) the sum of the values of the accounts counted.
+        """
+        totals = [0] * count
+        for account_id, series in values.items():
+            if account_id in included:
+                totals = list(map(operator.add, totals, series))
+        return totals
+        # end __included_totals()
+
+    def __included_accounts(self) -> tuple[int, ...]:
+        """
+        Read the accounts counted in the net worth.
+
+        The months kept, and their market values, are discarded if the
+        accounts or their types have changed.
+
+        Returns:
+            (tuple) the record_ids of the accounts.
+        """
+        dbref = self.__dbref
+        result = dbref.sql_query(
+            'SELECT "record_id", "account_type" FROM "accounts" '
+            + 'WHERE NOT IFNULL("account_separate", 0) ORDER BY "record_id"'
+        )
+        included = tuple(
+            (row["record_id"], row["account_type"])
+            for row in dbref.sql_fetchrowset(result)
+        )
+        if included != self.__included:
+            self.__included = included
+            self.clear()
+        return tuple(record_id for record_id, account_type in included)
+        # end __included_accounts()
+
+    def __monthly_changes(self, months: list[str]) -> array:
+        """
+        Get the net change of each month from the balance snapshots.
+
+        Parameters:
+            months (list): the consecutive months of the series.
+
+        Returns:
+            (array) the net change in cents of each month.
+        """
+        dbref = self.__dbref
+        result = dbref.sql_query(
+            'SELECT "month", SUM("amount") AS "amount" FROM "monthly_balances" '
+            + 'WHERE "account_id" IN ('
+            + self.INCLUDED
+            + ') AND "month" <= :last GROUP BY "month"',
+            {"last": months[-1]},
+        )
+        index = {month: position for position, month in enumerate(months)}
+        changes = array("q", bytes(8 * len(months)))
+        for row in dbref.sql_fetchrowset(result):
+            changes[index[row["month"]]] = row["amount"]
+        return changes
+        # end __monthly_changes()
+
+    def __daily_changes(self, months: list[str], versions: dict[str, int]) -> array:
+        """
+        Get the net change of each day, reading only the changed months.
+
+        Parameters:
+            months (list): the consecutive months of the series.
+            versions (dict): the version of each month of the ledger.
+
+        Returns:
+            (array) the net change in cents of each day of the months.
+        """
+        self.__included_accounts()
+        kept = self.__months
+        stale = [
+            month
+            for month in months
+            if month not in kept or kept[month][0] != versions.get(month, 0)
+        ]
+        if stale:
+            self.__read_months(stale[0], stale[-1], versions)
+
+        changes = array("q")
+        for month in months:
+            changes.extend(kept[month][1])
+        return changes
+        # end __daily_changes()
+
+    def __read_months(self, first: str, last: str, versions: dict[str, int]) -> None:
+        """
+        Read the daily net changes of a range of months from the ledger.
+
+        Parameters:
+            first (str): the first month to read.
+            last (str): the last month to read.
+            versions (dict): the version of each month of the ledger,
+                read before the ledger.
+        """
+        months = {}
+        for month in self.__month_range(first, last):
+            days = self.__month_days(month)
+            months[month] = (versions.get(month, 0), array("q", bytes(8 * days)))
+
+        dbref = self.__dbref
+        result = dbref.sql_query(
+            'SELECT "date", SUM("amount") AS "amount" FROM "transactions" '
+            + 'WHERE "account_id" IN ('
+            + self.INCLUDED
+            + ') AND "date" BETWEEN :first AND :last GROUP BY "date"',
+            {"first": first + "-01", "last": last + "-31"},
+        )
+        for row in dbref.sql_fetchrowset(result):
+            day = row["date"]
+            months[day[:7]][1][int(day[8:10]) - 1] = row["amount"]
+        self.__months.update(months)
+        # end __read_months()
+
+    @staticmethod
+    def __month_range(first: str, last: str) -> list[str]:
+        """
+        List the months from one to another.
+
+        Parameters:
+            first (str): the first 'YYYY-MM' month.
+            last (str): the last 'YYYY-MM' month.
+
+        Returns:
+            (list) the 'YYYY-MM' months, both ends included; empty if
+                'last' is before 'first'.
+        """
+        year, month = int(first[:4]), int(first[5:7])
+        end = int(last[:4]) * 12 + int(last[5:7]) - 1
+        months = []
+        for number in range(year * 12 + month - 1, end + 1):
+            months.append("{:04d}-{:02d}".format(number // 12, number % 12 + 1))
+        return months
+        # end __month_range()
+
+    @staticmethod
+    def __month_days(month: str) -> int:
+        """
+        Get the number of days of a month.
+
+        Parameters:
+            month (str): the 'YYYY-MM' month.
+
+        Returns:
+            (int) the number of days.
+        """
+        return monthrange(int(month[:4]), int(month[5:7]))[1]
+        # end __month_days()
+
+
+# end class NetWorth
@@ -0,0 +1,342 @@
+"""
+The simplified income tax estimates of the MoneyTrack program.
+
+File:       tax_estimate.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import threading
+from typing import Any, Union
+from weakref import WeakKeyDictionary
+
+from analytics.tax_lots import TaxLots
+from constants.account_types import AccountType
+from constants.transaction_types import TransactionType
+
+
+class TaxEstimate:
+    """
+    Estimate the income tax of a year from the ledger.
+
+    The taxable income of a year is
+        interest - INTEREST transactions of the bank accounts and the
+            taxable investment accounts,
+        dividends - DIVIDEND transactions of the taxable investment
+            accounts,
+        short_term, long_term - the gains realized by the sales in the
+            taxable investment accounts, from their TaxLots.
+    Tax deferred accounts are skipped. The taxes 'paid' for the year,
+    such as withholding and estimated payments, are the transactions
+    of the AccountType.TAX accounts.
+
+    The interest, dividends and taxes paid are summed in one SQL pass
+    over the year, and the gains in one pass over the trades up to its
+    end. The income of each year is kept with the ledger version it
+    was read at: the sum of the 'ledger_months' versions up to the end
+    of the year, which rises with any change to those months, and the
+    types of the accounts. Asking again is answered from what is kept
+    unless one has changed. Each database has one TaxEstimate, found
+    with TaxEstimate.for_dbref(), so a report opened again finds the
+    income already read. It may be used by several threads at once.
+
+    The tax is a simplified estimate, with one rate for ordinary income
+    and one for long term gains; see estimate().
+    """
+
+    # The keys of the income and the estimate.
+    INTEREST = "interest"
+    DIVIDENDS = "dividends"
+    SHORT_TERM = TaxLots.SHORT_TERM
+    LONG_TERM = TaxLots.LONG_TERM
+    PAID = "paid"
+    ORDINARY_INCOME = "ordinary_income"
+    CAPITAL_GAINS = "capital_gains"
+    LOSS_DEDUCTION = "loss_deduction"
+    TAX = "tax"
+    DUE = "due"
+
+    # The default tax rates of ordinary income and of long term gains.
+    ORDINARY_RATE = 0.22
+    LONG_TERM_RATE = 0.15
+
+    # The most net capital loss, in cents, deducted from ordinary income.
+    LOSS_LIMIT = 300000
+
+    # The estimate of each open database.
+    __estimates: "WeakKeyDictionary[Any, TaxEstimate]" = WeakKeyDictionary()
+    __estimates_lock = threading.Lock()
+
+    def __init__(self, dbref: Any) -> None:
+        """
+        Define the tax estimates of a database.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+        """
+        self.__dbref = dbref
+        # the (ledger version, income) of each (year, method) read
+        self.__years: dict[tuple[str, str], tuple[tuple, dict[str, int]]] = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+        # end __init__()
+
+    @classmethod
+    def for_dbref(cls, dbref: Any) -> "TaxEstimate":
+        """
+        Get the tax estimates of a database, creating them on first use.
+
+        They are dropped with the Dbal they belong to.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+
+        Returns:
+            (TaxEstimate) the tax estimates of the database.
+        """
+        with cls.__estimates_lock:
+            estimate = cls.__estimates.get(dbref)
+            if estimate is None:
+                estimate = cls(dbref)
+                cls.__estimates[dbref] = estimate
+        return estimate
+        # end for_dbref()
+
+    @classmethod
+    def estimate(
+        cls,
+        income: dict[str, int],
+        ordinary_rate: float = ORDINARY_RATE,
+        long_term_rate: float = LONG_TERM_RATE,
+    ) -> dict[str, int]:
+        """
+        Estimate the tax of a year's income.
+
+        A loss of one term offsets the gains of the other, and what is
+        left of the gains keeps its term. Short term gains are taxed
+        as ordinary income. A net loss is deducted from ordinary income
+        up to LOSS_LIMIT; any more is not carried over.
+
+        Parameters:
+            income (dict): the INTEREST, DIVIDENDS, SHORT_TERM,
+                LONG_TERM and PAID amounts in cents.
+            ordinary_rate (float): the rate of ordinary income.
+            long_term_rate (float): the rate of long term gains.
+
+        Returns:
+            (dict) the income, with the ORDINARY_INCOME, the taxable
+                CAPITAL_GAINS, the LOSS_DEDUCTION, the TAX, and the tax
+                DUE after what was PAID, negative for a refund, all in
+                cents.
+        """
+        short_term = income[cls.SHORT_TERM]
+        long_term = income[cls.LONG_TERM]
+        deduction = 0
+        if short_term < 0 or long_term < 0:
+            net = short_term + long_term
+            if net < 0:
+                short_term, long_term = 0, 0
+                deduction = min(-net, cls.LOSS_LIMIT)
+            elif short_term < 0:
+                short_term, long_term = 0, net
+            else:
+                short_term, long_term = net, 0
+        ordinary = max(
+            0, income[cls.INTEREST] + income[cls.DIVIDENDS] + short_term - deduction
+        )
+        tax = round(ordinary * ordinary_rate) + round(long_term * long_term_rate)
+
+        estimate = dict(income)
+        estimate[cls.ORDINARY_INCOME] = ordinary
+        estimate[cls.CAPITAL_GAINS] = long_term
+        estimate[cls.LOSS_DEDUCTION] = deduction
+        estimate[cls.TAX] = tax
+        estimate[cls.DUE] = tax - income[cls.PAID]
+        return estimate
+        # end estimate()
+
+    def get_dbref(self) -> Any:
+        """
+        Get the database reference of the tax estimates.
+
+        Returns:
+            (Dbal) the database the income is read from.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def get_hits(self) -> int:
+        """
+        Get the number of requests answered from the income kept.
+
+        Returns:
+            (int) the number of hits.
+        """
+        return self.__hits
+        # end get_hits()
+
+    def get_misses(self) -> int:
+        """
+        Get the number of requests that read the ledger.
+
+        Returns:
+            (int) the number of misses.
+        """
+        return self.__misses
+        # end get_misses()
+
+    def clear(self) -> None:
+        """Discard the income kept for each year."""
+        with self.__lock:
+            self.__years = {}
+        # end clear()
+
+    def get_income(
+        self, year: Union[int, str], method: str = TaxLots.FIFO
+    ) -> dict[str, int]:
+        """
+        Get the taxable income of a year.
+
+        Parameters:
+            year (Mixed): the tax year.
+            method (str): the cost basis method of the gains, one of
+                TaxLots.METHODS; default is FIFO.
+
+        Returns:
+            (dict) the INTEREST, DIVIDENDS, SHORT_TERM, LONG_TERM and
+                PAID amounts in cents.
+
+        Raises:
+            ValueError: if the method is not valid, or a trade sells
+                more shares than are held.
+        """
+        year = str(int(year))
+        version = self.__ledger_version(year)
+        with self.__lock:
+            kept = self.__years.get((year, method))
+            if kept is not None and kept[0] == version:
+                self.__hits += 1
+                return dict(kept[1])
+            self.__misses += 1
+
+        income = self.__read_income(year)
+        accounts = TaxLots.read_accounts(self.__dbref, method, year + "-12-31")
+        for lots in accounts.values():
+            gains = lots.get_realized(year)
+            income[self.SHORT_TERM] += gains[TaxLots.SHORT_TERM]
+            income[self.LONG_TERM] += gains[TaxLots.LONG_TERM]
+        with self.__lock:
+            self.__years[(year, method)] = (version, income)
+        return dict(income)
+        # end get_income()
+
+    def get_estimate(
+        self,
+        year: Union[int, str],
+        ordinary_rate: float = ORDINARY_RATE,
+        long_term_rate: float = LONG_TERM_RATE,
+        method: str = TaxLots.FIFO,
+    ) -> dict[str, int]:
+        """
+        Estimate the income tax of a year.
+
+        Parameters:
+            year (Mixed): the tax year.
+            ordinary_rate (float): the rate of ordinary income.
+            long_term_rate (float): the rate of long term gains.
+            method (str): the cost basis method of the gains, one of
+                TaxLots.METHODS; default is FIFO.
+
+        Returns:
+            (dict) the income and the tax in cents, as estimate().
+
+        Raises:
+            ValueError: if the method is not valid, or a trade sells
+                more shares than are held.
+        """
+        return self.estimate(
+            self.get_income(year, method), ordinary_rate, long_term_rate
+        )
+        # end get_estimate()
+
+    def __ledger_version(self, year: str) -> tuple:
+        """
+        Read the version of the ledger up to the end of a year.
+
+        Parameters:
+            year (str): the tax year.
+
+        Returns:
+            (tuple) the sum of the versions of the months up to the end
+                of the year, and the record_id, type and tax_deferred
+                flag of every account.
+        """
+        dbref = self.__dbref
+        row = dbref.sql_fetchrow(
+            dbref.sql_query(
+                'SELECT (SELECT IFNULL(SUM("version"), 0) FROM "ledger_months" '
+                + 'WHERE "month" <= :last) AS "version", '
+                + "(SELECT group_concat(\"account\", ',') FROM "
+                + '(SELECT "record_id" || \':\' || IFNULL("account_type", 0) '
+                + '|| \':\' || IFNULL("tax_deferred", 0) AS "account" '
+                + 'FROM "accounts" ORDER BY "record_id")) AS "accounts"',
+                {"last": year + "-12"},
+            )
+        )
+        return row["version"], row["accounts"]
+        # end __ledger_version()
+
+    def __read_income(self, year: str) -> dict[str, int]:
+        """
+        Sum the interest, dividends and taxes paid of a year.
+
+        Parameters:
+            year (str): the tax year.
+
+        Returns:
+            (dict) the INTEREST, DIVIDENDS and PAID amounts in cents,
+                and SHORT_TERM and LONG_TERM set to 0.
+        """
+        dbref = self.__dbref
+        row = dbref.sql_fetchrow(
+            dbref.sql_query(
+                "SELECT IFNULL(SUM(CASE WHEN "
+                + 'accounts."account_type" != :tax AND '
+                + 'transactions."transaction_type" = :interest '
+                + 'THEN transactions."amount" END), 0) AS "interest", '
+                + "IFNULL(SUM(CASE WHEN "
+                + 'accounts."account_type" = :investment AND '
+                + 'transactions."transaction_type" = :dividend '
+                + 'THEN transactions."amount" END), 0) AS "dividends", '
+                + 'IFNULL(SUM(CASE WHEN accounts."account_type" = :tax '
+                + 'THEN transactions."amount" END), 0) AS "paid" '
+                + 'FROM "accounts" JOIN "transactions" '
+                + 'ON transactions."account_id" = accounts."record_id" '
+                + 'WHERE (accounts."account_type" IN (:bank, :tax) '
+                + 'OR (accounts."account_type" = :investment '
+                + 'AND NOT IFNULL(accounts."tax_deferred", 0))) '
+                + 'AND transactions."date" BETWEEN :first AND :last',
+                {
+                    "bank": AccountType.BANK,
+                    "investment": AccountType.INVESTMENT,
+                    "tax": AccountType.TAX,
+                    "interest": TransactionType.INTEREST,
+                    "dividend": TransactionType.DIVIDEND,
+                    "first": year + "-01-01",
+                    "last": year + "-12-31",
+                },
+            )
+        )
+        return {
+            self.INTEREST: row["interest"],
+            self.DIVIDENDS: row["dividends"],
+            self.SHORT_TERM: 0,
+            self.LONG_TERM: 0,
+            self.PAID: row["paid"],
+        }
+        # end __read_income()
+
+
+# end class TaxEstimate
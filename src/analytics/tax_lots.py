@@ -0,0 +1,539 @@
+"""
+The tax lots and realized gains of the MoneyTrack program.
+
+File:       tax_lots.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from bisect import insort
+from collections import namedtuple
+from datetime import date
+from operator import itemgetter
+from typing import Any, Union
+
+from constants.account_types import AccountType
+from database.row_stream import RowStream
+
+
+class Lot(namedtuple("Lot", ("lot_id", "acquired", "shares", "basis"))):
+    """
+    The shares of a security bought together and still held.
+
+    The acquired date is an ISO 'YYYY-MM-DD' string, the shares are in
+    the units of the trades, and the basis is in cents.
+    """
+
+    __slots__ = ()
+
+    # end class Lot
+
+
+class Gain(
+    namedtuple(
+        "Gain",
+        (
+            "security_id",
+            "lot_id",
+            "acquired",
+            "sold",
+            "shares",
+            "proceeds",
+            "basis",
+            "long_term",
+        ),
+    )
+):
+    """
+    The gain realized by selling shares of one lot.
+
+    The dates are ISO 'YYYY-MM-DD' strings, and the proceeds and basis
+    are in cents. A gain is long term if the shares were held for more
+    than a year.
+    """
+
+    __slots__ = ()
+
+    def get_gain(self) -> int:
+        """
+        Get the gain, or loss, realized.
+
+        Returns:
+            (int) the proceeds less the basis, in cents.
+        """
+        return self.proceeds - self.basis
+        # end get_gain()
+
+    # end class Gain
+
+
+class TaxLots:
+    """
+    Track the lots of the securities held in one account.
+
+    Each security has a queue of its open lots, kept in order of the
+    date acquired: a purchase is appended, or inserted with bisect if
+    it is dated before the last lot, and a sale takes shares from the
+    head of the queue, so a sale never rescans the history. The lots
+    emptied at the head are dropped as the queue is trimmed.
+
+    The cost basis of the shares sold is found by the method of the
+    TaxLots:
+        FIFO - the shares of the earliest lots are sold first.
+        SPECIFIC - the shares of the lots named by the sale are sold,
+            then any more by FIFO.
+        AVERAGE - the basis of the shares sold is the average basis of
+            all shares held, and the shares are taken first in first
+            out for the holding period, as for mutual funds.
+
+    The TaxLots works only on the values given to it; read_accounts()
+    builds the TaxLots of the taxable investment accounts from the
+    trades in the database.
+    """
+
+    # The cost basis methods.
+    FIFO = "fifo"
+    SPECIFIC = "specific"
+    AVERAGE = "average"
+    METHODS = (FIFO, SPECIFIC, AVERAGE)
+
+    # The keys of the realized gains.
+    SHORT_TERM = "short_term"
+    LONG_TERM = "long_term"
+
+    # The number of rows read from the database at a time.
+    CHUNK_SIZE = 500
+
+    def __init__(self, method: str = FIFO) -> None:
+        """
+        Define the tax lots of an account.
+
+        Parameters:
+            method (str): the cost basis method, one of METHODS;
+                default is FIFO.
+
+        Raises:
+            ValueError: if the method is not one of METHODS.
+        """
+        if method not in self.METHODS:
+            raise ValueError("Invalid method ('" + str(method) + "').")
+        self.__method = method
+        # the open lots of each security as [acquired, shares, basis,
+        # lot_id] lists, in order from the index of the first one open
+        self.__queues: dict[int, list[list]] = {}
+        self.__heads: dict[int, int] = {}
+        # the open lots by lot_id, and their securities
+        self.__lots: dict[Any, tuple[int, list]] = {}
+        # the [shares, basis] held of each security
+        self.__holdings: dict[int, list[int]] = {}
+        # the gains realized and the [short, long] term total of each year
+        self.__gains: list[Gain] = []
+        self.__years: dict[str, list[int]] = {}
+        self.__bought = 0
+        # end __init__()
+
+    @classmethod
+    def read_accounts(
+        cls, dbref: Any, method: str = FIFO, end: Union[str, date] = None
+    ) -> dict[int, "TaxLots"]:
+        """
+        Build the tax lots of the taxable investment accounts.
+
+        The trades are read in one pass in date order. A trade of
+        shares into an account is a purchase, its basis the cash paid;
+        a trade of shares out of it is a sale, its proceeds the cash
+        received. The lot_id of a lot is the record_id of its
+        transaction.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            method (str): the cost basis method, FIFO or AVERAGE; the
+                ledger does not name the lots sold, so SPECIFIC sells
+                as FIFO.
+            end (Mixed): the last date, a date or ISO string; default
+                is the last trade.
+
+        Returns:
+            (dict) the TaxLots of each account_id with trades.
+
+        Raises:
+            ValueError: if the method is not valid, or a trade sells
+                more shares than are held.
+        """
+        sql = (
+            'SELECT transactions."account_id", transactions."record_id", '
+            + 'transactions."date", transactions."amount", '
+            + 'trades."security_id", trades."shares" FROM "trades" '
+            + 'JOIN "transactions" '
+            + 'ON transactions."record_id" = trades."transaction_id" '
+            + 'JOIN "accounts" ON accounts."record_id" = transactions."account_id" '
+            + 'WHERE accounts."account_type" = :account_type '
+            + 'AND NOT IFNULL(accounts."tax_deferred", 0)'
+        )
+        values = {"account_type": AccountType.INVESTMENT}
+        if end is not None:
+            sql += ' AND transactions."date" <= :end'
+            values["end"] = end if isinstance(end, str) else end.isoformat()
+        sql += ' ORDER BY transactions."date", transactions."record_id"'
+
+        accounts: dict[int, TaxLots] = {}
+        for row in RowStream(dbref.sql_query(sql, values), cls.CHUNK_SIZE):
+            account_id = row["account_id"]
+            if account_id not in accounts:
+                accounts[account_id] = cls(method)
+            shares = row["shares"]
+            if shares > 0:
+                accounts[account_id].buy(
+                    row["security_id"],
+                    row["date"],
+                    shares,
+                    -row["amount"],
+                    row["record_id"],
+                )
+            elif shares < 0:
+                accounts[account_id].sell(
+                    row["security_id"], row["date"], -shares, row["amount"]
+                )
+        return accounts
+        # end read_accounts()
+
+    def get_method(self) -> str:
+        """
+        Get the cost basis method.
+
+        Returns:
+            (str) one of METHODS.
+        """
+        return self.__method
+        # end get_method()
+
+    def buy(
+        self,
+        security_id: int,
+        acquired: Union[str, date],
+        shares: int,
+        basis: int,
+        lot_id: Any = None,
+    ) -> Any:
+        """
+        Add a lot of shares bought.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            acquired (Mixed): the date bought, a date or ISO string.
+            shares (int): the number of shares, greater than 0.
+            basis (int): the cost of the shares in cents.
+            lot_id (Any): names the lot for a SPECIFIC sale; default is
+                the number of lots bought, counting this one.
+
+        Returns:
+            (Any) the lot_id.
+
+        Raises:
+            ValueError: if the shares are not greater than 0, or the
+                lot_id is already open.
+        """
+        if shares <= 0:
+            raise ValueError("Invalid shares ('" + str(shares) + "').")
+        self.__bought += 1
+        if lot_id is None:
+            lot_id = self.__bought
+        if lot_id in self.__lots:
+            raise ValueError("Duplicate lot ('" + str(lot_id) + "').")
+        acquired = self.__iso_date(acquired)
+
+        lot = [acquired, shares, basis, lot_id]
+        if security_id not in self.__queues:
+            self.__queues[security_id] = []
+            self.__heads[security_id] = 0
+            self.__holdings[security_id] = [0, 0]
+        queue = self.__queues[security_id]
+        if queue and acquired < queue[-1][0]:
+            insort(queue, lot, self.__heads[security_id], key=itemgetter(0))
+        else:
+            queue.append(lot)
+        self.__lots[lot_id] = (security_id, lot)
+        holding = self.__holdings[security_id]
+        holding[0] += shares
+        holding[1] += basis
+        return lot_id
+        # end buy()
+
+    def sell(
+        self,
+        security_id: int,
+        sold: Union[str, date],
+        shares: int,
+        proceeds: int,
+        lots: dict[Any, int] = None,
+    ) -> list[Gain]:
+        """
+        Sell shares and realize the gains.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            sold (Mixed): the date sold, a date or ISO string.
+            shares (int): the number of shares, greater than 0.
+            proceeds (int): the cash received in cents.
+            lots (dict): for the SPECIFIC method, the shares to sell of
+                each lot_id; any shares more are sold first in first
+                out. Ignored by the other methods.
+
+        Returns:
+            (list) the Gain realized from each lot sold.
+
+        Raises:
+            ValueError: if the shares are not greater than 0, more
+                shares are sold than held, or a lot named is not open
+                or holds fewer shares.
+        """
+        holding = self.__holdings.get(security_id, [0, 0])
+        if shares <= 0 or shares > holding[0]:
+            raise ValueError(
+                "Invalid shares ('" + str(shares) + "'), " + str(holding[0]) + " held."
+            )
+        sold = self.__iso_date(sold)
+        named = lots if self.__method == self.SPECIFIC and lots else {}
+        parts = self.__choose(security_id, shares, named)
+
+        # the basis of each lot is reduced in proportion under every
+        # method, so it stays the basis of the lot's remaining shares
+        own = [
+            lot[2] if take == lot[1] else lot[2] * take // lot[1] for lot, take in parts
+        ]
+        bases = own
+        if self.__method == self.AVERAGE:
+            bases = self.__share(holding[1] * shares // holding[0], parts)
+        gains = []
+        for (lot, take), reduction, basis, part in zip(
+            parts, own, bases, self.__share(proceeds, parts)
+        ):
+            lot[1] -= take
+            lot[2] -= reduction
+            if not lot[1]:
+                del self.__lots[lot[3]]
+            gains.append(
+                Gain(
+                    security_id,
+                    lot[3],
+                    lot[0],
+                    sold,
+                    take,
+                    part,
+                    basis,
+                    self.__is_long_term(lot[0], sold),
+                )
+            )
+        holding[0] -= shares
+        holding[1] -= sum(bases)
+        self.__trim(security_id)
+
+        totals = self.__years.setdefault(sold[:4], [0, 0])
+        for gain in gains:
+            totals[gain.long_term] += gain.get_gain()
+        self.__gains.extend(gains)
+        return gains
+        # end sell()
+
+    def get_lots(self, security_id: int) -> list[Lot]:
+        """
+        Get the open lots of a security.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+
+        Returns:
+            (list) the open Lots, in order of the date acquired.
+        """
+        queue = self.__queues.get(security_id, [])
+        head = self.__heads.get(security_id, 0)
+        return [Lot(lot[3], lot[0], lot[1], lot[2]) for lot in queue[head:] if lot[1]]
+        # end get_lots()
+
+    def get_securities(self) -> list[int]:
+        """
+        Get the securities held.
+
+        Returns:
+            (list) the record_ids of the securities with shares held.
+        """
+        return [
+            security_id
+            for security_id, holding in self.__holdings.items()
+            if holding[0]
+        ]
+        # end get_securities()
+
+    def get_shares(self, security_id: int) -> int:
+        """
+        Get the shares held of a security.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+
+        Returns:
+            (int) the number of shares.
+        """
+        return self.__holdings.get(security_id, [0, 0])[0]
+        # end get_shares()
+
+    def get_basis(self, security_id: int) -> int:
+        """
+        Get the cost basis of the shares held of a security.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+
+        Returns:
+            (int) the basis in cents, by the method of the TaxLots.
+        """
+        return self.__holdings.get(security_id, [0, 0])[1]
+        # end get_basis()
+
+    def get_gains(self, year: Union[int, str] = None) -> list[Gain]:
+        """
+        Get the gains realized.
+
+        Parameters:
+            year (Mixed): the year sold, default is every year.
+
+        Returns:
+            (list) the Gains, in the order of the sales.
+        """
+        if year is None:
+            return list(self.__gains)
+        year = str(year)
+        return [gain for gain in self.__gains if gain.sold[:4] == year]
+        # end get_gains()
+
+    def get_realized(self, year: Union[int, str]) -> dict[str, int]:
+        """
+        Get the short and long term gains realized in a year.
+
+        Parameters:
+            year (Mixed): the year sold.
+
+        Returns:
+            (dict) the SHORT_TERM and LONG_TERM net gains in cents.
+        """
+        short_term, long_term = self.__years.get(str(year), (0, 0))
+        return {self.SHORT_TERM: short_term, self.LONG_TERM: long_term}
+        # end get_realized()
+
+    def __choose(
+        self, security_id: int, shares: int, named: dict[Any, int]
+    ) -> list[tuple[list, int]]:
+        """
+        Choose the lots a sale takes its shares from.
+
+        The lots are not changed, so a sale that is not valid leaves
+        them as they were.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            shares (int): the number of shares sold, no more than held.
+            named (dict): the shares to take of each lot_id first.
+
+        Returns:
+            (list) the (lot, shares taken) pairs, a pair for each lot.
+
+        Raises:
+            ValueError: if a lot named is not open or holds fewer
+                shares.
+        """
+        taken: dict[Any, list] = {}
+        for lot_id, take in named.items():
+            security, lot = self.__lots.get(lot_id, (None, None))
+            if security != security_id or not 0 < take <= lot[1] or take > shares:
+                raise ValueError("Invalid lot ('" + str(lot_id) + "').")
+            taken[lot_id] = [lot, take]
+            shares -= take
+
+        queue = self.__queues[security_id]
+        index = self.__heads[security_id]
+        while shares:
+            lot = queue[index]
+            part = taken.setdefault(lot[3], [lot, 0])
+            take = min(shares, lot[1] - part[1])
+            part[1] += take
+            shares -= take
+            index += 1
+        parts = [(lot, take) for lot, take in taken.values() if take]
+        return parts
+        # end __choose()
+
+    def __trim(self, security_id: int) -> None:
+        """
+        Move the head of a queue past its empty lots.
+
+        The emptied lots are dropped once they are half the queue.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+        """
+        queue = self.__queues[security_id]
+        head = self.__heads[security_id]
+        while head < len(queue) and not queue[head][1]:
+            head += 1
+        if head * 2 > len(queue):
+            del queue[:head]
+            head = 0
+        self.__heads[security_id] = head
+        # end __trim()
+
+    @staticmethod
+    def __share(amount: int, parts: list[tuple[list, int]]) -> list[int]:
+        """
+        Divide an amount among the parts of a sale by their shares.
+
+        Parameters:
+            amount (int): the amount in cents.
+            parts (list): the (lot, shares taken) pairs.
+
+        Returns:
+            (list) the amount of each part; the last takes what is left
+                by rounding, so they add up to the amount.
+        """
+        shares = sum(take for lot, take in parts)
+        amounts = [amount * take // shares for lot, take in parts[:-1]]
+        amounts.append(amount - sum(amounts))
+        return amounts
+        # end __share()
+
+    @staticmethod
+    def __iso_date(value: Union[str, date]) -> str:
+        """
+        Get the ISO string of a date.
+
+        Parameters:
+            value (Mixed): a date or an ISO 'YYYY-MM-DD' string.
+
+        Returns:
+            (str) the ISO 'YYYY-MM-DD' date.
+        """
+        if isinstance(value, date):
+            return value.isoformat()[:10]
+        return date.fromisoformat(value).isoformat()
+        # end __iso_date()
+
+    @staticmethod
+    def __is_long_term(acquired: str, sold: str) -> bool:
+        """
+        Tell if shares were held for more than a year.
+
+        Parameters:
+            acquired (str): the ISO date bought.
+            sold (str): the ISO date sold.
+
+        Returns:
+            (bool) True if sold after the anniversary of the purchase.
+        """
+        anniversary = str(int(acquired[:4]) + 1) + acquired[4:]
+        if anniversary[5:] == "02-29":
+            anniversary = anniversary[:5] + "02-28"
+        return sold > anniversary
+        # end __is_long_term()
+
+
+# end class TaxLots
@@ -0,0 +1,519 @@
+"""
+The market value of the investment accounts of the MoneyTrack program.
+
+File:       valuation.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import operator
+from array import array
+from bisect import bisect_right
+from datetime import date, timedelta
+from itertools import accumulate, chain, repeat
+from typing import Any, Union
+
+from constants.account_types import AccountType
+from database.price_history import PriceHistory
+
+
+class Valuation:
+    """
+    Value the investment accounts at the end of each day.
+
+    The value of an investment account is its cash, the balance of its
+    transactions, plus the market value of the shares it holds. Every
+    series is an array with an entry for each day of a date range. The
+    close of a security is carried over the days without a price. The
+    shares of a holding change only on the days of its trades, and for
+    each run of days between them the closes are multiplied by the
+    shares and added to the sums of the account with map() and the
+    operator functions, so no Python code runs for each holding on each
+    day. A security is valued at 0 on the days before its first price.
+
+    The cash and the trades are each read in one SQL pass, grouped by
+    the day of the range, with everything before the range summed into
+    its first day.
+    """
+
+    # The keys of the totals.
+    TOTAL = "total"
+    TAX_DEFERRED = "tax_deferred"
+    TAXABLE = "taxable"
+
+    # Shares are in 1/SHARE_SCALE of a share, as Trade.SHARE_SCALE, so
+    # shares times closes are in 1/VALUE_SCALE of a cent.
+    SHARE_SCALE = 10000
+    VALUE_SCALE = SHARE_SCALE * PriceHistory.PRICE_SCALE // 100
+
+    # The record_ids of the investment accounts.
+    ACCOUNTS = (
+        'SELECT "record_id" FROM "accounts" '
+        + 'WHERE "account_type" = '
+        + str(AccountType.INVESTMENT)
+    )
+
+    # The day of a transaction in the range, 0 for any day before it.
+    DAY = (
+        'MAX(0, CAST(julianday(transactions."date") - julianday(:start) '
+        + 'AS INTEGER)) AS "day"'
+    )
+
+    def __init__(self, dbref: Any) -> None:
+        """
+        Define the valuation of a database.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+        """
+        self.__dbref = dbref
+        self.__prices = PriceHistory(dbref)
+        # end __init__()
+
+    def get_dbref(self) -> Any:
+        """
+        Get the database reference of the valuation.
+
+        Returns:
+            (Dbal) the database the accounts are valued from.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def get_accounts(self) -> dict[int, bool]:
+        """
+        Get the investment accounts.
+
+        Returns:
+            (dict) True for each record_id of a tax deferred account,
+                False for each taxable one.
+        """
+        dbref = self.__dbref
+        result = dbref.sql_query(
+            'SELECT "record_id", "tax_deferred" FROM "accounts" '
+            + 'WHERE "account_type" = :account_type ORDER BY "record_id"',
+            {"account_type": AccountType.INVESTMENT},
+        )
+        return {
+            row["record_id"]: bool(row["tax_deferred"])
+            for row in dbref.sql_fetchrowset(result)
+        }
+        # end get_accounts()
+
+    def get_holdings(self, as_of: Union[str, date] = None) -> dict[int, dict[int, int]]:
+        """
+        Get the shares held in each account.
+
+        Parameters:
+            as_of (Mixed): the date, a date or ISO string; default is
+                after the last trade.
+
+        Returns:
+            (dict) for each account_id, the shares in 1/SHARE_SCALE of a
+                share held of each security_id; securities no longer
+                held are left out.
+        """
+        sql = (
+            'SELECT transactions."account_id", trades."security_id", '
+            + 'SUM(trades."shares") AS "shares" FROM "trades" '
+            + 'JOIN "transactions" '
+            + 'ON transactions."record_id" = trades."transaction_id"'
+        )
+        values = {}
+        if as_of is not None:
+            sql += ' WHERE transactions."date" <= :as_of'
+            values["as_of"] = as_of if isinstance(as_of, str) else as_of.isoformat()
+        sql += ' GROUP BY 1, 2 HAVING SUM(trades."shares") != 0'
+        holdings: dict[int, dict[int, int]] = {}
+        dbref = self.__dbref
+        for row in dbref.sql_fetchrowset(dbref.sql_query(sql, values)):
+            holdings.setdefault(row["account_id"], {})[row["security_id"]] = row[
+                "shares"
+            ]
+        return holdings
+        # end get_holdings()
+
+    def get_account_values(
+        self, start: Union[str, date] = None, end: Union[str, date] = None
+    ) -> tuple[list[str], dict[int, array]]:
+        """
+        Get the value of each investment account at the end of each day.
+
+        Parameters:
+            start (Mixed): the first day, a date or ISO string; default
+                is the first transaction of the investment accounts.
+            end (Mixed): the last day, a date or ISO string; default is
+                today.
+
+        Returns:
+            (tuple) the list of ISO 'YYYY-MM-DD' days and, for each
+                account_id, the array of its value in cents on those
+                days.
+        """
+        labels, dates = self.__day_range(start, end)
+        if not labels:
+            return [], {}
+        values = self.__daily_cash(dates, len(labels))
+        for account_id, market in self.__market_values(dates, len(labels)).items():
+            values[account_id] = array(
+                "q", map(operator.add, values[account_id], market)
+            )
+        return labels, values
+        # end get_account_values()
+
+    def get_market_values(
+        self, start: Union[str, date] = None, end: Union[str, date] = None
+    ) -> tuple[list[str], dict[int, array]]:
+        """
+        Get the market value of the shares held in each investment
+        account at the end of each day, without its cash.
+
+        Parameters:
+            start (Mixed): the first day, a date or ISO string; default
+                is the first transaction of the investment accounts.
+            end (Mixed): the last day, a date or ISO string; default is
+                today.
+
+        Returns:
+            (tuple) the list of ISO 'YYYY-MM-DD' days and, for each
+                account_id that holds shares in the range, the array of
+                the value in cents of its shares on those days.
+        """
+        labels, dates = self.__day_range(start, end)
+        if not labels:
+            return [], {}
+        return labels, self.__market_values(dates, len(labels))
+        # end get_market_values()
+
+    def get_market_values_on(self, days: list[str]) -> dict[int, array]:
+        """
+        Get the market value of the shares held in each investment
+        account at the end of some days, without its cash.
+
+        Only the given days are valued: the shares of each holding and
+        the close of each security are looked up for those days alone,
+        so the month ends of a long range cost a fraction of valuing
+        every day of it.
+
+        Parameters:
+            days (list): the ISO 'YYYY-MM-DD' days, in order.
+
+        Returns:
+            (dict) for each account_id that holds shares on any of the
+                days, the array of the value in cents of its shares on
+                those days.
+        """
+        if not days:
+            return {}
+        start = date.fromisoformat(days[0])
+        offsets = [(date.fromisoformat(day) - start).days for day in days]
+        dates = {"start": days[0], "end": days[-1]}
+        closes: dict[int, list[int]] = {}
+        products: dict[int, list[int]] = {}
+        for (account_id, security_id), trades in self.__trade_runs(dates).items():
+            if security_id not in closes:
+                closes[security_id] = self.__closes_on(security_id, start, offsets)
+            # the shares held at the end of each day
+            changed = [day for day, change in trades]
+            held = list(accumulate(change for day, change in trades))
+            shares = [
+                held[index] if index >= 0 else 0
+                for index in (bisect_right(changed, offset) - 1 for offset in offsets)
+            ]
+            product = products.setdefault(account_id, [0] * len(days))
+            product[:] = map(
+                operator.add,
+                product,
+                map(operator.mul, closes[security_id], shares),
+            )
+        half = self.VALUE_SCALE // 2
+        return {
+            account_id: array(
+                "q",
+                map(
+                    operator.floordiv,
+                    map(operator.add, product, repeat(half)),
+                    repeat(self.VALUE_SCALE),
+                ),
+            )
+            for account_id, product in products.items()
+        }
+        # end get_market_values_on()
+
+    def get_totals(
+        self, start: Union[str, date] = None, end: Union[str, date] = None
+    ) -> tuple[list[str], dict[str, array]]:
+        """
+        Get the total value of the investment accounts at the end of
+        each day.
+
+        Parameters:
+            start (Mixed): the first day, a date or ISO string; default
+                is the first transaction of the investment accounts.
+            end (Mixed): the last day, a date or ISO string; default is
+                today.
+
+        Returns:
+            (tuple) the list of ISO 'YYYY-MM-DD' days and a dict of the
+                arrays of the value in cents on those days of the
+                TAX_DEFERRED accounts, the TAXABLE ones, and the TOTAL
+                of all.
+        """
+        labels, values = self.get_account_values(start, end)
+        accounts = self.get_accounts()
+        zeros = bytes(8 * len(labels))
+        totals = {
+            self.TAX_DEFERRED: array("q", zeros),
+            self.TAXABLE: array("q", zeros),
+        }
+        for account_id, series in values.items():
+            key = self.TAX_DEFERRED if accounts.get(account_id) else self.TAXABLE
+            totals[key] = array("q", map(operator.add, totals[key], series))
+        totals[self.TOTAL] = array(
+            "q", map(operator.add, totals[self.TAX_DEFERRED], totals[self.TAXABLE])
+        )
+        return labels, totals
+        # end get_totals()
+
+    def __day_range(
+        self, start: Union[str, date], end: Union[str, date]
+    ) -> tuple[list[str], dict[str, str]]:
+        """
+        Get the days of a range.
+
+        Parameters:
+            start (Mixed): the first day, a date or ISO string, or None
+                for the first transaction of the investment accounts.
+            end (Mixed): the last day, a date or ISO string, or None for
+                today.
+
+        Returns:
+            (tuple) the list of ISO 'YYYY-MM-DD' days, empty if there
+                are none, and the ISO 'start' and 'end' days.
+        """
+        if start is None:
+            dbref = self.__dbref
+            row = dbref.sql_fetchrow(
+                dbref.sql_query(
+                    'SELECT MIN("date") AS "first" FROM "transactions" '
+                    + 'WHERE "account_id" IN ('
+                    + self.ACCOUNTS
+                    + ")"
+                )
+            )
+            start = row["first"] if row else None
+            if start is None:
+                return [], {}
+        if not isinstance(start, date):
+            start = date.fromisoformat(start)
+        if end is None:
+            end = date.today()
+        elif not isinstance(end, date):
+            end = date.fromisoformat(end)
+        labels = [
+            (start + timedelta(days=day)).isoformat()
+            for day in range((end - start).days + 1)
+        ]
+        return labels, {"start": start.isoformat(), "end": end.isoformat()}
+        # end __day_range()
+
+    def __market_values(self, dates: dict[str, str], days: int) -> dict[int, array]:
+        """
+        Get the market value of the shares of each account on each day.
+
+        Parameters:
+            dates (dict): the ISO 'start' and 'end' days of the range.
+            days (int): the number of days of the range.
+
+        Returns:
+            (dict) for each account_id holding shares, the array of
+                their value in cents on each day.
+        """
+        start = date.fromisoformat(dates["start"])
+        products = self.__daily_products(self.__trade_runs(dates), start, days)
+        half = self.VALUE_SCALE // 2
+        return {
+            account_id: array(
+                "q",
+                map(
+                    operator.floordiv,
+                    map(operator.add, product, repeat(half)),
+                    repeat(self.VALUE_SCALE),
+                ),
+            )
+            for account_id, product in products.items()
+        }
+        # end __market_values()
+
+    def __daily_cash(self, dates: dict[str, str], days: int) -> dict[int, array]:
+        """
+        Get the cash of each investment account at the end of each day.
+
+        Parameters:
+            dates (dict): the ISO 'start' and 'end' days of the range.
+            days (int): the number of days of the range.
+
+        Returns:
+            (dict) for each account_id, the array of its cash balance in
+                cents on each day.
+        """
+        dbref = self.__dbref
+        zeros = bytes(8 * days)
+        changes = {account_id: array("q", zeros) for account_id in self.get_accounts()}
+        result = dbref.sql_query(
+            'SELECT "account_id", '
+            + self.DAY
+            + ', SUM("amount") AS "amount" FROM "transactions" '
+            + 'WHERE "account_id" IN ('
+            + self.ACCOUNTS
+            + ') AND "date" <= :end GROUP BY 1, 2',
+            dates,
+        )
+        for row in dbref.sql_fetchrowset(result):
+            changes[row["account_id"]][row["day"]] += row["amount"]
+        return {
+            account_id: array("q", accumulate(amounts))
+            for account_id, amounts in changes.items()
+        }
+        # end __daily_cash()
+
+    def __trade_runs(
+        self, dates: dict[str, str]
+    ) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Get the days on which the shares of each holding change.
+
+        Parameters:
+            dates (dict): the ISO 'start' and 'end' days of the range.
+
+        Returns:
+            (dict) for each (account_id, security_id), the (day, shares)
+                changes in the order of the days of the range, the
+                trades before it summed into day 0.
+        """
+        dbref = self.__dbref
+        holdings: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        result = dbref.sql_query(
+            'SELECT transactions."account_id", trades."security_id", '
+            + self.DAY
+            + ', SUM(trades."shares") AS "shares" FROM "trades" '
+            + 'JOIN "transactions" '
+            + 'ON transactions."record_id" = trades."transaction_id" '
+            + 'WHERE transactions."account_id" IN ('
+            + self.ACCOUNTS
+            + ') AND transactions."date" <= :end GROUP BY 1, 2, 3 ORDER BY 3',
+            dates,
+        )
+        for row in dbref.sql_fetchrowset(result):
+            key = (row["account_id"], row["security_id"])
+            holdings.setdefault(key, []).append((row["day"], row["shares"]))
+        return holdings
+        # end __trade_runs()
+
+    def __daily_products(
+        self,
+        holdings: dict[tuple[int, int], list[tuple[int, int]]],
+        start: date,
+        days: int,
+    ) -> dict[int, list[int]]:
+        """
+        Sum the shares times the closes of the holdings of each account.
+
+        The products are summed over each run of days the shares of a
+        holding are the same. The sums are kept in lists, whose slices
+        are copied without converting every value as array slices are.
+
+        Parameters:
+            holdings (dict): the (day, shares) changes of each
+                (account_id, security_id), as __trade_runs().
+            start (date): the first day of the range.
+            days (int): the number of days of the range.
+
+        Returns:
+            (dict) for each account_id holding shares, the list of the
+                value of its shares in 1/VALUE_SCALE of a cent on each
+                day.
+        """
+        closes: dict[int, list[int]] = {}
+        products: dict[int, list[int]] = {}
+        for (account_id, security_id), trades in holdings.items():
+            if security_id not in closes:
+                closes[security_id] = self.__daily_closes(security_id, start, days)
+            close = closes[security_id]
+            product = products.setdefault(account_id, [0] * days)
+            shares = 0
+            ends = [day for day, change in trades[1:]] + [days]
+            for (first, change), last in zip(trades, ends):
+                shares += change
+                if shares:
+                    product[first:last] = map(
+                        operator.add,
+                        product[first:last],
+                        map(operator.mul, close[first:last], repeat(shares)),
+                    )
+        return products
+        # end __daily_products()
+
+    def __daily_closes(self, security_id: int, start: date, days: int) -> list[int]:
+        """
+        Get the close of a security on each day of a range.
+
+        A day without a price takes the last close before it.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            start (date): the first day of the range.
+            days (int): the number of days of the range.
+
+        Returns:
+            (list) the close in 1/PriceHistory.PRICE_SCALE of a dollar
+                of each day, 0 before the first price.
+        """
+        prices = self.__prices
+        close = prices.get_price(security_id, start) or 0
+        numbers, values = prices.get_prices(
+            security_id, start, start + timedelta(days=days - 1)
+        )
+        # each close is repeated until the day of the next one
+        first = PriceHistory.to_day(start)
+        lead = numbers[0] - first if numbers else days
+        runs = map(operator.sub, chain(numbers[1:], (first + days,)), numbers)
+        closes = [close] * lead
+        closes.extend(chain.from_iterable(map(repeat, values, runs)))
+        return closes
+        # end __daily_closes()
+
+    def __closes_on(
+        self, security_id: int, start: date, offsets: list[int]
+    ) -> list[int]:
+        """
+        Get the close of a security on some days of a range.
+
+        A day without a price takes the last close before it.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            start (date): the first day of the range.
+            offsets (list): the days to look up, in order, as the number
+                of days after 'start'.
+
+        Returns:
+            (list) the close in 1/PriceHistory.PRICE_SCALE of a dollar
+                of each day, 0 before the first price.
+        """
+        prices = self.__prices
+        close = prices.get_price(security_id, start) or 0
+        numbers, values = prices.get_prices(
+            security_id, start, start + timedelta(days=offsets[-1])
+        )
+        first = PriceHistory.to_day(start)
+        closes = []
+        for offset in offsets:
+            index = bisect_right(numbers, first + offset) - 1
+            closes.append(values[index] if index >= 0 else close)
+        return closes
+        # end __closes_on()
+
+
+# end class Valuation
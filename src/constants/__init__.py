@@ -15,6 +15,10 @@ The contants included in the package are
         InvestmentAccountTypes - Investment Account specific types
             including Brokerage and Single-Fund accounts.
 
+    from transaction_types:
+        TransactionType - The kinds of transactions in an account
+            register, such as Deposits, Withdrawals and Interest.
+
  File:       __init__.py
  Author:     Lorn B Kerr
  Copyright:  (c) 2022 Lorn B Kerr
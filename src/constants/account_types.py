@@ -7,7 +7,52 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from constants.element_types import ElementType
+from array import array
+from typing import Any
+
+from constants.element_types import ElementType, _code_names
+
+# The sequence types classified item by item by the helper methods;
+# anything else, an int or a NumPy array, is classified with the bit
+# operators directly.
+_SEQUENCES = (list, tuple, range, array)
+
+
+def _masked(code: Any, mask: int) -> Any:
+    """
+    Apply a mask to a code or to each of a set of codes.
+
+    Parameters:
+        code (Any): an int, a list, tuple, range or array of ints, or a
+            NumPy integer array.
+        mask (int): the mask to apply.
+
+    Returns:
+        (Any) the masked int, a list of masked ints for a sequence, or
+            a NumPy array for a NumPy array.
+    """
+    if isinstance(code, _SEQUENCES):
+        return [item & mask for item in code]
+    return code & mask
+
+
+def _masked_equals(code: Any, mask: int, value: int) -> Any:
+    """
+    Test whether a masked code, or each of a set of codes, equals a value.
+
+    Parameters:
+        code (Any): an int, a list, tuple, range or array of ints, or a
+            NumPy integer array.
+        mask (int): the mask to apply.
+        value (int): the value the masked code must equal.
+
+    Returns:
+        (Any) a bool, a list of bools for a sequence, or a NumPy bool
+            array for a NumPy array.
+    """
+    if isinstance(code, _SEQUENCES):
+        return [(item & mask) == value for item in code]
+    return (code & mask) == value
 
 
 class AccountType:
@@ -21,31 +66,133 @@ class AccountType:
     """
 
     ACCOUNT_TYPE_NASK = ElementType.ELEMENT_TYPE_MASK | 0x000F0
+    ACCOUNT_SUBTYPE_MASK = 0x0000F
     NO_TYPE = ElementType.ACCOUNT | 0x00000
     BANK = ElementType.ACCOUNT | 0x00010
     INVESTMENT = ElementType.ACCOUNT | 0x00020
     TAX = ElementType.ACCOUNT | 0x00030
 
     @staticmethod
-    def list() -> []:
+    def list() -> tuple[int, ...]:
         """
-        Return a list of the defined AccountTypes.
+        Return the defined AccountTypes.
+
+        The tuple is built once, when the module is loaded.
 
         Returns:
-            (list) a list of the available AccountTypes
+            (tuple) the available AccountTypes
         """
-        return [
-            AccountType.NO_TYPE,
-            AccountType.BANK,
-            AccountType.INVESTMENT,
-            AccountType.TAX,
-        ]
+        return _ACCOUNT_TYPE_LIST
 
     # end list()
 
+    @staticmethod
+    def name_of(code: int) -> str:
+        """
+        Get the name of a defined AccountType code.
+
+        Parameters:
+            code (int): the AccountType code.
+
+        Returns:
+            (str) the name of the code, such as 'BANK', or None if the
+                code is not a defined AccountType.
+        """
+        return _ACCOUNT_TYPE_NAMES.get(code)
+
+    # end name_of()
+
+    @staticmethod
+    def type_of(code: Any) -> Any:
+        """
+        Get the AccountType of an account type or subtype code.
+
+        The code may be a single int, or a list, tuple, range, array or
+        NumPy array of codes to classify all of them in one call.
+
+        Parameters:
+            code (Any): the account type or subtype code(s).
+
+        Returns:
+            (Any) the AccountType of each code, in the same form as
+                given; lists for the Python sequences.
+        """
+        return _masked(code, AccountType.ACCOUNT_TYPE_NASK)
+
+    # end type_of()
+
+    @staticmethod
+    def subtype_of(code: Any) -> Any:
+        """
+        Get the subtype bits of an account subtype code.
+
+        These are the low bits that distinguish, for example,
+        BankAccountType.CHECKING from BankAccountType.SAVINGS; 0 is the
+        NO_TYPE subtype of every account type. The code may be a single
+        int or a sequence or NumPy array of codes.
+
+        Parameters:
+            code (Any): the account subtype code(s).
+
+        Returns:
+            (Any) the subtype bits of each code, in the same form as
+                given; lists for the Python sequences.
+        """
+        return _masked(code, AccountType.ACCOUNT_SUBTYPE_MASK)
+
+    # end subtype_of()
+
+    @staticmethod
+    def is_bank(code: Any) -> Any:
+        """
+        Is an account type or subtype code a Bank account code?
+
+        The code may be a single int or a sequence or NumPy array of
+        codes.
+
+        Parameters:
+            code (Any): the account type or subtype code(s).
+
+        Returns:
+            (Any) True for each bank account code, in the same form as
+                given; lists for the Python sequences.
+        """
+        return _masked_equals(code, AccountType.ACCOUNT_TYPE_NASK, AccountType.BANK)
+
+    # end is_bank()
+
+    @staticmethod
+    def is_investment(code: Any) -> Any:
+        """
+        Is an account type or subtype code an Investment account code?
+
+        The code may be a single int or a sequence or NumPy array of
+        codes.
+
+        Parameters:
+            code (Any): the account type or subtype code(s).
+
+        Returns:
+            (Any) True for each investment account code, in the same
+                form as given; lists for the Python sequences.
+        """
+        return _masked_equals(
+            code, AccountType.ACCOUNT_TYPE_NASK, AccountType.INVESTMENT
+        )
+
+    # end is_investment()
+
 
 # end class AccountType
 
+_ACCOUNT_TYPE_LIST = (
+    AccountType.NO_TYPE,
+    AccountType.BANK,
+    AccountType.INVESTMENT,
+    AccountType.TAX,
+)
+_ACCOUNT_TYPE_NAMES = _code_names(AccountType, _ACCOUNT_TYPE_LIST)
+
 
 class BankAccountType:
     """
@@ -64,25 +211,46 @@ class BankAccountType:
     CD = AccountType.BANK | 0x3
 
     @staticmethod
-    def list() -> []:
+    def list() -> tuple[int, ...]:
         """
-        Return a list of the defined BankAccountTypes.
+        Return the defined BankAccountTypes.
+
+        The tuple is built once, when the module is loaded.
 
         Returns:
-            (list) a list of the available BankAccountTypes
+            (tuple) the available BankAccountTypes
         """
-        return [
-            BankAccountType.NO_TYPE,
-            BankAccountType.CHECKING,
-            BankAccountType.SAVINGS,
-            BankAccountType.CD,
-        ]
+        return _BANK_ACCOUNT_TYPE_LIST
 
     # end list()
 
+    @staticmethod
+    def name_of(code: int) -> str:
+        """
+        Get the name of a defined BankAccountType code.
+
+        Parameters:
+            code (int): the BankAccountType code.
+
+        Returns:
+            (str) the name of the code, such as 'CHECKING', or None if the
+                code is not a defined BankAccountType.
+        """
+        return _BANK_ACCOUNT_TYPE_NAMES.get(code)
+
+    # end name_of()
+
 
 # end class BankAccountType
 
+_BANK_ACCOUNT_TYPE_LIST = (
+    BankAccountType.NO_TYPE,
+    BankAccountType.CHECKING,
+    BankAccountType.SAVINGS,
+    BankAccountType.CD,
+)
+_BANK_ACCOUNT_TYPE_NAMES = _code_names(BankAccountType, _BANK_ACCOUNT_TYPE_LIST)
+
 
 class InvestmentAccountType:
     """
@@ -99,20 +267,50 @@ class InvestmentAccountType:
     SINGLE_FUND = AccountType.INVESTMENT | 0x2
 
     @staticmethod
-    def list() -> []:
+    def list() -> tuple[int, ...]:
         """
-        Return a list of the defined InvestmentAccountTypes.
+        Return the defined InvestmentAccountTypes.
+
+        The tuple is built once, when the module is loaded.
 
         Returns:
-            (list) a list of the available InvestmentAccountTypes
+            (tuple) the available InvestmentAccountTypes
         """
-        return [
-            InvestmentAccountType.NO_TYPE,
-            InvestmentAccountType.BROKERAGE,
-            InvestmentAccountType.SINGLE_FUND,
-        ]
+        return _INVESTMENT_ACCOUNT_TYPE_LIST
 
     # end list()
 
+    @staticmethod
+    def name_of(code: int) -> str:
+        """
+        Get the name of a defined InvestmentAccountType code.
+
+        Parameters:
+            code (int): the InvestmentAccountType code.
+
+        Returns:
+            (str) the name of the code, such as 'BROKERAGE', or None if the
+                code is not a defined InvestmentAccountType.
+        """
+        return _INVESTMENT_ACCOUNT_TYPE_NAMES.get(code)
+
+    # end name_of()
+
 
 # end class InvestmentAccountType
+
+_INVESTMENT_ACCOUNT_TYPE_LIST = (
+    InvestmentAccountType.NO_TYPE,
+    InvestmentAccountType.BROKERAGE,
+    InvestmentAccountType.SINGLE_FUND,
+)
+_INVESTMENT_ACCOUNT_TYPE_NAMES = _code_names(
+    InvestmentAccountType, _INVESTMENT_ACCOUNT_TYPE_LIST
+)
+
+
+# The defined codes of each kind of account type, for constant time
+# membership tests.
+ACCOUNT_TYPES = frozenset(_ACCOUNT_TYPE_LIST)
+BANK_ACCOUNT_TYPES = frozenset(_BANK_ACCOUNT_TYPE_LIST)
+INVESTMENT_ACCOUNT_TYPES = frozenset(_INVESTMENT_ACCOUNT_TYPE_LIST)
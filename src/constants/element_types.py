@@ -7,6 +7,29 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
+
+def _code_names(constants: type, codes: tuple[int, ...]) -> Mapping[int, str]:
+    """
+    Build the reverse lookup from the defined codes to their names.
+
+    Parameters:
+        constants (type): the class defining the codes.
+        codes (tuple): the defined codes of the class.
+
+    Returns:
+        (Mapping) the read-only name of each code.
+    """
+    return MappingProxyType(
+        {
+            value: name
+            for name, value in vars(constants).items()
+            if name.isupper() and isinstance(value, int) and value in codes
+        }
+    )
+
 
 class ElementType:
     """
@@ -21,22 +44,46 @@ class ElementType:
 
     NO_TYPE = 0x00000
     ACCOUNT = 0x10000
-    #    SECURITY = 0x20000
-    #    TRANSACTION = 0x30000
+    SECURITY = 0x20000
+    TRANSACTION = 0x30000
     #    CATEGORY = 0x40000
 
     @staticmethod
-    def list() -> []:
+    def list() -> tuple[int, ...]:
         """
-        Return a list of the defined ElementTypes.
+        Return the defined ElementTypes.
+
+        The tuple is built once, when the module is loaded.
 
         Returns:
-            (list) a list of the available ElementTypes
+            (tuple) the available ElementTypes
         """
-        return [
-            ElementType.NO_TYPE,
-            ElementType.ACCOUNT,
-            #            ElementType.SECURITY,
-            #            ElementType.TRANSACTION,
-            #            ElementType.CATEGORY,
-        ]
+        return _ELEMENT_TYPE_LIST
+
+    # end list()
+
+    @staticmethod
+    def name_of(code: int) -> str:
+        """
+        Get the name of a defined ElementType code.
+
+        Parameters:
+            code (int): the ElementType code.
+
+        Returns:
+            (str) the name of the code, such as 'ACCOUNT', or None if the
+                code is not a defined ElementType.
+        """
+        return _ELEMENT_TYPE_NAMES.get(code)
+
+    # end name_of()
+
+
+_ELEMENT_TYPE_LIST = (
+    ElementType.NO_TYPE,
+    ElementType.ACCOUNT,
+    ElementType.SECURITY,
+    ElementType.TRANSACTION,
+    #    ElementType.CATEGORY,
+)
+_ELEMENT_TYPE_NAMES = _code_names(ElementType, _ELEMENT_TYPE_LIST)
@@ -0,0 +1,84 @@
+"""
+The transaction types used throughout the MoneyTrack program.
+
+File:       transaction_types.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from constants.element_types import ElementType, _code_names
+
+
+class TransactionType:
+    """
+    Available transaction types.
+
+    Every transaction moves an amount into or out of one account; the
+    type records why. A transfer between two accounts is a TRANSFER
+    transaction in each of them. A BUY or SELL in an investment account
+    moves the cash of a trade, and its Trade holds the security and the
+    number of shares. The NO_TYPE type is used to indicate no
+    transaction type has been assigned.
+    """
+
+    TRANSACTION_TYPE_MASK = ElementType.ELEMENT_TYPE_MASK | 0x000F0
+    NO_TYPE = ElementType.TRANSACTION | 0x00000
+    DEPOSIT = ElementType.TRANSACTION | 0x00010
+    WITHDRAWAL = ElementType.TRANSACTION | 0x00020
+    TRANSFER = ElementType.TRANSACTION | 0x00030
+    INTEREST = ElementType.TRANSACTION | 0x00040
+    DIVIDEND = ElementType.TRANSACTION | 0x00050
+    FEE = ElementType.TRANSACTION | 0x00060
+    BUY = ElementType.TRANSACTION | 0x00070
+    SELL = ElementType.TRANSACTION | 0x00080
+
+    @staticmethod
+    def list() -> tuple[int, ...]:
+        """
+        Return the defined TransactionTypes.
+
+        The tuple is built once, when the module is loaded.
+
+        Returns:
+            (tuple) the available TransactionTypes
+        """
+        return _TRANSACTION_TYPE_LIST
+
+    # end list()
+
+    @staticmethod
+    def name_of(code: int) -> str:
+        """
+        Get the name of a defined TransactionType code.
+
+        Parameters:
+            code (int): the TransactionType code.
+
+        Returns:
+            (str) the name of the code, such as 'DEPOSIT', or None if the
+                code is not a defined TransactionType.
+        """
+        return _TRANSACTION_TYPE_NAMES.get(code)
+
+    # end name_of()
+
+
+# end class TransactionType
+
+_TRANSACTION_TYPE_LIST = (
+    TransactionType.NO_TYPE,
+    TransactionType.DEPOSIT,
+    TransactionType.WITHDRAWAL,
+    TransactionType.TRANSFER,
+    TransactionType.INTEREST,
+    TransactionType.DIVIDEND,
+    TransactionType.FEE,
+    TransactionType.BUY,
+    TransactionType.SELL,
+)
+_TRANSACTION_TYPE_NAMES = _code_names(TransactionType, _TRANSACTION_TYPE_LIST)
+
+# The defined transaction type codes, for constant time membership
+# tests.
+TRANSACTION_TYPES = frozenset(_TRANSACTION_TYPE_LIST)
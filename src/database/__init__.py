@@ -0,0 +1,23 @@
+"""
+Define the members of the database package for the MoneyTracker Program
+
+The modules included in the package are
+    BalanceSnapshots - Reads the balance of each account, and of each
+        month of it, kept up to date by triggers, and checks them
+        against the ledger.
+    ConnectionPool - One writer and a read-only connection per thread
+        sharing a database file, with a pool of reader threads.
+    ConnectionProfile - The SQLite settings applied to each database
+        connection, such as WAL journaling and the page cache size.
+    PriceHistory - The daily closing prices of the securities, held in
+        compact monthly blocks.
+    RowStream - The rows of a large query, read from the cursor a
+        chunk at a time and keyed by column name.
+    Schema - Creates the MoneyTracker tables and indexes and upgrades
+        older database files to the current schema version.
+
+ File:       database.__init__.py
+ Author:     Lorn B Kerr
+ Copyright:  (c) 2022 Lorn B Kerr
+ License:    MIT, see file LICENSE
+ """
@@ -0,0 +1,171 @@
+"""
+Read and check the account balance snapshots of the database.
+
+File:       balance_snapshots.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from typing import Any
+
+
+class BalanceSnapshots:
+    """
+    The materialized balances of the accounts.
+
+    The 'account_balances' table holds the balance of each account with
+    transactions, and 'monthly_balances' the net amount of each month
+    of each account. Triggers on the 'transactions' table, created by
+    schema version 4, keep both up to date in the same statement that
+    changes a transaction, so reading the balances of the account lists
+    costs one row per account however long the history is.
+
+    verify() recomputes the snapshots from the ledger and reports any
+    that differ; rebuild() also rewrites them.
+    """
+
+    # Recompute every snapshot from the ledger. Rows are replaced before
+    # stale ones are removed, so a reader never sees a missing balance.
+    REBUILD: tuple[str, ...] = (
+        'INSERT OR REPLACE INTO "account_balances" '
+        + '("account_id", "balance", "transactions") '
+        + 'SELECT "account_id", SUM("amount"), COUNT(*) '
+        + 'FROM "transactions" GROUP BY "account_id"',
+        'DELETE FROM "account_balances" '
+        + 'WHERE "account_id" NOT IN (SELECT "account_id" FROM "transactions")',
+        'INSERT OR REPLACE INTO "monthly_balances" '
+        + '("account_id", "month", "amount", "transactions") '
+        + 'SELECT "account_id", substr("date", 1, 7), SUM("amount"), COUNT(*) '
+        + 'FROM "transactions" GROUP BY "account_id", substr("date", 1, 7)',
+        'DELETE FROM "monthly_balances" WHERE NOT EXISTS ('
+        + 'SELECT 1 FROM "transactions" '
+        + 'WHERE "transactions"."account_id" = "monthly_balances"."account_id" '
+        + 'AND "date" BETWEEN "month" || \'-00\' AND "month" || \'-99\')',
+    )
+
+    # Compare the snapshots with the ledger in one statement, so they
+    # are read from the same state of the database. The account
+    # balances are reported with an empty month.
+    VERIFY = (
+        'SELECT "account_id", "month", '
+        + 'SUM("stored_amount") AS "stored_amount", '
+        + 'SUM("stored_transactions") AS "stored_transactions", '
+        + 'SUM("amount") AS "amount", '
+        + 'SUM("transactions") AS "transactions" FROM ('
+        + 'SELECT "account_id", \'\' AS "month", '
+        + '"balance" AS "stored_amount", '
+        + '"transactions" AS "stored_transactions", '
+        + 'NULL AS "amount", NULL AS "transactions" FROM "account_balances" '
+        + 'UNION ALL SELECT "account_id", \'\', NULL, NULL, SUM("amount"), '
+        + 'COUNT(*) FROM "transactions" GROUP BY "account_id" '
+        + 'UNION ALL SELECT "account_id", "month", "amount", "transactions", '
+        + 'NULL, NULL FROM "monthly_balances" '
+        + 'UNION ALL SELECT "account_id", substr("date", 1, 7), NULL, NULL, '
+        + 'SUM("amount"), COUNT(*) FROM "transactions" '
+        + 'GROUP BY "account_id", substr("date", 1, 7)) '
+        + 'GROUP BY "account_id", "month" '
+        + 'HAVING SUM("stored_amount") IS NOT SUM("amount") '
+        + 'OR SUM("stored_transactions") IS NOT SUM("transactions") '
+        + 'ORDER BY "account_id", "month"'
+    )
+
+    @staticmethod
+    def get_balances(dbref: Any, account_ids: list[int] = None) -> dict[int, int]:
+        """
+        Get the current balances of accounts.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            account_ids (list): the record_ids of the accounts, default
+                is every account with transactions.
+
+        Returns:
+            (dict) the balance in cents of each account by record_id;
+                0 for a requested account without transactions.
+        """
+        sql = 'SELECT "account_id", "balance" FROM "account_balances"'
+        values = {}
+        balances = {}
+        if account_ids is not None:
+            if not account_ids:
+                return balances
+            names = []
+            for number, account_id in enumerate(account_ids):
+                values["account_" + str(number)] = account_id
+                names.append(":account_" + str(number))
+                balances[account_id] = 0
+            sql += ' WHERE "account_id" IN (' + ", ".join(names) + ")"
+        result = dbref.sql_query(sql, values)
+        for row in dbref.sql_fetchrowset(result):
+            balances[row["account_id"]] = row["balance"]
+        return balances
+        # end get_balances()
+
+    @staticmethod
+    def get_month_end_balances(dbref: Any, account_id: int) -> list[tuple[str, int]]:
+        """
+        Get the balance of an account at the end of each month.
+
+        Only the months with transactions are listed; the balance of a
+        month without any is that of the month before it.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            account_id (int): the record_id of the account.
+
+        Returns:
+            (list) the ('YYYY-MM' month, balance in cents) pairs, in
+                month order.
+        """
+        result = dbref.sql_query(
+            'SELECT "month", SUM("amount") OVER '
+            + '(ORDER BY "month" ROWS UNBOUNDED PRECEDING) AS "balance" '
+            + 'FROM "monthly_balances" WHERE "account_id" = :account_id '
+            + 'ORDER BY "month"',
+            {"account_id": account_id},
+        )
+        rows = dbref.sql_fetchrowset(result)
+        return [(row["month"], row["balance"]) for row in rows]
+        # end get_month_end_balances()
+
+    @classmethod
+    def verify(cls, dbref: Any) -> list[dict[str, Any]]:
+        """
+        Compare the snapshots with balances recomputed from the ledger.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+
+        Returns:
+            (list) a dict for each snapshot that is wrong or missing,
+                holding its 'account_id' and 'month' ('' for the
+                account balance), the 'stored_amount' and
+                'stored_transactions' of the snapshot and the 'amount'
+                and 'transactions' it should hold; None where there is
+                no snapshot, or should be none. Empty if all are right.
+        """
+        return dbref.sql_fetchrowset(dbref.sql_query(cls.VERIFY))
+        # end verify()
+
+    @classmethod
+    def rebuild(cls, dbref: Any) -> list[dict[str, Any]]:
+        """
+        Rewrite the snapshots from the ledger if any are wrong.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+
+        Returns:
+            (list) the differences found by verify() before the
+                snapshots were rewritten; empty if none were needed.
+        """
+        differences = cls.verify(dbref)
+        if differences:
+            for statement in cls.REBUILD:
+                dbref.sql_query(statement)
+        return differences
+        # end rebuild()
+
+
+# end class BalanceSnapshots
@@ -0,0 +1,178 @@
+"""
+Share one database file between the GUI and the background jobs.
+
+File:       connection_pool.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from lbk_library import Dbal
+
+from database.connection_profile import ConnectionProfile
+
+
+class ConnectionPool:
+    """
+    One writer connection and a read-only connection for each thread.
+
+    All changes to the database go through the single writer, which
+    belongs to the thread that built the pool, normally the GUI thread.
+    Every thread that reads gets its own connection, opened on first
+    use with 'PRAGMA query_only' set, since a SQLite connection may
+    only be used by the thread that opened it. Under WAL journaling the
+    readers see each change as soon as the writer commits it and never
+    block the writer.
+
+    Work that only reads, such as reports, is given to submit() and
+    runs on the pool's reader threads, in parallel with the GUI.
+
+    The Account and AccountSet constructors accept a pool in place of
+    a Dbal; they then read through the reader of the calling thread and
+    keep the writer for add(), update() and delete().
+    """
+
+    # The default number of reader threads.
+    READERS = 4
+
+    def __init__(
+        self,
+        path: str,
+        readers: int = READERS,
+        profile: ConnectionProfile = None,
+    ) -> None:
+        """
+        Open the writer connection and set up the reader threads.
+
+        The reader threads are started as jobs are submitted.
+
+        Parameters:
+            path (str): the database file; it must be a file, not
+                ':memory:', so all connections share it.
+            readers (int): the number of reader threads, at least 1.
+            profile (ConnectionProfile): the settings applied to every
+                connection, default is the default ConnectionProfile.
+        """
+        self.__path = path
+        self.__profile = profile if profile is not None else ConnectionProfile()
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__number_readers = 0
+        self.__closed = False
+
+        self.__writer = Dbal()
+        self.__writer.sql_connect(path)
+        self.__profile.apply(self.__writer)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max(1, readers), thread_name_prefix="money_tracker_reader"
+        )
+        # end __init__()
+
+    def writer(self) -> Dbal:
+        """
+        Get the connection used for all changes to the database.
+
+        It may only be used by the thread that built the pool.
+
+        Returns:
+            (Dbal) the writer connection.
+        """
+        return self.__writer
+        # end writer()
+
+    def reader(self) -> Dbal:
+        """
+        Get the read-only connection of the calling thread.
+
+        The connection is opened on the first call from each thread.
+
+        Returns:
+            (Dbal) the reader connection of the thread.
+
+        Raises:
+            RuntimeError: if the pool has been closed.
+        """
+        dbref = getattr(self.__local, "dbref", None)
+        if dbref is None:
+            if self.__closed:
+                raise RuntimeError("The connection pool is closed")
+            dbref = Dbal()
+            dbref.sql_connect(self.__path)
+            self.__profile.apply(dbref)
+            dbref.sql_query("PRAGMA query_only = ON")
+            self.__local.dbref = dbref
+            with self.__lock:
+                self.__number_readers += 1
+        return dbref
+        # end reader()
+
+    def submit(self, function: Callable, *args: Any, **kwargs: Any) -> Future:
+        """
+        Run a read-only job on one of the reader threads.
+
+        Parameters:
+            function (Callable): the job, called as function(dbref,
+                *args, **kwargs) with the reader connection of its
+                thread.
+            args, kwargs: the other arguments of the job.
+
+        Returns:
+            (Future) the result of the job.
+
+        Raises:
+            RuntimeError: if the pool has been closed.
+        """
+        return self.__executor.submit(self.__run, function, args, kwargs)
+        # end submit()
+
+    def get_number_readers(self) -> int:
+        """
+        Get the number of reader connections opened so far.
+
+        Returns:
+            (int) the number of reader connections.
+        """
+        with self.__lock:
+            return self.__number_readers
+        # end get_number_readers()
+
+    def close(self) -> None:
+        """
+        Finish the submitted jobs and close all connections.
+
+        The reader connection of the calling thread is closed here.
+        Those of the pool threads are only held by the threads, and are
+        closed as the threads end.
+        """
+        if self.__closed:
+            return
+        self.__executor.shutdown(wait=True)
+        self.__closed = True
+        dbref = getattr(self.__local, "dbref", None)
+        if dbref is not None:
+            dbref.sql_close()
+            self.__local.dbref = None
+        self.__writer.sql_close()
+        # end close()
+
+    def __run(self, function: Callable, args: tuple, kwargs: dict) -> Any:
+        """
+        Run a job with the reader connection of the current thread.
+
+        Parameters:
+            function (Callable): the job.
+            args (tuple): the positional arguments of the job.
+            kwargs (dict): the keyword arguments of the job.
+
+        Returns:
+            (Any) the result of the job.
+        """
+        return function(self.reader(), *args, **kwargs)
+        # end __run()
+
+
+# end class ConnectionPool
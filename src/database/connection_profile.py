@@ -0,0 +1,199 @@
+"""
+Set up a database connection for shared use by the program.
+
+File:       connection_profile.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from configparser import ConfigParser
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+class ConnectionProfile:
+    """
+    The SQLite settings applied to each connection when it is opened.
+
+    The GUI and the background jobs use the same database file at the
+    same time, so the default profile turns on WAL journaling, where
+    readers do not block the writer, with 'synchronous=NORMAL', which
+    is safe under WAL and needs far fewer disk syncs. A larger page
+    cache, memory mapped reads and in memory temporary tables speed up
+    the reads, and a busy timeout makes a connection wait for a lock
+    instead of failing at once.
+
+    A deployment can change any of the settings in the [database]
+    section of a configuration file read with from_file().
+
+    The sqlite3 module already keeps the compiled statements of each
+    connection, found by their SQL text. The account queries are all
+    built with named parameters, so each kind of query always has the
+    same text and is compiled only once. Dbal does not give access to
+    the size of that cache, so it is not one of these settings.
+    """
+
+    # The allowed values of each setting: a tuple of the keywords
+    # accepted, or int for a number. The settings are applied in this
+    # order; the busy timeout comes first so changing the journal mode
+    # waits for other connections.
+    PRAGMAS: Mapping[str, Any] = MappingProxyType(
+        {
+            "busy_timeout": int,
+            "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+            "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+            "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+            "cache_size": int,
+            "mmap_size": int,
+        }
+    )
+
+    # The default settings. A negative cache_size is in KiB, so the
+    # page cache is 64 MiB; the memory map is 256 MiB; the busy timeout
+    # is in milliseconds.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "busy_timeout": 5000,
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "temp_store": "MEMORY",
+            "cache_size": -65536,
+            "mmap_size": 268435456,
+        }
+    )
+
+    # The configuration file section holding the settings.
+    SECTION = "database"
+
+    def __init__(self, settings: Mapping[str, Any] = None) -> None:
+        """
+        Define a profile.
+
+        Parameters:
+            settings (Mapping): the settings to change from the
+                DEFAULTS; keys must be names in PRAGMAS. Values may be
+                given as strings, as read from a configuration file.
+
+        Raises:
+            ValueError: if a setting is unknown or its value is not
+                allowed.
+        """
+        self.__settings = dict(self.DEFAULTS)
+        if settings:
+            for name, value in settings.items():
+                self.__settings[name] = self.__check_setting(name, value)
+        # end __init__()
+
+    @classmethod
+    def from_file(cls, path: str, section: str = SECTION) -> "ConnectionProfile":
+        """
+        Build a profile from a configuration file.
+
+        A missing file or section gives the default profile.
+
+        Parameters:
+            path (str): the configuration file to read.
+            section (str): the section holding the settings, default is
+                [database].
+
+        Returns:
+            (ConnectionProfile) the profile of the file.
+
+        Raises:
+            ValueError: if a setting is unknown or its value is not
+                allowed.
+        """
+        config = ConfigParser()
+        config.read(path)
+        if not config.has_section(section):
+            return cls()
+        return cls(dict(config.items(section)))
+        # end from_file()
+
+    def get_settings(self) -> dict[str, Any]:
+        """
+        Get the settings of this profile.
+
+        Returns:
+            (dict) the value of each setting, in the order applied.
+        """
+        return dict(self.__settings)
+        # end get_settings()
+
+    def get_statements(self) -> list[str]:
+        """
+        Get the PRAGMA statements that apply this profile.
+
+        Returns:
+            (list) the statements, in the order to run them.
+        """
+        return [
+            "PRAGMA " + name + " = " + str(value)
+            for name, value in self.__settings.items()
+        ]
+        # end get_statements()
+
+    def apply(self, dbref: Any) -> dict[str, Any]:
+        """
+        Apply this profile to an open database connection.
+
+        SQLite ignores settings it can not use for a connection, such
+        as WAL for a database in memory, so the values in effect are
+        read back and returned.
+
+        Parameters:
+            dbref (Dbal): reference to the open database.
+
+        Returns:
+            (dict) the value in effect of each setting.
+        """
+        for statement in self.get_statements():
+            dbref.sql_query(statement)
+        in_effect = {}
+        for name in self.__settings:
+            row = dbref.sql_fetchrow(dbref.sql_query("PRAGMA " + name))
+            in_effect[name] = next(iter(row.values())) if row else None
+        return in_effect
+        # end apply()
+
+    def __check_setting(self, name: str, value: Any) -> Any:
+        """
+        Check a setting and convert it to its stored form.
+
+        Parameters:
+            name (str): the name of the setting.
+            value (Any): the value of the setting.
+
+        Returns:
+            (Any) an int, or an upper case keyword.
+
+        Raises:
+            ValueError: if the setting is unknown or its value is not
+                allowed.
+        """
+        allowed = self.PRAGMAS.get(name)
+        if allowed is None:
+            raise ValueError("Unknown database setting: " + str(name))
+        if allowed is int:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    "Database setting " + name + " must be a number: " + str(value)
+                ) from None
+        keyword = str(value).strip().upper()
+        if keyword not in allowed:
+            raise ValueError(
+                "Database setting "
+                + name
+                + " must be one of "
+                + ", ".join(allowed)
+                + ": "
+                + str(value)
+            )
+        return keyword
+        # end __check_setting()
+
+
+# end class ConnectionProfile
@@ -0,0 +1,327 @@
+"""
+Store and read the daily closing prices of the securities.
+
+File:       price_history.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import json
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Iterable, Union
+
+
+class PriceHistory:
+    """
+    The daily closing prices of the securities in a database.
+
+    The prices are kept in the 'prices' table created by schema version
+    6, a WITHOUT ROWID table keyed on (security_id, month). Each row is
+    a block holding the prices of one security for one 'YYYY-MM' month
+    as two packed arrays: the days, as the number of days since
+    1970-01-01, and the closes, as integers in 1/PRICE_SCALE of a
+    dollar. A price takes about 14 bytes of the file, and a history is
+    read as one row a month and unpacked with array.frombytes() rather
+    than built from a row for each day. A history is returned as the
+    two arrays.
+    """
+
+    # Closes are stored as integers in 1/PRICE_SCALE of a dollar.
+    PRICE_SCALE = 10000
+
+    # Day 0 of the stored day numbers.
+    EPOCH = date(1970, 1, 1).toordinal()
+
+    # The array typecodes of the days and the closes of a block, stored
+    # little-endian.
+    DAY_TYPE = "i"
+    CLOSE_TYPE = "q"
+
+    def __init__(self, dbref: Any) -> None:
+        """
+        Define the price history of a database.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+        """
+        self.__dbref = dbref
+        # end __init__()
+
+    @classmethod
+    def to_day(cls, value: Union[str, date]) -> int:
+        """
+        Get the day number of a date.
+
+        Parameters:
+            value (Mixed): a date or an ISO 'YYYY-MM-DD' string.
+
+        Returns:
+            (int) the number of days since 1970-01-01.
+        """
+        if not isinstance(value, date):
+            value = date.fromisoformat(value)
+        return value.toordinal() - cls.EPOCH
+        # end to_day()
+
+    @classmethod
+    def to_date(cls, day: int) -> date:
+        """
+        Get the date of a day number.
+
+        Parameters:
+            day (int): the number of days since 1970-01-01.
+
+        Returns:
+            (date) the date.
+        """
+        return date.fromordinal(day + cls.EPOCH)
+        # end to_date()
+
+    def get_dbref(self) -> Any:
+        """
+        Get the database reference of the price history.
+
+        Returns:
+            (Dbal) the database holding the prices.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def add_prices(
+        self, security_id: int, prices: Iterable[tuple[Union[str, date], float]]
+    ) -> int:
+        """
+        Store closing prices of a security.
+
+        A price for a day already held replaces it. The blocks of the
+        months changed are rewritten in a single statement, so the
+        prices are stored in one transaction.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            prices (Iterable): the (date, close) pairs, the date as a
+                date or ISO string and the close in dollars.
+
+        Returns:
+            (int) the number of days with a price stored.
+        """
+        months: dict[str, dict[int, int]] = {}
+        for day, close in prices:
+            if not isinstance(day, date):
+                day = date.fromisoformat(day)
+            months.setdefault(day.isoformat()[:7], {})[self.to_day(day)] = round(
+                close * self.PRICE_SCALE
+            )
+        if not months:
+            return 0
+        count = sum(len(closes) for closes in months.values())
+
+        dbref = self.__dbref
+        result = dbref.sql_query(
+            'SELECT "month", "days", "closes" FROM "prices" '
+            + 'WHERE "security_id" = :security_id '
+            + 'AND "month" IN (SELECT value FROM json_each(:months))',
+            {"security_id": security_id, "months": json.dumps(list(months))},
+        )
+        for row in dbref.sql_fetchrowset(result):
+            merged = dict(
+                zip(
+                    self.__unpack(self.DAY_TYPE, row["days"]),
+                    self.__unpack(self.CLOSE_TYPE, row["closes"]),
+                )
+            )
+            merged.update(months[row["month"]])
+            months[row["month"]] = merged
+
+        rows = []
+        values = {"security_id": security_id}
+        for number, (month, closes) in enumerate(months.items()):
+            days = sorted(closes)
+            values["month_" + str(number)] = month
+            values["days_" + str(number)] = self.__pack(array(self.DAY_TYPE, days))
+            values["closes_" + str(number)] = self.__pack(
+                array(self.CLOSE_TYPE, [closes[day] for day in days])
+            )
+            rows.append(
+                "(:security_id, :month_{0}, :days_{0}, :closes_{0})".format(number)
+            )
+        dbref.sql_query(
+            'INSERT INTO "prices" ("security_id", "month", "days", "closes") '
+            + "VALUES "
+            + ", ".join(rows)
+            + ' ON CONFLICT ("security_id", "month") DO UPDATE SET '
+            + '"days" = excluded.days, "closes" = excluded.closes',
+            values,
+        )
+        return count
+        # end add_prices()
+
+    def get_prices(
+        self,
+        security_id: int,
+        start: Union[str, date] = None,
+        end: Union[str, date] = None,
+    ) -> tuple[array, array]:
+        """
+        Get the closing prices of a security over a date range.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            start (Mixed): the first date, a date or ISO string; default
+                is the first price held.
+            end (Mixed): the last date, a date or ISO string; default is
+                the last price held.
+
+        Returns:
+            (tuple) the array of day numbers, in order, and the array of
+                the closes in 1/PRICE_SCALE of a dollar on those days.
+        """
+        sql = (
+            'SELECT "days", "closes" FROM "prices" '
+            + 'WHERE "security_id" = :security_id'
+        )
+        values = {"security_id": security_id}
+        if start is not None:
+            start = self.to_day(start)
+            sql += ' AND "month" >= :start'
+            values["start"] = self.to_date(start).isoformat()[:7]
+        if end is not None:
+            end = self.to_day(end)
+            sql += ' AND "month" <= :end'
+            values["end"] = self.to_date(end).isoformat()[:7]
+        sql += ' ORDER BY "month"'
+
+        # the blocks are joined and unpacked at once
+        dbref = self.__dbref
+        blocks = dbref.sql_fetchrowset(dbref.sql_query(sql, values))
+        days = self.__unpack(self.DAY_TYPE, b"".join(row["days"] for row in blocks))
+        closes = self.__unpack(
+            self.CLOSE_TYPE, b"".join(row["closes"] for row in blocks)
+        )
+        first = 0 if start is None else bisect_right(days, start - 1)
+        last = len(days) if end is None else bisect_right(days, end)
+        if first or last < len(days):
+            days = days[first:last]
+            closes = closes[first:last]
+        return days, closes
+        # end get_prices()
+
+    def get_price(self, security_id: int, as_of: Union[str, date] = None) -> int:
+        """
+        Get the latest closing price of a security on or before a date.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            as_of (Mixed): the date, a date or ISO string; default is
+                the last price held.
+
+        Returns:
+            (int) the close in 1/PRICE_SCALE of a dollar, or None if no
+                price is held on or before the date.
+        """
+        sql = (
+            'SELECT "days", "closes" FROM "prices" '
+            + 'WHERE "security_id" = :security_id'
+        )
+        values = {"security_id": security_id}
+        day = None
+        if as_of is not None:
+            day = self.to_day(as_of)
+            sql += ' AND "month" <= :month'
+            values["month"] = self.to_date(day).isoformat()[:7]
+        # the date may fall before the first price of its month
+        sql += ' ORDER BY "month" DESC LIMIT 2'
+        result = self.__dbref.sql_query(sql, values)
+        for row in self.__dbref.sql_fetchrowset(result):
+            days = self.__unpack(self.DAY_TYPE, row["days"])
+            position = len(days) if day is None else bisect_right(days, day)
+            if position:
+                return self.__unpack(self.CLOSE_TYPE, row["closes"])[position - 1]
+        return None
+        # end get_price()
+
+    def get_range(self, security_id: int) -> tuple[date, date]:
+        """
+        Get the dates of the first and last prices held for a security.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+
+        Returns:
+            (tuple) the first and last dates, or None if no prices are
+                held.
+        """
+        dbref = self.__dbref
+        ends = []
+        for order in ("", " DESC"):
+            row = dbref.sql_fetchrow(
+                dbref.sql_query(
+                    'SELECT "days" FROM "prices" '
+                    + 'WHERE "security_id" = :security_id '
+                    + 'ORDER BY "month"'
+                    + order
+                    + " LIMIT 1",
+                    {"security_id": security_id},
+                )
+            )
+            if not row:
+                return None
+            ends.append(self.__unpack(self.DAY_TYPE, row["days"]))
+        return self.to_date(ends[0][0]), self.to_date(ends[1][-1])
+        # end get_range()
+
+    def delete_prices(self, security_id: int) -> None:
+        """
+        Remove all prices held for a security.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+        """
+        self.__dbref.sql_query(
+            'DELETE FROM "prices" WHERE "security_id" = :security_id',
+            {"security_id": security_id},
+        )
+        # end delete_prices()
+
+    @staticmethod
+    def __pack(values: array) -> bytes:
+        """
+        Get the little-endian bytes of an array.
+
+        Parameters:
+            values (array): the array to store.
+
+        Returns:
+            (bytes) the packed values.
+        """
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+        # end __pack()
+
+    @staticmethod
+    def __unpack(typecode: str, blob: bytes) -> array:
+        """
+        Get the array stored in little-endian bytes.
+
+        Parameters:
+            typecode (str): the array typecode of the values.
+            blob (bytes): the packed values.
+
+        Returns:
+            (array) the values.
+        """
+        values = array(typecode)
+        values.frombytes(blob)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+        # end __unpack()
+
+
+# end class PriceHistory
@@ -0,0 +1,63 @@
+"""
+Stream the rows of a query a chunk at a time, by column name.
+
+File:       row_stream.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from typing import Any, Iterator
+
+
+class RowStream:
+    """
+    The rows of a query result, read a chunk at a time.
+
+    Dbal.sql_fetchrowset() reads every row of a result before the first
+    is used. A large query, such as a lazy AccountSet, a transaction
+    register or the trades of the tax lots, is streamed instead: the
+    result Dbal.sql_query() returns is a DB-API cursor, and its rows
+    are pulled with fetchmany() 'chunk_size' at a time as they are
+    consumed. Each row is given as a dict keyed by the column names of
+    the query, from the cursor's description, as Dbal.sql_fetchrow()
+    gives it, so the callers never depend on the order of the columns.
+
+    A RowStream is iterated once; the rows are not kept.
+    """
+
+    CHUNK_SIZE = 500
+
+    def __init__(self, result: Any, chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Define the stream of a query result.
+
+        Parameters:
+            result (Cursor): the result of Dbal.sql_query().
+            chunk_size (int): the number of rows pulled from the cursor
+                at a time, at least 1.
+        """
+        self.__result = result
+        self.__chunk_size = max(1, chunk_size)
+        # end __init__()
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """
+        Read the rows as they are consumed.
+
+        Yields:
+            (dict) the next row, keyed by column name.
+        """
+        result = self.__result
+        if result.description is None:
+            return
+        columns = [description[0] for description in result.description]
+        rows = result.fetchmany(self.__chunk_size)
+        while rows:
+            for row in rows:
+                yield dict(zip(columns, row))
+            rows = result.fetchmany(self.__chunk_size)
+        # end __iter__()
+
+
+# end class RowStream
@@ -0,0 +1,415 @@
+"""
+Create and upgrade the MoneyTracker database schema.
+
+File:       schema.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from types import MappingProxyType
+from typing import Any, Mapping
+
+# The trigger statements adding a new transaction to the balances of its
+# account and month.
+_ADD_TO_BALANCES = (
+    'INSERT INTO "account_balances" ("account_id", "balance", "transactions") '
+    + "VALUES (NEW.account_id, NEW.amount, 1) "
+    + 'ON CONFLICT ("account_id") DO UPDATE SET '
+    + '"balance" = "balance" + excluded.balance, '
+    + '"transactions" = "transactions" + 1; '
+    + 'INSERT INTO "monthly_balances" '
+    + '("account_id", "month", "amount", "transactions") '
+    + "VALUES (NEW.account_id, substr(NEW.date, 1, 7), NEW.amount, 1) "
+    + 'ON CONFLICT ("account_id", "month") DO UPDATE SET '
+    + '"amount" = "amount" + excluded.amount, '
+    + '"transactions" = "transactions" + 1; '
+)
+
+# The trigger statements taking an old transaction out of the balances
+# of its account and month; a balance with no transactions left is
+# removed.
+_REMOVE_FROM_BALANCES = (
+    'UPDATE "account_balances" SET "balance" = "balance" - OLD.amount, '
+    + '"transactions" = "transactions" - 1 '
+    + 'WHERE "account_id" = OLD.account_id; '
+    + 'DELETE FROM "account_balances" '
+    + 'WHERE "account_id" = OLD.account_id AND "transactions" = 0; '
+    + 'UPDATE "monthly_balances" SET "amount" = "amount" - OLD.amount, '
+    + '"transactions" = "transactions" - 1 '
+    + 'WHERE "account_id" = OLD.account_id '
+    + 'AND "month" = substr(OLD.date, 1, 7); '
+    + 'DELETE FROM "monthly_balances" WHERE "account_id" = OLD.account_id '
+    + 'AND "month" = substr(OLD.date, 1, 7) AND "transactions" = 0; '
+)
+
+# The trigger statement raising the version of the month of the NEW or
+# OLD transaction.
+_RAISE_MONTH_VERSION = (
+    'INSERT INTO "ledger_months" ("month", "version") '
+    + "VALUES (substr({row}.date, 1, 7), 1) "
+    + 'ON CONFLICT ("month") DO UPDATE SET "version" = "version" + 1; '
+)
+
+# The trigger statement raising the version of the month of the
+# transaction of the NEW or OLD trade.
+_RAISE_TRADE_MONTH_VERSION = (
+    'INSERT INTO "ledger_months" ("month", "version") '
+    + 'SELECT substr("date", 1, 7), 1 FROM "transactions" '
+    + 'WHERE "record_id" = {row}.transaction_id '
+    + 'ON CONFLICT ("month") DO UPDATE SET "version" = "version" + 1; '
+)
+
+# The trigger statement raising the version of the month of the NEW or
+# OLD block of prices.
+_RAISE_PRICE_MONTH_VERSION = (
+    'INSERT INTO "price_months" ("month", "version") '
+    + "VALUES ({row}.month, 1) "
+    + 'ON CONFLICT ("month") DO UPDATE SET "version" = "version" + 1; '
+)
+
+
+class Schema:
+    """
+    The versioned schema of a MoneyTracker database.
+
+    The schema version of a database file is kept in SQLite's
+    'user_version' header field. Each migration brings the schema from
+    the previous version to its own; upgrade() runs those a database
+    has not had yet, in order. Every statement can be run again
+    safely, so a migration that was interrupted is completed by the
+    next upgrade().
+    """
+
+    # The migrations, in order, as (version, statements) pairs.
+    MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+        (
+            1,
+            (
+                'CREATE TABLE IF NOT EXISTS "accounts" ('
+                + '"record_id" INTEGER NOT NULL, '
+                + '"account_type" INTEGER, '
+                + '"account_subtype" INTEGER, '
+                + '"name" TEXT NOT NULL, '
+                + '"description" TEXT, '
+                + '"company" TEXT, '
+                + '"account_number" TEXT, '
+                + '"account_separate" BOOLEAN, '
+                + '"hide_in_transaction_list" BOOLEAN, '
+                + '"hide_in_account_lists" BOOLEAN, '
+                + '"check_writing_avail" BOOLEAN, '
+                + '"tax_deferred" BOOLEAN, '
+                + '"remarks" TEXT, '
+                + 'PRIMARY KEY("record_id" AUTOINCREMENT))',
+            ),
+        ),
+        (
+            2,
+            (
+                # Accounts are looked up by name, and names must be
+                # unique for that to find one account.
+                'CREATE UNIQUE INDEX IF NOT EXISTS "accounts_name" '
+                + 'ON "accounts" ("name")',
+                # The account sets select one type, and often one
+                # subtype, ordered by name then record_id. The record_id
+                # is part of every index entry, so these indexes return
+                # the rows already in order without a sort.
+                'CREATE INDEX IF NOT EXISTS "accounts_type_name" '
+                + 'ON "accounts" ("account_type", "name")',
+                'CREATE INDEX IF NOT EXISTS "accounts_type_subtype_name" '
+                + 'ON "accounts" ("account_type", "account_subtype", "name")',
+            ),
+        ),
+        (
+            3,
+            (
+                # Amounts are in cents; dates are ISO 'YYYY-MM-DD'.
+                'CREATE TABLE IF NOT EXISTS "transactions" ('
+                + '"record_id" INTEGER NOT NULL, '
+                + '"account_id" INTEGER NOT NULL '
+                + 'REFERENCES "accounts" ("record_id"), '
+                + '"date" TEXT NOT NULL, '
+                + '"transaction_type" INTEGER, '
+                + '"amount" INTEGER NOT NULL, '
+                + '"description" TEXT, '
+                + '"remarks" TEXT, '
+                + 'PRIMARY KEY("record_id" AUTOINCREMENT))',
+                # An account register is read in date, then record_id,
+                # order. With the amount in the index the opening
+                # balance of any date is summed from the index alone.
+                'CREATE INDEX IF NOT EXISTS "transactions_account_date" '
+                + 'ON "transactions" ("account_id", "date", "record_id", "amount")',
+            ),
+        ),
+        (
+            4,
+            (
+                # The balance of each account and the net amount of each
+                # month of it, kept up to date by the triggers below so
+                # the account lists never sum the ledger.
+                'CREATE TABLE IF NOT EXISTS "account_balances" ('
+                + '"account_id" INTEGER NOT NULL, '
+                + '"balance" INTEGER NOT NULL, '
+                + '"transactions" INTEGER NOT NULL, '
+                + 'PRIMARY KEY("account_id"))',
+                'CREATE TABLE IF NOT EXISTS "monthly_balances" ('
+                + '"account_id" INTEGER NOT NULL, '
+                + '"month" TEXT NOT NULL, '
+                + '"amount" INTEGER NOT NULL, '
+                + '"transactions" INTEGER NOT NULL, '
+                + 'PRIMARY KEY("account_id", "month")) WITHOUT ROWID',
+                'CREATE TRIGGER IF NOT EXISTS "transactions_insert_balances" '
+                + 'AFTER INSERT ON "transactions" BEGIN '
+                + _ADD_TO_BALANCES
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "transactions_delete_balances" '
+                + 'AFTER DELETE ON "transactions" BEGIN '
+                + _REMOVE_FROM_BALANCES
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "transactions_update_balances" '
+                + 'AFTER UPDATE OF "account_id", "date", "amount" '
+                + 'ON "transactions" BEGIN '
+                + _REMOVE_FROM_BALANCES
+                + _ADD_TO_BALANCES
+                + "END",
+                # Load the balances of the transactions already entered.
+                'INSERT OR REPLACE INTO "account_balances" '
+                + '("account_id", "balance", "transactions") '
+                + 'SELECT "account_id", SUM("amount"), COUNT(*) '
+                + 'FROM "transactions" GROUP BY "account_id"',
+                'INSERT OR REPLACE INTO "monthly_balances" '
+                + '("account_id", "month", "amount", "transactions") '
+                + 'SELECT "account_id", substr("date", 1, 7), SUM("amount"), '
+                + 'COUNT(*) FROM "transactions" '
+                + 'GROUP BY "account_id", substr("date", 1, 7)',
+            ),
+        ),
+        (
+            5,
+            (
+                # A version of each month of the ledger, raised by every
+                # change to a transaction of the month, so results
+                # computed from a month can be kept until it changes.
+                'CREATE TABLE IF NOT EXISTS "ledger_months" ('
+                + '"month" TEXT NOT NULL, '
+                + '"version" INTEGER NOT NULL, '
+                + 'PRIMARY KEY("month")) WITHOUT ROWID',
+                'CREATE TRIGGER IF NOT EXISTS "transactions_insert_months" '
+                + 'AFTER INSERT ON "transactions" BEGIN '
+                + _RAISE_MONTH_VERSION.format(row="NEW")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "transactions_delete_months" '
+                + 'AFTER DELETE ON "transactions" BEGIN '
+                + _RAISE_MONTH_VERSION.format(row="OLD")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "transactions_update_months" '
+                + 'AFTER UPDATE ON "transactions" BEGIN '
+                + _RAISE_MONTH_VERSION.format(row="OLD")
+                + _RAISE_MONTH_VERSION.format(row="NEW")
+                + "END",
+                'INSERT OR IGNORE INTO "ledger_months" ("month", "version") '
+                + 'SELECT DISTINCT substr("date", 1, 7), 1 FROM "transactions"',
+            ),
+        ),
+        (
+            6,
+            (
+                'CREATE TABLE IF NOT EXISTS "securities" ('
+                + '"record_id" INTEGER NOT NULL, '
+                + '"symbol" TEXT NOT NULL, '
+                + '"name" TEXT, '
+                + '"remarks" TEXT, '
+                + 'PRIMARY KEY("record_id" AUTOINCREMENT))',
+                'CREATE UNIQUE INDEX IF NOT EXISTS "securities_symbol" '
+                + 'ON "securities" ("symbol")',
+                # The daily closing prices, a block for each month of
+                # each security. A block holds the day numbers and the
+                # closes of the month as two packed arrays, so the
+                # history of a security is read as a few hundred rows
+                # instead of a row for each day. A month of prices fits
+                # in its b-tree page without an overflow page.
+                'CREATE TABLE IF NOT EXISTS "prices" ('
+                + '"security_id" INTEGER NOT NULL, '
+                + '"month" TEXT NOT NULL, '
+                + '"days" BLOB NOT NULL, '
+                + '"closes" BLOB NOT NULL, '
+                + 'PRIMARY KEY("security_id", "month")) WITHOUT ROWID',
+                'CREATE TRIGGER IF NOT EXISTS "securities_delete_prices" '
+                + 'AFTER DELETE ON "securities" BEGIN '
+                + 'DELETE FROM "prices" WHERE "security_id" = OLD.record_id; '
+                + "END",
+            ),
+        ),
+        (
+            7,
+            (
+                # The latest quote of each symbol, in 1/10000ths of a
+                # dollar, and the Unix time it was fetched.
+                'CREATE TABLE IF NOT EXISTS "quotes" ('
+                + '"symbol" TEXT NOT NULL, '
+                + '"price" INTEGER NOT NULL, '
+                + '"fetched" REAL NOT NULL, '
+                + 'PRIMARY KEY("symbol")) WITHOUT ROWID',
+            ),
+        ),
+        (
+            8,
+            (
+                # The security and shares of a BUY or SELL transaction.
+                # Shares are in 1/10000ths of a share, positive into the
+                # account and negative out of it; the cash is the
+                # amount of the transaction.
+                'CREATE TABLE IF NOT EXISTS "trades" ('
+                + '"record_id" INTEGER NOT NULL, '
+                + '"transaction_id" INTEGER NOT NULL '
+                + 'REFERENCES "transactions" ("record_id"), '
+                + '"security_id" INTEGER NOT NULL '
+                + 'REFERENCES "securities" ("record_id"), '
+                + '"shares" INTEGER NOT NULL, '
+                + '"remarks" TEXT, '
+                + 'PRIMARY KEY("record_id" AUTOINCREMENT))',
+                'CREATE UNIQUE INDEX IF NOT EXISTS "trades_transaction" '
+                + 'ON "trades" ("transaction_id")',
+                'CREATE INDEX IF NOT EXISTS "trades_security" '
+                + 'ON "trades" ("security_id", "transaction_id", "shares")',
+                'CREATE TRIGGER IF NOT EXISTS "transactions_delete_trades" '
+                + 'AFTER DELETE ON "transactions" BEGIN '
+                + 'DELETE FROM "trades" WHERE "transaction_id" = OLD.record_id; '
+                + "END",
+                # A change to a trade changes the month of its
+                # transaction.
+                'CREATE TRIGGER IF NOT EXISTS "trades_insert_months" '
+                + 'AFTER INSERT ON "trades" BEGIN '
+                + _RAISE_TRADE_MONTH_VERSION.format(row="NEW")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "trades_delete_months" '
+                + 'AFTER DELETE ON "trades" BEGIN '
+                + _RAISE_TRADE_MONTH_VERSION.format(row="OLD")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "trades_update_months" '
+                + 'AFTER UPDATE ON "trades" BEGIN '
+                + _RAISE_TRADE_MONTH_VERSION.format(row="OLD")
+                + _RAISE_TRADE_MONTH_VERSION.format(row="NEW")
+                + "END",
+            ),
+        ),
+        (
+            9,
+            (
+                # A version of each month of the prices, raised by every
+                # change to a block of prices of the month, as the
+                # 'ledger_months' versions are by the ledger.
+                'CREATE TABLE IF NOT EXISTS "price_months" ('
+                + '"month" TEXT NOT NULL, '
+                + '"version" INTEGER NOT NULL, '
+                + 'PRIMARY KEY("month")) WITHOUT ROWID',
+                'CREATE TRIGGER IF NOT EXISTS "prices_insert_months" '
+                + 'AFTER INSERT ON "prices" BEGIN '
+                + _RAISE_PRICE_MONTH_VERSION.format(row="NEW")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "prices_delete_months" '
+                + 'AFTER DELETE ON "prices" BEGIN '
+                + _RAISE_PRICE_MONTH_VERSION.format(row="OLD")
+                + "END",
+                'CREATE TRIGGER IF NOT EXISTS "prices_update_months" '
+                + 'AFTER UPDATE ON "prices" BEGIN '
+                + _RAISE_PRICE_MONTH_VERSION.format(row="OLD")
+                + _RAISE_PRICE_MONTH_VERSION.format(row="NEW")
+                + "END",
+                'INSERT OR IGNORE INTO "price_months" ("month", "version") '
+                + 'SELECT DISTINCT "month", 1 FROM "prices"',
+            ),
+        ),
+    )
+
+    # The schema version created by the current program.
+    VERSION = MIGRATIONS[-1][0]
+
+    # The checks of the existing data a migration needs, by version, as
+    # (query, message) pairs. The migration is not run while the query
+    # returns rows; the message is raised with the "name" of each.
+    CHECKS: Mapping[int, tuple[str, str]] = MappingProxyType(
+        {
+            2: (
+                'SELECT "name" FROM "accounts" GROUP BY "name" '
+                + 'HAVING COUNT(*) > 1 ORDER BY "name"',
+                "Account names must be unique before the upgrade; "
+                + "rename the accounts named ",
+            ),
+        }
+    )
+
+    @staticmethod
+    def get_version(dbref: Any) -> int:
+        """
+        Get the schema version of a database.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+
+        Returns:
+            (int) the schema version, 0 for a new database.
+        """
+        result = dbref.sql_query("PRAGMA user_version")
+        return dbref.sql_fetchrow(result)["user_version"]
+        # end get_version()
+
+    @classmethod
+    def upgrade(cls, dbref: Any, version: int = None) -> int:
+        """
+        Bring a database up to a schema version.
+
+        A database at a later version than requested is left as it is;
+        migrations are not undone.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            version (int): the schema version wanted, default is the
+                current VERSION.
+
+        Returns:
+            (int) the schema version of the database afterwards.
+
+        Raises:
+            ValueError: if the data of the database does not allow a
+                migration, such as accounts sharing a name. The database
+                is left at the version before that migration.
+        """
+        if version is None:
+            version = cls.VERSION
+        current = cls.get_version(dbref)
+        for migration, statements in cls.MIGRATIONS:
+            if current < migration <= version:
+                cls.__check(dbref, migration)
+                for statement in statements:
+                    dbref.sql_query(statement)
+                # the version is a literal, PRAGMA takes no parameters
+                dbref.sql_query("PRAGMA user_version = " + str(int(migration)))
+                current = migration
+        return current
+        # end upgrade()
+
+    @classmethod
+    def __check(cls, dbref: Any, migration: int) -> None:
+        """
+        Check that the data of a database allows a migration.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            migration (int): the version of the migration.
+
+        Raises:
+            ValueError: if the check of the migration returns rows.
+        """
+        if migration not in cls.CHECKS:
+            return
+        query, message = cls.CHECKS[migration]
+        rows = dbref.sql_fetchrowset(dbref.sql_query(query))
+        if rows:
+            raise ValueError(
+                message + ", ".join("'" + str(row["name"]) + "'" for row in rows)
+            )
+        # end __check()
+
+
+# end class Schema
@@ -3,12 +3,24 @@ Define the members of the db_elements package for the MoneyTracker Program
 
 The database elements included in the package are
     Account - The basic account
+    AccountCache - The most recently used account rows of each
+        database, by record_id and name.
+    AccountRecord - A compact, read-only record of one account row.
+    AccountSet - The common base of the sets of accounts, selecting
+        from the 'accounts' table in SQL.
     BankAccount - A Bank account such as a checking, savings, or CD
         account.
     BankAccountSet - A set of bank accounts
     InvestmentAccount - An investment account representing a brokerage
         or single mutual fund type of account.
     InvestmentAccountSet -  A set of investment accounts
+    ElementQuery - Builds the parameterized SELECT statements used by
+        the element sets.
+    Security - A stock, bond or fund held in the investment accounts.
+    Trade - The security and shares of a BUY or SELL transaction.
+    Transaction - One amount into or out of an account on a date.
+    TransactionSet - The register of one account, with the running
+        balance after each transaction.
 
  File:       elements.__init__.py
  Author:     Lorn B Kerr
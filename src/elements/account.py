@@ -7,10 +7,14 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from copy import deepcopy
-from typing import Any
+import json
+from types import MappingProxyType
+from typing import Any, Mapping
 
-from lbk_library import Element
+from lbk_library import Dbal, Element
+
+from database.connection_pool import ConnectionPool
+from elements.account_cache import AccountCache
 
 
 class Account(Element):
@@ -22,6 +26,43 @@ class Account(Element):
     Bank and Investment accounts.
     """
 
+    # Default values for the Account. The values are all immutable, so
+    # the one read-only mapping is shared by every Account of the class.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "name": "",
+            "description": "",
+            "company": "",
+            "account_number": "",
+            "check_writing_avail": False,
+            "account_separate": False,
+            "hide_in_transaction_list": False,
+            "hide_in_account_lists": False,
+            "remarks": "",
+        }
+    )
+
+    # The setter for each property, by property name. The setters are
+    # applied in this order by set_properties(). Subclasses extend the
+    # table with the setters of their own properties.
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            "name": "set_name",
+            "description": "set_description",
+            "company": "set_company",
+            "account_number": "set_account_number",
+            "check_writing_avail": "set_check_writing_avail",
+            "account_separate": "set_account_separate",
+            "hide_in_transaction_list": "set_hide_in_transaction_list",
+            "hide_in_account_lists": "set_hide_in_account_lists",
+        }
+    )
+
+    # Set True to run rows read from the database through the full
+    # validation of the constructor in from_row(); a debugging aid.
+    VALIDATE_ROWS = False
+
     def __init__(self, dbref, account_key=None, column=None):
         """
         Define a basic Account.
@@ -45,8 +86,13 @@ class Account(Element):
         account will be constructed from the database for the specific
         value given by 'column' and 'account_key'
 
+        If 'dbref' is a ConnectionPool, the account is read through the
+        reader connection of the calling thread and saved through the
+        writer connection of the pool.
+
         Parameters:
-            dbref (Dbal): reference to the database holding the element
+            dbref (Dbal): reference to the database holding the element,
+                or a ConnectionPool for it.
             account_key (Mixed): - the specific key of the Account being
                 constructed or a dict object of the values for an Account
                 for direct insertion into the properties array. If a
@@ -56,30 +102,18 @@ class Account(Element):
             column(string): Either 'account_key' or 'name', default is
                 None. Column name and account_key must be consistent,
         """
+        reader = dbref
+        if isinstance(dbref, ConnectionPool):
+            reader = dbref.reader()
+            dbref = dbref.writer()
         super().__init__(dbref, "accounts")
+        self.__reader = reader
+        self.__loaded = False
 
-        # Default values for the Account
-        self.defaults: dict[str, Any] = {
-            "record_id": 0,
-            "name": "",
-            "description": "",
-            "company": "",
-            "account_number": "",
-            "check_writing_avail": False,
-            "account_separate": False,
-            "hide_in_transaction_list": False,
-            "hide_in_account_lists": False,
-            "remarks": "",
-        }
-        self.set_initial_values(deepcopy(self.defaults))
+        self.defaults: Mapping[str, Any] = self.DEFAULTS
+        self.set_initial_values(dict(self.defaults))
         self.clear_value_valid_flags()
 
-        if isinstance(account_key, dict):
-            # make sure there are no missing keys
-            for key in self.defaults:
-                if key not in account_key:
-                    account_key[key] = deepcopy(self.defaults[key])
-
         if column is None:
             column = "record_id"
 
@@ -87,17 +121,240 @@ class Account(Element):
             account_key = None
             column = None
 
-        if isinstance(account_key, (int, str)):
+        if isinstance(account_key, dict):
+            # make sure there are no missing keys
+            properties = dict(self.defaults)
+            properties.update(account_key)
+            account_key = properties
+        elif isinstance(account_key, (int, str)):
             account_key = self.get_properties_from_db(column, account_key)
+            # the initial values are those of the row in the table
+            self.__loaded = bool(account_key)
 
         if not account_key:
-            account_key = deepcopy(self.defaults)
+            account_key = dict(self.defaults)
 
         self.set_properties(account_key)
-        self.set_initial_values(self.get_properties())
+        self.set_initial_values(dict(self.get_properties()))
         self.clear_value_changed_flags()
         # end __init__()
 
+    @classmethod
+    def from_row(
+        cls, dbref: Dbal, row: dict[str, Any], validate: bool = None
+    ) -> "Account":
+        """
+        Construct an Account from a row of the 'accounts' table.
+
+        Rows read from the database were validated when they were
+        written, so the values are taken as they are: only missing or
+        NULL columns are replaced by their defaults and boolean columns
+        are converted from the integers SQLite returns. Columns that
+        are not properties of this kind of Account are ignored.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            row (dict): the column values of one row of the 'accounts'
+                table.
+            validate (bool): True to build the Account through the full
+                validation of the constructor, default is the class
+                setting VALIDATE_ROWS.
+
+        Returns:
+            (Account) the Account holding the row values.
+        """
+        if validate is None:
+            validate = cls.VALIDATE_ROWS
+        if validate:
+            account = cls(dbref, dict(row))
+            account.__loaded = True
+            return account
+
+        account = cls.__new__(cls)
+        Element.__init__(account, dbref, "accounts")
+        account.__reader = dbref
+        account.__loaded = True
+        account.defaults = cls.DEFAULTS
+
+        properties = {}
+        for key, default in cls.DEFAULTS.items():
+            value = row.get(key)
+            if value is None:
+                value = default
+            elif isinstance(default, bool):
+                value = bool(value)
+            properties[key] = value
+
+        account.set_initial_values(dict(properties))
+        account.clear_value_valid_flags()
+        for key, value in properties.items():
+            account._set_property(key, value)
+            account.update_property_flags(key, value, True)
+        account.clear_value_changed_flags()
+        return account
+        # end from_row()
+
+    @classmethod
+    def save_many(cls, dbref: Any, accounts: list) -> int:
+        """
+        Insert or update a batch of Accounts in one statement.
+
+        Every account is validated first through the setters of the
+        class; if any is not valid nothing is written. An account with
+        a record_id updates that row. One without a record_id updates
+        the row with the same name, if there is one, and is inserted
+        otherwise. When the batch holds the same account more than
+        once, the last one is kept. No two accounts may end up with the
+        same name.
+
+        The batch is sent to SQLite as one JSON parameter of a single
+        INSERT ... ON CONFLICT statement, so the whole batch is written
+        in one transaction with one commit.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the
+                accounts, or a ConnectionPool for it, when the batch is
+                written through the writer connection of the pool.
+            accounts (list): the dicts of account values, or Accounts,
+                to save. Dicts may be sparse; missing values take the
+                defaults of the class.
+
+        Returns:
+            (int) the number of accounts written.
+
+        Raises:
+            ValueError: if any account in the batch is not valid, the
+                message giving the position and the invalid properties
+                of each one, or if a name would belong to two accounts.
+        """
+        if isinstance(dbref, ConnectionPool):
+            dbref = dbref.writer()
+        columns = [key for key in cls.DEFAULTS if key != "record_id"]
+        scratch = cls(dbref)
+        rows_by_id: dict[int, dict[str, Any]] = {}
+        rows_by_name: dict[str, dict[str, Any]] = {}
+        problems = []
+
+        for position, account in enumerate(accounts):
+            if isinstance(account, Account):
+                account = account.get_properties()
+            properties = dict(cls.DEFAULTS)
+            properties.update(account)
+            errors = scratch.set_properties(properties)
+            if errors:
+                problems.append(str(position) + ": " + str(errors))
+                continue
+            row = {key: scratch._get_property(key) for key in columns}
+            if properties["record_id"]:
+                row["record_id"] = properties["record_id"]
+                rows_by_id[row["record_id"]] = row
+            else:
+                row["record_id"] = None
+                rows_by_name[row["name"]] = row
+
+        if problems:
+            raise ValueError("Invalid accounts: " + "; ".join(problems))
+
+        # accounts given by name update the existing row of that name
+        owners = cls.__read_owners(
+            dbref, [row["name"] for row in rows_by_id.values()] + list(rows_by_name)
+        )
+        for name in [name for name in rows_by_name if name in owners]:
+            row = rows_by_name.pop(name)
+            row["record_id"] = owners[name]
+            rows_by_id.setdefault(owners[name], row)
+        rows = list(rows_by_id.values()) + list(rows_by_name.values())
+        if not rows:
+            return 0
+        cls.__check_names(rows, owners)
+
+        sql = (
+            "INSERT INTO accounts (record_id, "
+            + ", ".join(columns)
+            + ") SELECT "
+            + ", ".join(
+                "json_extract(value, '$." + column + "')"
+                for column in ["record_id"] + columns
+            )
+            + " FROM json_each(:rows) WHERE 1"
+            + " ON CONFLICT(record_id) DO UPDATE SET "
+            + ", ".join(column + " = excluded." + column for column in columns)
+        )
+        dbref.sql_query(sql, {"rows": json.dumps(rows)})
+        AccountCache.for_dbref(dbref).clear()
+        return len(rows)
+        # end save_many()
+
+    @classmethod
+    def __read_owners(cls, dbref: Dbal, names: list[str]) -> dict[str, int]:
+        """
+        Get the accounts in the table that have any of some names.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the accounts
+            names (list): the account names.
+
+        Returns:
+            (dict) the record_id of the account with each name that is
+                in the table.
+        """
+        if not names:
+            return {}
+        result = dbref.sql_query(
+            "SELECT record_id, name FROM accounts"
+            + " WHERE name IN (SELECT value FROM json_each(:names))",
+            {"names": json.dumps(names)},
+        )
+        return {row["name"]: row["record_id"] for row in dbref.sql_fetchrowset(result)}
+        # end __read_owners()
+
+    @classmethod
+    def __check_names(cls, rows: list[dict], owners: dict[str, int]) -> None:
+        """
+        Check that no name of a batch would belong to two accounts.
+
+        A name may not be given to two accounts of the batch, or to an
+        account when another one in the table has it.
+
+        Parameters:
+            rows (list): the rows of the batch, with their record_id,
+                None for a new account.
+            owners (dict): the record_id of the account in the table
+                with each name of the batch.
+
+        Raises:
+            ValueError: naming the names that would be duplicated.
+        """
+        owners = dict(owners)
+        duplicates = set()
+        for row in rows:
+            if owners.setdefault(row["name"], row["record_id"]) != row["record_id"]:
+                duplicates.add(row["name"])
+        if duplicates:
+            raise ValueError(
+                "Duplicate account names: "
+                + ", ".join("'" + name + "'" for name in sorted(duplicates))
+            )
+        # end __check_names()
+
+    @classmethod
+    def _get_setters(cls) -> dict[str, Any]:
+        """
+        Get the setter functions of the class FIELDS table.
+
+        The setter names are looked up once per class, so a subclass
+        overriding a setter gets its own version.
+
+        Returns:
+            (dict) the setter function for each property name.
+        """
+        setters = cls.__dict__.get("_setters")
+        if setters is None:
+            setters = {key: getattr(cls, name) for key, name in cls.FIELDS.items()}
+            cls._setters = setters
+        return setters
+        # end _get_setters()
+
     def set_properties(self, properties):
         """Set the values of the Account properties array.
 
@@ -105,33 +362,164 @@ class Account(Element):
         range, with unacceptable values set to None. Properties not part
         of the element are discarded.
 
+        The properties are dispatched in one pass through the FIELDS
+        table of the class, so the subclasses do not need to extend
+        this method.
+
         Parameters:
             properties (dict): holding the element values. Keys must
                 match the required keys of the element being modified,
                 properties may be sparse.
+
+        Returns:
+            (dict) the error message of each property in the FIELDS
+                table that was not valid; empty if all were valid.
         """
+        errors = {}
         if properties is not None and isinstance(properties, dict):
             super().set_properties(properties)
 
-            for key in properties.keys():
-                if key == "name":
-                    self.set_name(properties[key])
-                elif key == "description":
-                    self.set_description(properties[key])
-                elif key == "company":
-                    self.set_company(properties[key])
-                elif key == "account_number":
-                    self.set_account_number(properties[key])
-                elif key == "check_writing_avail":
-                    self.set_check_writing_avail(properties[key])
-                elif key == "account_separate":
-                    self.set_account_separate(properties[key])
-                elif key == "hide_in_transaction_list":
-                    self.set_hide_in_transaction_list(properties[key])
-                elif key == "hide_in_account_lists":
-                    self.set_hide_in_account_lists(properties[key])
+            for key, setter in self._get_setters().items():
+                if key in properties:
+                    result = setter(self, properties[key])
+                    if not result["valid"]:
+                        errors[key] = result["msg"]
+        return errors
         # end set_properties()
 
+    def get_changed_properties(self) -> dict[str, Any]:
+        """
+        Get the properties changed since the Account was read or saved.
+
+        The current values are compared with the initial values set
+        when the Account was constructed, added or updated. The
+        record_id is never included. For an Account built from a dict,
+        these are the changes since it was built, not the differences
+        from its row in the table.
+
+        Returns:
+            (dict) the new value of each changed property; empty if
+                nothing has changed.
+        """
+        initial_values = self.get_initial_values()
+        return {
+            key: value
+            for key, value in self.get_properties().items()
+            if key != "record_id"
+            and key in self.defaults
+            and initial_values.get(key) != value
+        }
+        # end get_changed_properties()
+
+    def add(self) -> int:
+        """
+        Add this Account to the database.
+
+        The saved values become the initial values, so a following
+        update() writes only what is changed after this.
+
+        Returns:
+            (int) the record_id of the new Account, 0 if it was not
+                added.
+        """
+        record_id = super().add()
+        if record_id:
+            AccountCache.for_dbref(self.get_dbref()).discard(record_id)
+            self.__loaded = True
+            self.set_initial_values(dict(self.get_properties()))
+            self.clear_value_changed_flags()
+        return record_id
+        # end add()
+
+    def update(self) -> bool:
+        """
+        Save the changed properties of this Account to the database.
+
+        When the Account was read from the database or last saved, only
+        the columns changed since then are written, and when nothing
+        has changed the database is not touched at all. An Account
+        built from a dict may differ from its row in any column, so
+        every column is written.
+
+        Returns:
+            (bool) True if the Account was saved or nothing needed to
+                be saved, False if the update failed.
+        """
+        if self.__loaded:
+            changed = self.get_changed_properties()
+            if not changed:
+                return True
+        else:
+            changed = {
+                key: value
+                for key, value in self.get_properties().items()
+                if key != "record_id" and key in self.defaults
+            }
+
+        sql = (
+            "UPDATE accounts SET "
+            + ", ".join(key + " = :" + key for key in changed)
+            + " WHERE record_id = :record_id"
+        )
+        values = dict(changed)
+        values["record_id"] = self.get_record_id()
+        AccountCache.for_dbref(self.get_dbref()).discard(values["record_id"])
+        result = self.get_dbref().sql_query(sql, values)
+        if result is None or result.rowcount < 1:
+            return False
+
+        self.__loaded = True
+        self.set_initial_values(dict(self.get_properties()))
+        self.clear_value_changed_flags()
+        return True
+        # end update()
+
+    def delete(self) -> bool:
+        """
+        Delete this Account from the database.
+
+        Returns:
+            (bool) True if the Account was deleted, False if not.
+        """
+        AccountCache.for_dbref(self.get_dbref()).discard(self.get_record_id())
+        return super().delete()
+        # end delete()
+
+    def get_properties_from_db(self, column: str, value: Any) -> dict[str, Any]:
+        """
+        Get the values of one account from the database.
+
+        The row is taken from the AccountCache of the database when it
+        was read before, and is cached after it is read otherwise. An
+        Account built with a ConnectionPool reads the row through its
+        reader connection.
+
+        Parameters:
+            column (str): either 'record_id' or 'name'.
+            value (Any): the record_id or name of the account.
+
+        Returns:
+            (dict) the column values of the account row, empty if there
+                is no such account.
+        """
+        cache = AccountCache.for_dbref(self.get_dbref())
+        row = cache.get(column, value)
+        if row is None:
+            if self.__reader is self.get_dbref():
+                row = super().get_properties_from_db(column, value)
+            elif column in ("record_id", "name"):
+                result = self.__reader.sql_query(
+                    "SELECT * FROM accounts WHERE " + column + " = :value",
+                    {"value": value},
+                )
+                row = self.__reader.sql_fetchrow(result) or {}
+            else:
+                row = {}
+            if row:
+                cache.put(row)
+        return row
+        # end get_properties_from_db()
+
     def get_name(self):
         """Get the Account's name.
 
@@ -317,8 +705,10 @@ class Account(Element):
             self._set_property("check_writing_avail", result["entry"])
         else:
             self._set_property("check_writing_avail", False)
+        self.update_property_flags(
+            "check_writing_avail", result["entry"], result["valid"]
+        )
         return result
-        self.update_property_flags("account_separate", result["entry"], result["valid"])
         # end set_check_writing_avail()
 
     def get_account_separate(self) -> bool:
@@ -355,8 +745,8 @@ class Account(Element):
             self._set_property("account_separate", result["entry"])
         else:
             self._set_property("account_separate", False)
-        return result
         self.update_property_flags("account_separate", result["entry"], result["valid"])
+        return result
         # end set_account_separate()
 
     def get_hide_in_transaction_list(self) -> bool:
@@ -392,10 +782,10 @@ class Account(Element):
             self._set_property("hide_in_transaction_list", result["entry"])
         else:
             self._set_property("hide_in_transaction_list", False)
-        return result
         self.update_property_flags(
             "hide_in_transaction_list", result["entry"], result["valid"]
         )
+        return result
         # end set_hide_in_transaction_list()
 
     def get_hide_in_account_lists(self) -> bool:
@@ -429,10 +819,10 @@ class Account(Element):
             self._set_property("hide_in_account_lists", result["entry"])
         else:
             self._set_property("hide_in_account_lists", False)
-        return result
         self.update_property_flags(
             "hide_in_account_lists", result["entry"], result["valid"]
         )
+        return result
         # end set_hide_in_account_lists()
 
 
@@ -0,0 +1,201 @@
+"""
+A cache of the 'accounts' rows already read from a database.
+
+File:       account_cache.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+from weakref import WeakKeyDictionary
+
+
+class AccountCache:
+    """
+    Hold the most recently used account rows of one database.
+
+    Each database connection (Dbal) has its own cache, found with
+    AccountCache.for_dbref(). A row is found by its record_id or by its
+    account name. When the cache is full the least recently used row is
+    dropped.
+
+    The cache holds the row values, not the Accounts built from them,
+    so every Account constructed from a cached row is a separate object
+    that can be edited without affecting the others. Accounts remove
+    their rows when they are added, updated or deleted; changes made to
+    the table by other means need a call to clear(). The cache may be
+    used by several threads at once.
+    """
+
+    # The default number of rows held for each database.
+    SIZE = 256
+
+    # The cache of each open database.
+    __caches: "WeakKeyDictionary[Any, AccountCache]" = WeakKeyDictionary()
+    __caches_lock = threading.Lock()
+
+    def __init__(self, size: int = SIZE) -> None:
+        """
+        Define an empty cache.
+
+        Parameters:
+            size (int): the most rows to hold, at least 1.
+        """
+        self.__size = max(1, size)
+        self.__rows: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self.__names: dict[str, int] = {}
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+        # end __init__()
+
+    @classmethod
+    def for_dbref(cls, dbref: Any) -> "AccountCache":
+        """
+        Get the cache of a database, creating it on first use.
+
+        The cache is dropped with the Dbal it belongs to.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the accounts
+
+        Returns:
+            (AccountCache) the cache of the database.
+        """
+        with cls.__caches_lock:
+            cache = cls.__caches.get(dbref)
+            if cache is None:
+                cache = cls()
+                cls.__caches[dbref] = cache
+        return cache
+        # end for_dbref()
+
+    def get(self, column: str, value: Any) -> dict[str, Any]:
+        """
+        Get a cached row by record_id or name.
+
+        Parameters:
+            column (str): either 'record_id' or 'name'.
+            value (Any): the record_id or name of the account.
+
+        Returns:
+            (dict) a copy of the row values, or None if the row is not
+                cached.
+        """
+        with self.__lock:
+            record_id = value
+            if column == "name":
+                record_id = self.__names.get(value)
+            elif column != "record_id":
+                record_id = None
+
+            row = self.__rows.get(record_id)
+            if row is None:
+                self.__misses += 1
+                return None
+            self.__rows.move_to_end(record_id)
+            self.__hits += 1
+            return dict(row)
+        # end get()
+
+    def put(self, row: dict[str, Any]) -> None:
+        """
+        Cache a row read from the database.
+
+        Rows without a record_id are not cached.
+
+        Parameters:
+            row (dict): the column values of one row of the 'accounts'
+                table.
+        """
+        record_id = row.get("record_id")
+        if not record_id:
+            return
+        with self.__lock:
+            self.__discard(record_id)
+            self.__rows[record_id] = dict(row)
+            if row.get("name"):
+                self.__names[row["name"]] = record_id
+            while len(self.__rows) > self.__size:
+                self.__discard(next(iter(self.__rows)))
+        # end put()
+
+    def discard(self, record_id: int) -> None:
+        """
+        Remove a row from the cache, if it is there.
+
+        Parameters:
+            record_id (int): the record_id of the row to remove.
+        """
+        with self.__lock:
+            self.__discard(record_id)
+        # end discard()
+
+    def clear(self) -> None:
+        """
+        Remove all rows from the cache.
+
+        The hit and miss counters are kept.
+        """
+        with self.__lock:
+            self.__rows.clear()
+            self.__names.clear()
+        # end clear()
+
+    def get_size(self) -> int:
+        """
+        Get the most rows the cache holds.
+
+        Returns:
+            (int) the size of the cache.
+        """
+        return self.__size
+        # end get_size()
+
+    def get_number_rows(self) -> int:
+        """
+        Get the number of rows now in the cache.
+
+        Returns:
+            (int) the number of cached rows.
+        """
+        return len(self.__rows)
+        # end get_number_rows()
+
+    def get_hits(self) -> int:
+        """
+        Get the number of lookups answered from the cache.
+
+        Returns:
+            (int) the number of cache hits.
+        """
+        return self.__hits
+        # end get_hits()
+
+    def get_misses(self) -> int:
+        """
+        Get the number of lookups that had to go to the database.
+
+        Returns:
+            (int) the number of cache misses.
+        """
+        return self.__misses
+        # end get_misses()
+
+    def __discard(self, record_id: int) -> None:
+        """
+        Remove a row from the cache while the lock is held.
+
+        Parameters:
+            record_id (int): the record_id of the row to remove.
+        """
+        row = self.__rows.pop(record_id, None)
+        if row is not None and self.__names.get(row.get("name")) == record_id:
+            del self.__names[row["name"]]
+        # end __discard()
+
+
+# end class AccountCache
@@ -0,0 +1,77 @@
+"""
+A compact, read-only record of one row of the 'accounts' table.
+
+File:       account_record.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from collections import namedtuple
+
+from lbk_library import Dbal
+
+from constants.account_types import AccountType
+from elements.account import Account
+from elements.bank_account import BankAccount
+from elements.investment_account import InvestmentAccount
+
+# The columns of the 'accounts' table, in the order they are held in
+# an AccountRecord.
+RECORD_COLUMNS = (
+    "record_id",
+    "account_type",
+    "account_subtype",
+    "name",
+    "description",
+    "company",
+    "account_number",
+    "account_separate",
+    "hide_in_transaction_list",
+    "hide_in_account_lists",
+    "check_writing_avail",
+    "tax_deferred",
+    "remarks",
+)
+
+
+class AccountRecord(namedtuple("AccountRecord", RECORD_COLUMNS)):
+    """
+    Hold the values of one account row without an Element around them.
+
+    A record is a tuple of the column values, so a large set of them
+    takes a fraction of the memory of full Accounts with their
+    properties, initial-value and flag dicts. The values are exactly
+    as read from SQLite: boolean columns hold 0 or 1 and NULL columns
+    hold None. When an account is to be edited the record is converted
+    to a full BankAccount or InvestmentAccount with to_account().
+    """
+
+    __slots__ = ()
+
+    # The Account class built for each account type by to_account().
+    ACCOUNT_CLASSES = {
+        AccountType.BANK: BankAccount,
+        AccountType.INVESTMENT: InvestmentAccount,
+    }
+
+    def to_account(self, dbref: Dbal, element_type: type = None) -> Account:
+        """
+        Build the full Account for this record.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the account
+            element_type (type): the Account class to build, default is
+                chosen by the record's account type; a plain Account
+                for unknown types.
+
+        Returns:
+            (Account) the Account holding the record values.
+        """
+        if element_type is None:
+            element_type = self.ACCOUNT_CLASSES.get(self.account_type, Account)
+        return element_type.from_row(dbref, self._asdict())
+        # end to_account()
+
+
+# end class AccountRecord
@@ -0,0 +1,288 @@
+"""
+This is a set of Accounts of a single AccountType in the database.
+
+File:       account_set.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from typing import Any
+
+from lbk_library import Dbal, ElementSet
+
+from database.balance_snapshots import BalanceSnapshots
+from database.connection_pool import ConnectionPool
+from database.row_stream import RowStream
+from elements.account_record import RECORD_COLUMNS, AccountRecord
+from elements.element_query import ElementQuery
+
+
+class AccountSet(ElementSet):
+    """
+    Provides a set of Accounts of one type from the database table 'accounts'.
+
+    The selection, ordering and paging of the set are all done by
+    SQLite, so only the rows actually requested are read from the
+    database and built into Accounts. The rows are trusted and built
+    with the Account from_row() constructor.
+
+    A lazy set does not read any rows when it is constructed. Each
+    iteration over it runs the query and pulls the rows from the cursor
+    in chunks, building each Account only as it is consumed, so scanning
+    a large table keeps memory use flat. Random access through
+    get_property_set() materializes the whole set first.
+
+    A records set holds compact, read-only AccountRecords instead of
+    full Accounts. A record is converted to its full Account with
+    AccountRecord.to_account() when it is to be edited.
+
+    A set built with a ConnectionPool runs its query on the reader
+    connection of the thread reading the set, and its Accounts are
+    saved through the writer connection of the pool.
+    """
+
+    # The default number of rows pulled from the cursor at a time by a
+    # lazy set.
+    CHUNK_SIZE = 500
+
+    # The columns of the 'accounts' table that can be used to select or
+    # order a set.
+    COLUMNS = RECORD_COLUMNS
+
+    def __init__(
+        self,
+        dbref: Dbal,
+        element_type: type,
+        account_type: int,
+        where_column: str = None,
+        where_value: Any = None,
+        order_by_column: str = "name",
+        limit: int = None,  # No limit
+        offset: int = None,
+        filters: dict[str, Any] = None,
+        lazy: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+        records: bool = False,
+    ) -> None:
+        """
+        Builds a set of Accounts from the database table 'accounts'.
+
+        ElementSet can only select on a single column, so the query is
+        built here instead of in the ElementSet constructor. The
+        'account_type', the optional 'where_column' and any 'filters'
+        are combined into one WHERE clause so 'limit' and 'offset'
+        apply to the selected subset.
+
+        Parameters:
+            dbref (Dbal): the dababase instance to use, or a
+                ConnectionPool for it.
+            element_type (type): the Account class to build for each
+                selected row.
+            account_type (int): the AccountType of all accounts in the
+                set.
+            where_column (str): column of the 'accounts' table to select
+                the specific subset of accounts; default is no subset.
+                Unknown columns are ignored.
+            where_value (Any): Value of the specific subset requested;
+                None indicates no subset.
+            order_by_column (str): column of the 'accounts' table to set
+                the order of the set. Default order is by the account
+                name.
+            limit (int): number of rows to retrieve, defaults to all.
+            offset (int): row number to start retrieval, 0 based,
+                defaults to row 0.
+            filters (dict): further column and value pairs that must
+                all match, such as {"account_subtype": ...,
+                "tax_deferred": True}. A list, tuple or set value
+                matches any of its members. Unknown columns and None
+                values are ignored.
+            lazy (bool): True to stream the set on iteration instead of
+                reading it now, default is False.
+            chunk_size (int): number of rows pulled from the cursor at a
+                time by a lazy set.
+            records (bool): True to build AccountRecords instead of
+                Accounts, default is False.
+        """
+        self.__pool = None
+        if isinstance(dbref, ConnectionPool):
+            self.__pool = dbref
+            dbref = dbref.writer()
+        self.__dbref = dbref
+        self.__table = "accounts"
+        self.__element_type = element_type
+        self.__property_set = []
+        self.__lazy = lazy
+        self.__chunk_size = max(1, chunk_size)
+        self.__records = records
+
+        query = ElementQuery(self.__table, self.COLUMNS)
+        query.add_predicate("account_type", account_type)
+        if where_column != "account_type":
+            query.add_predicate(where_column, where_value)
+        if filters:
+            for column, value in filters.items():
+                if column != "account_type":
+                    query.add_predicate(column, value)
+        if not query.add_order_by(order_by_column):
+            query.add_order_by("name")
+        query.add_order_by("record_id")
+        query.set_limit(limit, offset)
+        if records:
+            query.set_select_columns(AccountRecord._fields)
+
+        self.__sql, self.__values = query.get_sql()
+        if not lazy:
+            self.__property_set = list(self.__stream())
+        # end __init__()
+
+    def is_records(self) -> bool:
+        """
+        Does this set hold AccountRecords instead of Accounts?
+
+        Returns:
+            (bool) True if the set holds AccountRecords, False if it
+                holds Accounts.
+        """
+        return self.__records
+        # end is_records()
+
+    def is_lazy(self) -> bool:
+        """
+        Is this set streamed from the database on each iteration?
+
+        Returns:
+            (bool) True if the set has not been materialized, False if
+                the Accounts are held in the set.
+        """
+        return self.__lazy
+        # end is_lazy()
+
+    def materialize(self) -> list:
+        """
+        Read the whole set into memory for random access.
+
+        A set that is not lazy, or has already been materialized, is
+        returned unchanged.
+
+        Returns:
+            (list) the Accounts in the set.
+        """
+        if self.__lazy:
+            self.__property_set = list(self.__stream())
+            self.__lazy = False
+        return self.__property_set
+        # end materialize()
+
+    def get_balances(self) -> dict[int, int]:
+        """
+        Get the current balance of each account in this set.
+
+        The balances are read from the balance snapshots, one row per
+        account, without summing any transactions. A lazy set streams
+        its accounts once to collect their record_ids.
+
+        Returns:
+            (dict) the balance in cents of each account by record_id.
+        """
+        if self.__records:
+            account_ids = [record.record_id for record in self]
+        else:
+            account_ids = [account.get_record_id() for account in self]
+        reader = self.__dbref if self.__pool is None else self.__pool.reader()
+        return BalanceSnapshots.get_balances(reader, account_ids)
+        # end get_balances()
+
+    def __stream(self):
+        """
+        Run the query and build the Accounts as they are consumed.
+
+        Yields:
+            (Account) the next Account, or AccountRecord, of the set.
+        """
+        dbref = self.__dbref
+        reader = dbref if self.__pool is None else self.__pool.reader()
+        element_type = self.__element_type
+        rows = RowStream(reader.sql_query(self.__sql, self.__values), self.__chunk_size)
+        if self.__records:
+            for row in rows:
+                yield AccountRecord(**row)
+        else:
+            for row in rows:
+                yield element_type.from_row(dbref, row)
+        # end __stream()
+
+    def get_dbref(self) -> Dbal:
+        """
+        Get the database reference for this set.
+
+        Returns:
+            (Dbal) the database holding the set.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def get_table(self) -> str:
+        """
+        Get the database table for this set.
+
+        Returns:
+            (str) the name of the table holding the set.
+        """
+        return self.__table
+        # end get_table()
+
+    def get_property_set(self) -> list:
+        """
+        Get the list of Accounts in this set.
+
+        A lazy set is materialized first.
+
+        Returns:
+            (list) the Accounts in the set.
+        """
+        if self.__lazy:
+            self.materialize()
+        return self.__property_set
+        # end get_property_set()
+
+    def set_property_set(self, property_set: list) -> None:
+        """
+        Replace the list of Accounts in this set.
+
+        Parameters:
+            property_set (list): the new list of Accounts.
+        """
+        self.__property_set = property_set
+        self.__lazy = False
+        # end set_property_set()
+
+    def get_number_elements(self) -> int:
+        """
+        Get the number of Accounts in this set.
+
+        A lazy set is materialized first.
+
+        Returns:
+            (int) the number of Accounts in the set.
+        """
+        return len(self.get_property_set())
+        # end get_number_elements()
+
+    def __iter__(self):
+        """
+        Iterate over the Accounts in this set.
+
+        A lazy set runs its query again for each iteration and streams
+        the Accounts from the database.
+
+        Returns:
+            (iterator) over the Accounts in the set.
+        """
+        if self.__lazy:
+            return self.__stream()
+        return iter(self.__property_set)
+        # end __iter__()
+
+
+# end Class AccountSet
@@ -7,12 +7,12 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from copy import deepcopy
-from typing import Any, Union
+from types import MappingProxyType
+from typing import Any, Mapping, Union
 
 from lbk_library import Dbal
 
-from constants.account_types import AccountType, BankAccountType
+from constants.account_types import BANK_ACCOUNT_TYPES, AccountType, BankAccountType
 from elements.account import Account
 
 
@@ -24,6 +24,33 @@ class BankAccount(Account):
     specific to Bank accounts such as checking, savings and CD accounts.
     """
 
+    # Default values for the Account, shared by every instance.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "name": "",
+            "description": "",
+            "company": "",
+            "account_number": "",
+            "account_separate": False,
+            "hide_in_transaction_list": False,
+            "hide_in_account_lists": False,
+            "check_writing_avail": False,
+            "account_type": AccountType.BANK,
+            "account_subtype": BankAccountType.NO_TYPE,
+            "remarks": "",
+        }
+    )
+
+    # The setters of the Account properties plus the Bank Account ones.
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            **Account.FIELDS,
+            "account_type": "_set_account_type",
+            "account_subtype": "set_account_subtype",
+        }
+    )
+
     def __init__(
         self, dbref: Dbal, account_key: Union[int, str] = None, column: str = None
     ) -> None:
@@ -54,7 +81,8 @@ class BankAccount(Account):
         value given by 'column' and 'account_key'
 
         Parameters:
-            dbref (Dbal): reference to the database holding the element
+            dbref (Dbal): reference to the database holding the element,
+                or a ConnectionPool for it.
             account_key (Mixed): - the specific key of the Account being
                 constructed or a dict object of the values for an Account
                 for direct insertion into the properties array. If a
@@ -64,75 +92,9 @@ class BankAccount(Account):
             column(string): Either 'account_key' or 'name', default is
                 None. Column name and account_key must be consistent,
         """
-        super().__init__(dbref)
-
-        # Default values for the Account
-        self.defaults: dict[str, Any] = {
-            "record_id": 0,
-            "name": "",
-            "description": "",
-            "company": "",
-            "account_number": "",
-            "account_separate": False,
-            "hide_in_transaction_list": False,
-            "hide_in_account_lists": False,
-            "check_writing_avail": False,
-            "account_type": AccountType.BANK,
-            "account_subtype": BankAccountType.NO_TYPE,
-            "remarks": "",
-        }
-        self.set_initial_values(deepcopy(self.defaults))
-        self.clear_value_valid_flags()
-
-        # get available account_subtypes for a bank acoount.
-
-        if isinstance(account_key, dict):
-            # make sure there are no missing keys
-            for key in self.defaults:
-                if key not in account_key:
-                    account_key[key] = deepcopy(self.defaults[key])
-
-        if column is None:
-            column = "record_id"
-
-        if column not in ("record_id", "name"):
-            account_key = None
-            column = None
-
-        if isinstance(account_key, (int, str)):
-            account_key = self.get_properties_from_db(column, account_key)
-
-        if not account_key:
-            account_key = deepcopy(self.defaults)
-
-        self.set_properties(account_key)
-        self.set_initial_values(self.get_properties())
-        self.clear_value_changed_flags()
+        super().__init__(dbref, account_key, column)
         # end __init__()
 
-    def set_properties(self, properties: dict[str, Any]) -> None:
-        """
-        Set the values of the Account properties array.
-
-        Each property is validated for type and value within an acceptable
-        range, with unacceptable values set to None. Properties not part
-        of the element are discarded.
-
-        Parameters:
-            properties (dict): holding the element values. Keys must
-                match the required keys of the element being modified,
-                properties may be sparse.
-        """
-        if properties is not None and isinstance(properties, dict):
-            super().set_properties(properties)
-
-            for key in properties.keys():
-                if key == "account_type":
-                    self.__set_account_type(properties[key])
-                elif key == "account_subtype":
-                    self.set_account_subtype(properties[key])
-        # end set_properties()
-
     def get_account_type(self) -> int:
         """
         Get the Account type.
@@ -146,7 +108,7 @@ class BankAccount(Account):
         return AccountType.BANK
         # end get_account_type()
 
-    def __set_account_type(
+    def _set_account_type(
         self, account_type: AccountType = AccountType.BANK
     ) -> dict[str, Any]:
         """
@@ -194,7 +156,9 @@ class BankAccount(Account):
             (str) One of the constant BankAccountType members
         """
         account_subtype = self._get_property("account_subtype")
-        if account_subtype not in BankAccountType.list() or account_subtype is None:
+        if not isinstance(account_subtype, int) or (
+            account_subtype not in BANK_ACCOUNT_TYPES
+        ):
             account_subtype = BankAccountType.NO_TYPE
         return account_subtype
         # end get_account_subtype()
@@ -225,8 +189,8 @@ class BankAccount(Account):
         """
         result = {}
         if (
-            account_subtype is not None
-            and account_subtype in BankAccountType.list()
+            isinstance(account_subtype, int)
+            and account_subtype in BANK_ACCOUNT_TYPES
             and account_subtype != BankAccountType.NO_TYPE
         ):
             result["entry"] = account_subtype
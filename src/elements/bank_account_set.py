@@ -7,13 +7,16 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from lbk_library import Dbal, ElementSet
+from typing import Any
 
-from constants.account_types import AccountType, BankAccountType
+from lbk_library import Dbal
+
+from constants.account_types import BANK_ACCOUNT_TYPES, AccountType, BankAccountType
+from elements.account_set import AccountSet
 from elements.bank_account import BankAccount
 
 
-class BankAccountSet(ElementSet):
+class BankAccountSet(AccountSet):
     """
     Provides a set of BankAccounts from the database table 'accounts'.
     """
@@ -26,52 +29,66 @@ class BankAccountSet(ElementSet):
         order_by_column: str = "name",
         limit: int = None,  # No limit
         offset: int = None,
+        filters: dict[str, Any] = None,
+        lazy: bool = False,
+        chunk_size: int = AccountSet.CHUNK_SIZE,
+        records: bool = False,
     ) -> None:
         """
         Builds a set of BankAccounts from the database table 'accounts'.
 
         Parameters:
-            dbref (Dbal): the dababase instance to use.
-            where_column (int): column of the 'accounts' table to select
+            dbref (Dbal): the dababase instance to use, or a
+                ConnectionPool for it.
+            where_column (str): column of the 'accounts' table to select
                 the specific subset of bank accounts; default is no
                 subset.
             where_value (int): Value of the specific subset requested;
-                limited to the set of values in BankAccountTypes;
-                default is BankAccountTypoes.NONE indicating no subset.
+                for 'account_subtype' limited to the set of values in
+                BankAccountTypes; default is BankAccountTypoes.NO_TYPE
+                indicating no subset.
             order_by_column (str): column of the 'accounts' table to set
                 the order of the bank_account_set. Default order is by
                 the account name.
-            limit (int): number of rows to retrieve, defaults to all.
-            offset (int): row number to start retrieval, 0 based,
-                defaults to row 0.
+            limit (int): number of rows of the subset to retrieve,
+                defaults to all.
+            offset (int): row number of the subset to start retrieval,
+                0 based, defaults to row 0.
+            filters (dict): further column and value pairs that must
+                all match, such as {"company": "NFCU"}; see AccountSet.
+            lazy (bool): True to stream the set on iteration instead of
+                reading it now, default is False; see AccountSet.
+            chunk_size (int): number of rows pulled from the cursor at a
+                time by a lazy set.
+            records (bool): True to hold compact, read-only
+                AccountRecords instead of full accounts, default is
+                False; see AccountSet.
         """
-        table_name = "accounts"  # The database table for this element
-        element_type = BankAccount
-        bank_account_column = "account_type"
-        account_type = AccountType.BANK
+        # A where_value of NO_TYPE selects no subset; a subtype subset
+        # must also be a defined BankAccountType.
+        if where_value == BankAccountType.NO_TYPE or (
+            where_column == "account_subtype"
+            and (
+                not isinstance(where_value, int)
+                or where_value not in BANK_ACCOUNT_TYPES
+            )
+        ):
+            where_column = None
 
         super().__init__(
             dbref,
-            table_name,
-            element_type,
-            bank_account_column,
-            account_type,
+            BankAccount,
+            AccountType.BANK,
+            where_column,
+            where_value,
             order_by_column,
             limit,
             offset,
+            filters,
+            lazy,
+            chunk_size,
+            records,
         )
-
-        # Build the subset from the total bank account set
-        subset = []
-        if (
-            where_column is not None
-            and where_value in BankAccountType.list()
-            and where_value != BankAccountType.NO_TYPE
-        ):
-            for account in self.get_property_set():
-                if account._get_property(where_column) == where_value:
-                    subset.append(account)
-            self.set_property_set(subset)
         # end __init__()
 
 
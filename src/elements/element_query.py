@@ -0,0 +1,221 @@
+"""
+Build parameterized SELECT statements for the database elements.
+
+File:       element_query.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from typing import Any
+
+
+class ElementQuery:
+    """
+    Build a SELECT statement for one element table.
+
+    Predicates on any number of columns are combined with AND so the
+    whole selection is done by SQLite. Column names are checked against
+    the known columns of the table before they are placed in the
+    statement; all values are passed as named parameters.
+    """
+
+    def __init__(self, table: str, columns: tuple[str, ...]) -> None:
+        """
+        Define an empty query on a table.
+
+        Parameters:
+            table (str): the database table to select from.
+            columns (tuple): the columns of the table that may be used
+                in predicates and ordering.
+        """
+        self.__table = table
+        self.__columns = columns
+        self.__select = "*"
+        self.__expressions: list[str] = []
+        self.__predicates: list[str] = []
+        self.__values: dict[str, Any] = {}
+        self.__order_by: list[str] = []
+        self.__limit = None
+        self.__offset = None
+        # end __init__()
+
+    def set_select_columns(self, columns: tuple[str, ...]) -> bool:
+        """
+        Limit the columns returned by the query.
+
+        Parameters:
+            columns (tuple): the columns to return, all must be known
+                columns of the table.
+
+        Returns:
+            (bool) True if the columns were accepted, False if not and
+                all columns will be returned.
+        """
+        if not columns or not all(column in self.__columns for column in columns):
+            self.__select = "*"
+            return False
+        self.__select = ", ".join(columns)
+        return True
+        # end set_select_columns()
+
+    def add_expression(self, name: str, expression: str) -> None:
+        """
+        Return a computed value with each row.
+
+        The expression is placed in the statement as it is, so it must
+        come from the program, never from user input; any values it
+        needs are passed with set_value().
+
+        Parameters:
+            name (str): the column name of the computed value.
+            expression (str): the SQL expression to compute.
+        """
+        self.__expressions.append(expression + " AS " + name)
+        # end add_expression()
+
+    def set_value(self, name: str, value: Any) -> None:
+        """
+        Set the value of a named parameter used in an expression.
+
+        Parameters:
+            name (str): the parameter name, without the ':'.
+            value (Any): the value of the parameter.
+        """
+        self.__values[name] = value
+        # end set_value()
+
+    def add_predicate(self, column: str, value: Any) -> bool:
+        """
+        Require a column to match a value.
+
+        A list, tuple, set or frozenset value matches any of its
+        members. A None value or an unknown column adds no predicate.
+
+        Parameters:
+            column (str): the column to test.
+            value (Any): the value, or collection of values, to match.
+
+        Returns:
+            (bool) True if the predicate was added, False if not.
+        """
+        if column not in self.__columns or value is None:
+            return False
+
+        if isinstance(value, (list, tuple, set, frozenset)):
+            if not value:
+                # nothing can match an empty collection
+                self.__predicates.append("0")
+                return True
+            names = []
+            for member in sorted(value):
+                name = self.__parameter_name(column)
+                self.__values[name] = member
+                names.append(":" + name)
+            self.__predicates.append(column + " IN (" + ", ".join(names) + ")")
+        else:
+            name = self.__parameter_name(column)
+            self.__values[name] = value
+            self.__predicates.append(column + " = :" + name)
+        return True
+        # end add_predicate()
+
+    def add_range(self, column: str, start: Any = None, end: Any = None) -> bool:
+        """
+        Require a column to lie within a range, ends included.
+
+        Either end may be None for an open range. An unknown column, or
+        a range open at both ends, adds no predicate.
+
+        Parameters:
+            column (str): the column to test.
+            start (Any): the lowest value to match, default is no limit.
+            end (Any): the highest value to match, default is no limit.
+
+        Returns:
+            (bool) True if the predicate was added, False if not.
+        """
+        if column not in self.__columns or (start is None and end is None):
+            return False
+
+        if start is not None:
+            name = self.__parameter_name(column)
+            self.__values[name] = start
+            self.__predicates.append(column + " >= :" + name)
+        if end is not None:
+            name = self.__parameter_name(column)
+            self.__values[name] = end
+            self.__predicates.append(column + " <= :" + name)
+        return True
+        # end add_range()
+
+    def add_order_by(self, column: str) -> bool:
+        """
+        Add a column to the ordering of the query.
+
+        Parameters:
+            column (str): the column to order by.
+
+        Returns:
+            (bool) True if the column was added, False if not.
+        """
+        if column not in self.__columns:
+            return False
+        self.__order_by.append(column)
+        return True
+        # end add_order_by()
+
+    def set_limit(self, limit: int = None, offset: int = None) -> None:
+        """
+        Set the number of rows to retrieve and the row to start at.
+
+        Parameters:
+            limit (int): number of rows to retrieve, None for all.
+            offset (int): row number to start retrieval, 0 based, None
+                for row 0.
+        """
+        self.__limit = limit
+        self.__offset = offset
+        # end set_limit()
+
+    def get_sql(self) -> tuple[str, dict[str, Any]]:
+        """
+        Get the SELECT statement and its parameter values.
+
+        Returns:
+            (tuple) the SQL statement and its named parameter values.
+        """
+        values = dict(self.__values)
+        sql = "SELECT " + ", ".join([self.__select] + self.__expressions)
+        sql += " FROM " + self.__table
+        if self.__predicates:
+            sql += " WHERE " + " AND ".join(self.__predicates)
+        if self.__order_by:
+            sql += " ORDER BY " + ", ".join(self.__order_by)
+        if self.__limit is not None or self.__offset is not None:
+            sql += " LIMIT :limit OFFSET :offset"
+            values["limit"] = -1 if self.__limit is None else self.__limit
+            values["offset"] = 0 if self.__offset is None else self.__offset
+        return sql, values
+        # end get_sql()
+
+    def __parameter_name(self, column: str) -> str:
+        """
+        Get an unused parameter name for a column.
+
+        Parameters:
+            column (str): the column the parameter is for.
+
+        Returns:
+            (str) the parameter name.
+        """
+        name = column
+        counter = 0
+        while name in self.__values:
+            counter += 1
+            name = column + "_" + str(counter)
+        return name
+        # end __parameter_name()
+
+
+# end class ElementQuery
@@ -7,12 +7,16 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from copy import deepcopy
-from typing import Any, Union
+from types import MappingProxyType
+from typing import Any, Mapping, Union
 
 from lbk_library import Dbal
 
-from constants.account_types import AccountType, InvestmentAccountType
+from constants.account_types import (
+    INVESTMENT_ACCOUNT_TYPES,
+    AccountType,
+    InvestmentAccountType,
+)
 from elements.account import Account
 
 
@@ -25,6 +29,36 @@ class InvestmentAccount(Account):
     accounts.
     """
 
+    # Default values for the Account, shared by every instance.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "name": "",
+            "description": "",
+            "company": "",
+            "account_number": "",
+            "account_separate": False,
+            "hide_in_transaction_list": False,
+            "hide_in_account_lists": False,
+            "check_writing_avail": False,
+            "tax_deferred": False,
+            "account_type": AccountType.INVESTMENT,
+            "account_subtype": InvestmentAccountType.NO_TYPE,
+            "remarks": "",
+        }
+    )
+
+    # The setters of the Account properties plus the Investment
+    # Account ones.
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            **Account.FIELDS,
+            "account_type": "_set_account_type",
+            "account_subtype": "set_account_subtype",
+            "tax_deferred": "set_tax_deferred",
+        }
+    )
+
     def __init__(
         self, dbref: Dbal, account_key: Union[int, str] = None, column: str = None
     ) -> None:
@@ -55,7 +89,8 @@ class InvestmentAccount(Account):
         value given by 'column' and 'account_key'
 
         Parameters:
-            dbref (Dbal): reference to the database holding the element
+            dbref (Dbal): reference to the database holding the element,
+                or a ConnectionPool for it.
             account_key (Mixed): - the specific key of the Account being
                 constructed or a dict object of the values for an Account
                 for direct insertion into the properties array. If a
@@ -65,76 +100,9 @@ class InvestmentAccount(Account):
             column(string): Either 'account_key' or 'name', default is
                 None. Column name and account_key must be consistent,
         """
-        super().__init__(dbref)
-
-        # Default values for the Account
-        self.defaults: dict[str, Any] = {
-            "record_id": 0,
-            "name": "",
-            "description": "",
-            "company": "",
-            "account_number": "",
-            "account_separate": False,
-            "hide_in_transaction_list": False,
-            "hide_in_account_lists": False,
-            "check_writing_avail": False,
-            "tax_deferred": False,
-            "account_type": AccountType.INVESTMENT,
-            "account_subtype": InvestmentAccountType.NO_TYPE,
-            "remarks": "",
-        }
-        self.set_initial_values(deepcopy(self.defaults))
-        self.clear_value_valid_flags()
-
-        if isinstance(account_key, dict):
-            # make sure there are no missing keys
-            for key in self.defaults:
-                if key not in account_key:
-                    account_key[key] = deepcopy(self.defaults[key])
-
-        if column is None:
-            column = "record_id"
-
-        if column not in ("record_id", "name"):
-            account_key = None
-            column = None
-
-        if isinstance(account_key, (int, str)):
-            account_key = self.get_properties_from_db(column, account_key)
-
-        if not account_key:
-            account_key = deepcopy(self.defaults)
-
-        self.set_properties(account_key)
-        self.set_initial_values(self.get_properties())
-        self.clear_value_changed_flags()
+        super().__init__(dbref, account_key, column)
         # end __init__()
 
-    def set_properties(self, properties: dict[str, Any]) -> None:
-        """
-        Set the values of the Account properties array.
-
-        Each property is validated for type and value within an acceptable
-        range, with unacceptable values set to None. Properties not part
-        of the element are discarded.
-
-        Parameters:
-            properties (dict): holding the element values. Keys must
-                match the required keys of the element being modified,
-                properties may be sparse.
-        """
-        if properties is not None and isinstance(properties, dict):
-            super().set_properties(properties)
-
-            for key in properties.keys():
-                if key == "account_type":
-                    self.__set_account_type(properties[key])
-                elif key == "account_subtype":
-                    self.set_account_subtype(properties[key])
-                elif key == "tax_deferred":
-                    self.set_tax_deferred(properties[key])
-        # end set_properties()
-
     def get_account_type(self) -> int:
         """
         Get the Account type.
@@ -148,7 +116,7 @@ class InvestmentAccount(Account):
         return AccountType.INVESTMENT
         # end get_account_type()
 
-    def __set_account_type(
+    def _set_account_type(
         self, account_type: AccountType = AccountType.INVESTMENT
     ) -> dict[str, Any]:
         """
@@ -196,9 +164,8 @@ class InvestmentAccount(Account):
             (str) One of the constant InvestmentAccountType members
         """
         account_subtype = self._get_property("account_subtype")
-        if (
-            account_subtype not in InvestmentAccountType.list()
-            or account_subtype is None
+        if not isinstance(account_subtype, int) or (
+            account_subtype not in INVESTMENT_ACCOUNT_TYPES
         ):
             account_subtype = InvestmentAccountType.NO_TYPE
         return account_subtype
@@ -233,8 +200,8 @@ class InvestmentAccount(Account):
         """
         result = {}
         if (
-            account_subtype is not None
-            and account_subtype in InvestmentAccountType.list()
+            isinstance(account_subtype, int)
+            and account_subtype in INVESTMENT_ACCOUNT_TYPES
             and account_subtype != InvestmentAccountType.NO_TYPE
         ):
             result["entry"] = account_subtype
@@ -283,8 +250,8 @@ class InvestmentAccount(Account):
             self._set_property("tax_deferred", result["entry"])
         else:
             self._set_property("tax_deferred", False)
-        return result
         self.update_property_flags("tax_deferred", result["entry"], result["valid"])
+        return result
         # end set_tax_deferred()
 
 
@@ -7,13 +7,20 @@ Copyright:  (c) 2022 Lorn B Kerr
 License:    MIT, see file License
 """
 
-from lbk_library import Dbal, ElementSet
+from typing import Any
 
-from constants.account_types import AccountType, InvestmentAccountType
+from lbk_library import Dbal
+
+from constants.account_types import (
+    INVESTMENT_ACCOUNT_TYPES,
+    AccountType,
+    InvestmentAccountType,
+)
+from elements.account_set import AccountSet
 from elements.investment_account import InvestmentAccount
 
 
-class InvestmentAccountSet(ElementSet):
+class InvestmentAccountSet(AccountSet):
     """
     Provides a set of Investment Accounts from the database table 'accounts'.
     """
@@ -26,55 +33,69 @@ class InvestmentAccountSet(ElementSet):
         order_by_column: str = "name",
         limit: int = None,  # No limit
         offset: int = None,
+        filters: dict[str, Any] = None,
+        lazy: bool = False,
+        chunk_size: int = AccountSet.CHUNK_SIZE,
+        records: bool = False,
     ) -> None:
         """
         Builds a set of InvestmentAccounts from the database table 'accounts'.
 
         Parameters:
-            dbref (Dbal): the dababase instance to use.
-            where_column (int): column of the 'accounts' table to select
+            dbref (Dbal): the dababase instance to use, or a
+                ConnectionPool for it.
+            where_column (str): column of the 'accounts' table to select
                 the specific subset of investment accounts; default is
                 no subset.
             where_value (int): Value of the specific subset requested;
-                limited to the set of values in InvestmentAccountTypes;
-                default is InvestmentAccountTypoes.NONE indicating no
-                subset.
+                for 'account_subtype' limited to the set of values in
+                InvestmentAccountTypes; default is
+                InvestmentAccountTypoes.NO_TYPE indicating no subset.
             order_by_column (str): column of the 'accounts' table to set
                 the order of the investment_account_set. Default order
                 is by the account name.
-            limit (int): number of rows to retrieve, defaults to all.
-            offset (int): row number to start retrieval, 0 based,
-                defaults to row 0.
+            limit (int): number of rows of the subset to retrieve,
+                defaults to all.
+            offset (int): row number of the subset to start retrieval,
+                0 based, defaults to row 0.
+            filters (dict): further column and value pairs that must
+                all match, such as {"account_subtype":
+                InvestmentAccountType.BROKERAGE, "tax_deferred": True};
+                see AccountSet.
+            lazy (bool): True to stream the set on iteration instead of
+                reading it now, default is False; see AccountSet.
+            chunk_size (int): number of rows pulled from the cursor at a
+                time by a lazy set.
+            records (bool): True to hold compact, read-only
+                AccountRecords instead of full accounts, default is
+                False; see AccountSet.
         """
-        table_name = "accounts"  # The database table for this element
-        element_type = InvestmentAccount
-        invest_account_column = "account_type"
-        account_type = AccountType.INVESTMENT
+        # A where_value of NO_TYPE selects no subset; a subtype subset
+        # must also be a defined InvestmentAccountType.
+        if where_value == InvestmentAccountType.NO_TYPE or (
+            where_column == "account_subtype"
+            and (
+                not isinstance(where_value, int)
+                or where_value not in INVESTMENT_ACCOUNT_TYPES
+            )
+        ):
+            where_column = None
 
         super().__init__(
             dbref,
-            table_name,
-            element_type,
-            invest_account_column,
-            account_type,
+            InvestmentAccount,
+            AccountType.INVESTMENT,
+            where_column,
+            where_value,
             order_by_column,
             limit,
             offset,
+            filters,
+            lazy,
+            chunk_size,
+            records,
         )
         # end __init__()
 
-        # Build the subset from the total investment account set
-        subset = []
-        if (
-            where_column is not None
-            and where_value in InvestmentAccountType.list()
-            and where_value != InvestmentAccountType.NO_TYPE
-        ):
-            for account in self.get_property_set():
-                if account._get_property(where_column) == where_value:
-                    subset.append(account)
-            self.set_property_set(subset)
-        # end __init__()
-
 
 # end Class InvestmentAccountSet
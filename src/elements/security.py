@@ -0,0 +1,223 @@
+"""
+A security held in the investment accounts of the MoneyTrack program.
+
+File:       security.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from types import MappingProxyType
+from typing import Any, Mapping, Union
+
+from lbk_library import Dbal, Element
+
+
+class Security(Element):
+    """
+    Implement a Security in the database.
+
+    A security is a stock, bond or fund with a ticker symbol, held in
+    the brokerage and single fund investment accounts. Its daily
+    closing prices are kept by the PriceHistory of the database and are
+    removed with it.
+    """
+
+    # Default values for the Security, shared by every instance.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "symbol": "",
+            "name": "",
+            "remarks": "",
+        }
+    )
+
+    # The setter for each property, by property name, applied in this
+    # order by set_properties().
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            "symbol": "set_symbol",
+            "name": "set_name",
+        }
+    )
+
+    def __init__(self, dbref: Dbal, security_key: Union[int, str, dict] = None) -> None:
+        """
+        Define a Security.
+
+        If 'security_key' is not given, a Security with all properties
+        set to default values is constructed. If it is a dict, the
+        properties are set from the dict. If it is a record_id or a
+        ticker symbol, the Security is read from the database.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            security_key (Mixed): the record_id or symbol of the
+                Security, or a dict of its values.
+        """
+        super().__init__(dbref, "securities")
+
+        self.defaults: Mapping[str, Any] = self.DEFAULTS
+        self.set_initial_values(dict(self.defaults))
+        self.clear_value_valid_flags()
+
+        if isinstance(security_key, dict):
+            properties = dict(self.defaults)
+            properties.update(security_key)
+            security_key = properties
+        elif isinstance(security_key, int):
+            security_key = self.get_properties_from_db("record_id", security_key)
+        elif isinstance(security_key, str):
+            security_key = self.get_properties_from_db(
+                "symbol", security_key.strip().upper()
+            )
+
+        if not security_key:
+            security_key = dict(self.defaults)
+
+        self.set_properties(security_key)
+        self.set_initial_values(dict(self.get_properties()))
+        self.clear_value_changed_flags()
+        # end __init__()
+
+    @classmethod
+    def from_row(cls, dbref: Dbal, row: dict[str, Any]) -> "Security":
+        """
+        Construct a Security from a row of the 'securities' table.
+
+        As for Account.from_row(), rows read from the database were
+        validated when they were written and are taken as they are;
+        missing or NULL columns are replaced by their defaults.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            row (dict): the column values of one row of the
+                'securities' table.
+
+        Returns:
+            (Security) the Security holding the row values.
+        """
+        security = cls.__new__(cls)
+        Element.__init__(security, dbref, "securities")
+        security.defaults = cls.DEFAULTS
+
+        properties = {}
+        for key, default in cls.DEFAULTS.items():
+            value = row.get(key)
+            properties[key] = default if value is None else value
+
+        security.set_initial_values(dict(properties))
+        security.clear_value_valid_flags()
+        for key, value in properties.items():
+            security._set_property(key, value)
+            security.update_property_flags(key, value, True)
+        security.clear_value_changed_flags()
+        return security
+        # end from_row()
+
+    def set_properties(self, properties: dict[str, Any]) -> dict[str, str]:
+        """
+        Set the values of the Security properties array.
+
+        Each property is validated through its setter in the FIELDS
+        table. Properties not part of the element are discarded.
+
+        Parameters:
+            properties (dict): holding the element values, may be
+                sparse.
+
+        Returns:
+            (dict) the error message of each property in the FIELDS
+                table that was not valid; empty if all were valid.
+        """
+        errors = {}
+        if properties is not None and isinstance(properties, dict):
+            super().set_properties(properties)
+
+            for key, setter in self.FIELDS.items():
+                if key in properties:
+                    result = getattr(self, setter)(properties[key])
+                    if not result["valid"]:
+                        errors[key] = result["msg"]
+        return errors
+        # end set_properties()
+
+    def get_symbol(self) -> str:
+        """
+        Get the ticker symbol of the Security.
+
+        Returns:
+            (str) the symbol, such as 'VTI', empty if not set.
+        """
+        symbol = self._get_property("symbol")
+        if symbol is None:
+            symbol = self.defaults["symbol"]
+        return symbol
+        # end get_symbol()
+
+    def set_symbol(self, symbol: str) -> dict[str, Any]:
+        """
+        Set the ticker symbol of the Security.
+
+        Parameters:
+            symbol (str): the ticker symbol; required, from 1 to 16
+                characters, and stored in upper case. If it is not
+                valid, the symbol is set to the empty string.
+
+        Returns:
+            (dict): ['entry'] - (str) the updated symbol
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        if isinstance(symbol, str):
+            symbol = symbol.strip().upper()
+        result = self.validate.text_field(symbol, self.validate.REQUIRED, 1, 16)
+        if result["valid"]:
+            self._set_property("symbol", result["entry"])
+        else:
+            self._set_property("symbol", "")
+        self.update_property_flags("symbol", result["entry"], result["valid"])
+        return result
+        # end set_symbol()
+
+    def get_name(self) -> str:
+        """
+        Get the name of the Security.
+
+        Returns:
+            (str) the name, such as the fund or company name.
+        """
+        name = self._get_property("name")
+        if name is None:
+            name = self.defaults["name"]
+        return name
+        # end get_name()
+
+    def set_name(self, name: str) -> dict[str, Any]:
+        """
+        Set the name of the Security.
+
+        Parameters:
+            name (str): the fund or company name; optional and no more
+                than 255 characters. If it is not valid, the name is
+                set to the empty string.
+
+        Returns:
+            (dict): ['entry'] - (str) the updated name
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = self.validate.text_field(name, self.validate.OPTIONAL, 0, 255)
+        if result["valid"]:
+            self._set_property("name", result["entry"])
+        else:
+            self._set_property("name", "")
+        self.update_property_flags("name", result["entry"], result["valid"])
+        return result
+        # end set_name()
+
+
+# end class Security
@@ -0,0 +1,282 @@
+"""
+A trade of a security in an investment account of the MoneyTrack program.
+
+File:       trade.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from types import MappingProxyType
+from typing import Any, Mapping, Union
+
+from lbk_library import Dbal, Element
+
+
+class Trade(Element):
+    """
+    Implement a Trade in the database.
+
+    A trade is the security side of a BUY or SELL Transaction: the
+    Transaction holds the account, the date and the cash of the trade,
+    and the Trade holds the security and the number of shares. Shares
+    are whole 1/SHARE_SCALE ths of a share, positive for shares into
+    the account and negative for shares out of it. A Trade is removed
+    with its Transaction.
+    """
+
+    # Shares are stored as integers in 1/SHARE_SCALE of a share.
+    SHARE_SCALE = 10000
+
+    # Default values for the Trade, shared by every instance.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "transaction_id": 0,
+            "security_id": 0,
+            "shares": 0,
+            "remarks": "",
+        }
+    )
+
+    # The setter for each property, by property name, applied in this
+    # order by set_properties().
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            "transaction_id": "set_transaction_id",
+            "security_id": "set_security_id",
+            "shares": "set_shares",
+        }
+    )
+
+    def __init__(self, dbref: Dbal, trade_key: Union[int, dict] = None) -> None:
+        """
+        Define a Trade.
+
+        If 'trade_key' is not given, a Trade with all properties set to
+        default values is constructed. If it is a dict, the properties
+        are set from the dict. If it is a record_id, the Trade is read
+        from the database.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            trade_key (Mixed): the record_id of the Trade, or a dict of
+                its values.
+        """
+        super().__init__(dbref, "trades")
+
+        self.defaults: Mapping[str, Any] = self.DEFAULTS
+        self.set_initial_values(dict(self.defaults))
+        self.clear_value_valid_flags()
+
+        if isinstance(trade_key, dict):
+            properties = dict(self.defaults)
+            properties.update(trade_key)
+            trade_key = properties
+        elif isinstance(trade_key, int):
+            trade_key = self.get_properties_from_db("record_id", trade_key)
+
+        if not trade_key:
+            trade_key = dict(self.defaults)
+
+        self.set_properties(trade_key)
+        self.set_initial_values(dict(self.get_properties()))
+        self.clear_value_changed_flags()
+        # end __init__()
+
+    @classmethod
+    def from_row(cls, dbref: Dbal, row: dict[str, Any]) -> "Trade":
+        """
+        Construct a Trade from a row of the 'trades' table.
+
+        As for Account.from_row(), rows read from the database were
+        validated when they were written and are taken as they are;
+        missing or NULL columns are replaced by their defaults.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            row (dict): the column values of one row of the 'trades'
+                table.
+
+        Returns:
+            (Trade) the Trade holding the row values.
+        """
+        trade = cls.__new__(cls)
+        Element.__init__(trade, dbref, "trades")
+        trade.defaults = cls.DEFAULTS
+
+        properties = {}
+        for key, default in cls.DEFAULTS.items():
+            value = row.get(key)
+            properties[key] = default if value is None else value
+
+        trade.set_initial_values(dict(properties))
+        trade.clear_value_valid_flags()
+        for key, value in properties.items():
+            trade._set_property(key, value)
+            trade.update_property_flags(key, value, True)
+        trade.clear_value_changed_flags()
+        return trade
+        # end from_row()
+
+    def set_properties(self, properties: dict[str, Any]) -> dict[str, str]:
+        """
+        Set the values of the Trade properties array.
+
+        Each property is validated through its setter in the FIELDS
+        table. Properties not part of the element are discarded.
+
+        Parameters:
+            properties (dict): holding the element values, may be
+                sparse.
+
+        Returns:
+            (dict) the error message of each property in the FIELDS
+                table that was not valid; empty if all were valid.
+        """
+        errors = {}
+        if properties is not None and isinstance(properties, dict):
+            super().set_properties(properties)
+
+            for key, setter in self.FIELDS.items():
+                if key in properties:
+                    result = getattr(self, setter)(properties[key])
+                    if not result["valid"]:
+                        errors[key] = result["msg"]
+        return errors
+        # end set_properties()
+
+    def get_transaction_id(self) -> int:
+        """
+        Get the record_id of the Transaction of the Trade.
+
+        Returns:
+            (int) the record_id of the Transaction, 0 if not set.
+        """
+        transaction_id = self._get_property("transaction_id")
+        if transaction_id is None:
+            transaction_id = self.defaults["transaction_id"]
+        return transaction_id
+        # end get_transaction_id()
+
+    def set_transaction_id(self, transaction_id: int) -> dict[str, Any]:
+        """
+        Set the Transaction of the Trade.
+
+        Parameters:
+            transaction_id (int): the record_id of the BUY or SELL
+                Transaction; required and must be greater than 0. If
+                it is not valid, the transaction_id is set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated transaction_id
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        return self.__set_record_id("transaction_id", "transaction", transaction_id)
+        # end set_transaction_id()
+
+    def get_security_id(self) -> int:
+        """
+        Get the record_id of the Security traded.
+
+        Returns:
+            (int) the record_id of the Security, 0 if not set.
+        """
+        security_id = self._get_property("security_id")
+        if security_id is None:
+            security_id = self.defaults["security_id"]
+        return security_id
+        # end get_security_id()
+
+    def set_security_id(self, security_id: int) -> dict[str, Any]:
+        """
+        Set the Security traded.
+
+        Parameters:
+            security_id (int): the record_id of the Security; required
+                and must be greater than 0. If it is not valid, the
+                security_id is set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated security_id
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        return self.__set_record_id("security_id", "security", security_id)
+        # end set_security_id()
+
+    def get_shares(self) -> int:
+        """
+        Get the number of shares traded.
+
+        Returns:
+            (int) the shares in 1/SHARE_SCALE of a share, negative for
+                shares out of the account.
+        """
+        shares = self._get_property("shares")
+        if shares is None:
+            shares = self.defaults["shares"]
+        return shares
+        # end get_shares()
+
+    def set_shares(self, shares: int) -> dict[str, Any]:
+        """
+        Set the number of shares traded.
+
+        Parameters:
+            shares (int): the shares in whole 1/SHARE_SCALE ths of a
+                share, positive for shares bought and negative for
+                shares sold; required and not 0. If it is not valid,
+                the shares are set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated shares
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": shares, "valid": True, "msg": ""}
+        if not isinstance(shares, int) or isinstance(shares, bool) or shares == 0:
+            result["entry"] = 0
+            result["valid"] = False
+            result["msg"] = "Invalid shares ('" + str(shares) + "')."
+        self._set_property("shares", result["entry"])
+        self.update_property_flags("shares", result["entry"], result["valid"])
+        return result
+        # end set_shares()
+
+    def __set_record_id(self, key: str, name: str, record_id: int) -> dict[str, Any]:
+        """
+        Set a property holding the record_id of another element.
+
+        Parameters:
+            key (str): the property name.
+            name (str): the element referred to, for the error message.
+            record_id (int): the record_id; must be greater than 0. If
+                it is not valid, the property is set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated record_id
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": record_id, "valid": True, "msg": ""}
+        if (
+            not isinstance(record_id, int)
+            or isinstance(record_id, bool)
+            or record_id < 1
+        ):
+            result["entry"] = 0
+            result["valid"] = False
+            result["msg"] = "Invalid " + name + " ('" + str(record_id) + "')."
+        self._set_property(key, result["entry"])
+        self.update_property_flags(key, result["entry"], result["valid"])
+        return result
+        # end __set_record_id()
+
+
+# end class Trade
@@ -0,0 +1,360 @@
+"""
+A transaction in an account register of the MoneyTrack program.
+
+File:       transaction.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Mapping, Union
+
+from lbk_library import Dbal, Element
+
+from constants.transaction_types import TRANSACTION_TYPES, TransactionType
+
+
+class Transaction(Element):
+    """
+    Implement a Transaction in the database.
+
+    A transaction moves an amount into or out of one account on one
+    date. Amounts are whole cents, positive for money into the account
+    and negative for money out of it, so balances add up exactly.
+    Dates are held as ISO 'YYYY-MM-DD' strings, which sort in date
+    order.
+    """
+
+    # Default values for the Transaction, shared by every instance.
+    DEFAULTS: Mapping[str, Any] = MappingProxyType(
+        {
+            "record_id": 0,
+            "account_id": 0,
+            "date": "",
+            "transaction_type": TransactionType.NO_TYPE,
+            "amount": 0,
+            "description": "",
+            "remarks": "",
+        }
+    )
+
+    # The setter for each property, by property name, applied in this
+    # order by set_properties().
+    FIELDS: Mapping[str, str] = MappingProxyType(
+        {
+            "account_id": "set_account_id",
+            "date": "set_date",
+            "transaction_type": "set_transaction_type",
+            "amount": "set_amount",
+            "description": "set_description",
+        }
+    )
+
+    def __init__(self, dbref: Dbal, transaction_key: Union[int, dict] = None) -> None:
+        """
+        Define a Transaction.
+
+        If 'transaction_key' is not given, a Transaction with all
+        properties set to default values is constructed. If it is a
+        dict, the properties are set from the dict. If it is a
+        record_id, the Transaction is read from the database.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            transaction_key (Mixed): the record_id of the Transaction,
+                or a dict of its values.
+        """
+        super().__init__(dbref, "transactions")
+
+        self.defaults: Mapping[str, Any] = self.DEFAULTS
+        self.set_initial_values(dict(self.defaults))
+        self.clear_value_valid_flags()
+
+        if isinstance(transaction_key, dict):
+            properties = dict(self.defaults)
+            properties.update(transaction_key)
+            transaction_key = properties
+        elif isinstance(transaction_key, int):
+            transaction_key = self.get_properties_from_db("record_id", transaction_key)
+
+        if not transaction_key:
+            transaction_key = dict(self.defaults)
+
+        self.set_properties(transaction_key)
+        self.set_initial_values(dict(self.get_properties()))
+        self.clear_value_changed_flags()
+        # end __init__()
+
+    @classmethod
+    def from_row(cls, dbref: Dbal, row: dict[str, Any]) -> "Transaction":
+        """
+        Construct a Transaction from a row of the 'transactions' table.
+
+        As for Account.from_row(), rows read from the database were
+        validated when they were written and are taken as they are;
+        missing or NULL columns are replaced by their defaults.
+
+        Parameters:
+            dbref (Dbal): reference to the database holding the element
+            row (dict): the column values of one row of the
+                'transactions' table.
+
+        Returns:
+            (Transaction) the Transaction holding the row values.
+        """
+        transaction = cls.__new__(cls)
+        Element.__init__(transaction, dbref, "transactions")
+        transaction.defaults = cls.DEFAULTS
+
+        properties = {}
+        for key, default in cls.DEFAULTS.items():
+            value = row.get(key)
+            properties[key] = default if value is None else value
+
+        transaction.set_initial_values(dict(properties))
+        transaction.clear_value_valid_flags()
+        for key, value in properties.items():
+            transaction._set_property(key, value)
+            transaction.update_property_flags(key, value, True)
+        transaction.clear_value_changed_flags()
+        return transaction
+        # end from_row()
+
+    def set_properties(self, properties: dict[str, Any]) -> dict[str, str]:
+        """
+        Set the values of the Transaction properties array.
+
+        Each property is validated through its setter in the FIELDS
+        table. Properties not part of the element are discarded.
+
+        Parameters:
+            properties (dict): holding the element values, may be
+                sparse.
+
+        Returns:
+            (dict) the error message of each property in the FIELDS
+                table that was not valid; empty if all were valid.
+        """
+        errors = {}
+        if properties is not None and isinstance(properties, dict):
+            super().set_properties(properties)
+
+            for key, setter in self.FIELDS.items():
+                if key in properties:
+                    result = getattr(self, setter)(properties[key])
+                    if not result["valid"]:
+                        errors[key] = result["msg"]
+        return errors
+        # end set_properties()
+
+    def get_account_id(self) -> int:
+        """
+        Get the record_id of the account holding the Transaction.
+
+        Returns:
+            (int) the record_id of the account, 0 if not set.
+        """
+        account_id = self._get_property("account_id")
+        if account_id is None:
+            account_id = self.defaults["account_id"]
+        return account_id
+        # end get_account_id()
+
+    def set_account_id(self, account_id: int) -> dict[str, Any]:
+        """
+        Set the account holding the Transaction.
+
+        Parameters:
+            account_id (int): the record_id of the account; required
+                and must be greater than 0. If it is not valid, the
+                account_id is set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated account_id
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": account_id, "valid": True, "msg": ""}
+        if (
+            not isinstance(account_id, int)
+            or isinstance(account_id, bool)
+            or account_id < 1
+        ):
+            result["entry"] = 0
+            result["valid"] = False
+            result["msg"] = "Invalid account ('" + str(account_id) + "')."
+        self._set_property("account_id", result["entry"])
+        self.update_property_flags("account_id", result["entry"], result["valid"])
+        return result
+        # end set_account_id()
+
+    def get_date(self) -> str:
+        """
+        Get the date of the Transaction.
+
+        Returns:
+            (str) the ISO 'YYYY-MM-DD' date, empty if not set.
+        """
+        transaction_date = self._get_property("date")
+        if transaction_date is None:
+            transaction_date = self.defaults["date"]
+        return transaction_date
+        # end get_date()
+
+    def set_date(self, transaction_date: Union[str, date]) -> dict[str, Any]:
+        """
+        Set the date of the Transaction.
+
+        Parameters:
+            transaction_date (Mixed): a date, or an ISO 'YYYY-MM-DD'
+                string; required. If it is not valid, the date is set
+                to the empty string.
+
+        Returns:
+            (dict): ['entry'] - (str) the updated ISO date
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": "", "valid": False, "msg": ""}
+        try:
+            if not isinstance(transaction_date, date):
+                transaction_date = date.fromisoformat(transaction_date)
+            result["entry"] = transaction_date.isoformat()[:10]
+            result["valid"] = True
+        except (TypeError, ValueError):
+            result["msg"] = "Invalid date ('" + str(transaction_date) + "')."
+        self._set_property("date", result["entry"])
+        self.update_property_flags("date", result["entry"], result["valid"])
+        return result
+        # end set_date()
+
+    def get_transaction_type(self) -> int:
+        """
+        Get the type of the Transaction.
+
+        Returns:
+            (int) one of the TransactionType members, NO_TYPE if not
+                set or not valid.
+        """
+        transaction_type = self._get_property("transaction_type")
+        if (
+            not isinstance(transaction_type, int)
+            or transaction_type not in TRANSACTION_TYPES
+        ):
+            transaction_type = TransactionType.NO_TYPE
+        return transaction_type
+        # end get_transaction_type()
+
+    def set_transaction_type(self, transaction_type: int) -> dict[str, Any]:
+        """
+        Set the type of the Transaction.
+
+        Parameters:
+            transaction_type (int): one of the TransactionType members
+                other than NO_TYPE; required. If it is not valid, the
+                type is set to TransactionType.NO_TYPE.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated transaction_type
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": transaction_type, "valid": True, "msg": ""}
+        if (
+            not isinstance(transaction_type, int)
+            or transaction_type not in TRANSACTION_TYPES
+            or transaction_type == TransactionType.NO_TYPE
+        ):
+            result["entry"] = TransactionType.NO_TYPE
+            result["valid"] = False
+            result["msg"] = (
+                "Invalid transaction type ('" + str(transaction_type) + "')."
+            )
+        self._set_property("transaction_type", result["entry"])
+        self.update_property_flags("transaction_type", result["entry"], result["valid"])
+        return result
+        # end set_transaction_type()
+
+    def get_amount(self) -> int:
+        """
+        Get the amount of the Transaction.
+
+        Returns:
+            (int) the amount in cents, negative for money out of the
+                account.
+        """
+        amount = self._get_property("amount")
+        if amount is None:
+            amount = self.defaults["amount"]
+        return amount
+        # end get_amount()
+
+    def set_amount(self, amount: int) -> dict[str, Any]:
+        """
+        Set the amount of the Transaction.
+
+        Parameters:
+            amount (int): the amount in whole cents, positive for money
+                into the account and negative for money out of it. If
+                it is not an integer, the amount is set to 0.
+
+        Returns:
+            (dict): ['entry'] - (int) the updated amount
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = {"entry": amount, "valid": True, "msg": ""}
+        if not isinstance(amount, int) or isinstance(amount, bool):
+            result["entry"] = 0
+            result["valid"] = False
+            result["msg"] = "Invalid amount ('" + str(amount) + "')."
+        self._set_property("amount", result["entry"])
+        self.update_property_flags("amount", result["entry"], result["valid"])
+        return result
+        # end set_amount()
+
+    def get_description(self) -> str:
+        """
+        Get the description of the Transaction.
+
+        Returns:
+            (str) the description, such as the payee.
+        """
+        description = self._get_property("description")
+        if description is None:
+            description = self.defaults["description"]
+        return description
+        # end get_description()
+
+    def set_description(self, description: str) -> dict[str, Any]:
+        """
+        Set the description of the Transaction.
+
+        Parameters:
+            description (str): a brief description, such as the payee;
+                optional and no more than 255 characters. If it is not
+                valid, the description is set to the empty string.
+
+        Returns:
+            (dict): ['entry'] - (str) the updated description
+                    ['valid'] - (bool) True if the operation suceeded,
+                        False otherwise
+                    ['msg'] - (str) Error message if not valid
+        """
+        result = self.validate.text_field(description, self.validate.OPTIONAL, 0, 255)
+        if result["valid"]:
+            self._set_property("description", result["entry"])
+        else:
+            self._set_property("description", "")
+        self.update_property_flags("description", result["entry"], result["valid"])
+        return result
+        # end set_description()
+
+
+# end class Transaction
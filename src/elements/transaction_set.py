@@ -0,0 +1,330 @@
+"""
+This is the register of Transactions of one account in the database.
+
+File:       transaction_set.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from array import array
+from datetime import date
+from typing import Iterator, Union
+
+from lbk_library import Dbal, ElementSet
+
+from database.connection_pool import ConnectionPool
+from database.row_stream import RowStream
+from elements.element_query import ElementQuery
+from elements.transaction import Transaction
+
+
+class TransactionSet(ElementSet):
+    """
+    Provides the register of one account from the table 'transactions'.
+
+    The register is in date order, transactions of the same date in the
+    order they were entered. The running balance after each transaction
+    is computed by SQLite with a window SUM() while the rows are read,
+    starting from the opening balance of the first date in the set, so
+    a page of the register from any date, or any offset, has the right
+    balances without reading the earlier history.
+
+    As with AccountSet, a lazy set does not read any rows when it is
+    constructed; each iteration streams the rows from the cursor in
+    chunks, so an account with a very long history is scanned with flat
+    memory use.
+    """
+
+    # The default number of rows pulled from the cursor at a time by a
+    # lazy set.
+    CHUNK_SIZE = 500
+
+    # The columns of the 'transactions' table.
+    COLUMNS = tuple(Transaction.DEFAULTS)
+
+    # The running balance of the set, after each transaction.
+    BALANCE = (
+        ":opening + SUM(amount) OVER "
+        + "(ORDER BY date, record_id ROWS UNBOUNDED PRECEDING)"
+    )
+
+    def __init__(
+        self,
+        dbref: Dbal,
+        account_id: int,
+        start_date: Union[str, date] = None,
+        end_date: Union[str, date] = None,
+        limit: int = None,  # No limit
+        offset: int = None,
+        lazy: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """
+        Builds the register of an account.
+
+        Parameters:
+            dbref (Dbal): the dababase instance to use, or a
+                ConnectionPool for it.
+            account_id (int): the record_id of the account.
+            start_date (Mixed): the first date of the register, a date
+                or ISO string; default is the first transaction.
+            end_date (Mixed): the last date of the register, a date or
+                ISO string; default is the last transaction.
+            limit (int): number of transactions to retrieve, defaults
+                to all.
+            offset (int): position of the first transaction to
+                retrieve, 0 based, defaults to 0.
+            lazy (bool): True to stream the set on iteration instead of
+                reading it now, default is False.
+            chunk_size (int): number of rows pulled from the cursor at a
+                time by a lazy set.
+        """
+        self.__pool = None
+        if isinstance(dbref, ConnectionPool):
+            self.__pool = dbref
+            dbref = dbref.writer()
+        self.__dbref = dbref
+        self.__table = "transactions"
+        self.__account_id = account_id
+        self.__property_set: list[Transaction] = []
+        self.__balances = array("q")
+        self.__lazy = lazy
+        self.__chunk_size = max(1, chunk_size)
+
+        if isinstance(start_date, date):
+            start_date = start_date.isoformat()
+        if isinstance(end_date, date):
+            end_date = end_date.isoformat()
+        self.__opening_balance = 0
+        if start_date is not None:
+            self.__opening_balance = self.get_balance(
+                self.__reader(), account_id, start_date, False
+            )
+
+        query = ElementQuery(self.__table, self.COLUMNS)
+        query.add_expression("balance", self.BALANCE)
+        query.set_value("opening", self.__opening_balance)
+        query.add_predicate("account_id", account_id)
+        query.add_range("date", start_date, end_date)
+        query.add_order_by("date")
+        query.add_order_by("record_id")
+        query.set_limit(limit, offset)
+        self.__sql, self.__values = query.get_sql()
+
+        if not lazy:
+            self.__load()
+        # end __init__()
+
+    @staticmethod
+    def get_balance(
+        dbref: Dbal,
+        account_id: int,
+        as_of: Union[str, date] = None,
+        inclusive: bool = True,
+    ) -> int:
+        """
+        Get the balance of an account on a date.
+
+        The sum is read from the '(account_id, date, ...)' index alone.
+
+        Parameters:
+            dbref (Dbal): the dababase instance to use.
+            account_id (int): the record_id of the account.
+            as_of (Mixed): the date, a date or ISO string; default is
+                the balance after all transactions.
+            inclusive (bool): True to include the transactions of the
+                date itself, the closing balance; False for the opening
+                balance of the date.
+
+        Returns:
+            (int) the balance in cents.
+        """
+        sql = "SELECT SUM(amount) AS balance FROM transactions"
+        sql += " WHERE account_id = :account_id"
+        values = {"account_id": account_id}
+        if as_of is not None:
+            if isinstance(as_of, date):
+                as_of = as_of.isoformat()
+            sql += " AND date " + ("<=" if inclusive else "<") + " :as_of"
+            values["as_of"] = as_of
+        row = dbref.sql_fetchrow(dbref.sql_query(sql, values))
+        return (row["balance"] if row else None) or 0
+        # end get_balance()
+
+    def get_account_id(self) -> int:
+        """
+        Get the account of this register.
+
+        Returns:
+            (int) the record_id of the account.
+        """
+        return self.__account_id
+        # end get_account_id()
+
+    def get_opening_balance(self) -> int:
+        """
+        Get the balance before the first date of this register.
+
+        Returns:
+            (int) the opening balance in cents, 0 when the register
+                starts with the first transaction.
+        """
+        return self.__opening_balance
+        # end get_opening_balance()
+
+    def is_lazy(self) -> bool:
+        """
+        Is this set streamed from the database on each iteration?
+
+        Returns:
+            (bool) True if the set has not been materialized, False if
+                the Transactions are held in the set.
+        """
+        return self.__lazy
+        # end is_lazy()
+
+    def materialize(self) -> list[Transaction]:
+        """
+        Read the whole set into memory for random access.
+
+        A set that is not lazy, or has already been materialized, is
+        returned unchanged.
+
+        Returns:
+            (list) the Transactions in the set.
+        """
+        if self.__lazy:
+            self.__load()
+            self.__lazy = False
+        return self.__property_set
+        # end materialize()
+
+    def balances(self) -> Iterator[tuple[Transaction, int]]:
+        """
+        Iterate over the Transactions with the balance after each.
+
+        A lazy set runs its query again and streams the rows.
+
+        Returns:
+            (iterator) over (Transaction, balance in cents) pairs.
+        """
+        if self.__lazy:
+            return self.__stream()
+        return zip(self.__property_set, self.__balances)
+        # end balances()
+
+    def get_balances(self) -> array:
+        """
+        Get the balance after each Transaction of the set.
+
+        A lazy set is materialized first.
+
+        Returns:
+            (array) the balances in cents, in register order.
+        """
+        if self.__lazy:
+            self.materialize()
+        return self.__balances
+        # end get_balances()
+
+    def get_dbref(self) -> Dbal:
+        """
+        Get the database reference for this set.
+
+        Returns:
+            (Dbal) the database holding the set.
+        """
+        return self.__dbref
+        # end get_dbref()
+
+    def get_table(self) -> str:
+        """
+        Get the database table for this set.
+
+        Returns:
+            (str) the name of the table holding the set.
+        """
+        return self.__table
+        # end get_table()
+
+    def get_property_set(self) -> list[Transaction]:
+        """
+        Get the list of Transactions in this set.
+
+        A lazy set is materialized first.
+
+        Returns:
+            (list) the Transactions in the set.
+        """
+        if self.__lazy:
+            self.materialize()
+        return self.__property_set
+        # end get_property_set()
+
+    def get_number_elements(self) -> int:
+        """
+        Get the number of Transactions in this set.
+
+        A lazy set is materialized first.
+
+        Returns:
+            (int) the number of Transactions in the set.
+        """
+        return len(self.get_property_set())
+        # end get_number_elements()
+
+    def __iter__(self) -> Iterator[Transaction]:
+        """
+        Iterate over the Transactions in this set.
+
+        A lazy set runs its query again for each iteration and streams
+        the Transactions from the database.
+
+        Returns:
+            (iterator) over the Transactions in the set.
+        """
+        if self.__lazy:
+            return (transaction for transaction, balance in self.__stream())
+        return iter(self.__property_set)
+        # end __iter__()
+
+    def __load(self) -> None:
+        """Read the Transactions of the set and their balances."""
+        property_set = []
+        balances = array("q")
+        for transaction, balance in self.__stream():
+            property_set.append(transaction)
+            balances.append(balance)
+        self.__property_set = property_set
+        self.__balances = balances
+        # end __load()
+
+    def __reader(self) -> Dbal:
+        """
+        Get the connection to read the set with on this thread.
+
+        Returns:
+            (Dbal) the reader of the pool, or the set's database.
+        """
+        if self.__pool is None:
+            return self.__dbref
+        return self.__pool.reader()
+        # end __reader()
+
+    def __stream(self) -> Iterator[tuple[Transaction, int]]:
+        """
+        Run the query and build the Transactions as they are consumed.
+
+        Yields:
+            (tuple) the next Transaction of the set and the balance
+                after it.
+        """
+        dbref = self.__dbref
+        result = self.__reader().sql_query(self.__sql, self.__values)
+        for row in RowStream(result, self.__chunk_size):
+            yield Transaction.from_row(dbref, row), row["balance"]
+        # end __stream()
+
+
+# end Class TransactionSet
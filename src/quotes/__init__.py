@@ -0,0 +1,22 @@
+"""
+Define the members of the quotes package for the MoneyTracker Program
+
+The quotes package fetches security prices from a quote provider, such
+as Yahoo Finance, and keeps them in the database. The modules included
+in the package are
+    FileQuoteProvider - A quote provider reading price history from CSV
+        files, for tests and machines without a network connection.
+    QuoteError - Raised by a quote provider that cannot get prices.
+    QuoteProvider - The interface of every quote provider.
+    QuoteService - Fetches quotes and price history in batches on a
+        thread pool, keeping quotes for a time and storing only the
+        missing history.
+    RateLimiter - Spaces the requests made to a quote provider.
+    YFinanceProvider - The quote provider for Yahoo Finance, through
+        the optional yfinance package.
+
+ File:       quotes.__init__.py
+ Author:     Lorn B Kerr
+ Copyright:  (c) 2022 Lorn B Kerr
+ License:    MIT, see file LICENSE
+ """
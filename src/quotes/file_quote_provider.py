@@ -0,0 +1,170 @@
+"""
+A quote provider reading price history from CSV files.
+
+File:       file_quote_provider.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import csv
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from quotes.quote_provider import QuoteError, QuoteProvider
+
+
+class FileQuoteProvider(QuoteProvider):
+    """
+    Provide quotes from a directory of CSV files, without a network.
+
+    Each security has a file named for its symbol, such as 'VTI.csv',
+    with a 'Date' column of ISO dates and a 'Close' column, as in the
+    history files downloaded from Yahoo Finance; other columns are
+    ignored. The latest quote of a security is its last close. A file
+    is read when first needed and again only after it changes.
+
+    It stands in for a network provider in the tests and on machines
+    without a network connection, and counts the requests it answers.
+    """
+
+    MAX_SYMBOLS = 100
+    RATE = 0.0
+
+    def __init__(self, directory: str) -> None:
+        """
+        Define a provider on a directory of CSV files.
+
+        Parameters:
+            directory (str): the directory holding the files.
+        """
+        self.__directory = directory
+        # the (modification time, dates, closes) of each file read
+        self.__histories: dict[str, tuple[float, list[date], list[float]]] = {}
+        self.__requests = 0
+        self.__lock = threading.Lock()
+        # end __init__()
+
+    def get_directory(self) -> str:
+        """
+        Get the directory of the CSV files.
+
+        Returns:
+            (str) the directory.
+        """
+        return self.__directory
+        # end get_directory()
+
+    def get_number_requests(self) -> int:
+        """
+        Get the number of requests answered.
+
+        Returns:
+            (int) the number of calls of get_quotes() and get_history().
+        """
+        return self.__requests
+        # end get_number_requests()
+
+    def get_quotes(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Get the last close of securities.
+
+        Parameters:
+            symbols (list): the ticker symbols.
+
+        Returns:
+            (dict) the last close in dollars of each symbol with a file.
+
+        Raises:
+            QuoteError: if a file cannot be read.
+        """
+        self.__count()
+        quotes = {}
+        for symbol in symbols:
+            history = self.__read(symbol)
+            if history is not None and history[0]:
+                quotes[symbol] = history[1][-1]
+        return quotes
+        # end get_quotes()
+
+    def get_history(
+        self, symbols: list[str], start: date, end: date
+    ) -> dict[str, list[tuple[date, float]]]:
+        """
+        Get the closes of securities over a date range.
+
+        Parameters:
+            symbols (list): the ticker symbols.
+            start (date): the first day of the range.
+            end (date): the last day of the range.
+
+        Returns:
+            (dict) the (date, close in dollars) pairs of each symbol
+                with a file, in date order.
+
+        Raises:
+            QuoteError: if a file cannot be read.
+        """
+        self.__count()
+        histories = {}
+        for symbol in symbols:
+            history = self.__read(symbol)
+            if history is not None:
+                dates, closes = history
+                first = bisect_left(dates, start)
+                last = bisect_right(dates, end)
+                histories[symbol] = list(zip(dates[first:last], closes[first:last]))
+        return histories
+        # end get_history()
+
+    def __count(self) -> None:
+        """Count a request."""
+        with self.__lock:
+            self.__requests += 1
+        # end __count()
+
+    def __read(self, symbol: str) -> tuple[list[date], list[float]]:
+        """
+        Get the history of a security from its file.
+
+        Parameters:
+            symbol (str): the ticker symbol.
+
+        Returns:
+            (tuple) the list of dates, in order, and the list of the
+                closes on those dates; None if there is no file.
+
+        Raises:
+            QuoteError: if the file cannot be read.
+        """
+        path = os.path.join(self.__directory, symbol + ".csv")
+        try:
+            modified = os.path.getmtime(path)
+        except OSError:
+            return None
+        with self.__lock:
+            held = self.__histories.get(symbol)
+        if held is not None and held[0] == modified:
+            return held[1], held[2]
+
+        prices = {}
+        try:
+            with open(path, newline="") as history_file:
+                for row in csv.DictReader(history_file):
+                    close = row.get("Close")
+                    # Yahoo Finance writes 'null' for days without a close
+                    if close and close != "null":
+                        prices[date.fromisoformat(row["Date"][:10])] = float(close)
+        except (OSError, KeyError, ValueError) as error:
+            raise QuoteError("Cannot read '" + path + "': " + str(error)) from error
+        dates = sorted(prices)
+        closes = [prices[day] for day in dates]
+        with self.__lock:
+            self.__histories[symbol] = (modified, dates, closes)
+        return dates, closes
+        # end __read()
+
+
+# end class FileQuoteProvider
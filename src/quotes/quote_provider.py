@@ -0,0 +1,83 @@
+"""
+The interface of the quote providers of the MoneyTrack program.
+
+File:       quote_provider.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date
+
+
+class QuoteError(Exception):
+    """Raised by a QuoteProvider that cannot get the prices requested."""
+
+    # end class QuoteError
+
+
+class QuoteProvider(ABC):
+    """
+    A source of security prices.
+
+    A provider answers for a batch of symbols at a time. Symbols it
+    does not know are left out of its results rather than raising an
+    error; a failure of the whole request, such as a network error,
+    raises QuoteError. A provider may be called from several threads
+    at once.
+
+    The class constants tell the QuoteService how to use the provider:
+    the largest batch of symbols for one request, and how many requests
+    it may be sent each second and in a burst.
+    """
+
+    # The largest number of symbols in one request.
+    MAX_SYMBOLS = 50
+
+    # The requests allowed each second, 0 for no limit, and the number
+    # that may be sent at once.
+    RATE = 2.0
+    BURST = 2
+
+    @abstractmethod
+    def get_quotes(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Get the latest price of securities.
+
+        Parameters:
+            symbols (list): the ticker symbols, no more than
+                MAX_SYMBOLS.
+
+        Returns:
+            (dict) the latest price in dollars of each known symbol.
+
+        Raises:
+            QuoteError: if the request fails.
+        """
+        # end get_quotes()
+
+    @abstractmethod
+    def get_history(
+        self, symbols: list[str], start: date, end: date
+    ) -> dict[str, list[tuple[date, float]]]:
+        """
+        Get the daily closing prices of securities over a date range.
+
+        Parameters:
+            symbols (list): the ticker symbols, no more than
+                MAX_SYMBOLS.
+            start (date): the first day of the range.
+            end (date): the last day of the range.
+
+        Returns:
+            (dict) the (date, close in dollars) pairs of each known
+                symbol, in date order.
+
+        Raises:
+            QuoteError: if the request fails.
+        """
+        # end get_history()
+
+
+# end class QuoteProvider
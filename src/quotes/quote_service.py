@@ -0,0 +1,310 @@
+"""
+Fetch security prices for the MoneyTrack program.
+
+File:       quote_service.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Callable, Iterator, Union
+
+from database.price_history import PriceHistory
+from quotes.quote_provider import QuoteError, QuoteProvider
+from quotes.rate_limiter import RateLimiter
+
+
+class QuoteService:
+    """
+    Get quotes and price history from a QuoteProvider.
+
+    The symbols wanted are split into batches of the provider's
+    MAX_SYMBOLS, and the batches are sent on a thread pool, each
+    request waiting its turn at a RateLimiter set from the provider's
+    RATE and BURST. The database is only used from the calling thread.
+
+    Quotes are kept in the 'quotes' table, created by schema version 7,
+    and a quote younger than the time to live is answered from there
+    without a request. History is stored in the PriceHistory of the
+    database; only the dates before and after the prices already held
+    are requested, and symbols missing the same dates share requests.
+
+    A batch that fails is left out of the results and its error is
+    kept for each of its symbols; see get_errors().
+    """
+
+    # The default seconds a quote is kept.
+    TTL = 900.0
+
+    # The default number of threads sending requests.
+    WORKERS = 4
+
+    # The years of history fetched for a security without any.
+    HISTORY_YEARS = 30
+
+    def __init__(
+        self,
+        dbref: Any,
+        provider: QuoteProvider,
+        workers: int = WORKERS,
+        ttl: float = TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Define a quote service.
+
+        Parameters:
+            dbref (Dbal): reference to the database.
+            provider (QuoteProvider): the source of the prices.
+            workers (int): the number of threads sending requests.
+            ttl (float): the seconds a quote is kept.
+            clock (Callable): the Unix time in seconds, default is
+                time.time.
+        """
+        self.__dbref = dbref
+        self.__provider = provider
+        self.__ttl = ttl
+        self.__clock = clock
+        self.__prices = PriceHistory(dbref)
+        self.__limiter = RateLimiter(provider.RATE, provider.BURST)
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="money_tracker_quotes"
+        )
+        self.__errors: dict[str, str] = {}
+        # end __init__()
+
+    def get_provider(self) -> QuoteProvider:
+        """
+        Get the provider of the prices.
+
+        Returns:
+            (QuoteProvider) the provider.
+        """
+        return self.__provider
+        # end get_provider()
+
+    def get_errors(self) -> dict[str, str]:
+        """
+        Get the errors of the last request for quotes or history.
+
+        Returns:
+            (dict) the error message for each symbol that failed.
+        """
+        return dict(self.__errors)
+        # end get_errors()
+
+    def close(self) -> None:
+        """Stop the request threads, waiting for any running."""
+        self.__executor.shutdown(wait=True)
+        # end close()
+
+    def get_quotes(self, symbols: list[str], refresh: bool = False) -> dict[str, int]:
+        """
+        Get the latest prices of securities.
+
+        Parameters:
+            symbols (list): the ticker symbols.
+            refresh (bool): True to request every quote, even those
+                that are still kept; default is False.
+
+        Returns:
+            (dict) the price in 1/PriceHistory.PRICE_SCALE of a dollar
+                of each symbol with a quote.
+        """
+        self.__errors = {}
+        symbols = self.__unique(symbols)
+        now = self.__clock()
+        quotes = {}
+        if not refresh and symbols:
+            result = self.__dbref.sql_query(
+                'SELECT "symbol", "price" FROM "quotes" '
+                + 'WHERE "symbol" IN (SELECT value FROM json_each(:symbols)) '
+                + 'AND "fetched" >= :oldest',
+                {"symbols": json.dumps(symbols), "oldest": now - self.__ttl},
+            )
+            for row in self.__dbref.sql_fetchrowset(result):
+                quotes[row["symbol"]] = row["price"]
+
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        fetched = {}
+        for batch, prices in self.__request(self.__provider.get_quotes, missing):
+            for symbol, price in prices.items():
+                fetched[symbol] = round(price * PriceHistory.PRICE_SCALE)
+        if fetched:
+            self.__dbref.sql_query(
+                'INSERT INTO "quotes" ("symbol", "price", "fetched") '
+                + "SELECT key, value, :fetched FROM json_each(:quotes) WHERE 1 "
+                + 'ON CONFLICT ("symbol") DO UPDATE SET '
+                + '"price" = excluded.price, "fetched" = excluded.fetched',
+                {"quotes": json.dumps(fetched), "fetched": now},
+            )
+        quotes.update(fetched)
+        return quotes
+        # end get_quotes()
+
+    def update_history(
+        self,
+        symbols: list[str] = None,
+        start: Union[str, date] = None,
+        end: Union[str, date] = None,
+    ) -> dict[str, int]:
+        """
+        Fetch and store the daily closes missing from the price history.
+
+        Parameters:
+            symbols (list): the ticker symbols of the securities to
+                update, default is every security in the database.
+                Symbols without a Security are ignored.
+            start (Mixed): the first date wanted, a date or ISO string;
+                default is the first date held, or HISTORY_YEARS before
+                'end' for a security without prices.
+            end (Mixed): the last date wanted, a date or ISO string;
+                default is today.
+
+        Returns:
+            (dict) the number of closes stored for each symbol.
+        """
+        self.__errors = {}
+        if isinstance(start, str):
+            start = date.fromisoformat(start)
+        if isinstance(end, str):
+            end = date.fromisoformat(end)
+        if end is None:
+            end = date.today()
+
+        sql = 'SELECT "record_id", "symbol" FROM "securities"'
+        values = {}
+        if symbols is not None:
+            sql += ' WHERE "symbol" IN (SELECT value FROM json_each(:symbols))'
+            values["symbols"] = json.dumps(self.__unique(symbols))
+        result = self.__dbref.sql_query(sql, values)
+        security_ids = {
+            row["symbol"]: row["record_id"]
+            for row in self.__dbref.sql_fetchrowset(result)
+        }
+
+        # the symbols missing each date range
+        ranges: dict[tuple[date, date], list[str]] = {}
+        for symbol, security_id in security_ids.items():
+            for missing in self.__missing(security_id, start, end):
+                ranges.setdefault(missing, []).append(symbol)
+
+        stored: dict[str, int] = {}
+        for (first, last), range_symbols in ranges.items():
+            for batch, histories in self.__request(
+                self.__provider.get_history, range_symbols, first, last
+            ):
+                for symbol, history in histories.items():
+                    if symbol in security_ids and history:
+                        count = self.__prices.add_prices(security_ids[symbol], history)
+                        stored[symbol] = stored.get(symbol, 0) + count
+        return stored
+        # end update_history()
+
+    def __missing(
+        self, security_id: int, start: date, end: date
+    ) -> list[tuple[date, date]]:
+        """
+        Get the date ranges missing from the history of a security.
+
+        Ranges without a weekday, when there are no closes, are left
+        out.
+
+        Parameters:
+            security_id (int): the record_id of the security.
+            start (date): the first date wanted, None for the first
+                date held.
+            end (date): the last date wanted.
+
+        Returns:
+            (list) the (first, last) dates of each missing range.
+        """
+        held = self.__prices.get_range(security_id)
+        if held is None:
+            if start is None:
+                start = end - timedelta(days=round(365.25 * self.HISTORY_YEARS))
+            ranges = [(start, end)]
+        else:
+            ranges = []
+            if start is not None and start < held[0]:
+                ranges.append((start, held[0] - timedelta(days=1)))
+            if held[1] < end:
+                ranges.append((held[1] + timedelta(days=1), end))
+        return [
+            (first, last)
+            for first, last in ranges
+            if first <= last
+            and ((last - first).days >= 2 or first.weekday() < 5 or last.weekday() < 5)
+        ]
+        # end __missing()
+
+    def __request(
+        self, method: Callable, symbols: list[str], *arguments: Any
+    ) -> Iterator[tuple[list[str], dict]]:
+        """
+        Send the batches of a request on the thread pool.
+
+        Parameters:
+            method (Callable): the provider method to call.
+            symbols (list): the ticker symbols, split into batches.
+            arguments (tuple): the further arguments of the method.
+
+        Yields:
+            (tuple) each batch that succeeded and its result, in the
+                order they finish.
+        """
+        size = max(1, self.__provider.MAX_SYMBOLS)
+        batches = []
+        for first in range(0, len(symbols), size):
+            last = first + size
+            batches.append(symbols[first:last])
+        futures = {
+            self.__executor.submit(self.__send, method, batch, *arguments): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                yield batch, future.result()
+            except QuoteError as error:
+                for symbol in batch:
+                    self.__errors[symbol] = str(error)
+        # end __request()
+
+    def __send(self, method: Callable, *arguments: Any) -> Any:
+        """
+        Call a provider method when the rate limit allows.
+
+        This runs on a request thread.
+
+        Parameters:
+            method (Callable): the provider method to call.
+            arguments (tuple): the arguments of the method.
+
+        Returns:
+            (Any) the result of the method.
+        """
+        self.__limiter.acquire()
+        return method(*arguments)
+        # end __send()
+
+    @staticmethod
+    def __unique(symbols: list[str]) -> list[str]:
+        """
+        Get the distinct symbols, in upper case.
+
+        Parameters:
+            symbols (list): the ticker symbols.
+
+        Returns:
+            (list) the symbols, in their first order.
+        """
+        return list(dict.fromkeys(symbol.strip().upper() for symbol in symbols))
+        # end __unique()
+
+
+# end class QuoteService
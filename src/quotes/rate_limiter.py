@@ -0,0 +1,88 @@
+"""
+Limit the rate of the requests sent to a quote provider.
+
+File:       rate_limiter.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    A token bucket shared by the threads sending requests.
+
+    The bucket holds up to 'burst' tokens and gains 'rate' tokens each
+    second. Each request takes a token, waiting for one when the bucket
+    is empty, so a burst of requests goes out at once and the requests
+    after it are spaced 1/rate seconds apart.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Define a rate limit.
+
+        Parameters:
+            rate (float): the requests allowed each second; 0 or less
+                for no limit.
+            burst (int): the requests that may be sent at once, at
+                least 1.
+            clock (Callable): the time in seconds, default is
+                time.monotonic.
+            sleep (Callable): waits a number of seconds, default is
+                time.sleep.
+        """
+        self.__rate = rate
+        self.__burst = max(1, burst)
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__tokens = float(self.__burst)
+        self.__updated = clock()
+        self.__lock = threading.Lock()
+        # end __init__()
+
+    def get_rate(self) -> float:
+        """
+        Get the requests allowed each second.
+
+        Returns:
+            (float) the rate, 0 or less for no limit.
+        """
+        return self.__rate
+        # end get_rate()
+
+    def acquire(self) -> float:
+        """
+        Wait until a request may be sent.
+
+        Returns:
+            (float) the seconds waited.
+        """
+        if self.__rate <= 0:
+            return 0.0
+        with self.__lock:
+            now = self.__clock()
+            self.__tokens = min(
+                self.__burst, self.__tokens + (now - self.__updated) * self.__rate
+            )
+            self.__updated = now
+            # the token is taken now, so later callers queue behind it
+            self.__tokens -= 1
+            wait = -self.__tokens / self.__rate if self.__tokens < 0 else 0.0
+        if wait:
+            self.__sleep(wait)
+        return wait
+        # end acquire()
+
+
+# end class RateLimiter
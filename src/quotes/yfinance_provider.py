@@ -0,0 +1,153 @@
+"""
+The quote provider for Yahoo Finance.
+
+File:       yfinance_provider.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import math
+from datetime import date, timedelta
+from typing import Any
+
+from quotes.quote_provider import QuoteError, QuoteProvider
+
+
+class YFinanceProvider(QuoteProvider):
+    """
+    Provide quotes from Yahoo Finance through the yfinance package.
+
+    yfinance, and the pandas it brings, are only imported when the
+    first request is made, so the program starts without them and runs
+    without them installed; a request then raises QuoteError. Each
+    request downloads the daily closes of a whole batch of symbols.
+    """
+
+    MAX_SYMBOLS = 50
+    RATE = 1.0
+    BURST = 2
+
+    def get_quotes(self, symbols: list[str]) -> dict[str, float]:
+        """
+        Get the latest close of securities.
+
+        Parameters:
+            symbols (list): the ticker symbols, no more than
+                MAX_SYMBOLS.
+
+        Returns:
+            (dict) the latest price in dollars of each known symbol.
+
+        Raises:
+            QuoteError: if yfinance is not installed or the request
+                fails.
+        """
+        # a few days back, so there is a close over weekends and holidays
+        frame = self.__download(symbols, period="5d")
+        quotes = {}
+        for symbol, closes in self.__closes(frame, symbols).items():
+            if closes:
+                quotes[symbol] = closes[-1][1]
+        return quotes
+        # end get_quotes()
+
+    def get_history(
+        self, symbols: list[str], start: date, end: date
+    ) -> dict[str, list[tuple[date, float]]]:
+        """
+        Get the daily closes of securities over a date range.
+
+        Parameters:
+            symbols (list): the ticker symbols, no more than
+                MAX_SYMBOLS.
+            start (date): the first day of the range.
+            end (date): the last day of the range.
+
+        Returns:
+            (dict) the (date, close in dollars) pairs of each known
+                symbol, in date order.
+
+        Raises:
+            QuoteError: if yfinance is not installed or the request
+                fails.
+        """
+        # yfinance takes the day after the range as its end
+        frame = self.__download(
+            symbols,
+            start=start.isoformat(),
+            end=(end + timedelta(days=1)).isoformat(),
+        )
+        return self.__closes(frame, symbols)
+        # end get_history()
+
+    @staticmethod
+    def __download(symbols: list[str], **arguments: Any) -> Any:
+        """
+        Download the daily prices of a batch of symbols.
+
+        Parameters:
+            symbols (list): the ticker symbols.
+            arguments (dict): the period or start and end of the prices.
+
+        Returns:
+            (DataFrame) the prices, with a column group for each symbol.
+
+        Raises:
+            QuoteError: if yfinance is not installed or the request
+                fails.
+        """
+        try:
+            import yfinance
+        except ImportError as error:
+            raise QuoteError("The yfinance package is not installed.") from error
+        try:
+            return yfinance.download(
+                tickers=" ".join(symbols),
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                actions=False,
+                progress=False,
+                threads=False,
+                **arguments,
+            )
+        except Exception as error:
+            raise QuoteError("Yahoo Finance request failed: " + str(error)) from error
+        # end __download()
+
+    @staticmethod
+    def __closes(frame: Any, symbols: list[str]) -> dict[str, list[tuple[date, float]]]:
+        """
+        Get the closes of each symbol from downloaded prices.
+
+        Parameters:
+            frame (DataFrame): the prices downloaded.
+            symbols (list): the ticker symbols requested.
+
+        Returns:
+            (dict) the (date, close) pairs of each symbol with prices.
+        """
+        histories = {}
+        if frame is None or frame.empty:
+            return histories
+        for symbol in symbols:
+            try:
+                column = frame[symbol]["Close"]
+            except KeyError:
+                # a single symbol may come back without its column group
+                if len(symbols) != 1 or "Close" not in frame.columns:
+                    continue
+                column = frame["Close"]
+            history = [
+                (stamp.date(), float(close))
+                for stamp, close in column.items()
+                if not math.isnan(close)
+            ]
+            if history:
+                histories[symbol] = history
+        return histories
+        # end __closes()
+
+
+# end class YFinanceProvider
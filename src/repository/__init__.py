@@ -0,0 +1,16 @@
+"""
+Define the members of the repository package for the MoneyTracker Program
+
+The repository loads the database elements off the GUI thread, so the
+window keeps responding while large sets are read. The modules
+included in the package are
+    AccountRepository - Awaitable loading of accounts and account sets
+        on the reader threads of a ConnectionPool.
+    QtAsyncBridge - Runs the repository coroutines on an asyncio event
+        loop thread and delivers their results to the Qt GUI thread.
+
+ File:       repository.__init__.py
+ Author:     Lorn B Kerr
+ Copyright:  (c) 2022 Lorn B Kerr
+ License:    MIT, see file LICENSE
+ """
@@ -0,0 +1,194 @@
+"""
+Load accounts from the database without blocking the caller.
+
+File:       account_repository.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import asyncio
+from typing import Any, Callable
+
+from lbk_library import Dbal
+
+from constants.account_types import BankAccountType, InvestmentAccountType
+from database.connection_pool import ConnectionPool
+from elements.account import Account
+from elements.account_record import AccountRecord
+from elements.bank_account_set import BankAccountSet
+from elements.investment_account_set import InvestmentAccountSet
+
+
+class AccountRepository:
+    """
+    Awaitable access to the accounts of a database.
+
+    Each query runs on a reader thread of the ConnectionPool, so a
+    coroutine awaiting it leaves its event loop free, for instance to
+    keep the window responding. The Accounts returned are saved through
+    the writer connection of the pool, so they are to be edited and
+    saved on the thread that built the pool.
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        """
+        Define a repository on a connection pool.
+
+        Parameters:
+            pool (ConnectionPool): the connections to the database.
+        """
+        self.__pool = pool
+        # end __init__()
+
+    def get_pool(self) -> ConnectionPool:
+        """
+        Get the connection pool of this repository.
+
+        Returns:
+            (ConnectionPool) the connections to the database.
+        """
+        return self.__pool
+        # end get_pool()
+
+    async def get(self, record_id: int) -> Account:
+        """
+        Load one account by its record_id.
+
+        The account is built as the Account class of its account type,
+        such as a BankAccount.
+
+        Parameters:
+            record_id (int): the record_id of the account.
+
+        Returns:
+            (Account) the account, or None if there is no such account.
+        """
+        return await self.__run(self.__get, record_id)
+        # end get()
+
+    async def bank_accounts(
+        self,
+        subtype: int = BankAccountType.NO_TYPE,
+        order_by_column: str = "name",
+        limit: int = None,
+        offset: int = None,
+        filters: dict[str, Any] = None,
+        records: bool = False,
+    ) -> BankAccountSet:
+        """
+        Load a set of bank accounts.
+
+        Parameters:
+            subtype (int): the BankAccountType of the accounts, default
+                is all bank accounts.
+            order_by_column (str): column of the 'accounts' table to set
+                the order of the set. Default order is by the account
+                name.
+            limit (int): number of accounts to load, defaults to all.
+            offset (int): position of the first account to load, 0
+                based, defaults to 0.
+            filters (dict): further column and value pairs that must
+                all match; see AccountSet.
+            records (bool): True to load compact, read-only
+                AccountRecords, default is False.
+
+        Returns:
+            (BankAccountSet) the accounts, already read.
+        """
+        return await self.__run(
+            lambda dbref: BankAccountSet(
+                self.__pool,
+                "account_subtype",
+                subtype,
+                order_by_column,
+                limit,
+                offset,
+                filters,
+                records=records,
+            )
+        )
+        # end bank_accounts()
+
+    async def investment_accounts(
+        self,
+        subtype: int = InvestmentAccountType.NO_TYPE,
+        order_by_column: str = "name",
+        limit: int = None,
+        offset: int = None,
+        filters: dict[str, Any] = None,
+        records: bool = False,
+    ) -> InvestmentAccountSet:
+        """
+        Load a set of investment accounts.
+
+        Parameters:
+            subtype (int): the InvestmentAccountType of the accounts,
+                default is all investment accounts.
+            order_by_column (str): column of the 'accounts' table to set
+                the order of the set. Default order is by the account
+                name.
+            limit (int): number of accounts to load, defaults to all.
+            offset (int): position of the first account to load, 0
+                based, defaults to 0.
+            filters (dict): further column and value pairs that must
+                all match; see AccountSet.
+            records (bool): True to load compact, read-only
+                AccountRecords, default is False.
+
+        Returns:
+            (InvestmentAccountSet) the accounts, already read.
+        """
+        return await self.__run(
+            lambda dbref: InvestmentAccountSet(
+                self.__pool,
+                "account_subtype",
+                subtype,
+                order_by_column,
+                limit,
+                offset,
+                filters,
+                records=records,
+            )
+        )
+        # end investment_accounts()
+
+    async def __run(self, function: Callable, *args: Any) -> Any:
+        """
+        Run a query on a reader thread and wait for its result.
+
+        Parameters:
+            function (Callable): the query, called with the reader
+                connection of its thread and 'args'.
+            args: the other arguments of the query.
+
+        Returns:
+            (Any) the result of the query.
+        """
+        return await asyncio.wrap_future(self.__pool.submit(function, *args))
+        # end __run()
+
+    def __get(self, dbref: Dbal, record_id: int) -> Account:
+        """
+        Read one account on a reader thread.
+
+        Parameters:
+            dbref (Dbal): the reader connection of the thread.
+            record_id (int): the record_id of the account.
+
+        Returns:
+            (Account) the account, or None if there is no such account.
+        """
+        result = dbref.sql_query(
+            "SELECT * FROM accounts WHERE record_id = :record_id",
+            {"record_id": record_id},
+        )
+        row = dbref.sql_fetchrow(result)
+        if not row:
+            return None
+        element_type = AccountRecord.ACCOUNT_CLASSES.get(row["account_type"], Account)
+        return element_type.from_row(self.__pool.writer(), row)
+        # end __get()
+
+
+# end class AccountRepository
@@ -0,0 +1,123 @@
+"""
+Run coroutines for the Qt GUI and deliver their results to it.
+
+File:       qt_async_bridge.py
+Author:     Lorn B Kerr
+Copyright:  (c) 2022 Lorn B Kerr
+License:    MIT, see file License
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Coroutine
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class QtAsyncBridge(QObject):
+    """
+    Connect an asyncio event loop to the Qt event loop.
+
+    The asyncio loop runs on its own thread, so the Qt event loop of
+    the GUI thread is never blocked by it. A coroutine, such as a call
+    to an AccountRepository, is started with run(); when it finishes
+    its result, or its exception, is passed to a callback on the GUI
+    thread through a queued Qt signal, where it can safely update the
+    widgets.
+
+    The bridge must be built on the GUI thread.
+    """
+
+    # Carries a callback and its value to the GUI thread.
+    __deliver = pyqtSignal(object, object)
+
+    def __init__(self, parent: QObject = None) -> None:
+        """
+        Start the asyncio event loop thread.
+
+        Parameters:
+            parent (QObject): the Qt parent of the bridge.
+        """
+        super().__init__(parent)
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__loop.run_forever, name="money_tracker_asyncio", daemon=True
+        )
+        self.__deliver.connect(self.__on_deliver)
+        self.__thread.start()
+        # end __init__()
+
+    def run(
+        self,
+        coroutine: Coroutine,
+        on_result: Callable[[Any], None] = None,
+        on_error: Callable[[BaseException], None] = None,
+    ) -> Future:
+        """
+        Start a coroutine on the asyncio event loop.
+
+        Parameters:
+            coroutine (Coroutine): the coroutine to run.
+            on_result (Callable): called on the GUI thread with the
+                result of the coroutine, default is no call.
+            on_error (Callable): called on the GUI thread with the
+                exception raised by the coroutine, default is no call.
+
+        Returns:
+            (Future) the result of the coroutine; it can be cancelled.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        future.add_done_callback(partial(self.__done, on_result, on_error))
+        return future
+        # end run()
+
+    def close(self) -> None:
+        """Stop the asyncio event loop and wait for its thread to end."""
+        if self.__loop.is_closed():
+            return
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+        # end close()
+
+    def __done(
+        self,
+        on_result: Callable[[Any], None],
+        on_error: Callable[[BaseException], None],
+        future: Future,
+    ) -> None:
+        """
+        Send the outcome of a finished coroutine to the GUI thread.
+
+        This runs on the asyncio thread.
+
+        Parameters:
+            on_result (Callable): the callback for the result.
+            on_error (Callable): the callback for an exception.
+            future (Future): the finished coroutine.
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_result is not None:
+                self.__deliver.emit(on_result, future.result())
+        elif on_error is not None:
+            self.__deliver.emit(on_error, error)
+        # end __done()
+
+    def __on_deliver(self, callback: Callable[[Any], None], value: Any) -> None:
+        """
+        Call a callback on the GUI thread.
+
+        Parameters:
+            callback (Callable): the callback.
+            value (Any): the result or exception to pass to it.
+        """
+        callback(value)
+        # end __on_deliver()
+
+
+# end class QtAsyncBridge
@@ -10,6 +10,8 @@ if src_path not in sys.path:
 from lbk_library import Dbal
 
 from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
+from constants.transaction_types import TransactionType
+from database.schema import Schema
 
 database = "test.db"
 
@@ -52,6 +54,13 @@ def create_accounts_table(open_database):
     return dbref
 
 
+@pytest.fixture
+def create_transactions_table(create_accounts_table):
+    dbref = create_accounts_table
+    Schema.upgrade(dbref)
+    return dbref
+
+
 string_too_long = (
     "ShortTermCapitalGainsShortTermCapitalGains"
     + "ShortTermCapitalGainsShortTermCapitalGains"
@@ -207,3 +216,60 @@ def load_accounts_table(dbref):
             i += 1
         sql = dbref.sql_query_from_array(sql_query, entries)
         dbref.sql_query(sql, entries)
+
+
+def load_transactions_table(dbref):
+    # account 3, Chase Savings, and account 5, BA checking
+    value_set = [
+        [3, "2022-01-03", TransactionType.DEPOSIT, 100000, "opening deposit"],
+        [5, "2022-01-03", TransactionType.DEPOSIT, 250000, "opening deposit"],
+        [5, "2022-01-10", TransactionType.WITHDRAWAL, -12550, "groceries"],
+        [5, "2022-01-10", TransactionType.WITHDRAWAL, -4999, "gas"],
+        [3, "2022-01-31", TransactionType.INTEREST, 125, "interest"],
+        [5, "2022-02-01", TransactionType.TRANSFER, -50000, "to savings"],
+        [3, "2022-02-01", TransactionType.TRANSFER, 50000, "from checking"],
+        [5, "2022-02-15", TransactionType.DEPOSIT, 310000, "pay"],
+        [5, "2022-02-28", TransactionType.FEE, -500, "service charge"],
+        [3, "2022-02-28", TransactionType.INTEREST, 188, "interest"],
+    ]
+    columns = ["account_id", "date", "transaction_type", "amount", "description"]
+    sql_query = {"type": "INSERT", "table": "transactions"}
+    for values in value_set:
+        entries = dict(zip(columns, values))
+        sql = dbref.sql_query_from_array(sql_query, entries)
+        dbref.sql_query(sql, entries)
+
+
+def load_trades_table(dbref):
+    # needs the 'securities' and 'trades' tables of Schema version 8
+    for symbol, name in [("VTI", "Total Stock Market"), ("BND", "Total Bond Market")]:
+        entries = {"symbol": symbol, "name": name}
+        sql = dbref.sql_query_from_array(
+            {"type": "INSERT", "table": "securities"}, entries
+        )
+        dbref.sql_query(sql, entries)
+    # account 4 is taxable, account 2 is tax deferred, account 1 is a
+    # taxable single fund account; security 1 is VTI, 2 is BND
+    value_set = [
+        [4, "2022-01-03", TransactionType.TRANSFER, 500000, "opening", 0, 0],
+        [4, "2022-01-04", TransactionType.BUY, -200000, "buy VTI", 1, 100000],
+        [4, "2022-01-05", TransactionType.BUY, -160000, "buy BND", 2, 200000],
+        [4, "2022-02-01", TransactionType.SELL, 88000, "sell VTI", 1, -40000],
+        [2, "2022-01-03", TransactionType.DEPOSIT, 100000, "opening", 0, 0],
+        [2, "2022-01-04", TransactionType.BUY, -100000, "buy VTI", 1, 50000],
+        [1, "2022-01-10", TransactionType.DEPOSIT, 100000, "opening", 0, 0],
+        [1, "2022-01-10", TransactionType.BUY, -100000, "buy BND", 2, 125000],
+    ]
+    columns = ["account_id", "date", "transaction_type", "amount", "description"]
+    sql_query = {"type": "INSERT", "table": "transactions"}
+    for values in value_set:
+        entries = dict(zip(columns, values))
+        sql = dbref.sql_query_from_array(sql_query, entries)
+        dbref.sql_query(sql, entries)
+        if values[5]:
+            dbref.sql_query(
+                'INSERT INTO "trades" ("transaction_id", "security_id", "shares") '
+                + 'VALUES ((SELECT MAX("record_id") FROM "transactions"), '
+                + ":security_id, :shares)",
+                {"security_id": values[5], "shares": values[6]},
+            )
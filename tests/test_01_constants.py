@@ -1,24 +1,36 @@
 import os
 import sys
 
+import pytest
+
 src_path = os.path.join(os.path.realpath("."), "src")
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
+from array import array
+
+from constants.account_types import (
+    ACCOUNT_TYPES,
+    BANK_ACCOUNT_TYPES,
+    INVESTMENT_ACCOUNT_TYPES,
+    AccountType,
+    BankAccountType,
+    InvestmentAccountType,
+)
 from constants.element_types import ElementType
+from constants.transaction_types import TRANSACTION_TYPES, TransactionType
 
 
 def test_0101_ElementType():
     assert ElementType.NO_TYPE == 0
     assert ElementType.ACCOUNT
-    #    assert ElementType.SECURITY
-    #    assert ElementType.TRANSACTION
+    assert ElementType.SECURITY
+    assert ElementType.TRANSACTION
     #    assert ElementType.CATEGORY
     assert ElementType.NO_TYPE in ElementType.list()
     assert ElementType.ACCOUNT in ElementType.list()
-    #    assert ElementType.SECURITY in ElementType.list()
-    #    assert ElementType.TRANSACTION in ElementType.list()
+    assert ElementType.SECURITY in ElementType.list()
+    assert ElementType.TRANSACTION in ElementType.list()
     #    assert ElementType.CATEGORY in ElementType.list()
 
 
@@ -51,3 +63,83 @@ def test_0104_InvestmentAccountType():
     assert InvestmentAccountType.NO_TYPE in InvestmentAccountType.list()
     assert InvestmentAccountType.BROKERAGE in InvestmentAccountType.list()
     assert InvestmentAccountType.SINGLE_FUND in InvestmentAccountType.list()
+
+
+def test_0105_type_code_sets():
+    assert ACCOUNT_TYPES == frozenset(AccountType.list())
+    assert BANK_ACCOUNT_TYPES == frozenset(BankAccountType.list())
+    assert INVESTMENT_ACCOUNT_TYPES == frozenset(InvestmentAccountType.list())
+    assert BankAccountType.CD in BANK_ACCOUNT_TYPES
+    assert InvestmentAccountType.BROKERAGE not in BANK_ACCOUNT_TYPES
+
+
+def test_0106_classify_codes():
+    assert AccountType.is_bank(BankAccountType.CHECKING)
+    assert AccountType.is_bank(AccountType.BANK)
+    assert not AccountType.is_bank(InvestmentAccountType.SINGLE_FUND)
+    assert AccountType.is_investment(InvestmentAccountType.SINGLE_FUND)
+    assert not AccountType.is_investment(BankAccountType.CD)
+    assert AccountType.type_of(BankAccountType.SAVINGS) == AccountType.BANK
+    assert AccountType.type_of(InvestmentAccountType.NO_TYPE) == AccountType.INVESTMENT
+    assert AccountType.subtype_of(BankAccountType.NO_TYPE) == 0
+    assert AccountType.subtype_of(BankAccountType.CD) == 3
+    assert AccountType.subtype_of(InvestmentAccountType.SINGLE_FUND) == 2
+
+
+def test_0107_classify_code_sequences():
+    codes = [
+        BankAccountType.CHECKING,
+        InvestmentAccountType.BROKERAGE,
+        BankAccountType.CD,
+        AccountType.TAX,
+    ]
+    assert AccountType.is_bank(codes) == [True, False, True, False]
+    assert AccountType.is_investment(tuple(codes)) == [False, True, False, False]
+    assert AccountType.type_of(array("q", codes)) == [
+        AccountType.BANK,
+        AccountType.INVESTMENT,
+        AccountType.BANK,
+        AccountType.TAX,
+    ]
+    assert AccountType.subtype_of(codes) == [1, 1, 3, 0]
+
+
+def test_0108_classify_numpy_arrays():
+    numpy = pytest.importorskip("numpy")
+    codes = numpy.array(
+        [BankAccountType.SAVINGS, InvestmentAccountType.SINGLE_FUND], dtype=numpy.int64
+    )
+    assert AccountType.is_bank(codes).tolist() == [True, False]
+    assert AccountType.is_investment(codes).tolist() == [False, True]
+    assert AccountType.subtype_of(codes).tolist() == [2, 2]
+
+
+def test_0109_cached_lists_and_names():
+    assert isinstance(ElementType.list(), tuple)
+    assert ElementType.list() is ElementType.list()
+    assert AccountType.list() is AccountType.list()
+    assert BankAccountType.list() is BankAccountType.list()
+    assert InvestmentAccountType.list() is InvestmentAccountType.list()
+    assert ElementType.name_of(ElementType.ACCOUNT) == "ACCOUNT"
+    assert ElementType.name_of(ElementType.ELEMENT_TYPE_MASK) is None
+    assert AccountType.name_of(AccountType.INVESTMENT) == "INVESTMENT"
+    assert AccountType.name_of(AccountType.ACCOUNT_TYPE_NASK) is None
+    assert BankAccountType.name_of(BankAccountType.NO_TYPE) == "NO_TYPE"
+    assert BankAccountType.name_of(BankAccountType.SAVINGS) == "SAVINGS"
+    assert BankAccountType.name_of(InvestmentAccountType.BROKERAGE) is None
+    assert InvestmentAccountType.name_of(InvestmentAccountType.SINGLE_FUND) == (
+        "SINGLE_FUND"
+    )
+
+
+def test_0110_TransactionType():
+    assert TransactionType.NO_TYPE == ElementType.TRANSACTION
+    for code in TransactionType.list():
+        assert code & ElementType.ELEMENT_TYPE_MASK == ElementType.TRANSACTION
+        assert code in TRANSACTION_TYPES
+    assert len(TRANSACTION_TYPES) == len(TransactionType.list())
+    assert TransactionType.list() is TransactionType.list()
+    assert TransactionType.name_of(TransactionType.DEPOSIT) == "DEPOSIT"
+    assert TransactionType.name_of(TransactionType.SELL) == "SELL"
+    assert TransactionType.name_of(TransactionType.TRANSACTION_TYPE_MASK) is None
+    assert TransactionType.name_of(AccountType.BANK) is None
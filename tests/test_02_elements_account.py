@@ -495,4 +495,83 @@ def test_0219_item_delete(create_accounts_table):
     close_database(dbref)
 
 
+def test_0220_shared_defaults(open_database):
+    dbref = open_database
+    account = Account(dbref, sparse_values)
+    account2 = Account(dbref)
+    assert account.defaults is Account.DEFAULTS
+    assert account2.defaults is account.defaults
+    with pytest.raises(TypeError):
+        account.defaults["name"] = "Cash"
+    # the caller's dict is not filled in with the defaults
+    assert sparse_values == {"record_id": 10, "name": "Cash"}
+    close_database(dbref)
+
+
+def test_0221_changed_properties(open_database):
+    dbref = open_database
+    account = Account(dbref, account_values)
+    assert account.get_changed_properties() == {}
+    account.set_check_writing_avail(True)
+    account.set_account_separate(True)
+    account.set_hide_in_transaction_list(True)
+    account.set_hide_in_account_lists(True)
+    account.set_company(account_values["company"])
+    assert account.get_changed_properties() == {
+        "check_writing_avail": True,
+        "account_separate": True,
+        "hide_in_transaction_list": True,
+        "hide_in_account_lists": True,
+    }
+    close_database(dbref)
+
+
+def test_0222_update_changed_only(create_accounts_table):
+    dbref = create_accounts_table
+    account = Account(dbref, account_values)
+    assert account.add() == 1
+    assert account.get_changed_properties() == {}
+    # nothing changed, nothing to write
+    assert account.update()
+
+    # each update writes only its own changes
+    account = Account(dbref, 1)
+    account2 = Account(dbref, 1)
+    account.set_name("Petty Cash")
+    assert account.update()
+    assert account.get_changed_properties() == {}
+    account2.set_account_number("5431")
+    account2.set_hide_in_account_lists(True)
+    assert account2.update()
+    account3 = Account(dbref, 1)
+    assert account3.get_name() == "Petty Cash"
+    assert account3.get_account_number() == "5431"
+    assert account3.get_hide_in_account_lists()
+    assert account3.get_company() == account_values["company"]
+
+    # a changed account that is not in the table is not saved
+    account = Account(dbref, account_values)
+    account.set_name("Missing")
+    assert not account.update()
+    close_database(dbref)
+
+
+def test_0223_update_from_dict(create_accounts_table):
+    dbref = create_accounts_table
+    account = Account(dbref, account_values)
+    assert account.add() == 1
+    assert Account(dbref, 1).get_name() == "Cash"
+    # an account built from a dict writes its row even though nothing
+    # was changed after it was built
+    values = dict(account_values)
+    values.update({"record_id": 1, "name": "Renamed", "company": "Other Bank"})
+    account = Account(dbref, values)
+    assert account.update()
+    account2 = Account(dbref, 1)
+    assert account2.get_name() == "Renamed"
+    assert account2.get_company() == "Other Bank"
+    assert account2.get_account_number() == account_values["account_number"]
+    close_database(dbref)
+
+
 # end test_02_elements_account.py
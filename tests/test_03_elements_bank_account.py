@@ -7,10 +7,17 @@ src_path = os.path.join(os.path.realpath("."), "src")
 if src_path not in sys.path:
     sys.path.append(src_path)
 
-from db_support import close_database, create_accounts_table, database, open_database
+from db_support import (
+    close_database,
+    create_accounts_table,
+    database,
+    load_accounts_table,
+    open_database,
+)
 
 from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
 from elements.account import Account
+from elements.account_cache import AccountCache
 from elements.bank_account import BankAccount
 
 # set account values for tests
@@ -96,6 +103,13 @@ def test_0305_set_get_account_subtype(open_database):
     assert result["entry"] == BankAccountType.NO_TYPE
     assert len(result["msg"]) > 0
 
+    for bad in ([BankAccountType.CHECKING], {"CHECKING": 1}):
+        result = account.set_account_subtype(bad)
+        assert not result["valid"]
+        assert result["entry"] == BankAccountType.NO_TYPE
+    account._set_property("account_subtype", [BankAccountType.CHECKING])
+    assert account.get_account_subtype() == BankAccountType.NO_TYPE
+
     result = account.set_account_subtype(BankAccountType.CHECKING)
     assert result["valid"]
     assert result["entry"] == BankAccountType.CHECKING
@@ -322,4 +336,152 @@ def test_0313_item_delete(create_accounts_table):
     close_database(dbref)
 
 
+def test_0314_from_row(open_database):
+    dbref = open_database
+    row = {
+        "record_id": 3,
+        "account_type": AccountType.BANK,
+        "account_subtype": BankAccountType.SAVINGS,
+        "name": "Chase Savings",
+        "description": None,
+        "company": "Chase Bank",
+        "account_number": "0987654321",
+        "account_separate": 0,
+        "hide_in_transaction_list": 0,
+        "hide_in_account_lists": 1,
+        "check_writing_avail": 1,
+        "tax_deferred": 0,
+        "remarks": "a bank account",
+    }
+    account = BankAccount.from_row(dbref, row)
+    assert type(account) is BankAccount
+    assert account.get_dbref() == dbref
+    assert account.get_table() == "accounts"
+    # only the BankAccount properties are kept
+    assert len(account.get_properties()) == len(account.defaults)
+    assert account.get_record_id() == 3
+    assert account.get_account_type() == AccountType.BANK
+    assert account.get_account_subtype() == BankAccountType.SAVINGS
+    assert account.get_name() == "Chase Savings"
+    assert account.get_description() == ""
+    assert account.get_hide_in_account_lists() is True
+    assert account.get_check_writing_avail() is True
+    assert account.get_account_separate() is False
+    assert account.get_initial_values()["name"] == "Chase Savings"
+
+    # the debug flag runs the full validation
+    account = BankAccount.from_row(dbref, row, True)
+    assert type(account) is BankAccount
+    assert account.get_name() == "Chase Savings"
+    assert account.get_description() == ""
+    close_database(dbref)
+
+
+def test_0315_save_many(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    accounts = [
+        {
+            "name": "New Savings",
+            "company": "NFCU",
+            "account_subtype": BankAccountType.SAVINGS,
+        },
+        # by name, updates record 7
+        {
+            "name": "CD 1",
+            "company": "NFCU",
+            "account_subtype": BankAccountType.CD,
+            "remarks": "renewed",
+        },
+        # by record_id, updates record 5
+        {
+            "record_id": 5,
+            "name": "BofA checking",
+            "company": "Bank of America",
+            "account_subtype": BankAccountType.CHECKING,
+        },
+    ]
+    assert BankAccount.save_many(dbref, accounts) == 3
+    count_result = dbref.sql_query("SELECT COUNT(*) FROM accounts")
+    assert dbref.sql_fetchrow(count_result)["COUNT(*)"] == 9
+
+    account = BankAccount(dbref, "New Savings", "name")
+    assert account.get_record_id() == 9
+    assert account.get_account_type() == AccountType.BANK
+    assert account.get_account_subtype() == BankAccountType.SAVINGS
+    account = BankAccount(dbref, 7)
+    assert account.get_name() == "CD 1"
+    assert account.get_remarks() == "renewed"
+    account = BankAccount(dbref, 5)
+    assert account.get_name() == "BofA checking"
+    assert account.get_check_writing_avail()
+
+    assert BankAccount.save_many(dbref, []) == 0
+    close_database(dbref)
+
+
+def test_0316_save_many_invalid(create_accounts_table):
+    dbref = create_accounts_table
+    accounts = [
+        {"name": "Good", "company": "NFCU", "account_subtype": BankAccountType.CD},
+        {"name": "", "company": "NFCU", "account_subtype": BankAccountType.CD},
+    ]
+    with pytest.raises(ValueError) as error:
+        BankAccount.save_many(dbref, accounts)
+    assert "1: " in str(error.value)
+    assert "name" in str(error.value)
+    # nothing is written when any account is invalid
+    count_result = dbref.sql_query("SELECT COUNT(*) FROM accounts")
+    assert dbref.sql_fetchrow(count_result)["COUNT(*)"] == 0
+    close_database(dbref)
+
+
+def test_0317_cached_reads(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    cache = AccountCache.for_dbref(dbref)
+    hits = cache.get_hits()
+    account = BankAccount(dbref, 5)
+    account2 = BankAccount(dbref, account.get_name(), "name")
+    assert cache.get_hits() == hits + 1
+    assert account2 is not account
+    assert account2.get_properties() == account.get_properties()
+    # saving or deleting drops the cached row
+    account.set_account_number("5431")
+    assert account.update()
+    assert BankAccount(dbref, 5).get_account_number() == "5431"
+    assert account.delete()
+    assert BankAccount(dbref, 5).get_record_id() == 0
+    close_database(dbref)
+
+
+def test_0318_save_many_duplicate_names(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+
+    def checking(name, record_id=0):
+        return {
+            "record_id": record_id,
+            "name": name,
+            "company": "Bank of America",
+            "account_subtype": BankAccountType.CHECKING,
+        }
+
+    # record 5 is "BA checking", record 3 is "Chase Savings"
+    batches = [
+        ([checking("Chase Savings", 5)], "Chase Savings"),
+        ([checking("Joint", 5), checking("Joint", 3)], "Joint"),
+        ([checking("Joint", 5), checking("Joint")], "Joint"),
+    ]
+    for accounts, name in batches:
+        with pytest.raises(ValueError) as error:
+            BankAccount.save_many(dbref, accounts)
+        assert str(error.value) == "Duplicate account names: '" + name + "'"
+    assert BankAccount(dbref, 5).get_name() == "BA checking"
+    assert BankAccount(dbref, 3).get_name() == "Chase Savings"
+    # an account may keep its own name
+    assert BankAccount.save_many(dbref, [checking("BA checking", 5)]) == 1
+    close_database(dbref)
+
+
 # end test_03_db_elements_account.py
@@ -98,6 +98,13 @@ def test_0405_set_get_account_subtype(open_database):
     assert result["entry"] == InvestmentAccountType.NO_TYPE
     assert len(result["msg"]) > 0
 
+    for bad in ([InvestmentAccountType.BROKERAGE], {"BROKERAGE": 1}):
+        result = account.set_account_subtype(bad)
+        assert not result["valid"]
+        assert result["entry"] == InvestmentAccountType.NO_TYPE
+    account._set_property("account_subtype", [InvestmentAccountType.BROKERAGE])
+    assert account.get_account_subtype() == InvestmentAccountType.NO_TYPE
+
     result = account.set_account_subtype(InvestmentAccountType.BROKERAGE)
     assert result["valid"]
     assert result["entry"] == InvestmentAccountType.BROKERAGE
@@ -353,4 +360,44 @@ def test_0414_item_delete(create_accounts_table):
     close_database(dbref)
 
 
+def test_0415_from_row(open_database):
+    dbref = open_database
+    row = {
+        "record_id": 2,
+        "account_type": AccountType.INVESTMENT,
+        "account_subtype": InvestmentAccountType.BROKERAGE,
+        "name": "MerrillLynch IRA",
+        "description": "sample fund 2",
+        "company": "Fidelity Investments",
+        "account_number": "ml-23654",
+        "tax_deferred": 1,
+        "remarks": None,
+    }
+    account = InvestmentAccount.from_row(dbref, row)
+    assert type(account) is InvestmentAccount
+    assert len(account.get_properties()) == len(account_values)
+    assert account.get_record_id() == 2
+    assert account.get_account_subtype() == InvestmentAccountType.BROKERAGE
+    assert account.get_name() == "MerrillLynch IRA"
+    assert account.get_tax_deferred() is True
+    # missing and NULL columns take the defaults
+    assert account.get_check_writing_avail() == account.defaults["check_writing_avail"]
+    assert account.get_remarks() == account.defaults["remarks"]
+    close_database(dbref)
+
+
+def test_0416_field_table(open_database):
+    dbref = open_database
+    for key in Account.FIELDS:
+        assert InvestmentAccount.FIELDS[key] == Account.FIELDS[key]
+    for key, setter in InvestmentAccount.FIELDS.items():
+        assert key in InvestmentAccount.DEFAULTS
+        assert callable(getattr(InvestmentAccount, setter))
+    account = InvestmentAccount(dbref)
+    account.set_properties({"tax_deferred": True, "not_a_field": 1})
+    assert account.get_tax_deferred()
+    assert "not_a_field" not in account.get_properties()
+    close_database(dbref)
+
+
 # end test_04_elements_investment_account
@@ -102,4 +102,55 @@ def test_0507_ordered_selected_rows(create_accounts_table):
     close_database(dbref)
 
 
+def test_0508_limited_selected_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    # limit and offset apply to the selected subset, not the full table
+    account_set = BankAccountSet(
+        dbref, "account_subtype", BankAccountType.CD, "name", 1, 1
+    )
+    selected_set = account_set.get_property_set()
+    assert len(selected_set) == 1
+    assert selected_set[0].get_name() == "CD 2"
+    assert selected_set[0].get_account_subtype() == BankAccountType.CD
+    close_database(dbref)
+
+
+def test_0509_other_column_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    account_set = BankAccountSet(dbref, "company", "NFCU")
+    assert account_set.get_number_elements() == 2
+    for account in account_set:
+        assert account.get_company() == "NFCU"
+    # unknown columns select no subset
+    account_set = BankAccountSet(dbref, "no_column", "NFCU")
+    assert account_set.get_number_elements() == 4
+    # neither does an unhashable account_subtype
+    account_set = BankAccountSet(dbref, "account_subtype", [BankAccountType.CD])
+    assert account_set.get_number_elements() == 4
+    close_database(dbref)
+
+
+def test_0510_lazy_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    account_set = BankAccountSet(dbref, lazy=True, chunk_size=1)
+    assert account_set.is_lazy()
+    names = [account.get_name() for account in account_set]
+    assert names == ["BA checking", "CD 1", "CD 2", "Chase Savings"]
+    for account in account_set:
+        assert isinstance(account, BankAccount)
+    # each iteration streams the current table contents
+    dbref.sql_query("DELETE FROM accounts WHERE name = 'CD 1'")
+    names = [account.get_name() for account in account_set]
+    assert names == ["BA checking", "CD 2", "Chase Savings"]
+    assert account_set.is_lazy()
+    # random access materializes the set
+    assert account_set.get_number_elements() == 3
+    assert not account_set.is_lazy()
+    assert account_set.get_property_set()[1].get_name() == "CD 2"
+    close_database(dbref)
+
+
 ## end test_05_elements_account_set.py
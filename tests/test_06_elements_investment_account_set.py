@@ -17,6 +17,8 @@ from db_support import (
 from lbk_library import Dbal
 
 from constants.account_types import AccountType, InvestmentAccountType
+from elements.account_record import AccountRecord
+from elements.investment_account import InvestmentAccount
 from elements.investment_account_set import InvestmentAccountSet
 
 
@@ -81,6 +83,13 @@ def test_0606_selected_rows(create_accounts_table):
     )
     count = dbref.sql_fetchrow(count_result)["COUNT(*)"]
     assert count == len(account_set.get_property_set())
+    # an unhashable account_subtype selects no subset
+    account_set = InvestmentAccountSet(
+        dbref, "account_subtype", [InvestmentAccountType.SINGLE_FUND]
+    )
+    assert account_set.get_number_elements() == len(
+        InvestmentAccountSet(dbref).get_property_set()
+    )
     close_database(dbref)
 
 
@@ -106,4 +115,73 @@ def test_0607_ordered_selected_rows(create_accounts_table):
     close_database(dbref)
 
 
+def test_0608_filtered_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    account_set = InvestmentAccountSet(
+        dbref,
+        filters={
+            "account_subtype": InvestmentAccountType.BROKERAGE,
+            "tax_deferred": True,
+        },
+    )
+    assert account_set.get_number_elements() == 1
+    account = account_set.get_property_set()[0]
+    assert account.get_name() == "MerrillLynch IRA"
+    assert account.get_tax_deferred()
+
+    account_set = InvestmentAccountSet(
+        dbref,
+        filters={
+            "company": "Fidelity Investments",
+            "hide_in_account_lists": False,
+        },
+    )
+    assert account_set.get_number_elements() == 3
+
+    account_set = InvestmentAccountSet(
+        dbref,
+        filters={
+            "account_subtype": [
+                InvestmentAccountType.BROKERAGE,
+                InvestmentAccountType.SINGLE_FUND,
+            ]
+        },
+    )
+    assert account_set.get_number_elements() == 4
+    close_database(dbref)
+
+
+def test_0609_limited_selected_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    # limit and offset apply to the selected subset, not the full table
+    account_set = InvestmentAccountSet(
+        dbref, "account_subtype", InvestmentAccountType.SINGLE_FUND, "name", 5, 1
+    )
+    selected_set = account_set.get_property_set()
+    assert len(selected_set) == 1
+    assert selected_set[0].get_name() == "Fidelity Short Term Bond"
+    close_database(dbref)
+
+
+def test_0610_record_rows(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    account_set = InvestmentAccountSet(
+        dbref, "account_subtype", InvestmentAccountType.BROKERAGE, records=True
+    )
+    assert account_set.is_records()
+    records = account_set.get_property_set()
+    assert len(records) == 2
+    for record in records:
+        assert isinstance(record, AccountRecord)
+        assert record.account_subtype == InvestmentAccountType.BROKERAGE
+    assert records[1].name == "MerrillLynch IRA"
+    account = records[1].to_account(dbref)
+    assert isinstance(account, InvestmentAccount)
+    assert account.get_tax_deferred()
+    close_database(dbref)
+
+
 # end test_06_elements_account_set.py
@@ -0,0 +1,114 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from elements.element_query import ElementQuery
+
+columns = ("record_id", "account_type", "account_subtype", "name", "tax_deferred")
+
+
+def test_0701_constructor():
+    query = ElementQuery("accounts", columns)
+    assert isinstance(query, ElementQuery)
+    sql, values = query.get_sql()
+    assert sql == "SELECT * FROM accounts"
+    assert values == {}
+
+
+def test_0702_add_predicate():
+    query = ElementQuery("accounts", columns)
+    assert query.add_predicate("account_type", 5)
+    assert query.add_predicate("tax_deferred", True)
+    assert not query.add_predicate("no_column", 1)
+    assert not query.add_predicate("name", None)
+    sql, values = query.get_sql()
+    assert sql == (
+        "SELECT * FROM accounts WHERE account_type = :account_type"
+        + " AND tax_deferred = :tax_deferred"
+    )
+    assert values == {"account_type": 5, "tax_deferred": True}
+
+
+def test_0703_repeated_and_collection_predicates():
+    query = ElementQuery("accounts", columns)
+    assert query.add_predicate("account_subtype", [3, 2])
+    assert query.add_predicate("account_subtype", 2)
+    sql, values = query.get_sql()
+    assert sql == (
+        "SELECT * FROM accounts WHERE account_subtype IN "
+        + "(:account_subtype, :account_subtype_1)"
+        + " AND account_subtype = :account_subtype_2"
+    )
+    assert values == {
+        "account_subtype": 2,
+        "account_subtype_1": 3,
+        "account_subtype_2": 2,
+    }
+
+    query = ElementQuery("accounts", columns)
+    assert query.add_predicate("account_subtype", ())
+    sql, values = query.get_sql()
+    assert sql == "SELECT * FROM accounts WHERE 0"
+
+
+def test_0704_order_and_limit():
+    query = ElementQuery("accounts", columns)
+    assert query.add_order_by("name")
+    assert not query.add_order_by("no_column")
+    assert query.add_order_by("record_id")
+    query.set_limit(10)
+    sql, values = query.get_sql()
+    assert sql == (
+        "SELECT * FROM accounts ORDER BY name, record_id"
+        + " LIMIT :limit OFFSET :offset"
+    )
+    assert values == {"limit": 10, "offset": 0}
+
+    query.set_limit(None, 20)
+    sql, values = query.get_sql()
+    assert values == {"limit": -1, "offset": 20}
+
+
+def test_0705_select_columns():
+    query = ElementQuery("accounts", columns)
+    assert query.set_select_columns(("record_id", "name"))
+    sql, values = query.get_sql()
+    assert sql == "SELECT record_id, name FROM accounts"
+    assert not query.set_select_columns(("record_id", "no_column"))
+    sql, values = query.get_sql()
+    assert sql == "SELECT * FROM accounts"
+
+
+def test_0706_add_range():
+    query = ElementQuery("accounts", columns)
+    assert query.add_range("record_id", 2, 5)
+    assert query.add_range("name", end="M")
+    assert not query.add_range("name")
+    assert not query.add_range("no_column", 1, 2)
+    sql, values = query.get_sql()
+    assert sql == (
+        "SELECT * FROM accounts WHERE record_id >= :record_id"
+        + " AND record_id <= :record_id_1 AND name <= :name"
+    )
+    assert values == {"record_id": 2, "record_id_1": 5, "name": "M"}
+
+
+def test_0707_add_expression():
+    query = ElementQuery("accounts", columns)
+    query.add_expression("total", ":opening + SUM(record_id) OVER ()")
+    query.set_value("opening", 10)
+    assert query.add_predicate("account_type", 5)
+    sql, values = query.get_sql()
+    assert sql == (
+        "SELECT *, :opening + SUM(record_id) OVER () AS total FROM accounts"
+        + " WHERE account_type = :account_type"
+    )
+    assert values == {"opening": 10, "account_type": 5}
+
+
+# end test_07_elements_element_query.py
@@ -0,0 +1,99 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import close_database, open_database
+
+from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
+from elements.account import Account
+from elements.account_record import RECORD_COLUMNS, AccountRecord
+from elements.bank_account import BankAccount
+from elements.investment_account import InvestmentAccount
+
+bank_row = (
+    3,
+    AccountType.BANK,
+    BankAccountType.SAVINGS,
+    "Chase Savings",
+    "sample bank 1",
+    "Chase Bank",
+    "0987654321",
+    0,
+    0,
+    0,
+    1,
+    0,
+    "an bank account",
+)
+
+investment_row = (
+    2,
+    AccountType.INVESTMENT,
+    InvestmentAccountType.BROKERAGE,
+    "MerrillLynch IRA",
+    "sample fund 2",
+    "Fidelity Investments",
+    "ml-23654",
+    0,
+    0,
+    0,
+    0,
+    1,
+    "an IRA account",
+)
+
+
+def test_0801_constructor():
+    record = AccountRecord._make(bank_row)
+    assert isinstance(record, AccountRecord)
+    assert isinstance(record, tuple)
+    assert record._fields == RECORD_COLUMNS
+    assert record.record_id == 3
+    assert record.name == "Chase Savings"
+    assert record.account_subtype == BankAccountType.SAVINGS
+
+
+def test_0802_read_only():
+    record = AccountRecord._make(bank_row)
+    with pytest.raises(AttributeError):
+        record.name = "Chase Checking"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+    assert not hasattr(record, "__dict__")
+
+
+def test_0803_to_bank_account(open_database):
+    dbref = open_database
+    account = AccountRecord._make(bank_row).to_account(dbref)
+    assert type(account) is BankAccount
+    assert account.get_dbref() == dbref
+    assert account.get_record_id() == 3
+    assert account.get_name() == "Chase Savings"
+    assert account.get_account_subtype() == BankAccountType.SAVINGS
+    assert account.get_check_writing_avail() is True
+    close_database(dbref)
+
+
+def test_0804_to_investment_account(open_database):
+    dbref = open_database
+    account = AccountRecord._make(investment_row).to_account(dbref)
+    assert type(account) is InvestmentAccount
+    assert account.get_name() == "MerrillLynch IRA"
+    assert account.get_tax_deferred() is True
+
+    values = list(investment_row)
+    values[1] = AccountType.TAX
+    account = AccountRecord._make(values).to_account(dbref)
+    assert type(account) is Account
+
+    account = AccountRecord._make(investment_row).to_account(dbref, Account)
+    assert type(account) is Account
+    close_database(dbref)
+
+
+# end test_08_elements_account_record.py
@@ -0,0 +1,115 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    open_database,
+)
+
+from analytics.account_columns import AccountColumns
+from constants.account_types import AccountType, BankAccountType, InvestmentAccountType
+
+
+def test_0901_constructor_empty(create_accounts_table):
+    dbref = create_accounts_table
+    columns = AccountColumns(dbref)
+    assert isinstance(columns, AccountColumns)
+    assert columns.get_number_rows() == 0
+    assert columns.count() == 0
+    assert columns.group_by("account_type") == {}
+    close_database(dbref)
+
+
+def test_0902_load_columns(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    columns = AccountColumns(dbref)
+    assert columns.get_number_rows() == 8
+    assert columns.get_record_ids() == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert list(columns.get_column("account_type"))[:3] == [
+        AccountType.INVESTMENT,
+        AccountType.INVESTMENT,
+        AccountType.BANK,
+    ]
+    assert list(columns.get_column("tax_deferred")) == [0, 1, 0, 0, 0, 0, 0, 0]
+    labels = columns.get_labels("company")
+    assert labels == ["Fidelity Investments", "Chase Bank", "Bank of America", "NFCU"]
+    assert list(columns.get_column("company")) == [0, 0, 1, 0, 2, 0, 3, 3]
+    close_database(dbref)
+
+
+def test_0903_select(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    columns = AccountColumns(dbref)
+    bank = columns.select("account_type", AccountType.BANK)
+    assert columns.count(bank) == 4
+    assert columns.get_record_ids(bank) == [3, 5, 7, 8]
+
+    cds = columns.select("account_subtype", BankAccountType.CD)
+    assert columns.get_record_ids(cds) == [7, 8]
+
+    tax_deferred = columns.select("tax_deferred", True)
+    brokerage = columns.select("account_subtype", InvestmentAccountType.BROKERAGE)
+    assert columns.get_record_ids(tax_deferred & brokerage) == [2]
+    assert columns.count(~tax_deferred) == 7
+
+    nfcu = columns.select("company", "NFCU")
+    assert columns.get_record_ids(nfcu) == [7, 8]
+    assert columns.count(columns.select("company", "No Bank")) == 0
+
+    checking_or_savings = columns.select(
+        "account_subtype", [BankAccountType.CHECKING, BankAccountType.SAVINGS]
+    )
+    assert columns.get_record_ids(checking_or_savings) == [3, 5]
+    close_database(dbref)
+
+
+def test_0904_select_masked_codes(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    columns = AccountColumns(dbref)
+    # the account type is found from the bit-packed subtype codes
+    bank = columns.select(
+        "account_subtype", AccountType.BANK, AccountType.ACCOUNT_TYPE_NASK
+    )
+    assert columns.get_record_ids(bank) == [3, 5, 7, 8]
+    assert bank == columns.select("account_type", AccountType.BANK)
+    close_database(dbref)
+
+
+def test_0905_group_by(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    columns = AccountColumns(dbref)
+    assert columns.group_by("account_type") == {
+        AccountType.INVESTMENT: 4,
+        AccountType.BANK: 4,
+    }
+    bank = columns.select("account_type", AccountType.BANK)
+    assert columns.group_by("account_subtype", bank) == {
+        BankAccountType.SAVINGS: 1,
+        BankAccountType.CHECKING: 1,
+        BankAccountType.CD: 2,
+    }
+    assert columns.group_by(
+        "account_subtype", code_mask=AccountType.ACCOUNT_TYPE_NASK
+    ) == {AccountType.INVESTMENT: 4, AccountType.BANK: 4}
+    assert columns.group_by("company", bank) == {
+        "Chase Bank": 1,
+        "Bank of America": 1,
+        "NFCU": 2,
+    }
+    assert columns.group_by("tax_deferred") == {False: 7, True: 1}
+    close_database(dbref)
+
+
+# end test_09_analytics_account_columns.py
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from elements.account_cache import AccountCache
+
+
+class Database:
+    """A stand-in for a Dbal, the cache only needs a weak reference."""
+
+
+def row(record_id, name):
+    return {"record_id": record_id, "name": name, "company": "NFCU"}
+
+
+def test_1001_constructor():
+    cache = AccountCache()
+    assert isinstance(cache, AccountCache)
+    assert cache.get_size() == AccountCache.SIZE
+    assert cache.get_number_rows() == 0
+    assert cache.get_hits() == 0
+    assert cache.get_misses() == 0
+    assert AccountCache(0).get_size() == 1
+
+
+def test_1002_for_dbref():
+    dbref = Database()
+    dbref2 = Database()
+    cache = AccountCache.for_dbref(dbref)
+    assert AccountCache.for_dbref(dbref) is cache
+    assert AccountCache.for_dbref(dbref2) is not cache
+
+
+def test_1003_get_put():
+    cache = AccountCache()
+    assert cache.get("record_id", 1) is None
+    cache.put(row(1, "Checking"))
+    cache.put(row(0, "Not saved"))
+    assert cache.get_number_rows() == 1
+    assert cache.get("record_id", 1) == row(1, "Checking")
+    assert cache.get("name", "Checking") == row(1, "Checking")
+    assert cache.get("name", "Not saved") is None
+    assert cache.get("company", "NFCU") is None
+    assert cache.get_hits() == 2
+    assert cache.get_misses() == 3
+    # the cached row can not be changed through a returned copy
+    cache.get("record_id", 1)["name"] = "Savings"
+    assert cache.get("record_id", 1)["name"] == "Checking"
+
+
+def test_1004_rename():
+    cache = AccountCache()
+    cache.put(row(1, "Checking"))
+    cache.put(row(1, "Savings"))
+    assert cache.get_number_rows() == 1
+    assert cache.get("name", "Checking") is None
+    assert cache.get("name", "Savings") == row(1, "Savings")
+
+
+def test_1005_least_recently_used():
+    cache = AccountCache(2)
+    cache.put(row(1, "Checking"))
+    cache.put(row(2, "Savings"))
+    cache.get("record_id", 1)
+    cache.put(row(3, "CD"))
+    assert cache.get_number_rows() == 2
+    assert cache.get("record_id", 2) is None
+    assert cache.get("name", "Savings") is None
+    assert cache.get("record_id", 1) is not None
+    assert cache.get("name", "CD") is not None
+
+
+def test_1006_discard_clear():
+    cache = AccountCache()
+    cache.put(row(1, "Checking"))
+    cache.put(row(2, "Savings"))
+    cache.discard(1)
+    cache.discard(5)
+    assert cache.get("record_id", 1) is None
+    assert cache.get("name", "Checking") is None
+    assert cache.get_number_rows() == 1
+    cache.get("record_id", 2)
+    cache.clear()
+    assert cache.get_number_rows() == 0
+    assert cache.get("name", "Savings") is None
+    assert cache.get_hits() == 1
+    assert cache.get_misses() == 3
+
+
+# end test_10_elements_account_cache.py
@@ -0,0 +1,129 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    open_database,
+)
+
+from database.schema import Schema
+
+
+def index_names(dbref):
+    result = dbref.sql_query(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+        + " AND tbl_name = 'accounts' AND sql IS NOT NULL ORDER BY name"
+    )
+    return [row["name"] for row in dbref.sql_fetchrowset(result)]
+
+
+def test_1101_new_database(open_database):
+    dbref = open_database
+    assert Schema.get_version(dbref) == 0
+    assert Schema.upgrade(dbref) == Schema.VERSION
+    assert Schema.get_version(dbref) == Schema.VERSION
+    assert index_names(dbref) == [
+        "accounts_name",
+        "accounts_type_name",
+        "accounts_type_subtype_name",
+    ]
+    # nothing more to do
+    assert Schema.upgrade(dbref) == Schema.VERSION
+    close_database(dbref)
+
+
+def test_1102_partial_upgrade(open_database):
+    dbref = open_database
+    assert Schema.upgrade(dbref, 1) == 1
+    assert index_names(dbref) == []
+    assert Schema.upgrade(dbref) == Schema.VERSION
+    assert len(index_names(dbref)) == 3
+    # migrations are not undone
+    assert Schema.upgrade(dbref, 1) == Schema.VERSION
+    close_database(dbref)
+
+
+def test_1103_existing_table(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    assert Schema.get_version(dbref) == 0
+    assert Schema.upgrade(dbref) == Schema.VERSION
+    count_result = dbref.sql_query("SELECT COUNT(*) FROM accounts")
+    assert dbref.sql_fetchrow(count_result)["COUNT(*)"] == 8
+    close_database(dbref)
+
+
+def test_1104_query_plans(create_accounts_table):
+    dbref = create_accounts_table
+    Schema.upgrade(dbref)
+    result = dbref.sql_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM accounts WHERE name = :name",
+        {"name": "CD 1"},
+    )
+    assert "accounts_name" in str(dbref.sql_fetchrowset(result))
+    result = dbref.sql_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM accounts"
+        + " WHERE account_type = :account_type"
+        + " AND account_subtype = :account_subtype ORDER BY name, record_id",
+        {"account_type": 1, "account_subtype": 2},
+    )
+    plan = str(dbref.sql_fetchrowset(result))
+    assert "accounts_type_subtype_name" in plan
+    assert "TEMP B-TREE" not in plan
+    close_database(dbref)
+
+
+def test_1105_transactions_register_plan(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    result = dbref.sql_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM transactions"
+        + " WHERE account_id = :account_id AND date >= :date"
+        + " ORDER BY date, record_id",
+        {"account_id": 1, "date": "2022-01-01"},
+    )
+    plan = str(dbref.sql_fetchrowset(result))
+    assert "transactions_account_date" in plan
+    assert "TEMP B-TREE" not in plan
+    result = dbref.sql_query(
+        "EXPLAIN QUERY PLAN SELECT SUM(amount) FROM transactions"
+        + " WHERE account_id = :account_id AND date < :date",
+        {"account_id": 1, "date": "2022-01-01"},
+    )
+    assert "COVERING INDEX transactions_account_date" in str(
+        dbref.sql_fetchrowset(result)
+    )
+    close_database(dbref)
+
+
+def test_1106_duplicate_names(open_database):
+    dbref = open_database
+    assert Schema.upgrade(dbref, 1) == 1
+    for name in ["Cash", "Savings", "Cash", "Checking", "Savings"]:
+        dbref.sql_query(
+            'INSERT INTO "accounts" ("name") VALUES (:name)', {"name": name}
+        )
+    with pytest.raises(ValueError) as error:
+        Schema.upgrade(dbref)
+    assert "'Cash', 'Savings'" in str(error.value)
+    assert Schema.get_version(dbref) == 1
+    assert index_names(dbref) == []
+    # the upgrade goes on once the names are unique
+    dbref.sql_query(
+        'UPDATE "accounts" SET "name" = "name" || \' \' || "record_id" '
+        + 'WHERE "record_id" IN (3, 5)'
+    )
+    assert Schema.upgrade(dbref) == Schema.VERSION
+    assert len(index_names(dbref)) == 3
+    close_database(dbref)
+
+
+# end test_11_database_schema.py
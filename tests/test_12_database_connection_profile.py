@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import close_database, open_database
+
+from database.connection_profile import ConnectionProfile
+
+
+def test_1201_constructor():
+    profile = ConnectionProfile()
+    assert isinstance(profile, ConnectionProfile)
+    assert profile.get_settings() == dict(ConnectionProfile.DEFAULTS)
+    assert list(profile.get_settings()) == list(ConnectionProfile.PRAGMAS)
+    assert profile.get_statements()[0] == "PRAGMA busy_timeout = 5000"
+    assert "PRAGMA journal_mode = WAL" in profile.get_statements()
+
+
+def test_1202_settings():
+    profile = ConnectionProfile({"synchronous": "full", "cache_size": "-2000"})
+    settings = profile.get_settings()
+    assert settings["synchronous"] == "FULL"
+    assert settings["cache_size"] == -2000
+    assert settings["journal_mode"] == "WAL"
+    with pytest.raises(ValueError):
+        ConnectionProfile({"no_setting": 1})
+    with pytest.raises(ValueError):
+        ConnectionProfile({"journal_mode": "fast"})
+    with pytest.raises(ValueError):
+        ConnectionProfile({"mmap_size": "lots"})
+
+
+def test_1203_from_file(tmpdir):
+    path = tmpdir.join("money_tracker.ini")
+    path.write("[database]\njournal_mode = delete\nmmap_size = 0\n")
+    settings = ConnectionProfile.from_file(str(path)).get_settings()
+    assert settings["journal_mode"] == "DELETE"
+    assert settings["mmap_size"] == 0
+    assert settings["synchronous"] == "NORMAL"
+    missing = ConnectionProfile.from_file(str(tmpdir.join("missing.ini")))
+    assert missing.get_settings() == dict(ConnectionProfile.DEFAULTS)
+
+
+def test_1204_apply(open_database):
+    dbref = open_database
+    in_effect = ConnectionProfile({"cache_size": -4000}).apply(dbref)
+    assert in_effect["journal_mode"] == "wal"
+    assert in_effect["synchronous"] == 1
+    assert in_effect["temp_store"] == 2
+    assert in_effect["cache_size"] == -4000
+    assert in_effect["busy_timeout"] == 5000
+    close_database(dbref)
+
+
+# end test_12_database_connection_profile.py
@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import database, load_accounts_table
+
+from constants.account_types import AccountType, BankAccountType
+from database.connection_pool import ConnectionPool
+from database.schema import Schema
+from elements.bank_account import BankAccount
+from elements.bank_account_set import BankAccountSet
+
+
+@pytest.fixture
+def connection_pool(tmpdir):
+    pool = ConnectionPool(str(tmpdir.join(database)), 2)
+    Schema.upgrade(pool.writer())
+    load_accounts_table(pool.writer())
+    return pool
+
+
+def count_accounts(dbref):
+    result = dbref.sql_query("SELECT COUNT(*) FROM accounts")
+    return dbref.sql_fetchrow(result)["COUNT(*)"]
+
+
+def test_1301_constructor(connection_pool):
+    pool = connection_pool
+    assert isinstance(pool, ConnectionPool)
+    assert pool.get_number_readers() == 0
+    assert pool.reader() is pool.reader()
+    assert pool.reader() is not pool.writer()
+    assert pool.get_number_readers() == 1
+    pool.close()
+
+
+def test_1302_reader_is_read_only(connection_pool):
+    pool = connection_pool
+    result = pool.reader().sql_query("PRAGMA query_only")
+    assert pool.reader().sql_fetchrow(result)["query_only"] == 1
+    result = pool.writer().sql_query("PRAGMA journal_mode")
+    assert pool.writer().sql_fetchrow(result)["journal_mode"] == "wal"
+    pool.close()
+
+
+def test_1303_submit(connection_pool):
+    pool = connection_pool
+    futures = [pool.submit(count_accounts) for i in range(4)]
+    assert [future.result() for future in futures] == [8, 8, 8, 8]
+    # readers see the writer's changes once committed
+    pool.writer().sql_query("DELETE FROM accounts WHERE record_id = 8")
+    assert pool.submit(count_accounts).result() == 7
+    assert 1 <= pool.get_number_readers() <= 2
+
+    main_thread = threading.get_ident()
+    thread = pool.submit(lambda dbref: threading.get_ident()).result()
+    assert thread != main_thread
+    pool.close()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.submit(count_accounts)
+
+
+def test_1304_account(connection_pool):
+    pool = connection_pool
+    account = BankAccount(pool, 5)
+    assert account.get_dbref() is pool.writer()
+    assert account.get_name() == "BA checking"
+    account.set_account_number("5431")
+    assert account.update()
+    account = pool.submit(lambda dbref: BankAccount(pool, "BA checking", "name"))
+    assert account.result().get_account_number() == "5431"
+    pool.close()
+
+
+def test_1305_account_set(connection_pool):
+    pool = connection_pool
+    account_set = BankAccountSet(pool, "account_subtype", BankAccountType.CD)
+    assert account_set.get_dbref() is pool.writer()
+    assert account_set.get_number_elements() == 2
+    lazy_set = BankAccountSet(pool, lazy=True)
+    names = pool.submit(
+        lambda dbref: [account.get_name() for account in lazy_set]
+    ).result()
+    assert names == ["BA checking", "CD 1", "CD 2", "Chase Savings"]
+    pool.close()
+
+
+def test_1306_save_many(connection_pool):
+    pool = connection_pool
+    accounts = [
+        {
+            "name": "New Savings",
+            "company": "NFCU",
+            "account_subtype": BankAccountType.SAVINGS,
+        },
+        {
+            "record_id": 5,
+            "name": "BofA checking",
+            "company": "Bank of America",
+            "account_subtype": BankAccountType.CHECKING,
+        },
+    ]
+    assert BankAccount.save_many(pool, accounts) == 2
+    assert pool.submit(count_accounts).result() == 9
+    account = pool.submit(lambda dbref: BankAccount(pool, 5)).result()
+    assert account.get_name() == "BofA checking"
+    # "Chase Savings" is record 3
+    accounts[1]["name"] = "Chase Savings"
+    with pytest.raises(ValueError) as error:
+        BankAccount.save_many(pool, accounts[1:])
+    assert str(error.value) == "Duplicate account names: 'Chase Savings'"
+    pool.close()
+
+
+# end test_13_database_connection_pool.py
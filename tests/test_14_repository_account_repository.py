@@ -0,0 +1,75 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import database, load_accounts_table
+
+from constants.account_types import BankAccountType, InvestmentAccountType
+from database.connection_pool import ConnectionPool
+from database.schema import Schema
+from elements.account_record import AccountRecord
+from elements.bank_account import BankAccount
+from elements.bank_account_set import BankAccountSet
+from elements.investment_account import InvestmentAccount
+from elements.investment_account_set import InvestmentAccountSet
+from repository.account_repository import AccountRepository
+
+
+@pytest.fixture
+def repository(tmpdir):
+    pool = ConnectionPool(str(tmpdir.join(database)), 2)
+    Schema.upgrade(pool.writer())
+    load_accounts_table(pool.writer())
+    return AccountRepository(pool)
+
+
+def test_1401_constructor(repository):
+    assert isinstance(repository, AccountRepository)
+    assert isinstance(repository.get_pool(), ConnectionPool)
+    repository.get_pool().close()
+
+
+def test_1402_get(repository):
+    account = asyncio.run(repository.get(5))
+    assert isinstance(account, BankAccount)
+    assert account.get_name() == "BA checking"
+    assert account.get_dbref() is repository.get_pool().writer()
+    account = asyncio.run(repository.get(2))
+    assert isinstance(account, InvestmentAccount)
+    assert account.get_tax_deferred()
+    assert asyncio.run(repository.get(99)) is None
+    repository.get_pool().close()
+
+
+def test_1403_bank_accounts(repository):
+    account_set = asyncio.run(repository.bank_accounts())
+    assert isinstance(account_set, BankAccountSet)
+    assert account_set.get_number_elements() == 4
+    account_set = asyncio.run(repository.bank_accounts(subtype=BankAccountType.CD))
+    assert [account.get_name() for account in account_set] == ["CD 1", "CD 2"]
+    account_set = asyncio.run(repository.bank_accounts(limit=1, records=True))
+    assert isinstance(account_set.get_property_set()[0], AccountRecord)
+    repository.get_pool().close()
+
+
+def test_1404_investment_accounts(repository):
+    async def load_all():
+        return await asyncio.gather(
+            repository.investment_accounts(),
+            repository.investment_accounts(InvestmentAccountType.SINGLE_FUND),
+        )
+
+    all_accounts, funds = asyncio.run(load_all())
+    assert isinstance(all_accounts, InvestmentAccountSet)
+    assert all_accounts.get_number_elements() == 4
+    assert funds.get_number_elements() == 2
+    repository.get_pool().close()
+
+
+# end test_14_repository_account_repository.py
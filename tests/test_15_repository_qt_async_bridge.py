@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from repository.qt_async_bridge import QtAsyncBridge
+
+
+async def double(value):
+    await asyncio.sleep(0.01)
+    return value * 2
+
+
+async def fail():
+    raise ValueError("failed")
+
+
+def test_1501_result(qtbot):
+    bridge = QtAsyncBridge()
+    results = []
+    future = bridge.run(double(21), results.append)
+    qtbot.waitUntil(lambda: results == [42])
+    assert future.result() == 42
+    bridge.close()
+    bridge.close()
+
+
+def test_1502_error(qtbot):
+    bridge = QtAsyncBridge()
+    results = []
+    errors = []
+    bridge.run(fail(), results.append, errors.append)
+    qtbot.waitUntil(lambda: len(errors) == 1)
+    assert isinstance(errors[0], ValueError)
+    assert results == []
+    bridge.close()
+
+
+# end test_15_repository_qt_async_bridge.py
@@ -0,0 +1,144 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    create_transactions_table,
+    load_transactions_table,
+    open_database,
+    string_too_long,
+)
+from lbk_library import Element
+
+from constants.transaction_types import TransactionType
+from elements.transaction import Transaction
+
+transaction_values = {
+    "record_id": 10,
+    "account_id": 5,
+    "date": "2022-03-01",
+    "transaction_type": TransactionType.WITHDRAWAL,
+    "amount": -2500,
+    "description": "lunch",
+    "remarks": "a remark",
+}
+
+
+def test_1601_constr(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref)
+    assert isinstance(transaction, Transaction)
+    assert isinstance(transaction, Element)
+    assert transaction.defaults is Transaction.DEFAULTS
+    assert transaction.get_record_id() == 0
+    assert transaction.get_account_id() == 0
+    assert transaction.get_date() == ""
+    assert transaction.get_transaction_type() == TransactionType.NO_TYPE
+    assert transaction.get_amount() == 0
+    assert transaction.get_description() == ""
+    close_database(dbref)
+
+
+def test_1602_values(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref, transaction_values)
+    assert transaction.get_record_id() == 10
+    assert transaction.get_account_id() == 5
+    assert transaction.get_date() == "2022-03-01"
+    assert transaction.get_transaction_type() == TransactionType.WITHDRAWAL
+    assert transaction.get_amount() == -2500
+    assert transaction.get_description() == "lunch"
+    assert transaction.get_remarks() == "a remark"
+    close_database(dbref)
+
+
+def test_1603_set_account_id(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref)
+    assert transaction.set_account_id(3)["valid"]
+    assert transaction.get_account_id() == 3
+    for bad in (0, -1, "3", None, True):
+        result = transaction.set_account_id(bad)
+        assert not result["valid"]
+        assert result["msg"]
+        assert transaction.get_account_id() == 0
+    close_database(dbref)
+
+
+def test_1604_set_date(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref)
+    assert transaction.set_date("2022-12-31")["valid"]
+    assert transaction.get_date() == "2022-12-31"
+    assert transaction.set_date(date(2023, 1, 2))["valid"]
+    assert transaction.get_date() == "2023-01-02"
+    for bad in ("2022-13-01", "yesterday", None, 20220101):
+        result = transaction.set_date(bad)
+        assert not result["valid"]
+        assert transaction.get_date() == ""
+    close_database(dbref)
+
+
+def test_1605_set_transaction_type(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref)
+    assert transaction.set_transaction_type(TransactionType.INTEREST)["valid"]
+    assert transaction.get_transaction_type() == TransactionType.INTEREST
+    for bad in (TransactionType.NO_TYPE, 0, None, [TransactionType.INTEREST], {}):
+        assert not transaction.set_transaction_type(bad)["valid"]
+        assert transaction.get_transaction_type() == TransactionType.NO_TYPE
+    close_database(dbref)
+
+
+def test_1606_set_amount_description(open_database):
+    dbref = open_database
+    transaction = Transaction(dbref)
+    assert transaction.set_amount(-125)["valid"]
+    assert transaction.get_amount() == -125
+    for bad in (1.25, "125", None, False):
+        assert not transaction.set_amount(bad)["valid"]
+        assert transaction.get_amount() == 0
+    assert transaction.set_description("pay")["valid"]
+    assert not transaction.set_description(string_too_long * 2)["valid"]
+    assert transaction.get_description() == ""
+    close_database(dbref)
+
+
+def test_1607_add_read_update_delete(create_transactions_table):
+    dbref = create_transactions_table
+    transaction = Transaction(dbref, transaction_values)
+    record_id = transaction.add()
+    assert record_id == 1
+    transaction = Transaction(dbref, 1)
+    assert transaction.get_amount() == -2500
+    assert transaction.get_date() == "2022-03-01"
+    transaction.set_amount(-2750)
+    assert transaction.update()
+    assert Transaction(dbref, 1).get_amount() == -2750
+    assert transaction.delete()
+    assert Transaction(dbref, 1).get_record_id() == 0
+    close_database(dbref)
+
+
+def test_1608_from_row(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    result = dbref.sql_query("SELECT * FROM transactions WHERE record_id = 3")
+    row = dbref.sql_fetchrow(result)
+    transaction = Transaction.from_row(dbref, row)
+    assert transaction.get_properties() == Transaction(dbref, 3).get_properties()
+    transaction = Transaction.from_row(dbref, {"record_id": 4, "amount": None})
+    assert transaction.get_amount() == 0
+    assert transaction.get_description() == ""
+    close_database(dbref)
+
+
+# end test_16_elements_transaction.py
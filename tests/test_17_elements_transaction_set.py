@@ -0,0 +1,98 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    create_transactions_table,
+    load_transactions_table,
+    open_database,
+)
+
+from elements.transaction import Transaction
+from elements.transaction_set import TransactionSet
+
+# the running balances of account 5 in register order
+checking_balances = [250000, 237450, 232451, 182451, 492451, 491951]
+
+
+def test_1701_constructor(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    register = TransactionSet(dbref, 5)
+    assert isinstance(register, TransactionSet)
+    assert register.get_dbref() == dbref
+    assert register.get_table() == "transactions"
+    assert register.get_account_id() == 5
+    assert register.get_number_elements() == 6
+    assert isinstance(register.get_property_set()[0], Transaction)
+    assert [transaction.get_record_id() for transaction in register] == [
+        2,
+        3,
+        4,
+        6,
+        8,
+        9,
+    ]
+    assert register.get_opening_balance() == 0
+    assert list(register.get_balances()) == checking_balances
+    close_database(dbref)
+
+
+def test_1702_date_range(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    register = TransactionSet(dbref, 5, "2022-02-01", date(2022, 2, 15))
+    assert register.get_opening_balance() == 232451
+    assert [transaction.get_record_id() for transaction in register] == [6, 8]
+    assert list(register.get_balances()) == [182451, 492451]
+    close_database(dbref)
+
+
+def test_1703_paging(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    register = TransactionSet(dbref, 5, limit=2, offset=3)
+    pairs = [
+        (transaction.get_record_id(), balance)
+        for transaction, balance in register.balances()
+    ]
+    assert pairs == [(6, 182451), (8, 492451)]
+    close_database(dbref)
+
+
+def test_1704_lazy(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    register = TransactionSet(dbref, 3, lazy=True, chunk_size=1)
+    assert register.is_lazy()
+    balances = [balance for transaction, balance in register.balances()]
+    assert balances == [100000, 100125, 150125, 150313]
+    # each iteration streams again
+    assert len(list(register)) == 4
+    assert register.is_lazy()
+    assert register.get_number_elements() == 4
+    assert not register.is_lazy()
+    close_database(dbref)
+
+
+def test_1705_get_balance(create_transactions_table):
+    dbref = create_transactions_table
+    load_transactions_table(dbref)
+    assert TransactionSet.get_balance(dbref, 5) == 491951
+    assert TransactionSet.get_balance(dbref, 5, "2022-01-10") == 232451
+    assert TransactionSet.get_balance(dbref, 5, "2022-01-10", False) == 250000
+    assert TransactionSet.get_balance(dbref, 3, date(2022, 1, 31)) == 100125
+    assert TransactionSet.get_balance(dbref, 99) == 0
+    assert TransactionSet(dbref, 99).get_number_elements() == 0
+    close_database(dbref)
+
+
+# end test_17_elements_transaction_set.py
@@ -0,0 +1,150 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_transactions_table,
+    open_database,
+)
+
+from constants.transaction_types import TransactionType
+from database.balance_snapshots import BalanceSnapshots
+from database.schema import Schema
+from elements.bank_account_set import BankAccountSet
+from elements.transaction import Transaction
+
+# the balances of account 3, Chase Savings, and account 5, BA checking
+balances = {3: 150313, 5: 491951}
+
+
+def test_1801_upgrade_loads_snapshots(open_database):
+    dbref = open_database
+    # the transactions were entered before the snapshots were kept
+    Schema.upgrade(dbref, 3)
+    load_transactions_table(dbref)
+    Schema.upgrade(dbref)
+    assert BalanceSnapshots.get_balances(dbref) == balances
+    assert BalanceSnapshots.get_balances(dbref, [5, 7]) == {5: 491951, 7: 0}
+    assert BalanceSnapshots.get_balances(dbref, []) == {}
+    assert BalanceSnapshots.get_month_end_balances(dbref, 5) == [
+        ("2022-01", 232451),
+        ("2022-02", 491951),
+    ]
+    assert BalanceSnapshots.verify(dbref) == []
+    close_database(dbref)
+
+
+def test_1802_insert(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    assert BalanceSnapshots.get_balances(dbref) == balances
+    transaction = Transaction(
+        dbref,
+        {
+            "account_id": 3,
+            "date": "2022-03-05",
+            "transaction_type": TransactionType.WITHDRAWAL,
+            "amount": -313,
+        },
+    )
+    transaction.add()
+    assert BalanceSnapshots.get_balances(dbref, [3]) == {3: 150000}
+    assert BalanceSnapshots.get_month_end_balances(dbref, 3)[-1] == (
+        "2022-03",
+        150000,
+    )
+    assert BalanceSnapshots.verify(dbref) == []
+    close_database(dbref)
+
+
+def test_1803_update(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    # the 'to savings' transfer of account 5, moved to account 3 in March
+    transaction = Transaction(dbref, 6)
+    transaction.set_account_id(3)
+    transaction.set_date("2022-03-01")
+    transaction.set_amount(-40000)
+    transaction.update()
+    assert BalanceSnapshots.get_balances(dbref) == {3: 110313, 5: 541951}
+    assert BalanceSnapshots.get_month_end_balances(dbref, 3) == [
+        ("2022-01", 100125),
+        ("2022-02", 150313),
+        ("2022-03", 110313),
+    ]
+    # a change to other columns leaves the snapshots alone
+    transaction.set_description("moved")
+    transaction.update()
+    assert BalanceSnapshots.verify(dbref) == []
+    close_database(dbref)
+
+
+def test_1804_delete(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    for record_id in (1, 5, 7, 10):
+        Transaction(dbref, record_id).delete()
+    # an account without transactions has no snapshots left
+    assert BalanceSnapshots.get_balances(dbref) == {5: 491951}
+    assert BalanceSnapshots.get_month_end_balances(dbref, 3) == []
+    assert BalanceSnapshots.verify(dbref) == []
+    close_database(dbref)
+
+
+def test_1805_verify_and_rebuild(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    dbref.sql_query("UPDATE account_balances SET balance = 0 WHERE account_id = 5")
+    dbref.sql_query("DELETE FROM monthly_balances WHERE account_id = 3")
+    dbref.sql_query(
+        "INSERT INTO monthly_balances (account_id, month, amount, transactions)"
+        + " VALUES (9, '2021-12', 100, 1)"
+    )
+    differences = BalanceSnapshots.verify(dbref)
+    assert [(row["account_id"], row["month"]) for row in differences] == [
+        (3, "2022-01"),
+        (3, "2022-02"),
+        (5, ""),
+        (9, "2021-12"),
+    ]
+    assert differences[0]["stored_amount"] is None
+    assert differences[0]["amount"] == 100125
+    assert differences[2]["stored_amount"] == 0
+    assert differences[2]["amount"] == 491951
+    assert differences[3]["transactions"] is None
+    assert BalanceSnapshots.rebuild(dbref) == differences
+    assert BalanceSnapshots.verify(dbref) == []
+    assert BalanceSnapshots.rebuild(dbref) == []
+    assert BalanceSnapshots.get_balances(dbref) == balances
+    close_database(dbref)
+
+
+def test_1806_account_set_balances(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    account_set = BankAccountSet(dbref)
+    account_balances = account_set.get_balances()
+    assert len(account_balances) == account_set.get_number_elements()
+    assert account_balances[3] == 150313
+    assert account_balances[5] == 491951
+    assert sum(account_balances.values()) == 150313 + 491951
+    records = BankAccountSet(dbref, records=True, lazy=True)
+    assert records.get_balances() == account_balances
+    close_database(dbref)
+
+
+# end test_18_database_balance_snapshots.py
@@ -0,0 +1,221 @@
+import os
+import sys
+from array import array
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_trades_table,
+    load_transactions_table,
+    open_database,
+)
+
+from analytics.net_worth import NetWorth
+from analytics.valuation import Valuation
+from constants.transaction_types import TransactionType
+from database.price_history import PriceHistory
+from database.schema import Schema
+from elements.transaction import Transaction
+
+
+def load_ledger(dbref):
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+
+
+def test_1901_monthly_series(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    net_worth = NetWorth(dbref)
+    assert net_worth.get_dbref() == dbref
+    months, values = net_worth.get_series()
+    assert months == ["2022-01", "2022-02"]
+    assert isinstance(values, array)
+    assert list(values) == [332576, 642264]
+    months, values = net_worth.get_series("2021-12", date(2022, 3, 1))
+    assert months == ["2021-12", "2022-01", "2022-02", "2022-03"]
+    assert list(values) == [0, 332576, 642264, 642264]
+    # monthly series do not keep any months
+    assert net_worth.get_number_months() == 0
+    close_database(dbref)
+
+
+def test_1902_daily_series(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    net_worth = NetWorth(dbref)
+    days, values = net_worth.get_series(period=NetWorth.DAY)
+    assert len(days) == len(values) == 31 + 28
+    assert days[0] == "2022-01-01"
+    assert days[-1] == "2022-02-28"
+    assert values[0] == 0
+    assert values[2] == 350000
+    assert values[9] == 332451
+    assert values[-1] == 642264
+    days, values = net_worth.get_series("2022-02-14", "2022-02-15", NetWorth.DAY)
+    assert days == ["2022-02-14", "2022-02-15"]
+    assert list(values) == [332576, 642576]
+    assert net_worth.get_number_months() == 2
+    close_database(dbref)
+
+
+def test_1903_changed_months(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    net_worth = NetWorth(dbref)
+    net_worth.get_series(period=NetWorth.DAY)
+    transaction = Transaction(
+        dbref,
+        {
+            "account_id": 5,
+            "date": "2022-02-20",
+            "transaction_type": TransactionType.WITHDRAWAL,
+            "amount": -2264,
+        },
+    )
+    transaction.add()
+    days, values = net_worth.get_series("2022-02-19", "2022-02-20", NetWorth.DAY)
+    assert list(values) == [642576, 640312]
+    # a change to an earlier month is found too
+    transaction = Transaction(dbref, 1)
+    transaction.set_amount(99000)
+    transaction.update()
+    days, values = net_worth.get_series(period=NetWorth.DAY)
+    assert values[2] == 349000
+    assert values[-1] == 639000
+    assert net_worth.get_number_months() == 2
+    net_worth.clear()
+    assert net_worth.get_number_months() == 0
+    close_database(dbref)
+
+
+def test_1904_separate_accounts(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    net_worth = NetWorth(dbref)
+    net_worth.get_series(period=NetWorth.DAY)
+    dbref.sql_query("UPDATE accounts SET account_separate = 1 WHERE record_id = 3")
+    months, values = net_worth.get_series()
+    assert list(values) == [232451, 491951]
+    days, values = net_worth.get_series(period=NetWorth.DAY)
+    assert values[-1] == 491951
+    close_database(dbref)
+
+
+def test_1905_empty_ledger(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    net_worth = NetWorth(dbref)
+    assert net_worth.get_series() == ([], array("q"))
+    months, values = net_worth.get_series("2022-01", "2022-02")
+    assert list(values) == [0, 0]
+    with pytest.raises(ValueError):
+        net_worth.get_series(period="week")
+    close_database(dbref)
+
+
+def test_1906_holdings(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, [("2022-01-04", 200.0), ("2022-01-07", 205.0)])
+    prices.add_prices(2, [("2022-01-05", 80.0), ("2022-01-31", 79.5)])
+    net_worth = NetWorth(dbref)
+    # each purchase is at the close of its day, so the net worth does
+    # not change until the closes do
+    days, values = net_worth.get_series("2022-01-03", "2022-01-07", NetWorth.DAY)
+    assert list(values) == [600000, 600000, 600000, 600000, 607500]
+    months, values = net_worth.get_series("2022-01", "2022-01")
+    assert list(values) == [705875]
+    # a separate account is left out with its shares
+    dbref.sql_query("UPDATE accounts SET account_separate = 1 WHERE record_id = 2")
+    days, values = net_worth.get_series("2022-01-04", "2022-01-04", NetWorth.DAY)
+    assert list(values) == [500000]
+    close_database(dbref)
+
+
+def test_1907_kept_market_values(create_accounts_table, monkeypatch):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, [("2022-01-04", 200.0), ("2022-02-07", 205.0)])
+    prices.add_prices(2, [("2022-01-05", 80.0), ("2022-03-31", 79.5)])
+    valued = []
+    get_market_values = Valuation.get_market_values
+    get_market_values_on = Valuation.get_market_values_on
+
+    def market_values(valuation, start, end):
+        valued.append((start, end))
+        return get_market_values(valuation, start, end)
+
+    def market_values_on(valuation, days):
+        valued.append(days)
+        return get_market_values_on(valuation, days)
+
+    monkeypatch.setattr(Valuation, "get_market_values", market_values)
+    monkeypatch.setattr(Valuation, "get_market_values_on", market_values_on)
+
+    def series(start, end, period):
+        # the series kept against one read from scratch
+        kept = NetWorth.get_series(net_worth, start, end, period)
+        count = len(valued)
+        assert kept == NetWorth(dbref).get_series(start, end, period)
+        del valued[count:]
+        return kept
+
+    net_worth = NetWorth(dbref)
+    # a monthly series values only the ends of the months
+    months, monthly = series("2022-01", "2022-03", NetWorth.MONTH)
+    assert valued == [["2022-01-31", "2022-02-28", "2022-03-31"]]
+    # a daily series values every day of its months, and keeps their ends
+    days, daily = series("2022-01-15", "2022-03-10", NetWorth.DAY)
+    assert valued[1:] == [("2022-01-01", "2022-03-31")]
+    assert monthly[:2].tolist() == [
+        daily[days.index("2022-01-31")],
+        daily[days.index("2022-02-28")],
+    ]
+    del valued[:]
+    assert series("2022-01", "2022-03", NetWorth.MONTH)[1] == monthly
+    assert series("2022-01-15", "2022-03-10", NetWorth.DAY)[1] == daily
+    assert valued == []
+
+    # a change to the prices of a month values it and the months after
+    prices.add_prices(1, [("2022-02-10", 210.0)])
+    assert series("2022-01", "2022-03", NetWorth.MONTH)[1] != monthly
+    assert series("2022-01-15", "2022-03-10", NetWorth.DAY)[1] != daily
+    assert valued == [
+        ["2022-02-28", "2022-03-31"],
+        ("2022-02-01", "2022-03-31"),
+    ]
+    # and so does a change to a trade
+    del valued[:]
+    dbref.sql_query("UPDATE trades SET shares = 60000 WHERE shares = 50000")
+    series("2022-01", "2022-03", NetWorth.MONTH)
+    series("2022-01-15", "2022-03-10", NetWorth.DAY)
+    assert valued == [
+        ["2022-01-31", "2022-02-28", "2022-03-31"],
+        ("2022-01-01", "2022-03-31"),
+    ]
+    # a later month leaves the earlier ones kept
+    del valued[:]
+    prices.add_prices(2, [("2022-03-15", 81.0)])
+    series("2022-01", "2022-03", NetWorth.MONTH)
+    assert valued == [["2022-03-31"]]
+    close_database(dbref)
+
+
+# end test_19_analytics_net_worth.py
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import close_database, open_database, string_too_long
+from lbk_library import Element
+
+from database.price_history import PriceHistory
+from database.schema import Schema
+from elements.security import Security
+
+security_values = {
+    "record_id": 4,
+    "symbol": "VTI",
+    "name": "Vanguard Total Stock Market ETF",
+    "remarks": "a remark",
+}
+
+
+def test_2001_constr(open_database):
+    dbref = open_database
+    security = Security(dbref)
+    assert isinstance(security, Security)
+    assert isinstance(security, Element)
+    assert security.defaults is Security.DEFAULTS
+    assert security.get_record_id() == 0
+    assert security.get_symbol() == ""
+    assert security.get_name() == ""
+    security = Security(dbref, security_values)
+    assert security.get_record_id() == 4
+    assert security.get_symbol() == "VTI"
+    assert security.get_name() == "Vanguard Total Stock Market ETF"
+    assert security.get_remarks() == "a remark"
+    close_database(dbref)
+
+
+def test_2002_set_symbol(open_database):
+    dbref = open_database
+    security = Security(dbref)
+    result = security.set_symbol(" brk.b ")
+    assert result["valid"]
+    assert security.get_symbol() == "BRK.B"
+    for bad in ("", "ABCDEFGHIJKLMNOPQ", None):
+        result = security.set_symbol(bad)
+        assert not result["valid"]
+        assert result["msg"]
+        assert security.get_symbol() == ""
+    close_database(dbref)
+
+
+def test_2003_set_name(open_database):
+    dbref = open_database
+    security = Security(dbref)
+    assert security.set_name("Fidelity 500 Index Fund")["valid"]
+    assert security.get_name() == "Fidelity 500 Index Fund"
+    assert security.set_name("")["valid"]
+    assert not security.set_name(string_too_long * 2)["valid"]
+    assert security.get_name() == ""
+    close_database(dbref)
+
+
+def test_2004_add_read_update_delete(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    security = Security(dbref, {"symbol": "fxaix", "name": "Fidelity 500"})
+    record_id = security.add()
+    assert record_id == 1
+    assert Security(dbref, 1).get_symbol() == "FXAIX"
+    assert Security(dbref, "fxaix").get_record_id() == 1
+    security.set_name("Fidelity 500 Index Fund")
+    assert security.update()
+    assert Security(dbref, "FXAIX").get_name() == "Fidelity 500 Index Fund"
+    # the prices of a security go with it
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, [("2022-01-03", 158.25)])
+    assert security.delete()
+    assert Security(dbref, 1).get_record_id() == 0
+    assert prices.get_range(1) is None
+    close_database(dbref)
+
+
+def test_2005_from_row(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    record_id = Security(dbref, security_values).add()
+    result = dbref.sql_query(
+        "SELECT * FROM securities WHERE record_id = :record_id",
+        {"record_id": record_id},
+    )
+    security = Security.from_row(dbref, dbref.sql_fetchrow(result))
+    assert security.get_properties() == Security(dbref, record_id).get_properties()
+    security = Security.from_row(dbref, {"record_id": 5, "name": None})
+    assert security.get_name() == ""
+    close_database(dbref)
+
+
+# end test_20_elements_security.py
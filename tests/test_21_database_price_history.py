@@ -0,0 +1,130 @@
+import os
+import sys
+from array import array
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import close_database, open_database
+
+from database.price_history import PriceHistory
+from database.schema import Schema
+
+closes = [
+    ("2021-12-31", 10.5),
+    ("2022-01-03", 10.75),
+    (date(2022, 1, 4), 11.0),
+    ("2022-02-01", 12.34567),
+]
+
+
+def test_2101_days(open_database):
+    dbref = open_database
+    assert PriceHistory.to_day("1970-01-01") == 0
+    assert PriceHistory.to_day(date(1970, 1, 2)) == 1
+    assert PriceHistory.to_date(19000) == date(2022, 1, 8)
+    assert PriceHistory.to_date(PriceHistory.to_day("2022-02-28")) == date(2022, 2, 28)
+    close_database(dbref)
+
+
+def test_2102_add_get_prices(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    prices = PriceHistory(dbref)
+    assert prices.get_dbref() == dbref
+    assert prices.get_prices(1) == (array("i"), array("q"))
+    assert prices.add_prices(1, closes) == 4
+    assert prices.add_prices(1, []) == 0
+    days, values = prices.get_prices(1)
+    assert [PriceHistory.to_date(day).isoformat() for day in days] == [
+        "2021-12-31",
+        "2022-01-03",
+        "2022-01-04",
+        "2022-02-01",
+    ]
+    assert list(values) == [105000, 107500, 110000, 123457]
+    # one block is held for each month
+    result = dbref.sql_query("SELECT COUNT(*) AS blocks FROM prices")
+    assert dbref.sql_fetchrow(result)["blocks"] == 3
+    close_database(dbref)
+
+
+def test_2103_date_ranges(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, closes)
+    prices.add_prices(2, [("2022-01-03", 99.0)])
+    days, values = prices.get_prices(1, "2022-01-04", date(2022, 2, 1))
+    assert list(values) == [110000, 123457]
+    days, values = prices.get_prices(1, "2022-01-05", "2022-01-31")
+    assert len(days) == len(values) == 0
+    days, values = prices.get_prices(1, end="2022-01-03")
+    assert list(values) == [105000, 107500]
+    assert list(prices.get_prices(2)[1]) == [990000]
+    close_database(dbref)
+
+
+def test_2104_replace_prices(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, closes)
+    assert prices.add_prices(1, [("2022-01-04", 11.5), ("2022-01-05", 11.25)]) == 2
+    days, values = prices.get_prices(1, "2022-01-01")
+    assert list(values) == [107500, 115000, 112500, 123457]
+    close_database(dbref)
+
+
+def test_2105_get_price_and_range(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref)
+    prices = PriceHistory(dbref)
+    assert prices.get_price(1) is None
+    assert prices.get_range(1) is None
+    prices.add_prices(1, closes)
+    assert prices.get_price(1) == 123457
+    assert prices.get_price(1, "2022-01-04") == 110000
+    # before the first price of the month, the close of the month before
+    assert prices.get_price(1, "2022-01-01") == 105000
+    assert prices.get_price(1, date(2022, 1, 31)) == 110000
+    assert prices.get_price(1, "2021-12-30") is None
+    assert prices.get_price(1, "2030-01-01") == 123457
+    assert prices.get_range(1) == (date(2021, 12, 31), date(2022, 2, 1))
+    prices.delete_prices(1)
+    assert prices.get_range(1) is None
+    close_database(dbref)
+
+
+def price_versions(dbref):
+    result = dbref.sql_query("SELECT month, version FROM price_months ORDER BY month")
+    return {row["month"]: row["version"] for row in dbref.sql_fetchrowset(result)}
+
+
+def test_2106_price_months(open_database):
+    dbref = open_database
+    Schema.upgrade(dbref, 8)
+    prices = PriceHistory(dbref)
+    prices.add_prices(1, closes)
+    # the months already held are versioned by the upgrade
+    Schema.upgrade(dbref)
+    assert price_versions(dbref) == {"2021-12": 1, "2022-01": 1, "2022-02": 1}
+    # a replaced block raises its month, a new one starts at 1
+    prices.add_prices(1, [("2022-01-05", 11.25), ("2022-03-01", 12.0)])
+    prices.add_prices(2, [("2022-01-03", 99.0)])
+    assert price_versions(dbref) == {
+        "2021-12": 1,
+        "2022-01": 4,
+        "2022-02": 1,
+        "2022-03": 1,
+    }
+    prices.delete_prices(2)
+    assert price_versions(dbref)["2022-01"] == 5
+    close_database(dbref)
+
+
+# end test_21_database_price_history.py
@@ -0,0 +1,78 @@
+import os
+import sys
+import threading
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from quotes.rate_limiter import RateLimiter
+
+
+class Clock:
+    """A clock that moves only when something sleeps."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.waits = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.waits.append(seconds)
+        self.now += seconds
+
+
+def test_2201_unlimited():
+    clock = Clock()
+    limiter = RateLimiter(0, clock=clock, sleep=clock.sleep)
+    assert limiter.get_rate() == 0
+    for count in range(10):
+        assert limiter.acquire() == 0.0
+    assert clock.waits == []
+
+
+def test_2202_burst_then_spaced():
+    clock = Clock()
+    limiter = RateLimiter(2.0, 3, clock=clock, sleep=clock.sleep)
+    assert limiter.get_rate() == 2.0
+    waits = [limiter.acquire() for count in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([0.5, 0.5])
+    assert clock.waits == pytest.approx([0.5, 0.5])
+
+
+def test_2203_refills_over_time():
+    clock = Clock()
+    limiter = RateLimiter(1.0, 2, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    limiter.acquire()
+    clock.now += 10.0
+    # the bucket holds no more than the burst
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_2204_threads_queue():
+    clock = Clock()
+    lock = threading.Lock()
+
+    def sleep(seconds):
+        with lock:
+            clock.waits.append(seconds)
+
+    limiter = RateLimiter(4.0, 1, clock=clock, sleep=sleep)
+    threads = [threading.Thread(target=limiter.acquire) for count in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # each thread waits behind the tokens taken before it
+    assert sorted(clock.waits) == pytest.approx([0.25, 0.5, 0.75, 1.0])
+
+
+# end test_22_quotes_rate_limiter.py
@@ -0,0 +1,84 @@
+import importlib.util
+import os
+import sys
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from quotes.file_quote_provider import FileQuoteProvider
+from quotes.quote_provider import QuoteError, QuoteProvider
+from quotes.yfinance_provider import YFinanceProvider
+
+history = (
+    "Date,Open,High,Low,Close,Adj Close,Volume\n"
+    + "2022-01-03,10.0,10.9,9.9,10.5,10.4,1000\n"
+    + "2022-01-04,10.5,11.2,10.4,11.0,10.9,1200\n"
+    + "2022-01-05,null,null,null,null,null,null\n"
+    + "2022-01-06,11.0,11.5,10.8,11.25,11.1,900\n"
+)
+
+
+def write_history(tmpdir, symbol, text=history):
+    tmpdir.join(symbol + ".csv").write(text)
+
+
+def test_2301_constructor(tmpdir):
+    provider = FileQuoteProvider(str(tmpdir))
+    assert isinstance(provider, QuoteProvider)
+    assert provider.get_directory() == str(tmpdir)
+    assert provider.get_number_requests() == 0
+    assert provider.MAX_SYMBOLS == 100
+    assert provider.RATE == 0.0
+
+
+def test_2302_get_quotes(tmpdir):
+    write_history(tmpdir, "VTI")
+    provider = FileQuoteProvider(str(tmpdir))
+    assert provider.get_quotes(["VTI", "NONE"]) == {"VTI": 11.25}
+    assert provider.get_quotes([]) == {}
+    assert provider.get_number_requests() == 2
+
+
+def test_2303_get_history(tmpdir):
+    write_history(tmpdir, "VTI")
+    write_history(tmpdir, "BND", "Date,Close\n2022-01-04,80.0\n")
+    provider = FileQuoteProvider(str(tmpdir))
+    histories = provider.get_history(
+        ["VTI", "BND", "NONE"], date(2022, 1, 4), date(2022, 1, 31)
+    )
+    assert histories == {
+        "VTI": [(date(2022, 1, 4), 11.0), (date(2022, 1, 6), 11.25)],
+        "BND": [(date(2022, 1, 4), 80.0)],
+    }
+    histories = provider.get_history(["VTI"], date(2022, 2, 1), date(2022, 2, 28))
+    assert histories == {"VTI": []}
+
+
+def test_2304_changed_file(tmpdir):
+    write_history(tmpdir, "VTI")
+    provider = FileQuoteProvider(str(tmpdir))
+    assert provider.get_quotes(["VTI"]) == {"VTI": 11.25}
+    write_history(tmpdir, "VTI", history + "2022-01-07,11.3,11.6,11.2,11.5,11.4,800\n")
+    path = str(tmpdir.join("VTI.csv"))
+    os.utime(path, (0, os.path.getmtime(path) + 10))
+    assert provider.get_quotes(["VTI"]) == {"VTI": 11.5}
+
+
+def test_2305_errors(tmpdir):
+    write_history(tmpdir, "BAD", "Date,Close\nyesterday,10.0\n")
+    provider = FileQuoteProvider(str(tmpdir))
+    with pytest.raises(QuoteError):
+        provider.get_quotes(["BAD"])
+    # yfinance is optional and only needed for a request
+    yahoo = YFinanceProvider()
+    assert isinstance(yahoo, QuoteProvider)
+    if importlib.util.find_spec("yfinance") is None:
+        with pytest.raises(QuoteError):
+            yahoo.get_quotes(["VTI"])
+
+
+# end test_23_quotes_file_quote_provider.py
@@ -0,0 +1,138 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import close_database, open_database
+
+from database.price_history import PriceHistory
+from database.schema import Schema
+from quotes.file_quote_provider import FileQuoteProvider
+from quotes.quote_provider import QuoteError
+from quotes.quote_service import QuoteService
+
+history = (
+    "Date,Close\n"
+    + "2022-01-03,10.5\n"
+    + "2022-01-04,11.0\n"
+    + "2022-01-05,11.25\n"
+    + "2022-01-06,11.5\n"
+    + "2022-01-07,12.0\n"
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SmallProvider(FileQuoteProvider):
+    """Answers two symbols a request."""
+
+    MAX_SYMBOLS = 2
+
+
+class FailingProvider(FileQuoteProvider):
+    def get_quotes(self, symbols):
+        if "BAD" in symbols:
+            raise QuoteError("Request failed.")
+        return super().get_quotes(symbols)
+
+
+def load_securities(dbref, tmpdir, symbols):
+    Schema.upgrade(dbref)
+    for symbol in symbols:
+        tmpdir.join(symbol + ".csv").write(history)
+        dbref.sql_query(
+            "INSERT INTO securities (symbol) VALUES (:symbol)", {"symbol": symbol}
+        )
+
+
+def test_2401_cached_quotes(open_database, tmpdir):
+    dbref = open_database
+    load_securities(dbref, tmpdir, ["VTI", "BND"])
+    provider = FileQuoteProvider(str(tmpdir))
+    clock = Clock()
+    service = QuoteService(dbref, provider, ttl=60, clock=clock)
+    assert service.get_provider() == provider
+    quotes = service.get_quotes(["vti", "BND", "NONE", "VTI"])
+    assert quotes == {"VTI": 120000, "BND": 120000}
+    assert provider.get_number_requests() == 1
+    # only the symbol without a quote is requested again
+    clock.now += 30
+    assert service.get_quotes(["VTI", "BND"]) == quotes
+    assert provider.get_number_requests() == 1
+    service.get_quotes(["VTI", "NONE"])
+    assert provider.get_number_requests() == 2
+    # the kept quotes expire
+    clock.now += 31
+    service.get_quotes(["VTI", "BND"])
+    assert provider.get_number_requests() == 3
+    service.get_quotes(["VTI"], refresh=True)
+    assert provider.get_number_requests() == 4
+    result = dbref.sql_query("SELECT COUNT(*) AS quotes FROM quotes")
+    assert dbref.sql_fetchrow(result)["quotes"] == 2
+    service.close()
+    close_database(dbref)
+
+
+def test_2402_batches(open_database, tmpdir):
+    dbref = open_database
+    symbols = ["A", "B", "C", "D", "E"]
+    load_securities(dbref, tmpdir, symbols)
+    provider = SmallProvider(str(tmpdir))
+    service = QuoteService(dbref, provider, workers=3)
+    assert len(service.get_quotes(symbols)) == 5
+    assert provider.get_number_requests() == 3
+    stored = service.update_history(end="2022-01-07")
+    assert stored == {symbol: 5 for symbol in symbols}
+    assert provider.get_number_requests() == 6
+    service.close()
+    close_database(dbref)
+
+
+def test_2403_missing_history(open_database, tmpdir):
+    dbref = open_database
+    load_securities(dbref, tmpdir, ["VTI", "BND"])
+    provider = FileQuoteProvider(str(tmpdir))
+    service = QuoteService(dbref, provider)
+    assert service.update_history(["VTI"], "2022-01-04", "2022-01-05") == {"VTI": 2}
+    prices = PriceHistory(dbref)
+    assert prices.get_range(1) == (date(2022, 1, 4), date(2022, 1, 5))
+    # the days before and after those held, and all of BND
+    requests = provider.get_number_requests()
+    stored = service.update_history(start="2022-01-01", end="2022-01-07")
+    assert stored == {"VTI": 3, "BND": 5}
+    assert provider.get_number_requests() == requests + 3
+    assert list(prices.get_prices(1)[1]) == [105000, 110000, 112500, 115000, 120000]
+    # nothing is missing, or only a weekend
+    requests = provider.get_number_requests()
+    assert service.update_history(end=date(2022, 1, 9)) == {}
+    assert provider.get_number_requests() == requests
+    assert service.update_history(["NONE"]) == {}
+    service.close()
+    close_database(dbref)
+
+
+def test_2404_errors(open_database, tmpdir):
+    dbref = open_database
+    load_securities(dbref, tmpdir, ["VTI"])
+    provider = FailingProvider(str(tmpdir))
+    service = QuoteService(dbref, provider)
+    assert service.get_quotes(["VTI", "BAD"]) == {}
+    assert service.get_errors() == {"VTI": "Request failed.", "BAD": "Request failed."}
+    assert service.get_quotes(["VTI"]) == {"VTI": 120000}
+    assert service.get_errors() == {}
+    service.close()
+    close_database(dbref)
+
+
+# end test_24_quotes_quote_service.py
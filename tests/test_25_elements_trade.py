@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_trades_table,
+    open_database,
+)
+from lbk_library import Element
+
+from database.schema import Schema
+from elements.trade import Trade
+from elements.transaction import Transaction
+
+trade_values = {
+    "record_id": 7,
+    "transaction_id": 3,
+    "security_id": 2,
+    "shares": -12500,
+    "remarks": "a remark",
+}
+
+
+def test_2501_constr(open_database):
+    dbref = open_database
+    trade = Trade(dbref)
+    assert isinstance(trade, Trade)
+    assert isinstance(trade, Element)
+    assert trade.defaults is Trade.DEFAULTS
+    assert trade.get_record_id() == 0
+    assert trade.get_transaction_id() == 0
+    assert trade.get_security_id() == 0
+    assert trade.get_shares() == 0
+    trade = Trade(dbref, trade_values)
+    assert trade.get_record_id() == 7
+    assert trade.get_transaction_id() == 3
+    assert trade.get_security_id() == 2
+    assert trade.get_shares() == -12500
+    assert trade.get_remarks() == "a remark"
+    close_database(dbref)
+
+
+def test_2502_set_record_ids(open_database):
+    dbref = open_database
+    trade = Trade(dbref)
+    assert trade.set_transaction_id(4)["valid"]
+    assert trade.get_transaction_id() == 4
+    assert trade.set_security_id(1)["valid"]
+    assert trade.get_security_id() == 1
+    for bad in (0, -1, "3", None, True):
+        result = trade.set_transaction_id(bad)
+        assert not result["valid"]
+        assert result["msg"]
+        assert trade.get_transaction_id() == 0
+        assert not trade.set_security_id(bad)["valid"]
+        assert trade.get_security_id() == 0
+    close_database(dbref)
+
+
+def test_2503_set_shares(open_database):
+    dbref = open_database
+    trade = Trade(dbref)
+    assert trade.set_shares(15 * Trade.SHARE_SCALE)["valid"]
+    assert trade.get_shares() == 150000
+    assert trade.set_shares(-1)["valid"]
+    for bad in (0, 1.5, "10", None, False):
+        result = trade.set_shares(bad)
+        assert not result["valid"]
+        assert result["msg"]
+        assert trade.get_shares() == 0
+    close_database(dbref)
+
+
+def test_2504_add_read_delete(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    result = dbref.sql_query("SELECT * FROM trades WHERE transaction_id = 2")
+    trade = Trade.from_row(dbref, dbref.sql_fetchrow(result))
+    assert trade.get_security_id() == 1
+    assert trade.get_shares() == 100000
+    record_id = trade.get_record_id()
+    assert trade.get_properties() == Trade(dbref, record_id).get_properties()
+    record_id = Trade(
+        dbref, {"transaction_id": 1, "security_id": 2, "shares": 5000}
+    ).add()
+    assert Trade(dbref, record_id).get_shares() == 5000
+    # a trade is removed with its transaction
+    assert Transaction(dbref, 2).delete()
+    result = dbref.sql_query("SELECT COUNT(*) AS trades FROM trades")
+    assert dbref.sql_fetchrow(result)["trades"] == 5
+    close_database(dbref)
+
+
+def test_2505_trades_change_months(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    result = dbref.sql_query(
+        "SELECT version FROM ledger_months WHERE month = '2022-02'"
+    )
+    version = dbref.sql_fetchrow(result)["version"]
+    dbref.sql_query("UPDATE trades SET shares = -30000 WHERE transaction_id = 4")
+    result = dbref.sql_query(
+        "SELECT version FROM ledger_months WHERE month = '2022-02'"
+    )
+    assert dbref.sql_fetchrow(result)["version"] == version + 2
+    close_database(dbref)
+
+
+# end test_25_elements_trade.py
@@ -0,0 +1,133 @@
+import os
+import sys
+from array import array
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_trades_table,
+    open_database,
+)
+
+from analytics.valuation import Valuation
+from database.price_history import PriceHistory
+from database.schema import Schema
+from elements.trade import Trade
+
+
+def load_portfolio(dbref):
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    prices = PriceHistory(dbref)
+    prices.add_prices(
+        1, [("2022-01-04", 200.0), ("2022-01-07", 205.0), ("2022-02-01", 220.0)]
+    )
+    prices.add_prices(2, [("2022-01-05", 80.0), ("2022-01-31", 79.5)])
+
+
+def test_2601_accounts_holdings(create_accounts_table):
+    dbref = create_accounts_table
+    load_portfolio(dbref)
+    valuation = Valuation(dbref)
+    assert valuation.get_dbref() == dbref
+    assert Valuation.SHARE_SCALE == Trade.SHARE_SCALE
+    assert valuation.get_accounts() == {1: False, 2: True, 4: False, 6: False}
+    assert valuation.get_holdings() == {
+        1: {2: 125000},
+        2: {1: 50000},
+        4: {1: 60000, 2: 200000},
+    }
+    assert valuation.get_holdings(date(2022, 1, 4)) == {
+        2: {1: 50000},
+        4: {1: 100000},
+    }
+    close_database(dbref)
+
+
+def test_2602_account_values(create_accounts_table):
+    dbref = create_accounts_table
+    load_portfolio(dbref)
+    valuation = Valuation(dbref)
+    days, values = valuation.get_account_values(end="2022-02-01")
+    assert days[0] == "2022-01-03"
+    assert days[-1] == "2022-02-01"
+    assert sorted(values) == [1, 2, 4, 6]
+    assert isinstance(values[4], array)
+    assert len(values[4]) == len(days) == 30
+    # cash, then VTI, then BND and the price changes, then a sale
+    assert list(values[4][:5]) == [500000, 500000, 500000, 500000, 505000]
+    assert values[4][-2] == 504000
+    assert values[4][-1] == 519000
+    assert list(values[2][:2]) == [100000, 100000]
+    assert values[2][-1] == 110000
+    assert list(values[1][6:8]) == [0, 100000]
+    assert values[1][-1] == 99375
+    assert not any(values[6])
+    close_database(dbref)
+
+
+def test_2603_opening_values(create_accounts_table):
+    dbref = create_accounts_table
+    load_portfolio(dbref)
+    valuation = Valuation(dbref)
+    days, values = valuation.get_account_values("2022-01-31", date(2022, 2, 2))
+    assert days == ["2022-01-31", "2022-02-01", "2022-02-02"]
+    assert list(values[4]) == [504000, 519000, 519000]
+    assert valuation.get_account_values("2022-02-02", "2022-02-01") == ([], {})
+    close_database(dbref)
+
+
+def test_2604_totals(create_accounts_table):
+    dbref = create_accounts_table
+    load_portfolio(dbref)
+    valuation = Valuation(dbref)
+    days, totals = valuation.get_totals("2022-02-01", "2022-02-01")
+    assert days == ["2022-02-01"]
+    assert list(totals[Valuation.TAXABLE]) == [618375]
+    assert list(totals[Valuation.TAX_DEFERRED]) == [110000]
+    assert list(totals[Valuation.TOTAL]) == [728375]
+    close_database(dbref)
+
+
+def test_2605_no_trades(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    valuation = Valuation(dbref)
+    assert valuation.get_holdings() == {}
+    assert valuation.get_account_values() == ([], {})
+    days, totals = valuation.get_totals("2022-01-01", "2022-01-02")
+    assert list(totals[Valuation.TOTAL]) == [0, 0]
+    assert valuation.get_market_values_on(["2022-01-01"]) == {}
+    close_database(dbref)
+
+
+def test_2606_market_values_on(create_accounts_table):
+    dbref = create_accounts_table
+    load_portfolio(dbref)
+    valuation = Valuation(dbref)
+    days, values = valuation.get_market_values("2021-12-31", "2022-02-03")
+    wanted = ["2021-12-31", "2022-01-04", "2022-01-06", "2022-01-31", "2022-02-03"]
+    on_days = valuation.get_market_values_on(wanted)
+    assert sorted(on_days) == sorted(values)
+    for account_id, series in values.items():
+        assert isinstance(on_days[account_id], array)
+        assert list(on_days[account_id]) == [series[days.index(day)] for day in wanted]
+    # the days need not start at the first trade
+    assert list(valuation.get_market_values_on(["2022-02-01"])[4]) == [
+        values[4][days.index("2022-02-01")]
+    ]
+    assert valuation.get_market_values_on([]) == {}
+    close_database(dbref)
+
+
+# end test_26_analytics_valuation.py
@@ -0,0 +1,158 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_trades_table,
+    open_database,
+)
+
+from analytics.tax_lots import Gain, Lot, TaxLots
+from database.schema import Schema
+
+
+def two_lots(method):
+    lots = TaxLots(method)
+    assert lots.buy(1, "2020-01-02", 100, 100000) == 1
+    assert lots.buy(1, date(2021, 6, 1), 50, 60000) == 2
+    return lots
+
+
+def test_2701_constructor():
+    lots = TaxLots()
+    assert lots.get_method() == TaxLots.FIFO
+    assert lots.get_securities() == []
+    assert lots.get_lots(1) == []
+    assert lots.get_shares(1) == 0
+    assert lots.get_basis(1) == 0
+    assert lots.get_realized(2021) == {TaxLots.SHORT_TERM: 0, TaxLots.LONG_TERM: 0}
+    with pytest.raises(ValueError):
+        TaxLots("lifo")
+
+
+def test_2702_fifo():
+    lots = two_lots(TaxLots.FIFO)
+    gains = lots.sell(1, "2021-07-01", 120, 180000)
+    assert gains == [
+        Gain(1, 1, "2020-01-02", "2021-07-01", 100, 150000, 100000, True),
+        Gain(1, 2, "2021-06-01", "2021-07-01", 20, 30000, 24000, False),
+    ]
+    assert gains[1].get_gain() == 6000
+    assert lots.get_lots(1) == [Lot(2, "2021-06-01", 30, 36000)]
+    assert lots.get_shares(1) == 30
+    assert lots.get_basis(1) == 36000
+    assert lots.get_realized("2021") == {
+        TaxLots.SHORT_TERM: 6000,
+        TaxLots.LONG_TERM: 50000,
+    }
+    assert lots.get_gains(2021) == gains
+    assert lots.get_gains(2020) == []
+
+
+def test_2703_specific():
+    lots = two_lots(TaxLots.SPECIFIC)
+    gains = lots.sell(1, "2021-07-01", 40, 60000, {2: 30})
+    assert [(gain.lot_id, gain.shares, gain.basis) for gain in gains] == [
+        (2, 30, 36000),
+        (1, 10, 10000),
+    ]
+    assert lots.get_realized(2021) == {
+        TaxLots.SHORT_TERM: 9000,
+        TaxLots.LONG_TERM: 5000,
+    }
+    # more shares than a lot or a sale holds, or a lot not held, cannot
+    # be named, and nothing changes
+    for named in ({2: 21}, {1: 2}, {9: 1}):
+        with pytest.raises(ValueError):
+            lots.sell(1, "2021-07-02", 1, 1000, named)
+    assert lots.get_shares(1) == 110
+    assert lots.get_lots(1) == [
+        Lot(1, "2020-01-02", 90, 90000),
+        Lot(2, "2021-06-01", 20, 24000),
+    ]
+
+
+def test_2704_average():
+    lots = two_lots(TaxLots.AVERAGE)
+    gains = lots.sell(1, "2021-07-01", 75, 90000)
+    assert gains == [Gain(1, 1, "2020-01-02", "2021-07-01", 75, 90000, 80000, True)]
+    assert lots.get_basis(1) == 80000
+    gains = lots.sell(1, "2021-08-01", 75, 75000)
+    assert [(gain.shares, gain.basis, gain.long_term) for gain in gains] == [
+        (25, 26666, True),
+        (50, 53334, False),
+    ]
+    assert lots.get_basis(1) == 0
+    assert lots.get_securities() == []
+
+
+def test_2705_holding_period():
+    lots = TaxLots()
+    lots.buy(1, "2021-01-04", 10, 1000)
+    # a purchase dated earlier is sold first
+    lots.buy(1, "2020-02-29", 10, 1000, "leap")
+    lots.buy(2, "2020-01-02", 10, 1000)
+    assert [lot.lot_id for lot in lots.get_lots(1)] == ["leap", 1]
+    assert not lots.sell(1, "2021-02-28", 5, 600)[0].long_term
+    assert lots.sell(1, "2021-03-01", 5, 600)[0].long_term
+    assert not lots.sell(2, "2021-01-02", 5, 600)[0].long_term
+    assert lots.sell(2, "2021-01-03", 5, 600)[0].long_term
+    assert lots.get_securities() == [1]
+
+
+def test_2706_errors():
+    lots = two_lots(TaxLots.FIFO)
+    for shares in (0, -1, 151):
+        with pytest.raises(ValueError):
+            lots.sell(1, "2021-07-01", shares, 1000)
+    with pytest.raises(ValueError):
+        lots.sell(2, "2021-07-01", 1, 1000)
+    with pytest.raises(ValueError):
+        lots.buy(1, "2021-07-01", 0, 1000)
+    with pytest.raises(ValueError):
+        lots.buy(1, "2021-07-01", 1, 1000, 2)
+    with pytest.raises(ValueError):
+        lots.buy(1, "July 1", 1, 1000)
+    assert lots.get_shares(1) == 150
+
+
+def test_2707_many_lots():
+    lots = TaxLots()
+    for number in range(20000):
+        lots.buy(1, "2020-01-01", 10, 100)
+    for number in range(19999):
+        lots.sell(1, "2021-01-01", 10, 110)
+    assert lots.get_lots(1) == [Lot(20000, "2020-01-01", 10, 100)]
+    assert lots.get_realized(2021)[TaxLots.SHORT_TERM] == 19999 * 10
+    assert len(lots.get_gains()) == 19999
+
+
+def test_2708_read_accounts(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_trades_table(dbref)
+    # account 2 is tax deferred
+    accounts = TaxLots.read_accounts(dbref)
+    assert sorted(accounts) == [1, 4]
+    lots = accounts[4]
+    assert lots.get_lots(1) == [Lot(2, "2022-01-04", 60000, 120000)]
+    assert lots.get_lots(2) == [Lot(3, "2022-01-05", 200000, 160000)]
+    assert lots.get_realized(2022) == {TaxLots.SHORT_TERM: 8000, TaxLots.LONG_TERM: 0}
+    assert accounts[1].get_lots(2) == [Lot(8, "2022-01-10", 125000, 100000)]
+    accounts = TaxLots.read_accounts(dbref, TaxLots.AVERAGE, date(2022, 1, 31))
+    assert accounts[4].get_shares(1) == 100000
+    assert accounts[4].get_gains() == []
+    close_database(dbref)
+
+
+# end test_27_analytics_tax_lots.py
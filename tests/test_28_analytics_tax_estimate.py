@@ -0,0 +1,145 @@
+import os
+import sys
+
+import pytest
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    load_trades_table,
+    load_transactions_table,
+    open_database,
+)
+
+from analytics.tax_estimate import TaxEstimate
+from analytics.tax_lots import TaxLots
+from constants.account_types import AccountType
+from constants.transaction_types import TransactionType
+from database.schema import Schema
+
+
+def income(interest=0, dividends=0, short_term=0, long_term=0, paid=0):
+    return {
+        TaxEstimate.INTEREST: interest,
+        TaxEstimate.DIVIDENDS: dividends,
+        TaxEstimate.SHORT_TERM: short_term,
+        TaxEstimate.LONG_TERM: long_term,
+        TaxEstimate.PAID: paid,
+    }
+
+
+def add_transaction(dbref, account_id, day, transaction_type, amount):
+    dbref.sql_query(
+        'INSERT INTO "transactions" '
+        + '("account_id", "date", "transaction_type", "amount") '
+        + "VALUES (:account_id, :date, :transaction_type, :amount)",
+        {
+            "account_id": account_id,
+            "date": day,
+            "transaction_type": transaction_type,
+            "amount": amount,
+        },
+    )
+
+
+def load_ledger(dbref):
+    load_accounts_table(dbref)
+    Schema.upgrade(dbref)
+    load_transactions_table(dbref)
+    load_trades_table(dbref)
+    dbref.sql_query(
+        'INSERT INTO "accounts" ("record_id", "account_type", "name") '
+        + "VALUES (9, :account_type, 'Federal tax')",
+        {"account_type": AccountType.TAX},
+    )
+    # account 4 is taxable and account 2 is tax deferred
+    add_transaction(dbref, 4, "2022-03-15", TransactionType.DIVIDEND, 2500)
+    add_transaction(dbref, 2, "2022-03-15", TransactionType.DIVIDEND, 9999)
+    add_transaction(dbref, 2, "2022-03-31", TransactionType.INTEREST, 777)
+    add_transaction(dbref, 9, "2022-04-15", TransactionType.TRANSFER, 50000)
+    add_transaction(dbref, 3, "2021-12-31", TransactionType.INTEREST, 90)
+
+
+def test_2801_estimate():
+    estimate = TaxEstimate.estimate(income(10000, 5000, 2000, 4000, 1000), 0.2, 0.1)
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 17000
+    assert estimate[TaxEstimate.CAPITAL_GAINS] == 4000
+    assert estimate[TaxEstimate.LOSS_DEDUCTION] == 0
+    assert estimate[TaxEstimate.TAX] == 3400 + 400
+    assert estimate[TaxEstimate.DUE] == 3800 - 1000
+    assert estimate[TaxEstimate.INTEREST] == 10000
+    # a short term loss offsets the long term gains
+    estimate = TaxEstimate.estimate(income(10000, 0, -1000, 4000), 0.2, 0.1)
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 10000
+    assert estimate[TaxEstimate.CAPITAL_GAINS] == 3000
+    # a long term loss offsets the short term gains
+    estimate = TaxEstimate.estimate(income(10000, 0, 4000, -1000), 0.2, 0.1)
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 13000
+    assert estimate[TaxEstimate.CAPITAL_GAINS] == 0
+    # a net loss is deducted up to the limit
+    estimate = TaxEstimate.estimate(income(500000, 0, -200000, -250000))
+    assert estimate[TaxEstimate.LOSS_DEDUCTION] == TaxEstimate.LOSS_LIMIT
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 200000
+    assert estimate[TaxEstimate.TAX] == round(200000 * TaxEstimate.ORDINARY_RATE)
+    estimate = TaxEstimate.estimate(income(1000, 0, -5000, 0, 300))
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 0
+    assert estimate[TaxEstimate.TAX] == 0
+    assert estimate[TaxEstimate.DUE] == -300
+
+
+def test_2802_get_income(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    taxes = TaxEstimate(dbref)
+    assert taxes.get_dbref() == dbref
+    # interest of savings account 3, the dividend of account 4, the
+    # short term gain of account 4 and the payment into account 9
+    assert taxes.get_income(2022) == income(313, 2500, 8000, 0, 50000)
+    assert taxes.get_income("2021") == income(90)
+    assert taxes.get_income(2020) == income()
+    assert taxes.get_income(2022, TaxLots.AVERAGE) == income(313, 2500, 8000, 0, 50000)
+    with pytest.raises(ValueError):
+        taxes.get_income(2022, "lifo")
+
+    estimate = taxes.get_estimate(2022)
+    assert estimate[TaxEstimate.ORDINARY_INCOME] == 10813
+    assert estimate[TaxEstimate.TAX] == 2379
+    assert estimate[TaxEstimate.DUE] == 2379 - 50000
+    assert taxes.get_estimate(2022, 0.1, 0.0)[TaxEstimate.TAX] == 1081
+    close_database(dbref)
+
+
+def test_2803_cache(create_accounts_table):
+    dbref = create_accounts_table
+    load_ledger(dbref)
+    taxes = TaxEstimate.for_dbref(dbref)
+    assert TaxEstimate.for_dbref(dbref) is taxes
+    first = taxes.get_estimate(2022)
+    assert (taxes.get_hits(), taxes.get_misses()) == (0, 1)
+    # a report opened again finds the income already read
+    assert TaxEstimate.for_dbref(dbref).get_estimate(2022) == first
+    assert (taxes.get_hits(), taxes.get_misses()) == (1, 1)
+    # a later year does not change the income of 2022
+    add_transaction(dbref, 3, "2023-01-31", TransactionType.INTEREST, 200)
+    assert taxes.get_income(2022)[TaxEstimate.INTEREST] == 313
+    assert (taxes.get_hits(), taxes.get_misses()) == (2, 1)
+    # a change in the year is read again
+    add_transaction(dbref, 7, "2022-06-30", TransactionType.INTEREST, 1000)
+    assert taxes.get_income(2022)[TaxEstimate.INTEREST] == 1313
+    assert (taxes.get_hits(), taxes.get_misses()) == (2, 2)
+    # so is a change of the accounts
+    dbref.sql_query('UPDATE "accounts" SET "tax_deferred" = 1 WHERE "record_id" = 4')
+    assert taxes.get_income(2022) == income(1313, 0, 0, 0, 50000)
+    assert (taxes.get_hits(), taxes.get_misses()) == (2, 3)
+    taxes.clear()
+    assert taxes.get_income(2022) == income(1313, 0, 0, 0, 50000)
+    assert (taxes.get_hits(), taxes.get_misses()) == (2, 4)
+    close_database(dbref)
+
+
+# end test_28_analytics_tax_estimate.py
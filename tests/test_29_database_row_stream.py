@@ -0,0 +1,80 @@
+import os
+import sys
+
+src_path = os.path.join(os.path.realpath("."), "src")
+if src_path not in sys.path:
+    sys.path.append(src_path)
+
+from db_support import (
+    close_database,
+    create_accounts_table,
+    load_accounts_table,
+    open_database,
+)
+
+from database.row_stream import RowStream
+
+
+class CountingCursor:
+    """Count the fetchmany() calls of a cursor."""
+
+    def __init__(self, cursor):
+        self.description = cursor.description
+        self.cursor = cursor
+        self.sizes = []
+
+    def fetchmany(self, size):
+        self.sizes.append(size)
+        return self.cursor.fetchmany(size)
+
+
+def test_2901_rows_by_column_name(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    expected = dbref.sql_fetchrowset(
+        dbref.sql_query('SELECT "name", "record_id" FROM "accounts" ORDER BY 2')
+    )
+    rows = list(
+        RowStream(
+            dbref.sql_query('SELECT "name", "record_id" FROM "accounts" ORDER BY 2')
+        )
+    )
+    assert rows == [dict(row) for row in expected]
+    assert len(rows) > 0
+    # the columns are found by name, whatever their order
+    for row in RowStream(
+        dbref.sql_query('SELECT "record_id", "name" FROM "accounts" ORDER BY 1')
+    ):
+        assert row == rows.pop(0)
+    close_database(dbref)
+
+
+def test_2902_chunks(create_accounts_table):
+    dbref = create_accounts_table
+    load_accounts_table(dbref)
+    count = dbref.sql_fetchrow(
+        dbref.sql_query('SELECT COUNT(*) AS "count" FROM "accounts"')
+    )["count"]
+    cursor = CountingCursor(dbref.sql_query('SELECT "record_id" FROM "accounts"'))
+    stream = iter(RowStream(cursor, 2))
+    # nothing is read until the first row is asked for
+    assert cursor.sizes == []
+    next(stream)
+    assert cursor.sizes == [2]
+    assert len(list(stream)) == count - 1
+    assert cursor.sizes == [2] * (count // 2 + count % 2 + 1)
+    # the chunk size is at least 1
+    cursor = CountingCursor(dbref.sql_query('SELECT "record_id" FROM "accounts"'))
+    assert len(list(RowStream(cursor, 0))) == count
+    assert set(cursor.sizes) == {1}
+    close_database(dbref)
+
+
+def test_2903_no_rows(create_accounts_table):
+    dbref = create_accounts_table
+    assert list(RowStream(dbref.sql_query('SELECT * FROM "accounts"'))) == []
+    assert list(RowStream(dbref.sql_query('DELETE FROM "accounts"'))) == []
+    close_database(dbref)
+
+
+# end test_29_database_row_stream.py